@@ -0,0 +1,151 @@
+# benchmarks/map_benchmark.py
+"""
+Compara los mapas caóticos de src/core/chaotic_maps.py: rendimiento (bits/s generando con
+ChaoticBitGenerator y pasos/s iterando un lote de estados) y calidad (fracción de
+secuencias, desde condiciones iniciales aleatorias, que pasan la batería de pruebas de
+aleatoriedad y la verificación de periodo).
+
+    python benchmarks/map_benchmark.py --bits 100000 --sequences 10 --json mapas.json
+    python benchmarks/map_benchmark.py --maps cccbg,logistic --param logistic.r=3.99
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np
+
+DEFAULT_BITS = 100000
+DEFAULT_SEQUENCES = 10
+DEFAULT_SIGNIFICANCE = 0.01
+# Estados del lote y pasos con los que se mide la iteración vectorizada
+BATCH_STATES = 1024
+BATCH_STEPS = 200
+# Pruebas de la batería: nombre -> (método de RandomnessTests, argumentos)
+BATTERY = {
+    'monobit': ('monobit_test', {}),
+    'serial': ('serial_test', {'m': 2}),
+    'autocorr': ('auto_correlation_test', {'d': 1}),
+    'poker': ('poker_test', {'m': 4}),
+}
+
+
+def benchmark_map(name: str, params: dict = None, num_bits: int = DEFAULT_BITS, sequences: int = DEFAULT_SEQUENCES,
+                  significance: float = DEFAULT_SIGNIFICANCE, seed: int = 0) -> dict:
+    """
+    Genera `sequences` secuencias de num_bits bits con el mapa y aplica la batería a cada una.
+    Una secuencia aprueba una prueba con p-valor >= significance; si la verificación de
+    periodo la corta antes, cuenta como no aprobada (y sus pruebas también, si es muy corta).
+
+    Returns:
+        dict: 'map', 'params', 'bits_per_second', 'batch_steps_per_second', 'pass_rate'
+        (secuencias que aprueban toda la batería), 'test_pass_rates' ({prueba: fracción}),
+        'period_ok_rate' y 'mean_bits' (bits generados por secuencia).
+    """
+    from src.core.chaotic_generator import ChaoticBitGenerator
+    from src.core.chaotic_maps import create_map
+    from src.core.randomness_tests import RandomnessTests
+
+    chaotic_map = create_map(name, **(params or {}))
+    generator = ChaoticBitGenerator()
+    tests = RandomnessTests()
+    rng = np.random.default_rng(seed)
+    seconds = 0.0
+    generated = 0
+    passed_all = 0
+    periods_ok = 0
+    test_passes = dict.fromkeys(BATTERY, 0)
+    for _ in range(sequences):
+        x0, y0 = rng.uniform(0.05, 0.95, 2)
+        start = time.perf_counter()
+        bits, _, period_ok = generator.generate_block(chaotic_map, chaotic_map.initial_state(x0, y0), num_bits, set())
+        seconds += time.perf_counter() - start
+        generated += len(bits)
+        periods_ok += period_ok
+        passed = period_ok
+        for test, (method, kwargs) in BATTERY.items():
+            p_value = getattr(tests, method)(bits, **kwargs)['p_value']
+            ok = bool(p_value >= significance)  # nan (secuencia demasiado corta) no aprueba
+            test_passes[test] += ok
+            passed = passed and ok
+        passed_all += passed
+
+    states = np.random.default_rng(seed).uniform(0.05, 0.95, (BATCH_STATES, 2))
+    states = np.array([chaotic_map.initial_state(x0, y0) for x0, y0 in states])
+    start = time.perf_counter()
+    chaotic_map.iterate(states, BATCH_STEPS)
+    batch_seconds = time.perf_counter() - start
+    return {
+        'map': name,
+        'params': chaotic_map.params,
+        'bits_per_second': generated / seconds if seconds > 0 else None,
+        'batch_steps_per_second': BATCH_STATES * BATCH_STEPS / batch_seconds if batch_seconds > 0 else None,
+        'pass_rate': passed_all / sequences,
+        'test_pass_rates': {test: count / sequences for test, count in test_passes.items()},
+        'period_ok_rate': periods_ok / sequences,
+        'mean_bits': generated / sequences,
+    }
+
+
+def run_benchmarks(names=None, params: dict = None, num_bits: int = DEFAULT_BITS, sequences: int = DEFAULT_SEQUENCES,
+                   significance: float = DEFAULT_SIGNIFICANCE, seed: int = 0, report=print) -> list:
+    """Ejecuta benchmark_map para cada mapa (por defecto, todos los de CHAOTIC_MAPS)."""
+    from src.core.chaotic_maps import CHAOTIC_MAPS
+    results = []
+    for name in names or CHAOTIC_MAPS:
+        result = benchmark_map(name, (params or {}).get(name), num_bits, sequences, significance, seed)
+        results.append(result)
+        report(f"{name:<10} {result['bits_per_second']:12.4g} bits/s  {result['batch_steps_per_second']:12.4g} pasos/s en lote"
+               f"  aprueba {result['pass_rate']:6.1%}  periodo {result['period_ok_rate']:6.1%}"
+               f"  ({result['mean_bits']:.0f} bits por secuencia)")
+    return results
+
+
+def _parse_params(values) -> dict:
+    """['logistic.r=3.99', ...] -> {'logistic': {'r': 3.99}}"""
+    params = {}
+    for value in values:
+        key, _, number = value.partition('=')
+        name, _, param = key.partition('.')
+        if not (name and param and number):
+            raise ValueError(f"Parámetro con formato inválido: {value!r} (use mapa.parametro=valor).")
+        params.setdefault(name, {})[param] = float(number)
+    return params
+
+
+def main(argv=None) -> int:
+    from src.core.chaotic_maps import CHAOTIC_MAPS
+    parser = argparse.ArgumentParser(description="Rendimiento y calidad de los mapas caóticos.")
+    parser.add_argument('--maps', default=None, help=f"Mapas separados por comas (por defecto todos: {', '.join(CHAOTIC_MAPS)}).")
+    parser.add_argument('--param', action='append', default=[], metavar='MAPA.PARAM=VALOR',
+                        help="Parámetro de un mapa (se puede repetir), p. ej. bernoulli.beta=1.99.")
+    parser.add_argument('--bits', type=int, default=DEFAULT_BITS, help="Bits por secuencia.")
+    parser.add_argument('--sequences', type=int, default=DEFAULT_SEQUENCES, help="Secuencias por mapa.")
+    parser.add_argument('--significance', type=float, default=DEFAULT_SIGNIFICANCE, help="Nivel de significancia de las pruebas.")
+    parser.add_argument('--seed', type=int, default=0, help="Semilla de las condiciones iniciales.")
+    parser.add_argument('--json', help="Guardar los resultados en este archivo.")
+    args = parser.parse_args(argv)
+
+    names = args.maps.split(',') if args.maps else None
+    unknown = set(names or []) - set(CHAOTIC_MAPS)
+    if unknown:
+        parser.error(f"mapas desconocidos: {', '.join(sorted(unknown))}")
+    try:
+        params = _parse_params(args.param)
+    except ValueError as e:
+        parser.error(str(e))
+    results = run_benchmarks(names, params, args.bits, args.sequences, args.significance, args.seed)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'bits': args.bits, 'sequences': args.sequences, 'significance': args.significance,
+                       'results': results}, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
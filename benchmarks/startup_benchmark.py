@@ -0,0 +1,100 @@
+# benchmarks/startup_benchmark.py
+"""
+Mide el costo de arranque: tiempo de importación de los puntos de entrada (GUI, lotes,
+proceso de simulación) en intérpretes nuevos y qué módulos pesados carga cada uno.
+
+    python benchmarks/startup_benchmark.py [--repeat 5] [--json salida.json]
+
+Devuelve un código distinto de cero si una ruta sin GUI importa tkinter o matplotlib.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (nombre, módulo importado, ¿sin GUI?)
+TARGETS = [
+    ('gui', 'src.gui.main_window', False),
+    ('pestañas con gráficos', 'src.gui.simulation_tab, src.gui.results_tab', False),
+    ('lotes', 'src.cli.batch_runner', True),
+    ('proceso de simulación', 'src.core.simulation_worker', True),
+    ('carga HTTP', 'src.core.http_load_generator', True),
+]
+HEAVY_MODULES = ['tkinter', 'matplotlib', 'matplotlib.pyplot', 'matplotlib.backends.backend_tkagg',
+                 'matplotlib.backends.backend_pdf', 'pandas', 'scipy', 'scipy.stats', 'scipy.special']
+GUI_MODULES = ('tkinter', 'matplotlib')
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, repeat: int) -> dict:
+    """Importa module en `repeat` intérpretes nuevos; devuelve tiempos y módulos pesados cargados."""
+    times = []
+    loaded = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                                cwd=ROOT, capture_output=True, text=True, check=True)
+        sample = json.loads(output.stdout.strip().splitlines()[-1])
+        times.append(sample['seconds'])
+        loaded = sample['loaded']
+    return {'median_seconds': statistics.median(times), 'min_seconds': min(times), 'loaded': loaded}
+
+
+def import_profile(module: str, top: int = 10) -> list:
+    """Los `top` módulos con mayor tiempo acumulado según `python -X importtime`."""
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in output.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((int(parts[1]), parts[2].strip()))
+    rows.sort(reverse=True)
+    return [{'module': name, 'cumulative_ms': micros / 1000} for micros, name in rows[:top]]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Tiempo de importación de los puntos de entrada.")
+    parser.add_argument('--repeat', type=int, default=5, help="Intérpretes nuevos por medición.")
+    parser.add_argument('--profile', action='store_true', help="Mostrar los módulos más costosos de cada importación.")
+    parser.add_argument('--json', help="Guardar los resultados en este archivo.")
+    args = parser.parse_args(argv)
+
+    results = []
+    failed = False
+    for name, module, headless in TARGETS:
+        result = measure(module, args.repeat)
+        result.update({'name': name, 'module': module, 'headless': headless})
+        if headless:
+            result['gui_imported'] = any(m.split('.')[0] in GUI_MODULES for m in result['loaded'])
+            failed = failed or result['gui_imported']
+        if args.profile:
+            result['profile'] = import_profile(module)
+        results.append(result)
+
+        print(f"{name:<24} {result['median_seconds'] * 1000:8.1f} ms  (mín. {result['min_seconds'] * 1000:.1f} ms)"
+              f"  pesados: {', '.join(result['loaded']) or '-'}")
+        if result.get('gui_imported'):
+            print("    ERROR: una ruta sin GUI importa tkinter o matplotlib")
+        for row in result.get('profile', []):
+            print(f"    {row['cumulative_ms']:8.1f} ms  {row['module']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version, 'repeat': args.repeat, 'results': results}, f, indent=2, ensure_ascii=False)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,291 @@
+# benchmarks/throughput_benchmark.py
+"""
+Mide el rendimiento (bits/s, pasos/s, MB/s) y la memoria máxima (tracemalloc) del
+generador, de cada prueba de aleatoriedad, del simulador (paso a paso y en lote) y de los
+exportadores, para tamaños N entre 10^3 y 10^8.
+
+    python benchmarks/throughput_benchmark.py run --max-exponent 6 --json actual.json
+    python benchmarks/throughput_benchmark.py compare base.json actual.json --threshold 0.1
+
+Cada caso tiene un N máximo por defecto (los recorridos en Python puro a 10^8 tardan
+horas); --no-limit lo ignora. compare devuelve un código distinto de cero si algún caso
+perdió más de threshold de rendimiento o aumentó su memoria en esa proporción.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import numpy as np
+
+DEFAULT_EXPONENTS = range(3, 9)
+DEFAULT_THRESHOLD = 0.10
+
+
+def _random_bits(n):
+    return np.random.default_rng(0).integers(0, 2, n, dtype=np.uint8)
+
+
+def _history(n):
+    rng = np.random.default_rng(0)
+    return {
+        'time_steps': np.arange(n, dtype=np.int64),
+        'simulated_requests': rng.uniform(0, 200, n),
+        'latency': rng.uniform(1, 1000, n),
+        'cpu': rng.uniform(10, 98, n),
+        'memory': rng.uniform(20, 95, n),
+    }
+
+
+# Cada caso prepara sus datos fuera de la medición y devuelve una función que ejecuta la
+# operación medida y devuelve la cantidad procesada (en la unidad del caso)
+
+def _generator(n, workdir):
+    from src.core.chaotic_generator import ChaoticBitGenerator
+    generator = ChaoticBitGenerator()
+
+    def run():
+        generator.generate_cccbg_bits(0.495, 0.3, 0.301, n)
+        return n
+    return run
+
+
+def _randomness_test(method, **kwargs):
+    def setup(n, workdir):
+        from src.core.randomness_tests import RandomnessTests
+        tests = RandomnessTests()
+        bits = _random_bits(n)
+
+        def run():
+            getattr(tests, method)(bits, **kwargs)
+            return n
+        return run
+    return setup
+
+
+def _simulate_step(n, workdir):
+    from src.core.simulation_engine import LoadSimulator
+    simulator = LoadSimulator(seed=0)
+    bits = _random_bits(n).tolist()
+
+    def run():
+        for bit in bits:
+            simulator.simulate_step(bit)
+        return n
+    return run
+
+
+def _simulate_steps(n, workdir):
+    from src.core.simulation_engine import LoadSimulator
+    simulator = LoadSimulator(seed=0)
+    bits = _random_bits(n)
+
+    def run():
+        simulator.simulate_steps(bits)
+        return n
+    return run
+
+
+def _export(write):
+    def setup(n, workdir):
+        history = _history(n)
+        bits = _random_bits(n)
+
+        def run():
+            path = write(workdir, history, bits)
+            size = os.path.getsize(path)
+            os.remove(path)
+            return size / 1e6
+        return run
+    return setup
+
+
+def _write_history_csv(workdir, history, bits):
+    from src.utils.data_exporter import DataExporter
+    path = os.path.join(workdir, 'historial.csv')
+    DataExporter.write_history_csv(path, history)
+    return path
+
+
+def _write_bits_csv(workdir, history, bits):
+    from src.utils.data_exporter import DataExporter
+    path = os.path.join(workdir, 'bits.csv')
+    DataExporter.write_bits_csv(path, bits, x_values=history['latency'])
+    return path
+
+
+def _write_columnar(workdir, history, bits):
+    from src.utils.data_exporter import DataExporter
+    return DataExporter.write_columnar(os.path.join(workdir, 'historial.npz'), history, fmt='npz')
+
+
+# (nombre, unidad, función de preparación, N máximo por defecto)
+BENCHMARKS = [
+    ('generador', 'bits/s', _generator, 10**6),
+    ('prueba_monobit', 'bits/s', _randomness_test('monobit_test'), 10**8),
+    ('prueba_serial', 'bits/s', _randomness_test('serial_test', m=2), 10**7),
+    ('prueba_autocorrelacion', 'bits/s', _randomness_test('auto_correlation_test', d=1), 10**7),
+    ('prueba_poker', 'bits/s', _randomness_test('poker_test', m=4), 10**7),
+    ('simulador_paso', 'pasos/s', _simulate_step, 10**5),
+    ('simulador_lote', 'pasos/s', _simulate_steps, 10**6),
+    ('exportar_historial_csv', 'MB/s', _export(_write_history_csv), 10**6),
+    ('exportar_bits_csv', 'MB/s', _export(_write_bits_csv), 10**6),
+    ('exportar_npz', 'MB/s', _export(_write_columnar), 10**7),
+]
+
+
+def machine_metadata() -> dict:
+    """Datos del equipo y del entorno, para saber si dos mediciones son comparables."""
+    versions = {'numpy': np.__version__}
+    for name in ('scipy', 'pandas'):
+        try:
+            versions[name] = __import__(name).__version__
+        except ImportError:
+            versions[name] = None
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version,
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'versions': versions,
+        'commit': commit,
+    }
+
+
+def measure(setup, n: int, repeat: int, workdir: str) -> dict:
+    """
+    Mediana de `repeat` tiempos (sin tracemalloc, que hace más lento el código Python) y
+    memoria máxima de una ejecución adicional bajo tracemalloc.
+    """
+    times = []
+    for _ in range(repeat):
+        run = setup(n, workdir)
+        start = time.perf_counter()
+        amount = run()
+        times.append(time.perf_counter() - start)
+    run = setup(n, workdir)
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    seconds = statistics.median(times)
+    return {'seconds': seconds, 'amount': amount,
+            'throughput': amount / seconds if seconds > 0 else None, 'peak_bytes': peak}
+
+
+def run_benchmarks(sizes, names=None, repeat: int = 3, no_limit: bool = False, report=print) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, unit, setup, max_size in BENCHMARKS:
+            if names and name not in names:
+                continue
+            # Una ejecución sin medir carga los módulos que se importan en el primer uso (scipy, pandas)
+            setup(min(sizes), workdir)()
+            for n in sizes:
+                if n > max_size and not no_limit:
+                    continue
+                result = measure(setup, n, repeat, workdir)
+                result.update({'benchmark': name, 'size': n, 'unit': unit})
+                results.append(result)
+                report(f"{name:<24} N={n:<10d} {result['throughput']:14.4g} {unit:<8}"
+                       f" pico {result['peak_bytes'] / 1e6:9.2f} MB  ({result['seconds']:.3f} s)")
+    return results
+
+
+def compare(base: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    Compara dos archivos de resultados caso por caso (mismo nombre y N).
+
+    Returns:
+        list: Un dict por caso común con 'ratio' (rendimiento actual / base), 'memory_ratio'
+        y 'regression' (True si el rendimiento cayó o la memoria creció más de threshold).
+    """
+    base_results = {(r['benchmark'], r['size']): r for r in base['results']}
+    rows = []
+    for result in current['results']:
+        previous = base_results.get((result['benchmark'], result['size']))
+        if previous is None or not previous['throughput'] or not result['throughput']:
+            continue
+        ratio = result['throughput'] / previous['throughput']
+        memory_ratio = result['peak_bytes'] / previous['peak_bytes'] if previous['peak_bytes'] else None
+        regression = ratio < 1 - threshold or (memory_ratio is not None and memory_ratio > 1 + threshold)
+        rows.append({'benchmark': result['benchmark'], 'size': result['size'], 'unit': result['unit'],
+                     'ratio': ratio, 'memory_ratio': memory_ratio, 'regression': regression})
+    return rows
+
+
+def _parse_sizes(text: str) -> list:
+    return [int(float(value)) for value in text.split(',') if value.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Rendimiento y memoria del generador, las pruebas, el simulador y los exportadores.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Ejecutar las mediciones.")
+    run_parser.add_argument('--sizes', type=_parse_sizes, default=None,
+                            help="Tamaños separados por comas (por ejemplo 1e3,1e5); por defecto 10^3 … 10^max-exponent.")
+    run_parser.add_argument('--max-exponent', type=int, default=max(DEFAULT_EXPONENTS), help="Mayor potencia de 10 por defecto.")
+    run_parser.add_argument('--only', default=None, help="Casos separados por comas (ver BENCHMARKS).")
+    run_parser.add_argument('--repeat', type=int, default=3, help="Repeticiones por medición (se usa la mediana).")
+    run_parser.add_argument('--no-limit', action='store_true', help="Ignorar el N máximo de cada caso.")
+    run_parser.add_argument('--json', help="Guardar los resultados en este archivo.")
+
+    compare_parser = subparsers.add_parser('compare', help="Comparar dos archivos de resultados.")
+    compare_parser.add_argument('base', help="Resultados de referencia (JSON).")
+    compare_parser.add_argument('current', help="Resultados nuevos (JSON).")
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help="Variación relativa tolerada (por defecto 0.10).")
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        sizes = args.sizes or [10**e for e in DEFAULT_EXPONENTS if e <= args.max_exponent]
+        names = args.only.split(',') if args.only else None
+        unknown = set(names or []) - {name for name, *_ in BENCHMARKS}
+        if unknown:
+            parser.error(f"casos desconocidos: {', '.join(sorted(unknown))}")
+        output = {'metadata': machine_metadata(), 'repeat': args.repeat,
+                  'results': run_benchmarks(sizes, names, args.repeat, args.no_limit)}
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(output, f, indent=2, ensure_ascii=False)
+        return 0
+
+    with open(args.base, encoding='utf-8') as f:
+        base = json.load(f)
+    with open(args.current, encoding='utf-8') as f:
+        current = json.load(f)
+    for key in ('platform', 'processor', 'cpu_count', 'python'):
+        if base['metadata'].get(key) != current['metadata'].get(key):
+            print(f"Aviso: '{key}' difiere entre las mediciones; la comparación puede no ser válida.")
+    rows = compare(base, current, args.threshold)
+    for row in rows:
+        memory = '-' if row['memory_ratio'] is None else f"{row['memory_ratio']:.2f}x"
+        flag = '  REGRESIÓN' if row['regression'] else ''
+        print(f"{row['benchmark']:<24} N={row['size']:<10d} rendimiento {row['ratio']:.2f}x  memoria {memory}{flag}")
+    return 1 if any(row['regression'] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,24 @@
 # main.py
-from src.gui.main_window import MainWindow
-import tkinter as tk
+import sys
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        # Modo por lotes sin GUI: no importa tkinter ni matplotlib
+        from src.cli.batch_runner import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "loadgen":
+        # Generación de tráfico HTTP real con calendario caótico (sin GUI)
+        from src.core.http_load_generator import main as loadgen_main
+        sys.exit(loadgen_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "bits":
+        # Secuencias de bits para baterías externas (NIST STS, dieharder, TestU01), sin GUI
+        from src.utils.bitstream_export import main as bits_main
+        sys.exit(bits_main(sys.argv[2:]))
+
+    from src.gui.main_window import MainWindow
+
     # La clase MainWindow ya hereda de tk.Tk(), por lo que ella misma es la ventana principal.
     # No necesitas crear una instancia separada de tk.Tk() y luego ocultarla.
-    
+
     app = MainWindow()
-    app.mainloop() # Este es el único mainloop que se debe llamar.
\ No newline at end of file
+    app.mainloop() # Este es el único mainloop que se debe llamar.
@@ -0,0 +1,2 @@
+# src/cli/__init__.py
+# Este archivo vacío indica que el directorio 'cli' es un paquete de Python.
\ No newline at end of file
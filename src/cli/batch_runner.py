@@ -0,0 +1,225 @@
+# src/cli/batch_runner.py
+"""
+Ejecución por lotes sin GUI: lee configuraciones JSON o TOML con las mismas claves que
+construye ConfigTab, ejecuta generación, simulación y pruebas, y escribe los resultados
+en disco. No importa tkinter ni matplotlib.
+
+Uso:
+    python main.py batch config1.json config2.toml --output-dir resultados --workers 4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.core.simulation_runner import SimulationRunner, DEFAULT_CONFIG, validate_config_params
+from src.core.simulation_engine import summarize_history
+
+INT_KEYS = ('num_bits', 'num_users')
+FLOAT_KEYS = ('alpha', 'x0', 'y0', 'latency_sensitivity', 'cpu_sensitivity', 'memory_sensitivity', 'recovery_rate')
+
+
+def load_config_file(path: str) -> list:
+    """
+    Lee un archivo de configuración y devuelve la lista de configuraciones que contiene.
+
+    Formatos aceptados (JSON o TOML según la extensión):
+      - Un objeto/tabla con los parámetros de una ejecución.
+      - Una lista de objetos (solo JSON).
+      - Un objeto con 'runs' (lista de ejecuciones) y 'defaults' opcional compartido.
+    """
+    if path.lower().endswith('.toml'):
+        import tomllib
+        with open(path, 'rb') as f:
+            data = tomllib.load(f)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+    if isinstance(data, list):
+        defaults, runs = {}, data
+    elif 'runs' in data:
+        defaults, runs = data.get('defaults', {}), data['runs']
+    else:
+        defaults, runs = {}, [data]
+
+    base_name = os.path.splitext(os.path.basename(path))[0]
+    configs = []
+    for i, run in enumerate(runs):
+        config = dict(DEFAULT_CONFIG)
+        config.update(defaults)
+        config.update(run)
+        for key in INT_KEYS:
+            config[key] = int(config[key])
+        for key in FLOAT_KEYS:
+            config[key] = float(config[key])
+        config.setdefault('name', base_name if len(runs) == 1 else f"{base_name}_{i + 1:03d}")
+        validate_config_params(config)
+        configs.append(config)
+    return configs
+
+
+def _to_json_value(value):
+    """Convierte escalares y arreglos de NumPy a tipos nativos para json."""
+    if hasattr(value, 'tolist') and getattr(value, 'ndim', 0) > 0:
+        return value.tolist()
+    if hasattr(value, 'item'):
+        return value.item()
+    return value
+
+
+def run_config(config_params: dict, output_dir: str, write_data: bool = True, chunk_size: int = 65536,
+               stream: bool = False, store_dir: str = None) -> dict:
+    """
+    Ejecuta una configuración completa y escribe sus resultados en output_dir/<name>/.
+    Con stream, el historial y los bits se escriben en output_dir/<name>/flujo/ mientras se
+    simula (StreamingExportSink) en lugar de conservarse en memoria y volcarse a CSV al final.
+    Con store_dir, la ejecución se registra además en ese almacén (RunStore).
+
+    Returns:
+        dict: Resumen de la ejecución (también guardado como resumen.json).
+    """
+    run_dir = os.path.join(output_dir, config_params['name'])
+    os.makedirs(run_dir, exist_ok=True)
+    if stream:
+        config_params = dict(config_params, stream_dir=os.path.join(run_dir, 'flujo'), keep_history=False)
+
+    start = time.perf_counter()
+    runner = SimulationRunner(
+        config_params,
+        chunk_size=chunk_size,
+        checkpoint_path=config_params.get('checkpoint_path') or None,
+        checkpoint_interval=config_params.get('checkpoint_interval', 0)
+    )
+    result = runner.run()
+    elapsed = time.perf_counter() - start
+
+    if stream:
+        from src.utils.export_sink import read_stream
+        streamed = read_stream(result['stream_dir'])
+        history = streamed['simulation_history']
+    else:
+        history = result['simulation_history']
+    if write_data and not stream:
+        from src.utils.data_exporter import DataExporter
+        with runner.profiler.span('escritura de CSV'):
+            DataExporter.write_history_csv(os.path.join(run_dir, 'historial.csv'), result['simulation_history'])
+            DataExporter.write_bits_csv(os.path.join(run_dir, 'bits.csv'), result['bits'],
+                                        x_values=result['x_values'], period_ok=result['period_ok'])
+
+    test_results = {}
+    for name, test in result['test_results'].items():
+        if isinstance(test, dict):
+            test_results[name] = {k: _to_json_value(v) for k, v in test.items()}
+        else:
+            test_results[name] = _to_json_value(test)
+    num_steps = runner.steps_done
+    summary = {
+        'name': config_params['name'],
+        'config_params': config_params,
+        'num_steps': num_steps,
+        'period_ok': result['period_ok'],
+        'elapsed_seconds': elapsed,
+        'steps_per_second': num_steps / elapsed if elapsed > 0 else None,
+        'simulation_summary': summarize_history(history),
+        'test_results': test_results
+    }
+    if 'pacing' in result:
+        summary['pacing'] = result['pacing']
+    if 'pipeline' in result:
+        summary['pipeline'] = result['pipeline']
+    if runner.profiler.enabled:
+        summary['profile'] = runner.profiler.report()
+    if store_dir:
+        from src.utils.run_store import RunStore
+        with RunStore(store_dir) as store:
+            stored = dict(result, simulation_history=history)
+            if stream:
+                stored.update(bits=streamed['bits'], x_values=streamed['x_values'])
+            summary['run_id'] = store.save_run(config_params, stored)
+    with open(os.path.join(run_dir, 'resumen.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return summary
+
+
+def run_batch(configs: list, output_dir: str, workers: int = None, write_data: bool = True, chunk_size: int = 65536,
+              stream: bool = False, store_dir: str = None) -> list:
+    """
+    Ejecuta varias configuraciones, en paralelo entre procesos si workers > 1.
+    Sin workers, usa tantos procesos como núcleos haya y quepan a la vez en memoria según
+    el modelo de costos (max_parallel_runs).
+    Escribe además output_dir/resumen_lote.json con el resumen de todas las ejecuciones.
+    """
+    names = [c['name'] for c in configs]
+    if len(set(names)) != len(names):
+        raise ValueError("Los nombres de las ejecuciones deben ser únicos.")
+    os.makedirs(output_dir, exist_ok=True)
+    if not workers:
+        from src.core.cost_model import max_parallel_runs
+        workers = max_parallel_runs([dict(c, keep_history=not stream) for c in configs])
+    workers = min(workers, len(configs))
+
+    if workers <= 1:
+        summaries = [run_config(c, output_dir, write_data, chunk_size, stream, store_dir) for c in configs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_config, c, output_dir, write_data, chunk_size, stream, store_dir) for c in configs]
+            summaries = [f.result() for f in futures]
+
+    with open(os.path.join(output_dir, 'resumen_lote.json'), 'w', encoding='utf-8') as f:
+        json.dump(summaries, f, indent=2, ensure_ascii=False)
+    return summaries
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='main.py batch',
+        description="Ejecuta simulaciones por lotes sin GUI a partir de archivos JSON o TOML.")
+    parser.add_argument('configs', nargs='+', help="Archivos de configuración (.json o .toml)")
+    parser.add_argument('--output-dir', default='resultados', help="Directorio de salida (por defecto: resultados)")
+    parser.add_argument('--workers', type=int, default=None, help="Procesos en paralelo (por defecto: los núcleos disponibles que quepan en memoria)")
+    parser.add_argument('--chunk-size', type=int, default=65536, help="Pasos simulados por bloque")
+    parser.add_argument('--summary-only', action='store_true', help="No escribir historial ni bits, solo resúmenes")
+    parser.add_argument('--stream', action='store_true',
+                        help="Escribir historial y bits en disco durante la simulación, sin conservarlos en memoria")
+    parser.add_argument('--memmap', action='store_true',
+                        help="Guardar el historial y los bits en archivos np.memmap (<salida>/<nombre>/historial) en lugar de en memoria")
+    parser.add_argument('--store', metavar='DIR', default=None,
+                        help="Registrar cada ejecución en el almacén de ejecuciones de DIR (SQLite)")
+    parser.add_argument('--test-cache', metavar='DIR', default=None,
+                        help="Reutilizar los resultados de las pruebas guardados en DIR para configuraciones ya ejecutadas")
+    parser.add_argument('--pipeline', choices=('thread', 'process'), default=None,
+                        help="Ejecutar generación, simulación y pruebas como etapas concurrentes en hilos o procesos")
+    parser.add_argument('--profile', action='store_true',
+                        help="Medir tiempo y memoria por fase y guardarlos en resumen.json")
+    args = parser.parse_args(argv)
+
+    try:
+        configs = []
+        for path in args.configs:
+            configs.extend(load_config_file(path))
+        for config in configs:
+            if args.test_cache:
+                config.setdefault('test_cache_dir', args.test_cache)
+            if args.profile:
+                config['profile'] = True
+            if args.pipeline:
+                config['pipeline'] = args.pipeline
+            if args.memmap:
+                config['history_dir'] = os.path.join(args.output_dir, config['name'], 'historial')
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error en la configuración: {e}", file=sys.stderr)
+        return 2
+
+    summaries = run_batch(configs, args.output_dir, workers=args.workers,
+                          write_data=not args.summary_only, chunk_size=args.chunk_size, stream=args.stream,
+                          store_dir=args.store)
+    for summary in summaries:
+        print(f"{summary['name']}: {summary['num_steps']} pasos en {summary['elapsed_seconds']:.2f} s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,25 +1,18 @@
 import numpy as np
 
+from src.core.chaotic_maps import CoupledSkewTentMap
+
+# Bits generados entre dos avisos de progreso (y verificaciones de cancelación)
+PROGRESS_BLOCK_BITS = 1024
+# Pasos iterados entre dos verificaciones de periodo: ante una repetición, generate_chunk
+# deja de iterar como mucho estos pasos después
+PERIOD_CHECK_STEPS = 256
+
 class ChaoticBitGenerator:
     def __init__(self):
         pass
 
-    def _skew_tent_map(self, x, alpha):
-        """
-        Skew Tent Map: 
-        f(x) = x/alpha        si 0 <= x < alpha
-             = (1-x)/(1-alpha) si alpha <= x <= 1
-        """
-        if not (0.49 <= alpha <= 0.50):
-            raise ValueError("El parámetro alpha debe estar en el rango [0.49, 0.50].")
-        if not (0 <= x <= 1):
-            raise ValueError("x debe estar en el intervalo [0, 1].")
-        if x < alpha:
-            return x / alpha
-        else:
-            return (1 - x) / (1 - alpha)
-
-    def generate_cccbg_bits(self, alpha: float, x0: float, y0: float, num_bits: int) -> tuple:
+    def generate_cccbg_bits(self, alpha: float, x0: float, y0: float, num_bits: int, progress=None) -> tuple:
         """
         Genera una secuencia de bits usando dos mapas Skew Tent acoplados cruzadamente.
         Devuelve: bits, x_values, periodo_ok
@@ -29,6 +22,8 @@ class ChaoticBitGenerator:
             x0 (float): Condición inicial del primer mapa (en [0, 1]).
             y0 (float): Condición inicial del segundo mapa (en [0, 1]).
             num_bits (int): Número de bits a generar.
+            progress (ProgressReporter): Opcional; informa la fase "Generación de bits" y
+                permite cancelarla (lanza OperationCancelled).
 
         Returns:
             tuple: (Secuencia de bits (0s y 1s), lista de valores x generados, resultado de periodo)
@@ -40,43 +35,141 @@ class ChaoticBitGenerator:
         if not num_bits > 0:
             raise ValueError("El número de bits a generar debe ser un entero positivo.")
 
-        bits = []
-        x = x0
-        y = y0
-        x_values = []
-        y_values = []
+        if progress is None:
+            bits, x_values, _, period_ok = self.generate_cccbg_chunk(alpha, x0, y0, num_bits)
+            return bits, x_values, period_ok
+
+        # Por bloques pequeños para informar el avance; encadenar bloques da la misma secuencia
+        progress.start_phase("Generación de bits", num_bits)
         seen = set()
+        bit_blocks, x_blocks = [], []
+        x, y = x0, y0
         period_ok = True
+        generated = 0
+        while generated < num_bits:
+            n = min(PROGRESS_BLOCK_BITS, num_bits - generated)
+            bits, x_values, y_values, period_ok = self.generate_cccbg_chunk(alpha, x, y, n, seen)
+            bit_blocks.append(bits)
+            x_blocks.append(x_values)
+            generated += len(bits)
+            if not period_ok:
+                break
+            x, y = float(x_values[-1]), float(y_values[-1])
+            progress.update(generated)
+        progress.finish_phase()
+        return np.concatenate(bit_blocks), np.concatenate(x_blocks), period_ok
+
+    def generate_cccbg_chunk(self, alpha: float, x: float, y: float, num_bits: int, seen: set = None) -> tuple:
+        """
+        Genera un bloque de bits continuando desde el estado (x, y) del generador.
+        Permite generar secuencias largas por partes y reanudarlas desde un checkpoint:
+        encadenar bloques produce exactamente la misma secuencia que una sola llamada.
+
+        Args:
+            alpha (float): Parámetro del sistema Skew Tent (0.49 <= alpha <= 0.50).
+            x (float): Estado actual del primer mapa (en [0, 1]).
+            y (float): Estado actual del segundo mapa (en [0, 1]).
+            num_bits (int): Número de bits a generar en este bloque.
+            seen (set): Pares (x, y) ya visitados para la verificación de periodo.
+                Se actualiza en el sitio; si es None se usa un conjunto nuevo.
+
+        Returns:
+            tuple: (bits, valores x, valores y, resultado de periodo). Si se detecta una
+            repetición, el bloque termina antes y los valores x/y incluyen el punto repetido.
+        """
+        if not (0.49 <= alpha <= 0.50):
+            raise ValueError("El parámetro alpha debe estar en el rango [0.49, 0.50].")
+        if not (0 <= x <= 1 and 0 <= y <= 1):
+            raise ValueError("Las condiciones iniciales x0, y0 deben estar en [0, 1].")
+        if not num_bits > 0:
+            raise ValueError("El número de bits a generar debe ser un entero positivo.")
+        bits, states, period_ok = self.generate_chunk(CoupledSkewTentMap(alpha=alpha), (x, y), num_bits, seen)
+        return bits, states[:, 0], states[:, 1], period_ok
 
-        for i in range(num_bits):
-            # Paso 1: Iterar ambos mapas Skew Tent
-            fx = self._skew_tent_map(x, alpha)
-            fy = self._skew_tent_map(y, alpha)
-            # Paso 2: Acoplamiento cruzado
-            x_next = (fx + y) % 1
-            y_next = (fy + x) % 1
-
-            # Guardar el número real antes de decidir el bit
-            x_values.append(x_next)
-            y_values.append(y_next)
-
-            # Verificar periodo: si x_next o y_next ya se vieron, no cumple periodo
-            key = (round(x_next, 10), round(y_next, 10))
-            if key in seen:
-                period_ok = False
+    def generate_chunk(self, chaotic_map, state, num_bits: int, seen: set = None) -> tuple:
+        """
+        Genera un bloque de bits con cualquier mapa de CHAOTIC_MAPS, continuando desde su
+        estado. Encadenar bloques produce la misma secuencia que una sola llamada.
+
+        Args:
+            chaotic_map (ChaoticMap): Mapa que se itera (ver src/core/chaotic_maps.py).
+            state: Estado actual del mapa, de chaotic_map.dimension variables.
+            num_bits (int): Número de bits a generar en este bloque.
+            seen (set): Estados ya visitados (redondeados a 10 decimales) para la
+                verificación de periodo. Se actualiza en el sitio.
+
+        Returns:
+            tuple: (bits, estados (k, dimension), resultado de periodo). Si se detecta una
+            repetición, el bloque termina antes y los estados incluyen el repetido.
+        """
+        if seen is None:
+            seen = set()
+
+        # Verificar periodo por tramos: si un estado ya se vio, no cumple periodo y el resto
+        # del bloque no se itera
+        parts = []
+        period_ok = True
+        count = 0
+        for part in chaotic_map.iter_chunks(state, num_bits, PERIOD_CHECK_STEPS):
+            if chaotic_map.dimension == 2:
+                keys = ((round(a, 10), round(b, 10)) for a, b in zip(*part.T.tolist()))
+            else:
+                keys = (tuple(round(v, 10) for v in row) for row in part.tolist())
+            for i, key in enumerate(keys):
+                if key in seen:
+                    period_ok = False
+                    part = part[:i + 1]
+                    break
+                seen.add(key)
+            parts.append(part)
+            if not period_ok:
+                count += len(part) - 1
                 break
-            seen.add(key)
+            count += len(part)
 
-            # Paso 3: Generación del bit
-            bit = 1 if x_next > 0.5 else 0
-            bits.append(bit)
-            x = x_next
-            y = y_next
+        states = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        return chaotic_map.bits(states[:count]), states, period_ok
 
-        # Si se terminó el ciclo sin romper, cumple periodo
-        if len(bits) == num_bits:
-            period_ok = True
-        else:
-            period_ok = False
+    def generate_block(self, chaotic_map, state, num_bits: int, seen: set, should_stop=None):
+        """
+        Genera un bloque de num_bits con chaotic_map continuando desde state, en tramos de
+        PROGRESS_BLOCK_BITS, y comprueba entre tramos si se pidió detener.
+        Encadenar tramos produce la misma secuencia que generar el bloque de una vez.
 
-        return np.array(bits), np.array(x_values), period_ok
\ No newline at end of file
+        Returns:
+            tuple: (bits, estados (k, dimension), resultado de periodo), o None si
+            should_stop devolvió True (el bloque a medias se descarta).
+        """
+        parts = []
+        generated = 0
+        period_ok = True
+        while generated < num_bits:
+            if generated and should_stop is not None and should_stop():
+                return None
+            part = self.generate_chunk(chaotic_map, state, min(PROGRESS_BLOCK_BITS, num_bits - generated), seen)
+            parts.append(part)
+            generated += len(part[0])
+            period_ok = part[2]
+            if not period_ok:
+                break
+            state = part[1][-1]
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts]), period_ok
+
+    def generate_cccbg_block(self, alpha: float, x: float, y: float, num_bits: int, seen: set,
+                             should_stop=None):
+        """
+        Como generate_block, con el mapa del CCCBG desde (x, y).
+
+        Returns:
+            tuple: (bits, valores x, valores y, resultado de periodo), o None si should_stop
+            devolvió True (el bloque a medias se descarta).
+        """
+        if not (0.49 <= alpha <= 0.50):
+            raise ValueError("El parámetro alpha debe estar en el rango [0.49, 0.50].")
+        if not (0 <= x <= 1 and 0 <= y <= 1):
+            raise ValueError("Las condiciones iniciales x0, y0 deben estar en [0, 1].")
+        block = self.generate_block(CoupledSkewTentMap(alpha=alpha), (x, y), num_bits, seen, should_stop)
+        if block is None:
+            return None
+        bits, states, period_ok = block
+        return bits, np.ascontiguousarray(states[:, 0]), np.ascontiguousarray(states[:, 1]), period_ok
@@ -0,0 +1,288 @@
+"""
+Mapas caóticos intercambiables con una interfaz común de iteración por lotes y bloques.
+
+Cada mapa (ChaoticMap) trabaja sobre estados en [0, 1)^dimension y ofrece:
+  - step(states): un paso vectorizado de un lote de estados (batch, dimension).
+  - iterate(states, n): n pasos de un estado (dimension,) o de un lote (batch, dimension).
+  - iter_chunks(states, n, chunk_steps): lo mismo en bloques, con memoria acotada.
+  - bits(trayectoria): un bit por paso (salida del mapa > BIT_THRESHOLD).
+
+Iterar un mapa es secuencial en el tiempo; lo que se vectoriza es el lote de estados. Para
+uno o pocos estados, NumPy cuesta más por paso que Python escalar, por lo que los mapas de
+una o dos variables definen además _orbit (n pasos de un estado con aritmética escalar),
+que da exactamente los mismos valores que step.
+
+ChaoticBitGenerator genera bits con cualquiera de ellos (generate_chunk), SimulationTab los
+usa para las figuras de órbita y sensibilidad, y benchmarks/map_benchmark.py los compara.
+"""
+import abc
+
+import numpy as np
+
+# Pasos por bloque en iter_chunks
+DEFAULT_CHUNK_STEPS = 1 << 16
+# Lotes de hasta este número de estados se iteran uno a uno con _orbit (si el mapa lo tiene)
+SCALAR_BATCH_LIMIT = 16
+# Un paso produce el bit 1 si la salida del mapa supera este valor
+BIT_THRESHOLD = 0.5
+
+
+class ChaoticMap(metaclass=abc.ABCMeta):
+    """
+    Mapa caótico con parámetros (defaults, sobrescribibles como argumentos con nombre). Las
+    subclases definen step y, opcionalmente, validate, initial_state y _orbit.
+    """
+    name = None
+    label = None
+    dimension = 1
+    defaults = {}
+
+    def __init__(self, **params):
+        unknown = sorted(set(params) - set(self.defaults))
+        if unknown:
+            raise ValueError(f"Parámetros desconocidos para el mapa '{self.name}': {', '.join(unknown)}.")
+        self.params = dict(self.defaults, **params)
+        for key, value in self.params.items():
+            setattr(self, key, value)
+        self.validate()
+
+    def validate(self):
+        """Lanza ValueError si algún parámetro está fuera de su rango."""
+
+    def initial_state(self, x0: float, y0: float) -> np.ndarray:
+        """Estado inicial (dimension,) a partir de las condiciones iniciales x₀, y₀ de la configuración."""
+        return np.array([x0, y0][:self.dimension], dtype=np.float64)
+
+    @abc.abstractmethod
+    def step(self, states: np.ndarray) -> np.ndarray:
+        """Un paso de un lote de estados (batch, dimension); devuelve un arreglo nuevo."""
+
+    _orbit = None
+
+    def iterate(self, states, n: int) -> np.ndarray:
+        """
+        Itera n pasos desde un estado (dimension,) o un lote de estados (batch, dimension).
+
+        Returns:
+            np.ndarray: Trayectoria sin el estado inicial, de forma (n, dimension) o
+            (n, batch, dimension).
+        """
+        states = np.asarray(states, dtype=np.float64)
+        if states.shape[-1] != self.dimension:
+            raise ValueError(f"El mapa '{self.name}' tiene estados de {self.dimension} variables.")
+        if states.ndim == 1:
+            if self._orbit is not None:
+                return self._orbit(states.tolist(), n)
+            return self.iterate(states[None], n)[:, 0]
+        if self._orbit is not None and len(states) <= SCALAR_BATCH_LIMIT:
+            trajectory = np.empty((n,) + states.shape)
+            for i, state in enumerate(states):
+                trajectory[:, i] = self._orbit(state.tolist(), n)
+            return trajectory
+        trajectory = np.empty((n,) + states.shape)
+        for i in range(n):
+            states = self.step(states)
+            trajectory[i] = states
+        return trajectory
+
+    def iter_chunks(self, states, n: int, chunk_steps: int = DEFAULT_CHUNK_STEPS):
+        """Como iterate, pero produce la trayectoria en bloques consecutivos de chunk_steps pasos."""
+        done = 0
+        while done < n:
+            trajectory = self.iterate(states, min(chunk_steps, n - done))
+            yield trajectory
+            states = trajectory[-1]
+            done += len(trajectory)
+
+    def output(self, trajectory: np.ndarray) -> np.ndarray:
+        """Valor real de cada paso (la primera variable del estado)."""
+        return trajectory[..., 0]
+
+    def bits(self, trajectory: np.ndarray) -> np.ndarray:
+        """Un bit por paso: 1 si la salida supera BIT_THRESHOLD."""
+        return (self.output(trajectory) > BIT_THRESHOLD).astype(np.int64)
+
+
+class SkewTentMap(ChaoticMap):
+    """
+    Skew Tent Map:
+    f(x) = x/alpha          si 0 <= x < alpha
+         = (1-x)/(1-alpha)  si alpha <= x <= 1
+    """
+    name = 'skew_tent'
+    label = "Skew Tent"
+    defaults = {'alpha': 0.495}
+
+    def validate(self):
+        if not 0 < self.alpha < 1:
+            raise ValueError("El parámetro alpha debe estar en (0, 1).")
+
+    def step(self, states):
+        return np.where(states < self.alpha, states / self.alpha, (1 - states) / (1 - self.alpha))
+
+    def _orbit(self, state, n):
+        alpha = self.alpha
+        one_minus_alpha = 1 - alpha
+        x, = state
+        values = []
+        for _ in range(n):
+            x = x / alpha if x < alpha else (1 - x) / one_minus_alpha
+            values.append(x)
+        return np.array(values)[:, None]
+
+
+class CoupledSkewTentMap(SkewTentMap):
+    """
+    Dos mapas Skew Tent acoplados cruzadamente (el generador CCCBG):
+    x' = (f(x) + y) mod 1,  y' = (f(y) + x) mod 1
+    """
+    name = 'cccbg'
+    label = "Skew Tent acoplado (CCCBG)"
+    dimension = 2
+
+    def step(self, states):
+        mapped = super().step(states)
+        return np.mod(mapped + states[:, ::-1], 1)
+
+    def _orbit(self, state, n):
+        alpha = self.alpha
+        one_minus_alpha = 1 - alpha
+        x, y = state
+        x_values, y_values = [], []
+        for _ in range(n):
+            fx = x / alpha if x < alpha else (1 - x) / one_minus_alpha
+            fy = y / alpha if y < alpha else (1 - y) / one_minus_alpha
+            x, y = (fx + y) % 1, (fy + x) % 1
+            x_values.append(x)
+            y_values.append(y)
+        return np.array([x_values, y_values]).T
+
+
+class LogisticMap(ChaoticMap):
+    """Mapa logístico: x' = r x (1 - x); caótico para r cerca de 4."""
+    name = 'logistic'
+    label = "Logístico"
+    defaults = {'r': 4.0}
+
+    def validate(self):
+        if not 0 < self.r <= 4:
+            raise ValueError("El parámetro r debe estar en (0, 4].")
+
+    def step(self, states):
+        return self.r * states * (1 - states)
+
+    def _orbit(self, state, n):
+        r = self.r
+        x, = state
+        values = []
+        for _ in range(n):
+            x = r * x * (1 - x)
+            values.append(x)
+        return np.array(values)[:, None]
+
+
+class BernoulliShiftMap(ChaoticMap):
+    """
+    Desplazamiento de Bernoulli (transformación beta): x' = beta x mod 1. Con beta = 2 y
+    aritmética binaria de punto flotante cada paso descarta un bit de la mantisa y la órbita
+    llega a 0 en unos 50 pasos (la verificación de periodo lo detecta); un beta no entero
+    evita ese colapso.
+    """
+    name = 'bernoulli'
+    label = "Desplazamiento de Bernoulli"
+    defaults = {'beta': 2.0}
+
+    def validate(self):
+        if not self.beta > 1:
+            raise ValueError("El parámetro beta debe ser mayor que 1.")
+
+    def step(self, states):
+        return np.mod(self.beta * states, 1)
+
+    def _orbit(self, state, n):
+        beta = self.beta
+        x, = state
+        values = []
+        for _ in range(n):
+            x = (beta * x) % 1
+            values.append(x)
+        return np.array(values)[:, None]
+
+
+class PiecewiseLinearMap(ChaoticMap):
+    """
+    Mapa caótico lineal por tramos (PWLCM), simétrico respecto de 1/2:
+    f(x) = x/p               si 0 <= x < p
+         = (x-p)/(1/2-p)     si p <= x < 1/2
+         = f(1-x)            si 1/2 <= x < 1
+    """
+    name = 'pwlcm'
+    label = "Lineal por tramos (PWLCM)"
+    defaults = {'p': 0.2871}
+
+    def validate(self):
+        if not 0 < self.p < 0.5:
+            raise ValueError("El parámetro p debe estar en (0, 0.5).")
+
+    def step(self, states):
+        folded = np.where(states < 0.5, states, 1 - states)
+        return np.where(folded < self.p, folded / self.p, (folded - self.p) / (0.5 - self.p))
+
+    def _orbit(self, state, n):
+        p = self.p
+        half_minus_p = 0.5 - p
+        x, = state
+        values = []
+        for _ in range(n):
+            x = x if x < 0.5 else 1 - x
+            x = x / p if x < p else (x - p) / half_minus_p
+            values.append(x)
+        return np.array(values)[:, None]
+
+
+class CoupledMapLattice(ChaoticMap):
+    """
+    Red de mapas acoplados (CML): `sites` mapas logísticos en un anillo con acoplamiento
+    difusivo a sus vecinos,
+    x_i' = (1 - epsilon) f(x_i) + epsilon/2 (f(x_{i-1}) + f(x_{i+1})).
+    La salida (y el bit) es el sitio 0. El paso ya es vectorial sobre los sitios, por lo que
+    no tiene núcleo escalar.
+    """
+    name = 'cml'
+    label = "Red de mapas acoplados (CML)"
+    defaults = {'sites': 8, 'epsilon': 0.1, 'r': 4.0}
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.dimension = int(self.sites)
+
+    def validate(self):
+        if int(self.sites) < 3:
+            raise ValueError("La red debe tener al menos 3 sitios.")
+        if not 0 <= self.epsilon <= 1:
+            raise ValueError("El parámetro epsilon debe estar en [0, 1].")
+        if not 0 < self.r <= 4:
+            raise ValueError("El parámetro r debe estar en (0, 4].")
+
+    def initial_state(self, x0, y0):
+        """Sitio i en (x₀ + i (y₀ - x₀)) mod 1: y₀ fija la separación entre sitios vecinos."""
+        return np.mod(x0 + np.arange(self.dimension) * (y0 - x0), 1)
+
+    def step(self, states):
+        mapped = self.r * states * (1 - states)
+        neighbours = np.roll(mapped, 1, axis=-1) + np.roll(mapped, -1, axis=-1)
+        return (1 - self.epsilon) * mapped + self.epsilon / 2 * neighbours
+
+
+# Mapas disponibles por nombre
+CHAOTIC_MAPS = {cls.name: cls for cls in (SkewTentMap, CoupledSkewTentMap, LogisticMap, BernoulliShiftMap,
+                                          PiecewiseLinearMap, CoupledMapLattice)}
+# Mapa del generador de bits CCCBG
+DEFAULT_MAP = CoupledSkewTentMap.name
+
+
+def create_map(name: str, **params) -> ChaoticMap:
+    """Crea el mapa registrado con ese nombre en CHAOTIC_MAPS."""
+    if name not in CHAOTIC_MAPS:
+        raise ValueError(f"Mapa caótico desconocido: {name!r} (use {', '.join(CHAOTIC_MAPS)}).")
+    return CHAOTIC_MAPS[name](**params)
@@ -0,0 +1,145 @@
+import json
+import os
+import queue
+import threading
+import numpy as np
+
+CHECKPOINT_FORMAT_VERSION = 2
+
+HISTORY_KEYS = ['time_steps', 'latency', 'cpu', 'memory', 'simulated_requests']
+
+
+def save_checkpoint(path: str, snapshot: dict):
+    """
+    Escribe un checkpoint en formato binario NumPy (.npz) de forma atómica: primero en un
+    archivo temporal y luego se reemplaza el destino, para que un fallo a mitad de la
+    escritura nunca deje un checkpoint corrupto.
+
+    Args:
+        path (str): Ruta del archivo de checkpoint.
+        snapshot (dict): Estado devuelto por SimulationRunner.get_checkpoint_state().
+    """
+    sim_state = snapshot['simulator']
+    rng_name, rng_key, rng_pos, rng_has_gauss, rng_cached_gaussian = sim_state['rng_state']
+    arrays = {
+        'format_version': np.array(CHECKPOINT_FORMAT_VERSION),
+        'config_json': np.array(json.dumps(snapshot['config_params'])),
+        'steps_done': np.array(snapshot['steps_done'], dtype=np.int64),
+        'generator_state': np.array([snapshot['x'], snapshot['y']], dtype=np.float64),
+        'period_ok': np.array(snapshot['period_ok']),
+        'generation_finished': np.array(snapshot['generation_finished']),
+        'x_values': np.asarray(snapshot['x_values'], dtype=np.float64),
+        'y_values': np.asarray(snapshot['y_values'], dtype=np.float64),
+        # Los bits se guardan empaquetados (8 por byte)
+        'bits_packed': np.packbits(np.asarray(snapshot['bits'], dtype=np.uint8)),
+        'num_bits_stored': np.array(len(snapshot['bits']), dtype=np.int64),
+        'sim_metrics': np.array([sim_state['current_latency'],
+                                 sim_state['current_cpu_usage'],
+                                 sim_state['current_memory_usage']], dtype=np.float64),
+        'sim_time_step': np.array(sim_state['current_time_step'], dtype=np.int64),
+        'rng_name': np.array(rng_name),
+        'rng_key': np.asarray(rng_key, dtype=np.uint32),
+        'rng_pos': np.array(rng_pos, dtype=np.int64),
+        'rng_has_gauss': np.array(rng_has_gauss, dtype=np.int64),
+        'rng_cached_gaussian': np.array(rng_cached_gaussian, dtype=np.float64),
+    }
+    for key in HISTORY_KEYS:
+        arrays['history_' + key] = np.asarray(sim_state['history'][key], dtype=np.int64 if key == 'time_steps' else np.float64)
+    for key, value in snapshot['accumulator'].items():
+        arrays['tests_' + key] = np.asarray(value)
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: str) -> dict:
+    """
+    Lee un checkpoint escrito por save_checkpoint y devuelve el mismo diccionario de estado
+    que acepta SimulationRunner.set_checkpoint_state().
+    """
+    with np.load(path, allow_pickle=False) as data:
+        version = int(data['format_version'])
+        if version != CHECKPOINT_FORMAT_VERSION:
+            raise ValueError(f"Versión de checkpoint no soportada: {version}")
+        num_bits_stored = int(data['num_bits_stored'])
+        sim_metrics = data['sim_metrics']
+        history = {}
+        for key in HISTORY_KEYS:
+            # tolist() recupera los mismos floats de Python que tenía el historial original
+            history[key] = data['history_' + key].tolist()
+        accumulator = {}
+        for name in data.files:
+            if name.startswith('tests_'):
+                value = data[name]
+                accumulator[name[len('tests_'):]] = value if value.ndim > 0 else value.item()
+        return {
+            'config_params': json.loads(str(data['config_json'])),
+            'steps_done': int(data['steps_done']),
+            'x': float(data['generator_state'][0]),
+            'y': float(data['generator_state'][1]),
+            'period_ok': bool(data['period_ok']),
+            'generation_finished': bool(data['generation_finished']),
+            'x_values': data['x_values'],
+            'y_values': data['y_values'],
+            'bits': np.unpackbits(data['bits_packed'], count=num_bits_stored).astype(np.int64),
+            'simulator': {
+                'current_latency': float(sim_metrics[0]),
+                'current_cpu_usage': float(sim_metrics[1]),
+                'current_memory_usage': float(sim_metrics[2]),
+                'current_time_step': int(data['sim_time_step']),
+                'rng_state': (str(data['rng_name']), data['rng_key'], int(data['rng_pos']),
+                              int(data['rng_has_gauss']), float(data['rng_cached_gaussian'])),
+                'history': history
+            },
+            'accumulator': accumulator
+        }
+
+
+class CheckpointWriter:
+    """
+    Escribe checkpoints en un hilo de fondo para que la simulación solo se detenga el
+    tiempo necesario para copiar su estado. Si llega un checkpoint nuevo mientras otro
+    sigue pendiente, el pendiente se descarta: solo importa el más reciente.
+
+    Un checkpoint puede depender de datos que otro hilo todavía está escribiendo (las filas
+    del flujo continuo a las que se refiere): submit recibe en ready funciones que esperan
+    a que esos datos estén en disco, y el checkpoint se guarda solo después. Si alguna
+    lanza una excepción, el checkpoint no se guarda y el error se relanza en close.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.error = None
+        self._queue = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, snapshot: dict, ready=()):
+        try:
+            self._queue.get_nowait()  # Descartar un checkpoint aún no escrito
+        except queue.Empty:
+            pass
+        self._queue.put((snapshot, tuple(ready)))
+
+    def close(self):
+        """Espera a que se escriba el último checkpoint enviado y detiene el hilo."""
+        self._queue.put(None)
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            snapshot, ready = item
+            try:
+                for wait in ready:
+                    wait()
+                save_checkpoint(self.path, snapshot)
+            except Exception as e:
+                self.error = e
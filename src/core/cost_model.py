@@ -0,0 +1,295 @@
+"""
+Estimación del tiempo y la memoria de una ejecución antes de lanzarla.
+
+El modelo es lineal en el número de pasos: los costos por paso de cada fase (generación,
+simulación, pruebas, exportación a CSV) y la memoria por paso se miden en este equipo con
+una ejecución corta (calibrate) y se guardan en disco para no repetir la medición.
+plan_run decide, a partir de la estimación, si conviene guardar el historial en disco
+(archivos np.memmap), bloques más grandes o si la ejecución no cabe.
+"""
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from src.core.simulation_runner import SimulationRunner, DEFAULT_CONFIG
+
+COST_MODEL_VERSION = 1
+DEFAULT_CALIBRATION_PATH = os.path.join('ejecuciones', 'calibracion.json')
+# Pasos de la ejecución que mide los tiempos, y pares de tamaños que miden la memoria (la
+# pendiente entre ambos descuenta lo que no depende de N)
+CALIBRATION_STEPS = 20000
+MEMORY_CALIBRATION_STEPS = (2000, 6000)
+# Memoria por paso fuera del proceso de simulación cuando el resultado vuelve a la GUI: los
+# 7 arreglos de 8 bytes en memoria compartida y su copia en la GUI (2 * 56)
+GUI_BYTES_PER_STEP = 2 * 56
+# Bytes por paso de la exportación continua (5 columnas de historial, bits y valores x);
+# el historial en disco (MemmapHistory) ocupa lo mismo
+STREAM_BYTES_PER_STEP = 5 * 8 + 1 + 8
+# Fracción de la memoria disponible que puede ocupar una ejecución
+MEMORY_BUDGET_FRACTION = 0.7
+# A partir de esta duración estimada se pide confirmación
+LONG_RUN_SECONDS = 3600
+# Pasos desde los que se usan bloques grandes (menos costo fijo por bloque)
+LARGE_RUN_STEPS = 10**6
+LARGE_CHUNK_SIZE = 65536
+# Carpeta bajo la que el plan crea una subcarpeta por ejecución al sacar el historial de memoria
+DEFAULT_HISTORY_DIR = os.path.join('ejecuciones', 'historial')
+
+_calibration_cache = {}
+
+
+def machine_key() -> dict:
+    """Identifica el equipo y el entorno para los que vale una calibración."""
+    return {
+        'version': COST_MODEL_VERSION,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+    }
+
+
+def available_memory_bytes():
+    """Memoria física disponible, o None si el sistema no permite consultarla."""
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_AVPHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _memory_per_step(keep_history: bool) -> float:
+    peaks = []
+    for steps in MEMORY_CALIBRATION_STEPS:
+        config = dict(DEFAULT_CONFIG, num_bits=steps, seed=0, keep_history=keep_history)
+        tracemalloc.start()
+        try:
+            result = SimulationRunner(config, chunk_size=1000).run()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+        del result
+    low, high = MEMORY_CALIBRATION_STEPS
+    return max(0.0, (peaks[1] - peaks[0]) / (high - low))
+
+
+def calibrate() -> dict:
+    """
+    Mide en este equipo los segundos por paso de cada fase y los bytes por paso de la
+    ejecución (con y sin historial en memoria) y de los CSV. Tarda unos segundos.
+    """
+    from src.utils.data_exporter import DataExporter
+
+    # Una primera ejecución corta carga los módulos que se importan en el primer uso
+    SimulationRunner(dict(DEFAULT_CONFIG, num_bits=2000, seed=0), chunk_size=1000).run()
+    result = SimulationRunner(dict(DEFAULT_CONFIG, num_bits=CALIBRATION_STEPS, seed=0, profile=True)).run()
+    spans = {span['path']: span['wall_seconds'] for span in result['profile']['spans']}
+    seconds_per_step = {phase: spans.get(phase, 0.0) / CALIBRATION_STEPS
+                        for phase in ('generación', 'simulación', 'pruebas')}
+
+    with tempfile.TemporaryDirectory() as directory:
+        history_path = os.path.join(directory, 'historial.csv')
+        bits_path = os.path.join(directory, 'bits.csv')
+        start = time.perf_counter()
+        DataExporter.write_history_csv(history_path, result['simulation_history'])
+        DataExporter.write_bits_csv(bits_path, result['bits'], x_values=result['x_values'])
+        seconds_per_step['exportación CSV'] = (time.perf_counter() - start) / CALIBRATION_STEPS
+        csv_bytes_per_step = (os.path.getsize(history_path) + os.path.getsize(bits_path)) / CALIBRATION_STEPS
+
+    return {
+        'machine': machine_key(),
+        'seconds_per_step': seconds_per_step,
+        'bytes_per_step': {'memoria': _memory_per_step(True), 'flujo': _memory_per_step(False)},
+        'csv_bytes_per_step': csv_bytes_per_step,
+    }
+
+
+def cached_calibration(path: str = DEFAULT_CALIBRATION_PATH):
+    """
+    Calibración de este equipo sin medir nada: la ya cargada en el proceso o la guardada en
+    path si corresponde al mismo equipo y entorno; None si hay que calibrar (la GUI lo hace
+    entonces en un hilo de fondo).
+    """
+    key = path or ''
+    if key in _calibration_cache:
+        return _calibration_cache[key]
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            calibration = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if calibration.get('machine') != machine_key():
+        return None
+    _calibration_cache[key] = calibration
+    return calibration
+
+
+def load_calibration(path: str = DEFAULT_CALIBRATION_PATH, recalibrate: bool = False) -> dict:
+    """
+    Calibración de este equipo: la de cached_calibration o una nueva (que se guarda en path).
+    """
+    calibration = None if recalibrate else cached_calibration(path)
+    if calibration is None:
+        calibration = calibrate()
+        if path:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(calibration, f, indent=2, ensure_ascii=False)
+        _calibration_cache[path or ''] = calibration
+    return calibration
+
+
+def new_history_dir(base: str = DEFAULT_HISTORY_DIR) -> str:
+    """
+    Carpeta nueva para el historial en disco de una ejecución, bajo base y con la fecha y
+    hora: MemmapHistory reabre sus archivos desde cero, así que cada ejecución usa la suya.
+    """
+    name = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    directory = os.path.join(base, name)
+    suffix = 2
+    while os.path.exists(directory):
+        directory = os.path.join(base, f'{name}-{suffix}')
+        suffix += 1
+    return directory
+
+
+def estimate(config_params: dict, calibration: dict, gui: bool = True, write_csv: bool = False) -> dict:
+    """
+    Tiempo por fase, memoria máxima y disco de una configuración.
+
+    Args:
+        gui (bool): Sumar la memoria del resultado al volver a la GUI (SimulationWorker).
+        write_csv (bool): Sumar la escritura del historial y los bits en CSV (modo por lotes).
+
+    Returns:
+        dict: 'seconds' ({fase: s}), 'total_seconds', 'peak_memory_bytes' y 'disk_bytes'.
+    """
+    steps = int(config_params['num_bits'])
+    # Con 'history_dir' el historial está en archivos np.memmap: en memoria queda lo mismo
+    # que sin conservarlo, y la GUI abre esos archivos en lugar de recibir una copia
+    on_disk = bool(config_params.get('history_dir'))
+    keep_history = config_params.get('keep_history', True) and not on_disk
+    seconds = {phase: rate * steps for phase, rate in calibration['seconds_per_step'].items()
+               if phase != 'exportación CSV'}
+    memory = calibration['bytes_per_step']['memoria' if keep_history else 'flujo'] * steps
+    disk = 0
+    if keep_history and gui:
+        memory += GUI_BYTES_PER_STEP * steps
+    if config_params.get('stream_dir'):
+        disk += STREAM_BYTES_PER_STEP * steps
+    if on_disk:
+        disk += STREAM_BYTES_PER_STEP * steps
+    if write_csv:
+        seconds['exportación CSV'] = calibration['seconds_per_step']['exportación CSV'] * steps
+        disk += calibration['csv_bytes_per_step'] * steps
+    # Con un ritmo fijo de pasos por segundo, la simulación no puede ir más rápido que ese ritmo
+    if config_params.get('steps_per_second'):
+        seconds['simulación'] = max(seconds['simulación'], steps / config_params['steps_per_second'])
+    return {
+        'seconds': seconds,
+        'total_seconds': sum(seconds.values()),
+        'peak_memory_bytes': int(memory),
+        'disk_bytes': int(disk),
+    }
+
+
+def _free_disk_bytes(directory: str):
+    path = os.path.abspath(directory)
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+    return shutil.disk_usage(path).free
+
+
+def plan_run(config_params: dict, calibration: dict = None, available_memory: int = None, gui: bool = True) -> dict:
+    """
+    Estima una configuración y elige las opciones de ejecución.
+
+    - Si el historial en memoria no cabe en MEMORY_BUDGET_FRACTION de la memoria
+      disponible, lo pasa a archivos np.memmap ('history_dir'): el resultado sigue
+      completo, pero en disco.
+    - Con LARGE_RUN_STEPS pasos o más, usa bloques de LARGE_CHUNK_SIZE ('chunk_size').
+    - Si ni así cabe en memoria o en disco, la marca como no ejecutable.
+
+    Returns:
+        dict: 'config_params' (copia con los cambios), 'estimate', 'changes' (textos con las
+        decisiones tomadas), 'warnings' y 'fits' (False con el motivo en 'reason').
+    """
+    if calibration is None:
+        calibration = load_calibration()
+    if available_memory is None:
+        available_memory = available_memory_bytes()
+    config = dict(config_params)
+    changes, warnings = [], []
+    budget = None if available_memory is None else available_memory * MEMORY_BUDGET_FRACTION
+
+    result = estimate(config, calibration, gui)
+    if (budget is not None and result['peak_memory_bytes'] > budget and config.get('keep_history', True)
+            and not config.get('history_dir')):
+        on_disk = dict(config, history_dir=new_history_dir())
+        on_disk_result = estimate(on_disk, calibration, gui)
+        if on_disk_result['peak_memory_bytes'] <= budget:
+            changes.append(f"El historial ({result['peak_memory_bytes'] / 1e9:.1f} GB) no cabe en memoria: se guardará "
+                           f"en archivos np.memmap en '{on_disk['history_dir']}'.")
+            config, result = on_disk, on_disk_result
+    if config['num_bits'] >= LARGE_RUN_STEPS and 'chunk_size' not in config:
+        config['chunk_size'] = LARGE_CHUNK_SIZE
+        changes.append(f"Bloques de {LARGE_CHUNK_SIZE} pasos.")
+
+    plan = {'config_params': config, 'estimate': result, 'changes': changes, 'warnings': warnings, 'fits': True}
+    if budget is not None and result['peak_memory_bytes'] > budget:
+        plan['fits'] = False
+        plan['reason'] = (f"La ejecución necesita unos {result['peak_memory_bytes'] / 1e9:.1f} GB de memoria y hay "
+                          f"{available_memory / 1e9:.1f} GB disponibles.")
+        return plan
+    if result['disk_bytes']:
+        free = _free_disk_bytes(config.get('history_dir') or config.get('stream_dir') or '.')
+        if free is not None and result['disk_bytes'] > free:
+            plan['fits'] = False
+            plan['reason'] = (f"La ejecución escribe unos {result['disk_bytes'] / 1e9:.1f} GB y hay "
+                              f"{free / 1e9:.1f} GB libres en disco.")
+            return plan
+    if result['total_seconds'] > LONG_RUN_SECONDS:
+        warnings.append(f"La ejecución tardará unas {result['total_seconds'] / 3600:.1f} horas.")
+    return plan
+
+
+def max_parallel_runs(configs: list, calibration: dict = None, available_memory: int = None) -> int:
+    """
+    Procesos de un lote que caben a la vez en memoria (entre 1 y los núcleos disponibles),
+    según la configuración que más memoria necesita.
+    """
+    cpus = os.cpu_count() or 1
+    if available_memory is None:
+        available_memory = available_memory_bytes()
+    # Con un solo núcleo no hace falta calibrar
+    if cpus <= 1 or available_memory is None or not configs:
+        return cpus
+    if calibration is None:
+        calibration = load_calibration()
+    largest = max(estimate(config, calibration, gui=False)['peak_memory_bytes'] for config in configs)
+    if largest <= 0:
+        return cpus
+    return max(1, min(cpus, int(available_memory * MEMORY_BUDGET_FRACTION // largest)))
+
+
+def format_estimate(result: dict) -> str:
+    """Resumen legible de estimate()."""
+    phases = ", ".join(f"{phase} {seconds:.1f} s" for phase, seconds in result['seconds'].items())
+    text = (f"Tiempo estimado: {result['total_seconds']:.1f} s ({phases}).\n"
+            f"Memoria máxima estimada: {result['peak_memory_bytes'] / 1e6:.0f} MB.")
+    if result['disk_bytes']:
+        text += f"\nDisco: {result['disk_bytes'] / 1e6:.0f} MB."
+    return text
@@ -0,0 +1,311 @@
+import asyncio
+import os
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+HISTORY_KEYS = ['time_steps', 'latency', 'cpu', 'memory', 'simulated_requests']
+
+
+def build_arrival_schedule(bits=None, x_values=None, num_users: int = 100, step_seconds: float = 1.0) -> dict:
+    """
+    Convierte una secuencia caótica en un calendario de llegadas de solicitudes.
+
+    Cada bit/valor es un paso de step_seconds. Igual que LoadSimulator, un paso genera
+    num_users * (1 + u) solicitudes, con u en [0.5, 1.5] si el bit es 1 y en [0.0, 0.5]
+    si es 0. Con valores x, u se obtiene del propio valor caótico (el bit es x > 0.5);
+    con solo bits se usa el punto medio de cada rango. Las llegadas se reparten de forma
+    uniforme dentro de cada paso.
+
+    Args:
+        bits (np.ndarray): Secuencia de bits (0s y 1s).
+        x_values (np.ndarray): Valores reales del generador en [0, 1).
+        num_users (int): Usuarios simulados (escala del número de solicitudes).
+        step_seconds (float): Duración de cada paso en segundos.
+
+    Returns:
+        dict: 'arrival_times' (s desde el inicio, ordenadas), 'arrival_steps' (paso de cada
+        llegada), 'requests_per_step' y 'step_seconds'.
+    """
+    if step_seconds <= 0:
+        raise ValueError("La duración del paso debe ser positiva.")
+    if x_values is not None:
+        x = np.asarray(x_values, dtype=np.float64)
+        u = np.where(x > 0.5, 0.5 + 2.0 * (x - 0.5), x)
+    elif bits is not None:
+        u = np.where(np.asarray(bits) == 1, 1.0, 0.25)
+    else:
+        raise ValueError("Se requieren bits o valores x para construir el calendario.")
+
+    requests_per_step = np.rint(num_users * (1.0 + u)).astype(np.int64)
+    arrival_steps = np.repeat(np.arange(len(requests_per_step)), requests_per_step)
+    # Posición de cada llegada dentro de su paso: (j + 0.5) / n_paso
+    starts = np.cumsum(requests_per_step) - requests_per_step
+    index_in_step = np.arange(len(arrival_steps)) - np.repeat(starts, requests_per_step)
+    offsets = (index_in_step + 0.5) / np.repeat(requests_per_step, requests_per_step)
+    arrival_times = (arrival_steps + offsets) * step_seconds
+    return {
+        'arrival_times': arrival_times,
+        'arrival_steps': arrival_steps,
+        'requests_per_step': requests_per_step,
+        'step_seconds': step_seconds
+    }
+
+
+def _memory_usage_percent() -> float:
+    """Memoria residente del proceso como porcentaje de la memoria física (POSIX)."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+        return 100.0 * resident_pages / os.sysconf('SC_PHYS_PAGES')
+    except (OSError, ValueError, AttributeError):
+        return float('nan')
+
+
+class KeepAliveConnectionPool:
+    """
+    Pool de conexiones HTTP/1.1 persistentes (keep-alive) hacia un único host.
+    Cada conexión atiende una solicitud a la vez; las conexiones se reutilizan y solo se
+    abren nuevas mientras no se alcance max_connections.
+    """
+    def __init__(self, host: str, port: int, use_ssl: bool = False, max_connections: int = 100):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.max_connections = max_connections
+        self.connections_opened = 0
+        self._idle = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def request(self, raw_request: bytes, timeout: float) -> int:
+        """Envía una solicitud ya serializada y devuelve el código de estado HTTP."""
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else None
+            for attempt in range(2):
+                if conn is None:
+                    conn = await asyncio.wait_for(
+                        asyncio.open_connection(self.host, self.port, ssl=self.use_ssl or None), timeout)
+                    self.connections_opened += 1
+                reader, writer = conn
+                try:
+                    writer.write(raw_request)
+                    status, keep_alive = await asyncio.wait_for(self._read_response(reader), timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    writer.close()
+                    conn = None
+                    # Una conexión reutilizada pudo cerrarse del lado del servidor: reintentar una vez
+                    if attempt == 1:
+                        raise
+                    continue
+                except BaseException:
+                    writer.close()
+                    raise
+                if keep_alive:
+                    self._idle.append(conn)
+                else:
+                    writer.close()
+                return status
+
+    @staticmethod
+    async def _read_response(reader):
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.split(b"\r\n")
+        status = int(lines[0].split(b" ", 2)[1])
+        content_length = None
+        chunked = False
+        keep_alive = not lines[0].startswith(b"HTTP/1.0")
+        for line in lines[1:]:
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            value = value.strip().lower()
+            if name == b"content-length":
+                content_length = int(value)
+            elif name == b"transfer-encoding" and b"chunked" in value:
+                chunked = True
+            elif name == b"connection":
+                keep_alive = value == b"keep-alive" or (value != b"close" and keep_alive)
+        if chunked:
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif content_length is not None:
+            await reader.readexactly(content_length)
+        else:
+            # Sin longitud: el cuerpo termina al cerrar la conexión
+            await reader.read()
+            keep_alive = False
+        return status, keep_alive
+
+    def close(self):
+        for _, writer in self._idle:
+            writer.close()
+        self._idle = []
+
+
+class HttpLoadGenerator:
+    """
+    Generador de carga HTTP real con asyncio: dispara solicitudes contra un endpoint
+    siguiendo un calendario de llegadas caótico (build_arrival_schedule), a través de un
+    pool de conexiones keep-alive con concurrencia acotada.
+
+    Las solicitudes las disparan max_concurrency tareas trabajadoras que toman la siguiente
+    llegada del calendario, esperan su instante y envían la solicitud; así el número de
+    tareas vivas no crece con la duración ni con la tasa del calendario.
+
+    La latencia se mide desde el instante programado de cada llegada hasta recibir la
+    respuesta completa, de modo que las esperas por falta de conexiones libres también
+    cuentan. El historial resultante tiene la misma estructura que LoadSimulator.history.
+    """
+    def __init__(self, url: str, max_concurrency: int = 100, timeout: float = 10.0, method: str = 'GET'):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ValueError("Solo se admiten URLs http:// o https://.")
+        if max_concurrency <= 0:
+            raise ValueError("La concurrencia máxima debe ser un entero positivo.")
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.use_ssl = parts.scheme == 'https'
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        host_header = parts.netloc.rsplit('@', 1)[-1]
+        self._raw_request = (f"{method} {path} HTTP/1.1\r\nHost: {host_header}\r\n"
+                             f"User-Agent: simulacion-carga-caotica\r\nConnection: keep-alive\r\n"
+                             f"Content-Length: 0\r\n\r\n").encode('ascii')
+
+    def run(self, schedule: dict) -> dict:
+        """Ejecuta el calendario de forma síncrona (crea su propio bucle asyncio)."""
+        return asyncio.run(self.run_async(schedule))
+
+    async def run_async(self, schedule: dict) -> dict:
+        """
+        Ejecuta el calendario y devuelve:
+            'history': historial por paso con las claves de LoadSimulator. 'latency' es la
+                latencia media medida (ms), 'simulated_requests' las solicitudes disparadas,
+                y 'cpu'/'memory' el uso de CPU y memoria del propio proceso generador.
+            'latencies_ms', 'status_codes': valor por solicitud (NaN / 0 si falló).
+            'errors': solicitudes fallidas, sea sin respuesta o con código >= 400.
+            'http_errors': las de errors que sí recibieron respuesta (código >= 400).
+            'duration_seconds', 'requests_per_second', 'connections_opened'.
+        """
+        arrival_times = np.asarray(schedule['arrival_times'], dtype=np.float64)
+        arrival_steps = np.asarray(schedule['arrival_steps'], dtype=np.int64)
+        step_seconds = schedule['step_seconds']
+        num_steps = len(schedule['requests_per_step'])
+        total = len(arrival_times)
+
+        latencies_ms = np.full(total, np.nan)
+        status_codes = np.zeros(total, dtype=np.int32)
+        failures = 0
+        pool = KeepAliveConnectionPool(self.host, self.port, self.use_ssl, self.max_concurrency)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        next_arrival = 0
+
+        async def worker():
+            nonlocal next_arrival, failures
+            while next_arrival < total:
+                i = next_arrival
+                next_arrival += 1
+                scheduled = start + arrival_times[i]
+                delay = scheduled - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    status_codes[i] = await pool.request(self._raw_request, self.timeout)
+                    latencies_ms[i] = (loop.time() - scheduled) * 1000.0
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError):
+                    failures += 1
+
+        # Muestreo de CPU y memoria del proceso al final de cada paso
+        cpu_samples = np.full(num_steps, np.nan)
+        memory_samples = np.full(num_steps, np.nan)
+
+        async def sample_resources():
+            last_wall, last_cpu = loop.time(), time.process_time()
+            for step in range(num_steps):
+                await asyncio.sleep(max(0.0, start + (step + 1) * step_seconds - loop.time()))
+                wall, cpu = loop.time(), time.process_time()
+                cpu_samples[step] = 100.0 * (cpu - last_cpu) / max(wall - last_wall, 1e-9)
+                memory_samples[step] = _memory_usage_percent()
+                last_wall, last_cpu = wall, cpu
+
+        sampler = asyncio.ensure_future(sample_resources())
+        # Tantas trabajadoras como conexiones: más solo esperarían turno en el pool
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.max_concurrency, total))]
+        try:
+            if workers:
+                await asyncio.gather(*workers)
+            await sampler
+        finally:
+            sampler.cancel()
+            for task in workers:
+                task.cancel()
+            pool.close()
+        duration = loop.time() - start
+        http_errors = int(np.count_nonzero(status_codes >= 400))
+
+        # Agregar por paso con la misma estructura que LoadSimulator.history
+        ok = ~np.isnan(latencies_ms)
+        requests_per_step = np.bincount(arrival_steps, minlength=num_steps)
+        latency_sum = np.bincount(arrival_steps[ok], weights=latencies_ms[ok], minlength=num_steps)
+        latency_count = np.bincount(arrival_steps[ok], minlength=num_steps)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_latency = latency_sum / latency_count
+        history = {
+            'time_steps': list(range(num_steps)),
+            'latency': mean_latency.tolist(),
+            'cpu': cpu_samples.tolist(),
+            'memory': memory_samples.tolist(),
+            'simulated_requests': requests_per_step.astype(float).tolist()
+        }
+        return {
+            'history': history,
+            'latencies_ms': latencies_ms,
+            'status_codes': status_codes,
+            'errors': failures + http_errors,
+            'http_errors': http_errors,
+            'duration_seconds': duration,
+            'requests_per_second': total / duration if duration > 0 else float('nan'),
+            'connections_opened': pool.connections_opened
+        }
+
+
+def main(argv=None) -> int:
+    """Modo de generación de carga real: python main.py loadgen --url ..."""
+    import argparse
+    from src.core.chaotic_generator import ChaoticBitGenerator
+
+    parser = argparse.ArgumentParser(
+        prog='main.py loadgen',
+        description="Genera tráfico HTTP real siguiendo un calendario de llegadas caótico.")
+    parser.add_argument('--url', required=True, help="Endpoint HTTP de destino")
+    parser.add_argument('--alpha', type=float, default=0.495)
+    parser.add_argument('--x0', type=float, default=0.3)
+    parser.add_argument('--y0', type=float, default=0.301)
+    parser.add_argument('--num-steps', type=int, default=60, help="Pasos (bits) del calendario")
+    parser.add_argument('--num-users', type=int, default=100, help="Escala de solicitudes por paso")
+    parser.add_argument('--step-seconds', type=float, default=1.0)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--timeout', type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    _, x_values, _ = ChaoticBitGenerator().generate_cccbg_bits(args.alpha, args.x0, args.y0, args.num_steps)
+    schedule = build_arrival_schedule(x_values=x_values[:args.num_steps], num_users=args.num_users,
+                                      step_seconds=args.step_seconds)
+    result = HttpLoadGenerator(args.url, args.concurrency, args.timeout).run(schedule)
+    latencies = result['latencies_ms'][~np.isnan(result['latencies_ms'])]
+    print(f"Solicitudes: {len(result['latencies_ms'])}, errores: {result['errors']} "
+          f"({result['http_errors']} con código HTTP >= 400), "
+          f"{result['requests_per_second']:.0f} req/s")
+    if len(latencies):
+        print(f"Latencia ms: media {np.mean(latencies):.2f}, p50 {np.percentile(latencies, 50):.2f}, "
+              f"p99 {np.percentile(latencies, 99):.2f}")
+    return 0
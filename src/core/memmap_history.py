@@ -0,0 +1,226 @@
+"""
+Historial de la simulación en archivos np.memmap preasignados, para ejecuciones cuyo
+historial no cabe en memoria (10^9 pasos ocupan unos 40 GB).
+
+MemmapHistory se usa igual que el dict de listas de LoadSimulator: cada columna
+(MemmapColumn) admite append, extend, len, índices y rebanadas, y np.asarray la
+convierte sin copia. Quien recorre columnas completas (resumen, gráficos, exportación)
+debe hacerlo por bloques con iter_chunks o rebanadas, nunca cargando la columna entera.
+
+Cada columna es un archivo binario crudo <columna>.bin; <nombre>.json guarda los tipos y
+las filas escritas, de modo que MemmapHistory.open vuelve a abrir la carpeta.
+"""
+import json
+import os
+
+import numpy as np
+
+from src.utils.export_sink import HISTORY_DTYPES, BITS_DTYPES
+
+MEMMAP_FORMAT_VERSION = 1
+HISTORY_NAME = 'historial'
+BITS_NAME = 'bits'
+# Bits de una ejecución: con signo, para que 2 * b - 1 no desborde
+RUN_BITS_DTYPES = {'bits': '|i1', 'x_values': BITS_DTYPES['x_values']}
+# Filas por bloque al recorrer columnas completas
+DEFAULT_CHUNK_ROWS = 1 << 20
+# Filas preasignadas cuando no se conoce el total
+DEFAULT_CAPACITY = 1 << 16
+
+
+class MemmapColumn:
+    """
+    Columna de solo agregado sobre un np.memmap preasignado de `capacity` filas, de las que
+    las primeras `rows` están escritas. Si se llena, el archivo se agranda al doble.
+    """
+    def __init__(self, path: str, dtype, capacity: int, rows: int = 0, mode: str = 'w+'):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.rows = rows
+        self.writable = mode != 'r'
+        self._map(capacity, mode)
+
+    def _map(self, capacity, mode):
+        self.capacity = capacity
+        # np.memmap no admite archivos vacíos
+        if capacity == 0:
+            if mode == 'w+':
+                open(self.path, 'wb').close()
+            self._data = np.zeros(0, dtype=self.dtype)
+        else:
+            self._data = np.memmap(self.path, dtype=self.dtype, mode=mode, shape=(capacity,))
+
+    def _reserve(self, rows: int):
+        if not self.writable:
+            raise ValueError(f"La columna '{self.path}' está abierta solo para lectura.")
+        if rows > self.capacity:
+            self.flush()
+            self._data = None
+            self._map(max(rows, 2 * self.capacity, 1), 'r+')
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, index):
+        return self._data[:self.rows][index]
+
+    def __array__(self, dtype=None, copy=None):
+        view = self._data[:self.rows]
+        return view if dtype is None or np.dtype(dtype) == self.dtype else view.astype(dtype)
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk.tolist()
+
+    def iter_chunks(self, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        """Vistas consecutivas de como mucho chunk_rows filas (sin copia)."""
+        for start in range(0, self.rows, chunk_rows):
+            yield self._data[start:min(start + chunk_rows, self.rows)]
+
+    def append(self, value):
+        self._reserve(self.rows + 1)
+        self._data[self.rows] = value
+        self.rows += 1
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self.dtype)
+        self._reserve(self.rows + len(values))
+        self._data[self.rows:self.rows + len(values)] = values
+        self.rows += len(values)
+
+    def clear(self):
+        self.rows = 0
+
+    def truncate(self, rows: int):
+        """Descarta las filas desde `rows` (al reanudar desde un checkpoint)."""
+        if rows > self.rows:
+            raise ValueError(f"La columna '{self.path}' tiene menos de {rows} filas.")
+        self.rows = rows
+
+    def flush(self):
+        if isinstance(self._data, np.memmap):
+            self._data.flush()
+
+    def close(self):
+        """Escribe lo pendiente y recorta el archivo a las filas escritas."""
+        self.flush()
+        self._data = None
+        if self.writable and os.path.exists(self.path):
+            os.truncate(self.path, self.rows * self.dtype.itemsize)
+        self.writable = False
+        self._map(self.rows, 'r')
+
+
+def _manifest_path(directory, name):
+    return os.path.join(directory, f'{name}.json')
+
+
+class MemmapHistory(dict):
+    """
+    Columnas MemmapColumn en una carpeta, como {nombre: columna}.
+
+    Args:
+        directory (str): Carpeta de los archivos (se crea si no existe).
+        dtypes (dict): {columna: dtype}; por defecto las del historial (HISTORY_DTYPES).
+        capacity (int): Filas preasignadas por columna (normalmente num_bits).
+        name (str): Nombre del manifiesto; permite varias tablas en la misma carpeta
+            (el historial y los bits) siempre que sus columnas no se repitan.
+        start_rows (int): Filas a conservar de una escritura anterior (al reanudar desde un
+            checkpoint de start_rows pasos); 0 crea archivos nuevos.
+    """
+    def __init__(self, directory: str, dtypes: dict = None, capacity: int = DEFAULT_CAPACITY,
+                 name: str = HISTORY_NAME, start_rows: int = 0, _mode: str = None):
+        super().__init__()
+        self.directory = directory
+        self.name = name
+        self.dtypes = dict(dtypes or HISTORY_DTYPES)
+        mode = _mode or ('r+' if start_rows else 'w+')
+        if mode != 'r':
+            os.makedirs(directory, exist_ok=True)
+        for key, dtype in self.dtypes.items():
+            path = os.path.join(directory, f'{key}.bin')
+            if mode == 'r+' and (not os.path.exists(path) or os.path.getsize(path) < start_rows * np.dtype(dtype).itemsize):
+                raise ValueError(f"El historial en '{directory}' tiene menos de {start_rows} filas.")
+            size = max(capacity, start_rows) if mode != 'r' else start_rows
+            self[key] = MemmapColumn(path, dtype, size, rows=start_rows, mode=mode)
+        if mode != 'r':
+            self._write_manifest()
+
+    @classmethod
+    def open(cls, directory: str, name: str = HISTORY_NAME, writable: bool = False):
+        """Abre una tabla ya escrita (de solo lectura salvo writable)."""
+        with open(_manifest_path(directory, name), encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest['format_version'] != MEMMAP_FORMAT_VERSION:
+            raise ValueError(f"Versión de historial no soportada: {manifest['format_version']}")
+        return cls(directory, manifest['dtypes'], capacity=manifest['rows'], name=name,
+                   start_rows=manifest['rows'], _mode='r+' if writable else 'r')
+
+    @property
+    def rows(self) -> int:
+        """Filas completas (las de la columna más corta)."""
+        return min((len(column) for column in self.values()), default=0)
+
+    def append_rows(self, columns: dict):
+        """
+        Agrega el mismo número de filas a cada columna ({columna: valores}). Si las
+        longitudes no coinciden lanza ValueError sin escribir nada.
+        """
+        lengths = {key: len(values) for key, values in columns.items()}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"Las columnas deben tener el mismo número de filas: {lengths}.")
+        for key, values in columns.items():
+            self[key].extend(values)
+
+    def truncate(self, rows: int):
+        for column in self.values():
+            column.truncate(rows)
+
+    def iter_chunks(self, keys=None, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        """Recorre las columnas por bloques: (fila inicial, {columna: vista})."""
+        keys = list(keys or self.keys())
+        for start in range(0, self.rows, chunk_rows):
+            stop = min(start + chunk_rows, self.rows)
+            yield start, {key: self[key][start:stop] for key in keys}
+
+    def flush(self):
+        for column in self.values():
+            column.flush()
+        if any(column.writable for column in self.values()):
+            self._write_manifest()
+
+    def close(self):
+        """Escribe todo, recorta la preasignación sobrante y deja la tabla de solo lectura."""
+        writable = any(column.writable for column in self.values())
+        for column in self.values():
+            column.close()
+        if writable:
+            self._write_manifest()
+
+    def _write_manifest(self):
+        manifest = {'format_version': MEMMAP_FORMAT_VERSION, 'dtypes': self.dtypes, 'rows': self.rows}
+        path = _manifest_path(self.directory, self.name)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def __reduce__(self):
+        # Entre procesos (Pipeline en modo 'process') viaja la carpeta, no los datos
+        writable = any(column.writable for column in self.values())
+        self.flush()
+        return (MemmapHistory.open, (self.directory, self.name, writable))
+
+
+def open_memmap_run(directory: str) -> dict:
+    """
+    Abre el historial y los bits que SimulationRunner escribió con 'history_dir'.
+
+    Returns:
+        dict: 'simulation_history' (MemmapHistory), 'bits' y 'x_values' (vistas np.memmap).
+    """
+    history = MemmapHistory.open(directory, HISTORY_NAME)
+    bits = MemmapHistory.open(directory, BITS_NAME)
+    return {'simulation_history': history, 'bits': np.asarray(bits['bits']),
+            'x_values': np.asarray(bits['x_values'])}
+
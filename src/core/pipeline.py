@@ -0,0 +1,291 @@
+"""
+Ejecución por etapas concurrentes: una fuente (la generación de bits) y una cadena de
+etapas (simulación de carga, pruebas de aleatoriedad) unidas por colas acotadas de
+bloques de NumPy. Cada etapa corre en su propio hilo o proceso y trabaja sobre un bloque
+mientras la anterior ya produce el siguiente, por lo que el tiempo total tiende al de la
+etapa más lenta y no a la suma. Una cola llena bloquea a la etapa que escribe en ella
+(contrapresión): la memoria en vuelo queda acotada por queue_depth bloques por cola.
+
+Los bloques que salen de la última etapa se entregan en el hilo que llama a run(), que
+hace de etapa final (exportación continua, historial, progreso).
+"""
+import abc
+import multiprocessing as mp
+import queue
+import threading
+import time
+
+import numpy as np
+
+from src.core.chaotic_generator import ChaoticBitGenerator
+
+# Modos de ejecución de las etapas
+PIPELINE_MODES = ('thread', 'process')
+# Bloques que caben en cada cola entre dos etapas
+DEFAULT_QUEUE_DEPTH = 4
+# Cada cuánto el hilo que llama a run() atiende una detención mientras espera bloques
+POLL_SECONDS = 0.05
+# Orden de las filas de 'steps' en los bloques simulados (mismo que STEP_COLUMNS del runner)
+STEP_COLUMNS = ('time_steps', 'simulated_requests', 'latency', 'cpu', 'memory')
+
+
+class Stage:
+    """
+    Etapa de un Pipeline. process() recibe un bloque (dict de arreglos) y devuelve el que
+    pasa a la etapa siguiente; finish() se llama al terminar y su valor es el resultado de
+    la etapa. En modo 'process' la etapa se copia al proceso que la ejecuta y su resultado
+    vuelve copiado, por lo que ambos deben poder serializarse con pickle.
+    """
+    name = 'etapa'
+
+    def process(self, chunk: dict) -> dict:
+        return chunk
+
+    def finish(self):
+        return None
+
+
+class Source(Stage, metaclass=abc.ABCMeta):
+    """Primera etapa: chunks(stop) produce los bloques y deja de hacerlo cuando stop está activo."""
+    @abc.abstractmethod
+    def chunks(self, stop):
+        """Generador de bloques (dict de arreglos)."""
+
+
+class GenerationSource(Source):
+    """Genera num_bits bits del CCCBG desde (x, y) en bloques de chunk_size."""
+    name = 'generación'
+
+    def __init__(self, alpha: float, x: float, y: float, num_bits: int, chunk_size: int, seen: set = None):
+        self.alpha = alpha
+        self.x = x
+        self.y = y
+        self.num_bits = num_bits
+        self.chunk_size = chunk_size
+        self.seen = seen if seen is not None else set()
+
+    def chunks(self, stop):
+        generator = ChaoticBitGenerator()
+        x, y = self.x, self.y
+        generated = 0
+        while generated < self.num_bits and not stop.is_set():
+            block = generator.generate_cccbg_block(self.alpha, x, y, min(self.chunk_size, self.num_bits - generated),
+                                                   self.seen, should_stop=stop.is_set)
+            if block is None:
+                return
+            bits, x_values, y_values, period_ok = block
+            yield {'bits': bits, 'x_values': x_values, 'y_values': y_values, 'period_ok': period_ok}
+            if not period_ok:
+                return
+            generated += len(bits)
+            x, y = float(x_values[-1]), float(y_values[-1])
+
+
+class SimulationStage(Stage):
+    """
+    Simula cada bloque en lote y le agrega 'steps', un arreglo (5, k) con las filas de
+    STEP_COLUMNS. Sin keep_history vacía el historial del simulador después de cada bloque.
+    El resultado es el LoadSimulator (su estado final).
+    """
+    name = 'simulación'
+
+    def __init__(self, simulator, keep_history: bool = True):
+        self.simulator = simulator
+        self.keep_history = keep_history
+
+    def process(self, chunk: dict) -> dict:
+        bits = chunk['bits']
+        self.simulator.simulate_steps(bits)
+        history = self.simulator.history
+        chunk['steps'] = np.array([history[key][-len(bits):] for key in STEP_COLUMNS], dtype=np.float64)
+        if not self.keep_history:
+            self.simulator.clear_history()
+        return chunk
+
+    def finish(self):
+        return self.simulator
+
+
+class AccumulatorStage(Stage):
+    """Acumula los conteos de las pruebas de aleatoriedad; el resultado es el RandomnessAccumulator."""
+    name = 'pruebas'
+
+    def __init__(self, accumulator):
+        self.accumulator = accumulator
+
+    def process(self, chunk: dict) -> dict:
+        self.accumulator.update(chunk['bits'])
+        return chunk
+
+    def finish(self):
+        return self.accumulator
+
+
+class _End:
+    """Fin del flujo; acumula los resultados y las estadísticas de las etapas que pasó."""
+    def __init__(self, results, stats):
+        self.results = results
+        self.stats = stats
+
+
+class _Failure:
+    """Excepción de una etapa, reenviada hasta el hilo que llama a run()."""
+    def __init__(self, stage, error):
+        self.stage = stage
+        self.error = error
+
+
+def _run_stage(stage, inbox, outbox, stop):
+    """Cuerpo del hilo o proceso de una etapa (inbox es None para la fuente)."""
+    stats = {'stage': stage.name, 'items': 0, 'busy_seconds': 0.0, 'cpu_seconds': 0.0,
+             'input_wait_seconds': 0.0, 'output_wait_seconds': 0.0}
+    end = _End([], [])
+    failed = False
+
+    def send(message):
+        start = time.perf_counter()
+        outbox.put(message)
+        stats['output_wait_seconds'] += time.perf_counter() - start
+
+    def receive():
+        # Bloques de la etapa anterior hasta su _End; los errores se reenvían sin procesar
+        nonlocal end
+        while True:
+            start = time.perf_counter()
+            message = inbox.get()
+            stats['input_wait_seconds'] += time.perf_counter() - start
+            if isinstance(message, _End):
+                end = message
+                return
+            if isinstance(message, _Failure):
+                send(message)
+                continue
+            yield message
+
+    def record(start, cpu_start):
+        stats['busy_seconds'] += time.perf_counter() - start
+        stats['cpu_seconds'] += time.thread_time() - cpu_start
+        stats['items'] += 1
+
+    items = iter(stage.chunks(stop)) if inbox is None else receive()
+    try:
+        if inbox is None:
+            while True:
+                start, cpu_start = time.perf_counter(), time.thread_time()
+                chunk = next(items, None)
+                if chunk is None:
+                    break
+                record(start, cpu_start)
+                send(chunk)
+        else:
+            for chunk in items:
+                start, cpu_start = time.perf_counter(), time.thread_time()
+                chunk = stage.process(chunk)
+                record(start, cpu_start)
+                send(chunk)
+    except Exception as error:
+        failed = True
+        stop.set()
+        send(_Failure(stage.name, error))
+        # Seguir vaciando la entrada para que las etapas anteriores no queden bloqueadas
+        if inbox is not None:
+            for _ in items:
+                pass
+    result = None
+    if not failed:
+        try:
+            result = stage.finish()
+        except Exception as error:
+            stop.set()
+            send(_Failure(stage.name, error))
+    send(_End(end.results + [result], end.stats + [stats]))
+
+
+class Pipeline:
+    """
+    Ejecuta una fuente y una cadena de etapas concurrentes unidas por colas acotadas.
+
+    En modo 'thread' las etapas comparten el proceso (y el GIL: conviene cuando las etapas
+    pasan su tiempo en NumPy o en E/S); en modo 'process' cada etapa corre en su propio
+    proceso (inicio 'spawn') y los bloques viajan serializados entre procesos.
+
+    Una excepción en cualquier etapa detiene la fuente, deja terminar el flujo y se vuelve
+    a lanzar en run().
+    """
+    def __init__(self, source: Source, stages=(), mode: str = 'thread', queue_depth: int = DEFAULT_QUEUE_DEPTH):
+        if mode not in PIPELINE_MODES:
+            raise ValueError(f"Modo de pipeline desconocido: {mode!r} (use {', '.join(PIPELINE_MODES)}).")
+        if queue_depth <= 0:
+            raise ValueError("La profundidad de las colas debe ser un entero positivo.")
+        self.source = source
+        self.stages = list(stages)
+        self.mode = mode
+        self.queue_depth = queue_depth
+        self.stats = []
+        self.stopped = False
+
+    def run(self, consume, should_stop=None) -> list:
+        """
+        Ejecuta el pipeline hasta agotar la fuente. consume(chunk) se llama en este hilo con
+        cada bloque que sale de la última etapa, en orden. Si should_stop devuelve True, la
+        fuente deja de producir y los bloques ya producidos terminan de recorrer las etapas
+        (y llegan a consume), para que los resultados de todas ellas sean coherentes.
+
+        Returns:
+            list: Resultado de finish() de cada etapa, empezando por la fuente. Las
+            estadísticas por etapa (bloques, tiempo ocupado y de CPU, esperas de entrada y de
+            salida) quedan en self.stats.
+        """
+        if self.mode == 'process':
+            context = mp.get_context('spawn')
+            make_queue, stop, worker = context.Queue, context.Event(), context.Process
+        else:
+            make_queue, stop, worker = queue.Queue, threading.Event(), threading.Thread
+        stages = [self.source] + self.stages
+        queues = [make_queue(maxsize=self.queue_depth) for _ in stages]
+        workers = [worker(target=_run_stage, args=(stage, queues[i - 1] if i else None, queues[i], stop),
+                          name=f"pipeline-{stage.name}", daemon=True)
+                   for i, stage in enumerate(stages)]
+        for w in workers:
+            w.start()
+
+        error = None
+        outbox = queues[-1]
+        while True:
+            if should_stop is not None and not stop.is_set() and should_stop():
+                self.stopped = True
+                stop.set()
+            try:
+                message = outbox.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                dead = [stage.name for stage, w in zip(stages, workers)
+                        if self.mode == 'process' and w.exitcode not in (None, 0)]
+                if dead:
+                    stop.set()
+                    raise RuntimeError(f"La etapa '{dead[0]}' terminó inesperadamente.")
+                continue
+            if isinstance(message, _End):
+                break
+            if isinstance(message, _Failure):
+                error = error or message.error
+                stop.set()
+                continue
+            if error is None:
+                try:
+                    consume(message)
+                except Exception as e:
+                    error = e
+                    stop.set()
+        for w in workers:
+            w.join()
+        self.stats = message.stats
+        if error is not None:
+            raise error
+        return message.results
+
+
+def stage_profile(stats: list) -> dict:
+    """Perfil (formato de Profiler.report) con el tiempo ocupado de cada etapa, para Profiler.merge."""
+    spans = [{'path': s['stage'], 'calls': s['items'], 'wall_seconds': s['busy_seconds'],
+              'cpu_seconds': s['cpu_seconds'], 'alloc_peak_bytes': None, 'rss_peak_bytes': None} for s in stats]
+    return {'spans': spans, 'counters': {}}
@@ -0,0 +1,169 @@
+import json
+import sys
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Separador de los nombres de fases anidadas ('simulación/pruebas')
+SPAN_SEPARATOR = '/'
+
+
+def peak_rss_bytes():
+    """Memoria residente máxima del proceso hasta ahora, o None si no se puede consultar."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux la informa en KiB y macOS en bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class _NullSpan:
+    """Fase que no mide nada: la que devuelve un Profiler desactivado."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._enter(self.name)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler._exit()
+        return False
+
+
+class Profiler:
+    """
+    Mide fases de una ejecución con spans anidados (`with profiler.span('generación'):`) y
+    contadores (`profiler.count('bits', n)`).
+
+    Cada fase acumula, por ruta ('simulación/pruebas'), llamadas, tiempo de pared, tiempo de
+    CPU del proceso, el pico de memoria asignada por Python dentro de la fase (tracemalloc,
+    solo con trace_memory) y el pico de memoria residente del proceso al cerrarla. Desactivado,
+    span() devuelve siempre el mismo objeto vacío y count() no hace nada, por lo que puede
+    dejarse en el código sin costo apreciable.
+
+    No es seguro entre hilos: cada hilo o proceso usa su propio Profiler y los perfiles se
+    combinan con merge().
+    """
+    def __init__(self, enabled: bool = True, trace_memory: bool = False):
+        self.enabled = enabled
+        self.trace_memory = trace_memory and enabled
+        self.spans = {}
+        self.counters = {}
+        self._stack = []
+        self._started_tracing = False
+        self._start_wall = time.perf_counter()
+
+    def span(self, name: str):
+        """Context manager de una fase; se anida bajo la fase abierta actualmente."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def count(self, name: str, value=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def _enter(self, name):
+        path = SPAN_SEPARATOR.join([frame['path'] for frame in self._stack[-1:]] + [name])
+        # Se registra al abrir, para que report() conserve el orden (padres antes que hijos)
+        self.spans.setdefault(path, {
+            'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'alloc_peak_bytes': None, 'rss_peak_bytes': None})
+        frame = {'path': path, 'wall': time.perf_counter(), 'cpu': time.process_time()}
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            # El pico anterior pertenece a la fase padre; se reinicia para medir la nueva
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['start_memory'] = current
+            frame['peak'] = current
+        self._stack.append(frame)
+
+    def _exit(self):
+        frame = self._stack.pop()
+        stats = self.spans[frame['path']]
+        stats['calls'] += 1
+        stats['wall_seconds'] += time.perf_counter() - frame['wall']
+        stats['cpu_seconds'] += time.process_time() - frame['cpu']
+        if self.trace_memory:
+            peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+            stats['alloc_peak_bytes'] = max(stats['alloc_peak_bytes'] or 0, peak - frame['start_memory'])
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+            elif self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        stats['rss_peak_bytes'] = peak_rss_bytes()
+
+    def merge(self, profile: dict, prefix: str = None):
+        """Incorpora un perfil de report() (por ejemplo, el del proceso de simulación)."""
+        if not self.enabled or not profile:
+            return
+        for span in profile['spans']:
+            path = span['path'] if prefix is None else prefix + SPAN_SEPARATOR + span['path']
+            stats = {key: value for key, value in span.items() if key != 'path'}
+            if path in self.spans:
+                previous = self.spans[path]
+                for key in ('calls', 'wall_seconds', 'cpu_seconds'):
+                    stats[key] += previous[key]
+                for key in ('alloc_peak_bytes', 'rss_peak_bytes'):
+                    values = [v for v in (stats[key], previous[key]) if v is not None]
+                    stats[key] = max(values) if values else None
+            self.spans[path] = stats
+        for name, value in profile['counters'].items():
+            name = name if prefix is None else prefix + SPAN_SEPARATOR + name
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self) -> dict:
+        """
+        Perfil serializable: 'spans' (lista en el orden en que se abrieron por primera vez,
+        con 'path', 'calls', 'wall_seconds', 'cpu_seconds', 'alloc_peak_bytes' y
+        'rss_peak_bytes'), 'counters' y 'total_wall_seconds'.
+        """
+        return {
+            'spans': [dict(stats, path=path) for path, stats in self.spans.items()],
+            'counters': dict(self.counters),
+            'total_wall_seconds': time.perf_counter() - self._start_wall
+        }
+
+
+NULL_PROFILER = Profiler(enabled=False)
+
+
+def format_profile(profile: dict) -> list:
+    """Filas de texto (una por fase, sangradas según el anidamiento) para mostrar un perfil."""
+    lines = []
+    for span in profile['spans']:
+        depth = span['path'].count(SPAN_SEPARATOR)
+        name = span['path'].rsplit(SPAN_SEPARATOR, 1)[-1]
+        memory = '' if span['alloc_peak_bytes'] is None else f"  asignado {span['alloc_peak_bytes'] / 1e6:.1f} MB"
+        lines.append(f"{'  ' * depth}{name}: {span['wall_seconds']:.3f} s pared, {span['cpu_seconds']:.3f} s CPU,"
+                     f" {span['calls']} llamadas{memory}")
+    for name, value in profile['counters'].items():
+        lines.append(f"{name} = {value}")
+    return lines
+
+
+def write_profile(file_path: str, profile: dict):
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2, ensure_ascii=False)
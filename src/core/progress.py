@@ -0,0 +1,133 @@
+import threading
+import time
+
+
+class OperationCancelled(Exception):
+    """Se lanza cuando una operación se cancela a través de su CancellationToken."""
+
+
+class CancellationToken:
+    """
+    Señal de cancelación compartida entre quien pide detener y quien ejecuta el trabajo.
+    Acepta cualquier objeto con set()/is_set() (threading.Event o multiprocessing.Event),
+    de modo que también sirve entre procesos.
+    """
+    def __init__(self, event=None):
+        self._event = event if event is not None else threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise OperationCancelled("Operación cancelada.")
+
+
+class ProgressReporter:
+    """
+    Interfaz común de progreso y cancelación para las fases largas (generación, simulación,
+    pruebas, exportación).
+
+    Cada fase se abre con start_phase(nombre, total) y avanza con advance(n). El callback
+    recibe diccionarios con 'phase', 'done', 'total', 'elapsed_seconds', 'throughput'
+    (elementos por segundo) y 'eta_seconds', como mucho cada min_interval segundos (y
+    siempre al terminar la fase). check(), advance() y update() lanzan OperationCancelled si
+    el token se canceló, por lo que basta con llamarlos cada pocos milisegundos de trabajo;
+    quien prefiera detenerse de forma ordenada usa report() y consulta `cancelled`.
+    """
+    def __init__(self, callback=None, token: CancellationToken = None,
+                 min_interval: float = 0.1, clock=time.perf_counter):
+        self.callback = callback
+        self.token = token if token is not None else CancellationToken()
+        self.min_interval = min_interval
+        self.clock = clock
+        self.phase = None
+        self.total = 0
+        self.done = 0
+        self._start_done = 0
+        self._phase_start = None
+        self._last_report = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def check(self):
+        """Lanza OperationCancelled si se pidió cancelar."""
+        self.token.raise_if_cancelled()
+
+    def start_phase(self, phase: str, total: int, done: int = 0):
+        """Empieza una fase de `total` elementos (done > 0 al reanudar una fase a medias)."""
+        self.check()
+        self.phase = phase
+        self.total = total
+        self.done = done
+        self._start_done = done
+        self._phase_start = self.clock()
+        self._last_report = None
+        self._report(force=True)
+
+    def advance(self, count: int = 1):
+        """Suma count elementos completados, informa si corresponde y verifica la cancelación."""
+        self.update(self.done + count)
+
+    def update(self, done: int):
+        """Como report, pero además lanza OperationCancelled si se pidió cancelar."""
+        self.report(done)
+        self.check()
+
+    def report(self, done: int):
+        """Fija los elementos completados de la fase actual e informa si corresponde."""
+        self.done = done
+        self._report(force=done >= self.total)
+
+    def finish_phase(self):
+        if self.phase is not None and self.done < self.total:
+            self.done = self.total
+            self._report(force=True)
+
+    def snapshot(self) -> dict:
+        """Estado actual de la fase (el mismo diccionario que recibe el callback)."""
+        now = self.clock()
+        elapsed = now - self._phase_start if self._phase_start is not None else 0.0
+        processed = self.done - self._start_done if self._phase_start is not None else 0
+        throughput = processed / elapsed if elapsed > 0 else 0.0
+        remaining = max(0, self.total - self.done)
+        if remaining == 0:
+            eta = 0.0
+        else:
+            eta = remaining / throughput if throughput > 0 else None
+        return {
+            'phase': self.phase,
+            'done': self.done,
+            'total': self.total,
+            'elapsed_seconds': elapsed,
+            'throughput': throughput,
+            'eta_seconds': eta
+        }
+
+    def _report(self, force: bool = False):
+        if self.callback is None:
+            return
+        now = self.clock()
+        if not force and self._last_report is not None and now - self._last_report < self.min_interval:
+            return
+        self._last_report = now
+        self.callback(self.snapshot())
+
+
+def format_progress(update: dict) -> str:
+    """Texto breve para mostrar un diccionario de progreso en la interfaz o la consola."""
+    text = f"{update['phase']}: {update['done']:,}/{update['total']:,}"
+    if update['throughput']:
+        text += f" ({update['throughput']:,.0f}/s"
+        eta = update['eta_seconds']
+        if eta is not None and eta > 0:
+            minutes, seconds = divmod(int(round(eta)), 60)
+            text += f", restante {minutes:d}:{seconds:02d}"
+        text += ")"
+    return text
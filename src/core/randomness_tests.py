@@ -1,21 +1,78 @@
 import numpy as np
-from scipy.stats import chi2
-from scipy.special import erfc
+
+# scipy se importa al calcular los p-valores (no al importar el módulo) para que la GUI y
+# los modos sin GUI arranquen sin cargarlo
 
 class RandomnessTests:
-    def __init__(self):
-        pass
+    # Versión de cada prueba: forma parte de la clave de la caché de resultados, así que debe
+    # subirse al cambiar la implementación (o los umbrales) de la prueba correspondiente
+    TEST_VERSIONS = {
+        'Monobit Test': 1,
+        'Serial Test': 1,
+        'Auto-correlation Test (d=1)': 1,
+        'Poker Test (m=4)': 1,
+    }
+
+    def __init__(self, cache=None):
+        """
+        Args:
+            cache: ResultCache opcional (src/utils/result_cache.py); run_all_tests consulta
+                ahí cada prueba antes de calcularla.
+        """
+        self.cache = cache
+
+    @staticmethod
+    def _as_bits(bit_sequence) -> np.ndarray:
+        return np.asarray(bit_sequence).astype(np.int64)
+
+    @staticmethod
+    def pair_counts(bit_sequence: np.ndarray, d: int = 1) -> np.ndarray:
+        """Conteos de los pares (b_i, b_i+d) en el orden 00, 01, 10, 11."""
+        bits = RandomnessTests._as_bits(bit_sequence)
+        if len(bits) <= d:
+            return np.zeros(4, dtype=np.int64)
+        return np.bincount(2 * bits[:-d] + bits[d:], minlength=4)
+
+    @staticmethod
+    def block_counts(bit_sequence: np.ndarray, m: int = 4) -> np.ndarray:
+        """Conteos de los 2^m patrones de los bloques de m bits sin solapamiento."""
+        bits = RandomnessTests._as_bits(bit_sequence)
+        k = len(bits) // m
+        weights = 1 << np.arange(m - 1, -1, -1)
+        values = bits[:k * m].reshape(k, m) @ weights
+        return np.bincount(values, minlength=2**m)
+
+    @staticmethod
+    def correlation_from_pair_counts(counts: np.ndarray) -> float:
+        """Correlación de Pearson entre b_i y b_i+d a partir de los conteos de pares."""
+        n00, n01, n10, n11 = (float(c) for c in counts)
+        total = n00 + n01 + n10 + n11
+        if total == 0:
+            return np.nan
+        mean_x = (n10 + n11) / total
+        mean_y = (n01 + n11) / total
+        var_x = mean_x * (1 - mean_x)
+        var_y = mean_y * (1 - mean_y)
+        if var_x == 0 or var_y == 0:
+            return np.nan
+        return (n11 / total - mean_x * mean_y) / np.sqrt(var_x * var_y)
 
     def monobit_test(self, bit_sequence: np.ndarray) -> dict:
         """
         Monobit Test (Frequency Test): Verifica si la cantidad de 0s y 1s es aproximadamente igual.
         """
         n = len(bit_sequence)
+        ones = int(np.count_nonzero(bit_sequence))
+        counts = np.array([n - ones, ones])
         if n < 100:
-            return {"p_value": np.nan, "statistic": np.nan, "message": f"Secuencia demasiado corta (n={n}). Se requiere n >= 100."}
-        # Convertir bits a +1/-1
-        bits_pm = 2 * bit_sequence - 1
-        s_obs = np.sum(bits_pm)
+            return {"p_value": np.nan, "statistic": np.nan, "message": f"Secuencia demasiado corta (n={n}). Se requiere n >= 100.", "counts": counts}
+        # Suma de los bits convertidos a +1/-1
+        s_obs = 2 * ones - n
+        return dict(self._monobit_from_sum(n, s_obs), counts=counts)
+
+    @staticmethod
+    def _monobit_from_sum(n: int, s_obs) -> dict:
+        from scipy.special import erfc
         s_obs_norm = abs(s_obs) / np.sqrt(n)
         p_value = erfc(s_obs_norm / np.sqrt(2))
         return {"p_value": p_value, "statistic": s_obs_norm, "message": "OK"}
@@ -26,16 +83,17 @@ class RandomnessTests:
         Para m=2, compara la frecuencia de 00, 01, 10, 11.
         """
         n = len(bit_sequence)
-        if n < 10000:
-            return {"p_value": np.nan, "statistic": np.nan, "message": f"Secuencia de bits demasiado corta (n={n}). Se recomienda n >= 1000."}
         if m != 2:
             return {"p_value": np.nan, "statistic": np.nan, "message": "Solo m=2 soportado."}
         # Contar ocurrencias de cada díada
-        pairs = [str(int(bit_sequence[i])) + str(int(bit_sequence[i+1])) for i in range(n-1)]
-        counts = {k: 0 for k in ['00', '01', '10', '11']}
-        for p in pairs:
-            counts[p] += 1
-        observed = np.array([counts['00'], counts['01'], counts['10'], counts['11']])
+        observed = self.pair_counts(bit_sequence, d=1)
+        if n < 10000:
+            return {"p_value": np.nan, "statistic": np.nan, "message": f"Secuencia de bits demasiado corta (n={n}). Se recomienda n >= 1000.", "counts": observed}
+        return dict(self._serial_from_counts(n, observed), counts=observed)
+
+    @staticmethod
+    def _serial_from_counts(n: int, observed: np.ndarray) -> dict:
+        from scipy.stats import chi2
         expected = (n-1) / 4
         chi2_stat = np.sum((observed - expected) ** 2 / expected)
         df = 3
@@ -47,9 +105,17 @@ class RandomnessTests:
         Auto-correlation Test: Verifica la correlación entre bits separados por d posiciones.
         """
         n = len(bit_sequence)
+        counts = self.pair_counts(bit_sequence, d=d)
+        correlation = self.correlation_from_pair_counts(counts)
         if n < 10000 or d >= n:
-            return {"p_value": np.nan, "statistic": np.nan, "message": "Secuencia demasiado corta o d inválido."}
-        matches = np.sum(bit_sequence[:n-d] == bit_sequence[d:])
+            return {"p_value": np.nan, "statistic": np.nan, "message": "Secuencia demasiado corta o d inválido.",
+                    "counts": counts, "correlation": correlation}
+        matches = counts[0] + counts[3]
+        return dict(self._auto_correlation_from_matches(n, d, matches), counts=counts, correlation=correlation)
+
+    @staticmethod
+    def _auto_correlation_from_matches(n: int, d: int, matches) -> dict:
+        from scipy.special import erfc
         v = matches
         stat = 2 * (v - (n-d)/2) / np.sqrt(n-d)
         p_value = erfc(abs(stat)/np.sqrt(2))
@@ -61,22 +127,160 @@ class RandomnessTests:
         """
         n = len(bit_sequence)
         k = n // m
+        freq = self.block_counts(bit_sequence, m)
         if n < 10000 or k < 5 * (2**m):
-            return {"p_value": np.nan, "statistic": np.nan, "message": f"Secuencia demasiado corta o m muy grande (n={n}, m={m})."}
-        blocks = [''.join(str(int(b)) for b in bit_sequence[i*m:(i+1)*m]) for i in range(k)]
-        unique, counts = np.unique(blocks, return_counts=True)
-        freq = np.zeros(2**m)
-        for u, c in zip(unique, counts):
-            freq[int(u, 2)] = c
+            return {"p_value": np.nan, "statistic": np.nan, "message": f"Secuencia demasiado corta o m muy grande (n={n}, m={m}).", "counts": freq}
+        return dict(self._poker_from_counts(k, m, freq.astype(float)), counts=freq)
+
+    @staticmethod
+    def _poker_from_counts(k: int, m: int, freq: np.ndarray) -> dict:
+        from scipy.stats import chi2
         stat = ((2**m) / k) * np.sum(freq**2) - k
         df = 2**m - 1
         p_value = 1 - chi2.cdf(stat, df)
         return {"p_value": p_value, "statistic": stat, "message": "OK"}
 
-    def run_all_tests(self, bit_sequence: np.ndarray) -> dict:
+    def run_all_tests(self, bit_sequence: np.ndarray, progress=None, key: str = None) -> dict:
+        """
+        Ejecuta las cuatro pruebas. Con progress (ProgressReporter) informa la fase
+        "Pruebas de aleatoriedad" y se puede cancelar entre pruebas (OperationCancelled).
+
+        Con caché, cada prueba se busca por key (por ejemplo config_key de la configuración
+        del generador) o, si no se indica, por el resumen del contenido de bit_sequence.
+        """
+        if self.cache is not None and key is None:
+            from src.utils.result_cache import sequence_digest
+            key = sequence_digest(bit_sequence)
+        tests = [
+            ('Monobit Test', lambda: self.monobit_test(bit_sequence)),
+            ('Serial Test', lambda: self.serial_test(bit_sequence, m=2)),
+            ('Auto-correlation Test (d=1)', lambda: self.auto_correlation_test(bit_sequence, d=1)),
+            ('Poker Test (m=4)', lambda: self.poker_test(bit_sequence, m=4)),
+        ]
+        if progress is not None:
+            progress.start_phase("Pruebas de aleatoriedad", len(tests))
         results = {}
-        results['Monobit Test'] = self.monobit_test(bit_sequence)
-        results['Serial Test'] = self.serial_test(bit_sequence, m=2)
-        results['Auto-correlation Test (d=1)'] = self.auto_correlation_test(bit_sequence, d=1)
-        results['Poker Test (m=4)'] = self.poker_test(bit_sequence, m=4)
-        return results
\ No newline at end of file
+        for name, test in tests:
+            if self.cache is None:
+                results[name] = test()
+            else:
+                version = self.TEST_VERSIONS[name]
+                results[name] = self.cache.get(key, name, version)
+                if results[name] is None:
+                    results[name] = test()
+                    self.cache.put(key, name, version, results[name])
+            if progress is not None:
+                progress.advance()
+        return results
+
+
+def find_test_result(test_results, keys):
+    """
+    Resultado de una prueba en test_results, que puede venir con las claves de
+    SimulationRunner ('monobit', ...) o con los nombres de RandomnessTests ('Monobit Test',
+    ...); devuelve el primero de keys que sea un diccionario, o None.
+    """
+    if not test_results:
+        return None
+    for key in keys:
+        if isinstance(test_results.get(key), dict):
+            return test_results[key]
+    return None
+
+
+class RandomnessAccumulator:
+    """
+    Acumula por bloques los conteos que usan las pruebas de RandomnessTests, de modo que
+    las estadísticas se pueden calcular sin tener la secuencia completa y guardarse en un
+    checkpoint. Los resultados (incluidas las tablas de conteos 'counts') coinciden con los
+    de RandomnessTests sobre la secuencia entera.
+    """
+    def __init__(self, d: int = 1, m: int = 4):
+        self.d = d  # Desplazamiento de la prueba de autocorrelación
+        self.m = m  # Tamaño de bloque de la prueba Poker
+        self.reset()
+
+    def reset(self):
+        self.n = 0
+        self.ones = 0
+        self.pair_counts = np.zeros(4, dtype=np.int64)
+        self.lag_counts = np.zeros(4, dtype=np.int64)  # Pares (b_i, b_i+d) de la autocorrelación
+        self.poker_counts = np.zeros(2**self.m, dtype=np.int64)
+        # Bits pendientes entre bloques: los últimos d (autocorrelación) y el bloque Poker incompleto
+        self._tail = np.zeros(0, dtype=np.int8)
+        self._poker_carry = np.zeros(0, dtype=np.int8)
+
+    def update(self, bits: np.ndarray):
+        """Incorpora un bloque de bits (0s y 1s) a los conteos."""
+        bits = np.asarray(bits, dtype=np.int8)
+        if len(bits) == 0:
+            return
+        self.ones += int(np.count_nonzero(bits))
+
+        # Díadas y autocorrelación incluyendo la frontera con el bloque anterior
+        joined = np.concatenate((self._tail, bits))
+        if self.n > 0:
+            self.pair_counts += np.bincount(2 * joined[-len(bits)-1:-1] + joined[-len(bits):], minlength=4)
+        elif len(bits) > 1:
+            self.pair_counts += np.bincount(2 * bits[:-1] + bits[1:], minlength=4)
+        if len(joined) > self.d:
+            self.lag_counts += np.bincount(2 * joined[:-self.d] + joined[self.d:], minlength=4)
+        self._tail = joined[-self.d:].copy()
+
+        # Bloques Poker completos; el resto se guarda para el siguiente bloque
+        pending = np.concatenate((self._poker_carry, bits))
+        k = len(pending) // self.m
+        if k > 0:
+            weights = 1 << np.arange(self.m - 1, -1, -1)
+            values = pending[:k * self.m].reshape(k, self.m) @ weights
+            self.poker_counts += np.bincount(values, minlength=2**self.m)
+        self._poker_carry = pending[k * self.m:].copy()
+        self.n += len(bits)
+
+    def results(self) -> dict:
+        """Devuelve los resultados con las mismas claves que usa la simulación."""
+        n, d, m = self.n, self.d, self.m
+        k = n // m
+        if n < 100:
+            monobit = {"p_value": np.nan, "statistic": np.nan, "message": f"Secuencia demasiado corta (n={n}). Se requiere n >= 100."}
+        else:
+            monobit = RandomnessTests._monobit_from_sum(n, 2 * self.ones - n)
+        monobit['counts'] = np.array([n - self.ones, self.ones])
+        if n < 10000:
+            serial = {"p_value": np.nan, "statistic": np.nan, "message": f"Secuencia de bits demasiado corta (n={n}). Se recomienda n >= 1000."}
+        else:
+            serial = RandomnessTests._serial_from_counts(n, self.pair_counts.copy())
+        serial['counts'] = self.pair_counts.copy()
+        if n < 10000 or d >= n:
+            autocorr = {"p_value": np.nan, "statistic": np.nan, "message": "Secuencia demasiado corta o d inválido."}
+        else:
+            autocorr = RandomnessTests._auto_correlation_from_matches(n, d, int(self.lag_counts[0] + self.lag_counts[3]))
+        autocorr['counts'] = self.lag_counts.copy()
+        autocorr['correlation'] = RandomnessTests.correlation_from_pair_counts(self.lag_counts)
+        if n < 10000 or k < 5 * (2**m):
+            poker = {"p_value": np.nan, "statistic": np.nan, "message": f"Secuencia demasiado corta o m muy grande (n={n}, m={m})."}
+        else:
+            poker = RandomnessTests._poker_from_counts(k, m, self.poker_counts.astype(float))
+        poker['counts'] = self.poker_counts.copy()
+        return {'monobit': monobit, 'serial': serial, 'autocorr': autocorr, 'poker': poker}
+
+    def get_state(self) -> dict:
+        """Estado serializable (solo enteros y arreglos) para los checkpoints."""
+        return {
+            'n': self.n,
+            'ones': self.ones,
+            'pair_counts': self.pair_counts.copy(),
+            'lag_counts': self.lag_counts.copy(),
+            'poker_counts': self.poker_counts.copy(),
+            'tail': self._tail.copy(),
+            'poker_carry': self._poker_carry.copy()
+        }
+
+    def set_state(self, state: dict):
+        self.n = int(state['n'])
+        self.ones = int(state['ones'])
+        self.pair_counts = np.array(state['pair_counts'], dtype=np.int64)
+        self.lag_counts = np.array(state['lag_counts'], dtype=np.int64)
+        self.poker_counts = np.array(state['poker_counts'], dtype=np.int64)
+        self._tail = np.array(state['tail'], dtype=np.int8)
+        self._poker_carry = np.array(state['poker_carry'], dtype=np.int8)
@@ -0,0 +1,121 @@
+import math
+import time
+
+
+class RealTimeScheduler:
+    """
+    Asigna los pasos de simulación a instantes de reloj de pared a un ritmo fijo.
+
+    El paso k vence en t0 + k * periodo (plazos absolutos), de modo que los retrasos de un
+    paso no se acumulan en los siguientes. La espera combina un sleep grueso con una espera
+    activa durante el último tramo (spin_seconds) para reducir el jitter. Si el motor se
+    atrasa, wait_next devuelve varios pasos vencidos para ejecutarlos en lote en lugar de
+    ir acumulando retraso paso a paso.
+    """
+    def __init__(self, steps_per_second: float = None, acceleration: float = None,
+                 step_seconds: float = 1.0, max_batch: int = 1000, spin_seconds: float = 0.001,
+                 clock=time.perf_counter, sleep=time.sleep):
+        """
+        Args:
+            steps_per_second (float): Ritmo de pasos por segundo de reloj.
+            acceleration (float): Alternativa a steps_per_second: cuántas veces más rápido
+                que el tiempo real, si cada paso representa step_seconds.
+            step_seconds (float): Tiempo simulado que representa un paso.
+            max_batch (int): Máximo de pasos vencidos que se entregan de una vez.
+            spin_seconds (float): Tramo final de cada espera que se hace de forma activa.
+            clock, sleep: Reloj y función de espera (inyectables para pruebas).
+        """
+        if steps_per_second is None and acceleration is None:
+            raise ValueError("Indique steps_per_second o acceleration.")
+        if steps_per_second is None:
+            steps_per_second = acceleration / step_seconds
+        if steps_per_second <= 0:
+            raise ValueError("El ritmo de pasos debe ser positivo.")
+        if max_batch <= 0:
+            raise ValueError("El tamaño máximo de lote debe ser un entero positivo.")
+        self.period = 1.0 / steps_per_second
+        self.max_batch = max_batch
+        self.spin_seconds = spin_seconds
+        self.clock = clock
+        self.sleep = sleep
+        self.t0 = None
+        self.steps_scheduled = 0
+        self.missed_deadlines = 0
+        self.batches = 0
+        self.max_batch_used = 0
+        self.current_lag = 0.0
+        self.max_lag = 0.0
+        self._jitter_sum = 0.0
+        self._jitter_max = 0.0
+        self._waits = 0
+
+    @classmethod
+    def from_config(cls, config_params: dict):
+        """
+        Crea un planificador a partir de 'steps_per_second' o 'acceleration' (con
+        'step_seconds') en la configuración. Devuelve None si la ejecución no tiene ritmo.
+        """
+        steps_per_second = config_params.get('steps_per_second') or None
+        acceleration = config_params.get('acceleration') or None
+        if steps_per_second is None and acceleration is None:
+            return None
+        return cls(steps_per_second=steps_per_second, acceleration=acceleration,
+                   step_seconds=config_params.get('step_seconds', 1.0))
+
+    def start(self):
+        """Fija el instante del paso 0 (se llama solo en el primer wait_next)."""
+        self.t0 = self.clock()
+
+    def deadline(self, step: int) -> float:
+        return self.t0 + step * self.period
+
+    def wait_next(self, limit: int = None) -> int:
+        """
+        Espera hasta que venza el siguiente paso y devuelve cuántos pasos ejecutar ahora
+        (al menos 1, como máximo max_batch y limit). Los pasos devueltos se dan por
+        ejecutados en la contabilidad del planificador.
+        """
+        if self.t0 is None:
+            self.start()
+        limit = self.max_batch if limit is None else min(limit, self.max_batch)
+        next_deadline = self.deadline(self.steps_scheduled)
+        now = self.clock()
+        if now < next_deadline:
+            # Sleep grueso y espera activa al final para despertar cerca del plazo
+            remaining = next_deadline - now
+            if remaining > self.spin_seconds:
+                self.sleep(remaining - self.spin_seconds)
+            now = self.clock()
+            while now < next_deadline:
+                now = self.clock()
+            jitter = now - next_deadline
+            self._jitter_sum += jitter
+            self._jitter_max = max(self._jitter_max, jitter)
+            self._waits += 1
+
+        # Pasos cuyo plazo ya pasó (incluido el actual)
+        due = int((now - self.t0) / self.period) + 1 - self.steps_scheduled
+        batch = max(1, min(due, limit))
+        # Un paso pierde su plazo si se ejecuta más de un periodo después de vencer
+        late = math.ceil((now - self.t0) / self.period - 1) - self.steps_scheduled
+        self.missed_deadlines += min(batch, max(0, late))
+        self.current_lag = max(0.0, now - next_deadline)
+        self.max_lag = max(self.max_lag, self.current_lag)
+        self.steps_scheduled += batch
+        self.batches += 1
+        self.max_batch_used = max(self.max_batch_used, batch)
+        return batch
+
+    def stats(self) -> dict:
+        """Resumen del cumplimiento de plazos."""
+        return {
+            'steps_per_second': 1.0 / self.period,
+            'steps_scheduled': self.steps_scheduled,
+            'batches': self.batches,
+            'max_batch': self.max_batch_used,
+            'missed_deadlines': self.missed_deadlines,
+            'current_lag_seconds': self.current_lag,
+            'max_lag_seconds': self.max_lag,
+            'mean_jitter_seconds': self._jitter_sum / self._waits if self._waits else 0.0,
+            'max_jitter_seconds': self._jitter_max
+        }
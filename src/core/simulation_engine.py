@@ -1,6 +1,8 @@
 import numpy as np
 import time
 
+from src.core.memmap_history import MemmapColumn, DEFAULT_CHUNK_ROWS
+
 class LoadSimulator:
     def __init__(self,
                  num_users: int = 100,
@@ -13,7 +15,8 @@ class LoadSimulator:
                  recovery_rate: float = 0.05,     # Paper: 0.05
                  max_latency_ms: float = 1000.0,
                  max_cpu_usage_percent: float = 98.0,
-                 max_memory_usage_percent: float = 95.0
+                 max_memory_usage_percent: float = 95.0,
+                 seed: int = None
                  ):
         """
         Inicializa el simulador de carga.
@@ -30,6 +33,8 @@ class LoadSimulator:
             max_latency_ms (float): Latencia máxima permitida en la simulación.
             max_cpu_usage_percent (float): Uso máximo de CPU permitido.
             max_memory_usage_percent (float): Uso máximo de memoria permitido.
+            seed (int): Semilla del generador pseudoaleatorio del ruido de carga. Si es None
+                se usa el estado global de NumPy.
         """
         self.num_users = num_users
         
@@ -50,6 +55,9 @@ class LoadSimulator:
         self.max_cpu = max_cpu_usage_percent
         self.max_memory = max_memory_usage_percent
 
+        # Fuente del ruido de carga; su estado se guarda en los checkpoints
+        self.rng = np.random.RandomState(seed) if seed is not None else np.random
+
         # Historial para almacenar los datos de la simulación para gráficos
         self.history = {
             'time_steps': [],
@@ -91,10 +99,10 @@ class LoadSimulator:
         # Si bit es 1, aumenta las solicitudes; si es 0, puede ser base o incluso menos
         if chaotic_bit_value == 1:
             # Pico de carga: puede ser un multiplicador mayor, o añadir un número fijo
-            simulated_requests_this_step = self.num_users * (base_requests_per_user + np.random.uniform(0.5, 1.5))
+            simulated_requests_this_step = self.num_users * (base_requests_per_user + self.rng.uniform(0.5, 1.5))
         else:
             # Carga base/normal o disminución:
-            simulated_requests_this_step = self.num_users * (base_requests_per_user + np.random.uniform(0.0, 0.5))
+            simulated_requests_this_step = self.num_users * (base_requests_per_user + self.rng.uniform(0.0, 0.5))
 
         # --- Actualizar Métricas Simuladas ---
 
@@ -143,6 +151,120 @@ class LoadSimulator:
             'simulated_requests': simulated_requests_this_step
         }
 
+    def simulate_steps(self, chaotic_bits: np.ndarray) -> dict:
+        """
+        Simula un bloque de pasos de una vez. Produce exactamente el mismo historial y
+        consume el generador pseudoaleatorio igual que llamar simulate_step bit a bit,
+        pero genera el ruido de carga vectorizado y evita el costo por paso de la API escalar.
+
+        Args:
+            chaotic_bits (np.ndarray): Bits (0 o 1) generados por el mapa caótico.
+
+        Returns:
+            dict: Métricas del último paso simulado (mismo formato que simulate_step),
+            o None si el bloque está vacío.
+        """
+        bits = np.asarray(chaotic_bits)
+        n = len(bits)
+        if n == 0:
+            return None
+        if not np.all((bits == 0) | (bits == 1)):
+            raise ValueError("El valor del bit caótico debe ser 0 o 1.")
+        is_peak = bits == 1
+
+        # Mismo ruido que simulate_step: uniform(0.5, 1.5) para bits 1 y uniform(0.0, 0.5) para bits 0
+        base_requests_per_user = 1.0
+        low = np.where(is_peak, 0.5, 0.0)
+        high = np.where(is_peak, 1.5, 0.5)
+        requests = self.num_users * (base_requests_per_user + self.rng.uniform(low, high))
+        load = requests / self.num_users
+
+        latency_change = (load * self.latency_sensitivity).tolist()
+        cpu_change = (load * self.cpu_sensitivity).tolist()
+        memory_change = (load * self.memory_sensitivity).tolist()
+
+        latency = self.current_latency
+        cpu = self.current_cpu_usage
+        memory = self.current_memory_usage
+        recovery_rate = self.recovery_rate
+        latencies, cpus, memories = [], [], []
+        for i, peak in enumerate(is_peak.tolist()):
+            if peak:
+                latency += latency_change[i]
+                cpu += cpu_change[i]
+                memory += memory_change[i]
+            else:
+                latency -= latency_change[i] * recovery_rate
+                cpu -= cpu_change[i] * recovery_rate
+                memory -= memory_change[i] * recovery_rate
+            latency = max(self.base_latency, min(self.max_latency, latency))
+            cpu = max(self.base_cpu, min(self.max_cpu, cpu))
+            memory = max(self.base_memory, min(self.max_memory, memory))
+            latencies.append(latency)
+            cpus.append(cpu)
+            memories.append(memory)
+
+        self.current_latency = latency
+        self.current_cpu_usage = cpu
+        self.current_memory_usage = memory
+
+        first_step = self.current_time_step
+        self.history['time_steps'].extend(range(first_step, first_step + n))
+        self.history['latency'].extend(latencies)
+        self.history['cpu'].extend(cpus)
+        self.history['memory'].extend(memories)
+        self.history['simulated_requests'].extend(requests.tolist())
+        self.current_time_step += n
+
+        return {
+            'time_step': self.current_time_step - 1,
+            'latency_ms': self.current_latency,
+            'cpu_usage_percent': self.current_cpu_usage,
+            'memory_usage_percent': self.current_memory_usage,
+            'simulated_requests': self.history['simulated_requests'][-1]
+        }
+
+    def __getstate__(self):
+        # Sin semilla, rng es el módulo np.random (no serializable): para enviar el simulador a
+        # otro proceso (Pipeline en modo 'process') se copia su estado en un RandomState propio
+        state = self.__dict__.copy()
+        if state['rng'] is np.random:
+            state['rng'] = np.random.RandomState()
+            state['rng'].set_state(np.random.get_state())
+        return state
+
+    def get_state(self, include_history: bool = True) -> dict:
+        """
+        Devuelve una copia del estado interno (métricas actuales, paso de tiempo, estado
+        del generador pseudoaleatorio e historial) para guardarlo en un checkpoint.
+        Con include_history=False se omite el historial (quien llama lo copia por su cuenta).
+        """
+        state = {
+            'current_latency': self.current_latency,
+            'current_cpu_usage': self.current_cpu_usage,
+            'current_memory_usage': self.current_memory_usage,
+            'current_time_step': self.current_time_step,
+            'rng_state': self.rng.get_state(),
+        }
+        if include_history:
+            # Un historial en disco (MemmapHistory) no se copia: se retoma desde sus archivos
+            state['history'] = {k: [] if isinstance(v, MemmapColumn) else list(v) for k, v in self.history.items()}
+        return state
+
+    def set_state(self, state: dict):
+        """Restaura un estado devuelto por get_state para continuar la simulación."""
+        self.current_latency = state['current_latency']
+        self.current_cpu_usage = state['current_cpu_usage']
+        self.current_memory_usage = state['current_memory_usage']
+        self.current_time_step = state['current_time_step']
+        self.rng.set_state(state['rng_state'])
+        self.history = {k: list(v) for k, v in state['history'].items()}
+
+    def clear_history(self):
+        """Vacía el historial sin reiniciar las métricas ni el paso de tiempo."""
+        for values in self.history.values():
+            values.clear()
+
     def get_simulation_history(self) -> dict:
         """Retorna el historial completo de la simulación."""
         return self.history
@@ -159,4 +281,35 @@ class LoadSimulator:
             'memory': [],
             'simulated_requests': []
         }
-        self.current_time_step = 0
\ No newline at end of file
+        self.current_time_step = 0
+
+
+def summarize_history(history: dict, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> dict:
+    """
+    Calcula las estadísticas de resumen (promedios y máximos) de un historial de simulación.
+    Devuelve un diccionario vacío si el historial no tiene pasos.
+
+    Las columnas se recorren por bloques de chunk_rows filas (sumas y máximos parciales),
+    de modo que un historial en disco (MemmapHistory) nunca se carga completo en memoria.
+    """
+    num_steps = len(history['latency'])
+    if num_steps == 0:
+        return {}
+    sums = {key: 0.0 for key in ('simulated_requests', 'latency', 'cpu', 'memory')}
+    maxima = {key: -np.inf for key in ('latency', 'cpu', 'memory')}
+    for start in range(0, num_steps, chunk_rows):
+        for key in sums:
+            chunk = np.asarray(history[key][start:start + chunk_rows], dtype=np.float64)
+            sums[key] += float(chunk.sum())
+            if key in maxima:
+                maxima[key] = max(maxima[key], float(chunk.max()))
+    return {
+        'num_steps': num_steps,
+        'avg_requests': sums['simulated_requests'] / num_steps,
+        'avg_latency': sums['latency'] / num_steps,
+        'max_latency': maxima['latency'],
+        'avg_cpu': sums['cpu'] / num_steps,
+        'max_cpu': maxima['cpu'],
+        'avg_memory': sums['memory'] / num_steps,
+        'max_memory': maxima['memory']
+    }
@@ -0,0 +1,539 @@
+import numpy as np
+
+from src.core.chaotic_generator import ChaoticBitGenerator, PROGRESS_BLOCK_BITS
+from src.core.randomness_tests import RandomnessAccumulator, RandomnessTests
+from src.core.simulation_engine import LoadSimulator
+from src.core.checkpoint import CheckpointWriter, load_checkpoint
+from src.core.realtime_scheduler import RealTimeScheduler
+from src.core.profiling import Profiler, NULL_PROFILER
+from src.core.memmap_history import MemmapHistory, BITS_NAME, RUN_BITS_DTYPES
+from src.utils.export_sink import StreamingExportSink, HISTORY_DTYPES
+
+# Valores por defecto de los parámetros que construye ConfigTab (alpha fijo para ejecuciones reproducibles)
+DEFAULT_CONFIG = {
+    'alpha': 0.495,
+    'x0': 0.3,
+    'y0': 0.301,
+    'num_bits': 10000,
+    'num_users': 100,
+    'latency_sensitivity': 1.5,
+    'cpu_sensitivity': 0.8,
+    'memory_sensitivity': 0.5,
+    'recovery_rate': 0.05,
+}
+
+# Orden de las filas de los lotes que recibe on_steps
+STEP_COLUMNS = ('time_steps', 'simulated_requests', 'latency', 'cpu', 'memory')
+
+# Claves de los resultados del runner -> nombres de RandomnessTests (y de la caché de resultados)
+TEST_RESULT_NAMES = {'monobit': 'Monobit Test', 'serial': 'Serial Test',
+                     'autocorr': 'Auto-correlation Test (d=1)', 'poker': 'Poker Test (m=4)'}
+
+
+def validate_config_params(config_params: dict):
+    """
+    Aplica las mismas validaciones que ConfigTab._start_simulation.
+    Lanza ValueError con el mensaje correspondiente si algún parámetro es inválido.
+    """
+    if not (0.49 <= config_params['alpha'] <= 0.50):
+        raise ValueError("El parámetro α debe estar en el rango [0.49, 0.50].")
+    if not (0 <= config_params['x0'] <= 1 and 0 <= config_params['y0'] <= 1):
+        raise ValueError("Las condiciones iniciales x₀, y₀ deben estar en [0, 1].")
+    if config_params['num_bits'] <= 0:
+        raise ValueError("El número de bits debe ser un entero positivo.")
+    if config_params['num_users'] <= 0:
+        raise ValueError("El número de usuarios simulados debe ser un entero positivo.")
+
+
+class _GrowingArray:
+    """
+    Arreglo de solo agregado cuya capacidad se duplica al llenarse. Las filas escritas no se
+    vuelven a modificar, así que view() (sin copia) sirve de instantánea para un checkpoint
+    que se escribe en otro hilo mientras se sigue agregando.
+    """
+    def __init__(self, dtype, values=()):
+        values = np.asarray(values, dtype=dtype)
+        self._data = values.copy()
+        self.size = len(values)
+
+    def __len__(self):
+        return self.size
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        end = self.size + len(values)
+        if end > len(self._data):
+            data = np.empty(max(end, 2 * len(self._data)), dtype=self._data.dtype)
+            data[:self.size] = self._data[:self.size]
+            self._data = data
+        self._data[self.size:end] = values
+        self.size = end
+
+    def view(self) -> np.ndarray:
+        return self._data[:self.size]
+
+
+class SimulationRunner:
+    """
+    Ejecuta la generación de bits, la simulación de carga y las pruebas de aleatoriedad
+    por bloques, independiente de la GUI. Entre bloques puede guardar checkpoints para
+    reanudar una ejecución larga exactamente donde se quedó.
+    """
+    def __init__(self, config_params: dict, chunk_size: int = 4096,
+                 checkpoint_path: str = None, checkpoint_interval: int = 0,
+                 on_metrics=None, should_stop=None, scheduler=None, on_steps=None, progress=None,
+                 sink=None, test_cache=None, profiler=None, pipeline=None):
+        """
+        Args:
+            config_params (dict): Parámetros con las mismas claves que construye ConfigTab.
+            chunk_size (int): Número de bits generados y simulados por bloque.
+            checkpoint_path (str): Archivo donde guardar los checkpoints (opcional).
+            checkpoint_interval (int): Pasos entre checkpoints; 0 desactiva los periódicos.
+            on_metrics (callable): Se llama con las métricas de cada paso simulado. Si es
+                None, cada bloque se simula en lote con LoadSimulator.simulate_steps.
+            should_stop (callable): Devuelve True cuando se debe detener la ejecución.
+            scheduler (RealTimeScheduler): Ritmo de reloj de pared para los pasos. Si es
+                None se crea a partir de 'steps_per_second'/'acceleration' en la configuración
+                (sin ellos, la simulación corre lo más rápido posible).
+            on_steps (callable): Alternativa a on_metrics para la simulación en lote: se
+                llama tras cada lote con un arreglo (5, k) cuyas filas siguen STEP_COLUMNS.
+            progress (ProgressReporter): Informa la fase "Generación y simulación". Cancelar
+                su token detiene la ejecución igual que should_stop (con checkpoint final).
+            sink (StreamingExportSink): Recibe el historial y los bits de cada bloque, con
+                sync en cada checkpoint; run() lo cierra al terminar. Si es None y la
+                configuración trae 'stream_dir', se crea uno en esa carpeta.
+            test_cache (ResultCache): Caché de resultados de las pruebas, por configuración
+                del generador. Si es None y la configuración trae 'test_cache_dir', se abre
+                ahí. Con un acierto (y sin checkpoints) no se acumulan los conteos de las
+                pruebas; al terminar, los resultados se guardan para la próxima vez.
+            profiler (Profiler): Mide las fases (generación, simulación, pruebas,
+                exportación, checkpoints). Si es None se crea uno con 'profile' en la
+                configuración ('profile_memory' agrega tracemalloc); el perfil se devuelve
+                en el resultado como 'profile'.
+            pipeline (str): 'thread' o 'process' para ejecutar la generación, la simulación
+                y las pruebas como etapas concurrentes (Pipeline) unidas por colas acotadas.
+                Si es None se toma 'pipeline' de la configuración. Solo se usa sin on_metrics,
+                sin ritmo de reloj y sin checkpoints periódicos; si no, se ejecuta bloque a
+                bloque. Al detenerse, los bloques ya generados terminan de simularse.
+
+        Con 'keep_history': False en la configuración, el historial, los bits y los valores x
+        no se conservan en memoria entre bloques (solo llegan al sink); el resultado y los
+        checkpoints los traen vacíos, y al reanudar la verificación de periodo empieza de cero.
+
+        Con 'history_dir' en la configuración, el historial, los bits y los valores x se
+        escriben en archivos np.memmap preasignados en esa carpeta (MemmapHistory) en lugar
+        de listas en memoria: el resultado los trae como vistas de solo lectura, igual de
+        completos que en memoria. Los checkpoints no los copian (el historial ya está en
+        disco y se retoma desde él), por lo que al reanudar la verificación de periodo
+        también empieza de cero.
+        """
+        if chunk_size <= 0:
+            raise ValueError("El tamaño de bloque debe ser un entero positivo.")
+        self.config_params = config_params
+        self.chunk_size = chunk_size
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.on_metrics = on_metrics
+        self.on_steps = on_steps
+        self.progress = progress
+        self.sink = sink
+        if test_cache is None and config_params.get('test_cache_dir'):
+            from src.utils.result_cache import ResultCache
+            test_cache = ResultCache(config_params['test_cache_dir'])
+        self.test_cache = test_cache
+        if profiler is None:
+            profiler = (Profiler(trace_memory=config_params.get('profile_memory', False))
+                        if config_params.get('profile') else NULL_PROFILER)
+        self.profiler = profiler
+        self.pipeline = pipeline if pipeline is not None else config_params.get('pipeline')
+        self.pipeline_stats = None
+        self.keep_history = config_params.get('keep_history', True)
+        self.history_dir = config_params.get('history_dir')
+        self.bit_store = None
+        self.should_stop = should_stop if should_stop is not None else (lambda: False)
+        self.scheduler = scheduler if scheduler is not None else RealTimeScheduler.from_config(config_params)
+
+        self.chaotic_generator = ChaoticBitGenerator()
+        self.load_simulator = LoadSimulator(
+            num_users=config_params['num_users'],
+            latency_sensitivity=config_params['latency_sensitivity'],
+            cpu_sensitivity=config_params['cpu_sensitivity'],
+            memory_sensitivity=config_params['memory_sensitivity'],
+            recovery_rate=config_params['recovery_rate'],
+            seed=config_params.get('seed')
+        )
+        self.accumulator = RandomnessAccumulator(d=1, m=4)
+        self._accumulate = True
+
+        self.steps_done = 0
+        self.x = config_params['x0']
+        self.y = config_params['y0']
+        self.period_ok = True
+        self.generation_finished = False
+        self._seen = set()
+        self._bits = _GrowingArray(np.int64)
+        self._x_values = _GrowingArray(np.float64)
+        self._y_values = _GrowingArray(np.float64)
+        # Copia del historial en memoria hasta el último checkpoint (solo se le agregan las filas nuevas)
+        self._history_copy = {key: _GrowingArray(dtype) for key, dtype in HISTORY_DTYPES.items()}
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint_path: str, **kwargs):
+        """Crea un runner que continúa la ejecución guardada en checkpoint_path."""
+        state = load_checkpoint(checkpoint_path)
+        kwargs.setdefault('checkpoint_path', checkpoint_path)
+        runner = cls(state['config_params'], **kwargs)
+        runner.set_checkpoint_state(state)
+        return runner
+
+    def get_checkpoint_state(self) -> dict:
+        """
+        Estado completo de la ejecución en el paso actual. Los bits, los valores x, y y el
+        historial son vistas de arreglos de solo agregado: cada checkpoint copia solo las
+        filas nuevas desde el anterior, no toda la ejecución.
+        """
+        return {
+            'config_params': self.config_params,
+            'steps_done': self.steps_done,
+            'x': self.x,
+            'y': self.y,
+            'period_ok': self.period_ok,
+            'generation_finished': self.generation_finished,
+            'bits': self._bits.view(),
+            'x_values': self._x_values.view(),
+            'y_values': self._y_values.view(),
+            'simulator': self._simulator_state(),
+            'accumulator': self.accumulator.get_state()
+        }
+
+    def set_checkpoint_state(self, state: dict):
+        self.steps_done = state['steps_done']
+        self.x = state['x']
+        self.y = state['y']
+        self.period_ok = state['period_ok']
+        self.generation_finished = state['generation_finished']
+        self._bits = _GrowingArray(np.int64, state['bits'])
+        self._x_values = _GrowingArray(np.float64, state['x_values'])
+        self._y_values = _GrowingArray(np.float64, state['y_values'])
+        # Reconstruir los estados visitados para que la verificación de periodo continúe igual
+        self._seen = {(round(a, 10), round(b, 10))
+                      for a, b in zip(self._x_values.view().tolist(), self._y_values.view().tolist())}
+        self.load_simulator.set_state(state['simulator'])
+        self._history_copy = {key: _GrowingArray(dtype, state['simulator']['history'].get(key, ()))
+                              for key, dtype in HISTORY_DTYPES.items()}
+        self.accumulator.set_state(state['accumulator'])
+
+    def _simulator_state(self) -> dict:
+        """Estado del simulador; de su historial en memoria se copian solo las filas nuevas."""
+        if not self.keep_history or self.bit_store is not None:
+            # Historial vacío (se descarta en cada bloque) o en disco: get_state no lo copia
+            return self.load_simulator.get_state()
+        state = self.load_simulator.get_state(include_history=False)
+        history = self.load_simulator.history
+        state['history'] = {}
+        for key, column in self._history_copy.items():
+            column.extend(history[key][len(column):])
+            state['history'][key] = column.view()
+        return state
+
+    def run(self) -> dict:
+        """
+        Ejecuta (o continúa) la simulación hasta completar num_bits pasos o hasta que
+        should_stop devuelva True. Al detenerse se guarda un checkpoint final.
+
+        Returns:
+            dict: bits, x_values, period_ok, simulation_history, test_results, stopped y,
+            con ritmo de reloj, 'pacing' (estadísticas del planificador); por etapas
+            concurrentes, 'pipeline' (estadísticas de cada etapa).
+        """
+        writer = CheckpointWriter(self.checkpoint_path) if self.checkpoint_path else None
+        if self.sink is None and self.config_params.get('stream_dir'):
+            # Al reanudar se descarta lo escrito después del checkpoint
+            self.sink = StreamingExportSink(self.config_params['stream_dir'], self.config_params,
+                                            start_rows=self.steps_done)
+        if self.history_dir:
+            self._open_history_store()
+        # Los conteos acumulados van en los checkpoints: solo se omiten sin ellos y desde el inicio
+        cached_tests = self._cached_test_results() if writer is None and self.steps_done == 0 else None
+        # Sin bits guardados (solo flujo continuo o nada) no habría con qué recalcular las
+        # pruebas si la ejecución se detiene antes de terminar: se acumula igual
+        self._accumulate = cached_tests is None or not (self.keep_history or self.history_dir)
+        num_bits = self.config_params['num_bits']
+        if self.progress is not None:
+            self.progress.start_phase("Generación y simulación", num_bits, done=self.steps_done)
+        try:
+            if self._use_pipeline(writer):
+                stopped = self._run_pipeline(num_bits)
+            else:
+                stopped = self._run_blocks(writer, num_bits)
+            if self.steps_done >= num_bits:
+                self.generation_finished = True
+            if writer:
+                self._submit_checkpoint(writer)
+        finally:
+            try:
+                if writer:
+                    with self.profiler.span('checkpoint'):
+                        writer.close()
+            finally:
+                # Lo ya simulado queda en disco también si la ejecución falla
+                if self.sink is not None:
+                    with self.profiler.span('exportación continua'):
+                        self.sink.close()
+                if self.bit_store is not None:
+                    self.load_simulator.history.close()
+                    self.bit_store.close()
+        if self.progress is not None and not stopped:
+            self.progress.finish_phase()
+
+        with self.profiler.span('pruebas'):
+            if cached_tests is not None and not stopped:
+                test_results = cached_tests
+            else:
+                if not self._accumulate and self.bit_store is not None:
+                    # Detenida antes de terminar: los resultados guardados no valen para la parte simulada
+                    for bits in self.bit_store['bits'].iter_chunks():
+                        self.accumulator.update(bits.astype(np.int64))
+                elif not self._accumulate and self.keep_history:
+                    self.accumulator.update(self._bits.view())
+                test_results = self.accumulator.results()
+                if self.test_cache is not None and not stopped:
+                    self._store_test_results(test_results)
+        test_results['period_ok'] = self.period_ok
+        bits, x_values = self._stored_bits()
+        result = {
+            'bits': bits,
+            'x_values': x_values,
+            'period_ok': self.period_ok,
+            'simulation_history': self.load_simulator.get_simulation_history(),
+            'test_results': test_results,
+            'stopped': stopped
+        }
+        if self.scheduler is not None:
+            result['pacing'] = self.scheduler.stats()
+        if self.bit_store is not None:
+            result['history_dir'] = self.history_dir
+        if self.sink is not None:
+            result['stream_dir'] = self.sink.directory
+        if self.pipeline_stats is not None:
+            result['pipeline'] = self.pipeline_stats
+        if self.profiler.enabled:
+            result['profile'] = self.profiler.report()
+        return result
+
+    def _use_pipeline(self, writer) -> bool:
+        # Los checkpoints periódicos necesitan el estado de todas las fases en el mismo bloque
+        return (bool(self.pipeline) and self.on_metrics is None and self.scheduler is None
+                and not (writer and self.checkpoint_interval))
+
+    def _run_pipeline(self, num_bits: int) -> bool:
+        """
+        Genera, simula y acumula como etapas concurrentes; este hilo almacena cada bloque
+        (sink, historial, progreso) a medida que sale de la última etapa. Devuelve True si
+        se detuvo antes de terminar.
+        """
+        from src.core.pipeline import Pipeline, GenerationSource, SimulationStage, AccumulatorStage, stage_profile
+        source = GenerationSource(self.config_params['alpha'], self.x, self.y, num_bits - self.steps_done,
+                                  self.chunk_size, self._seen)
+        stages = [SimulationStage(self.load_simulator, self.keep_history or self.bit_store is not None)]
+        if self._accumulate:
+            stages.append(AccumulatorStage(self.accumulator))
+
+        def store(chunk):
+            if self.on_steps is not None:
+                with self.profiler.span('envío de métricas'):
+                    self.on_steps(chunk['steps'])
+            if not chunk['period_ok']:
+                self.period_ok = False
+                self.generation_finished = True
+            self._store_chunk(chunk['bits'], chunk['x_values'], chunk['y_values'], steps=chunk['steps'])
+            if self.progress is not None:
+                self.progress.report(self.steps_done)
+
+        pipeline = Pipeline(source, stages, mode=self.pipeline)
+        with self.profiler.span('etapas concurrentes'):
+            results = pipeline.run(store, should_stop=self._stop_requested)
+        # En modo 'process' las etapas devuelven copias del simulador y del acumulador
+        self.load_simulator = results[1]
+        if self._accumulate:
+            self.accumulator = results[2]
+        self.pipeline_stats = pipeline.stats
+        self.profiler.merge(stage_profile(pipeline.stats), prefix='etapas concurrentes')
+        return pipeline.stopped and not self.generation_finished and self.steps_done < num_bits
+
+    def _run_blocks(self, writer, num_bits: int) -> bool:
+        """Genera, simula y acumula bloque a bloque en este hilo; devuelve True si se detuvo."""
+        last_checkpoint = self.steps_done
+        stopped = False
+        while not self.generation_finished and self.steps_done < num_bits:
+            if self._stop_requested():
+                stopped = True
+                break
+            n = min(self.chunk_size, num_bits - self.steps_done)
+            with self.profiler.span('generación'):
+                generated = self._generate(n)
+            if generated is None:
+                stopped = True
+                break
+            bits, x_values, y_values, chunk_period_ok = generated
+
+            simulated = 0
+            while simulated < len(bits):
+                if self._stop_requested():
+                    stopped = True
+                    break
+                if self.scheduler is not None:
+                    # Con ritmo de reloj: esperar el plazo y ejecutar los pasos vencidos
+                    batch = self.scheduler.wait_next(limit=len(bits) - simulated)
+                else:
+                    # Lotes acotados para atender una detención en pocos milisegundos
+                    batch = min(len(bits) - simulated, PROGRESS_BLOCK_BITS * 4)
+                end = simulated + batch
+                if self.on_metrics is None:
+                    # Sin observadores por paso se simula el lote completo de una vez
+                    with self.profiler.span('simulación'):
+                        self.load_simulator.simulate_steps(bits[simulated:end])
+                    if self.on_steps is not None:
+                        with self.profiler.span('envío de métricas'):
+                            self.on_steps(self._last_steps(end - simulated))
+                    simulated = end
+                    if self.progress is not None:
+                        self.progress.report(self.steps_done + simulated)
+                else:
+                    # Simular paso a paso; si se pide detener, se descarta el resto del bloque
+                    with self.profiler.span('simulación paso a paso'):
+                        for bit in bits[simulated:end]:
+                            if self._stop_requested():
+                                stopped = True
+                                break
+                            current_metrics = self.load_simulator.simulate_step(bit)
+                            self.on_metrics(current_metrics)
+                            simulated += 1
+                    if stopped:
+                        break
+
+            complete = simulated == len(bits)
+            if not complete:
+                bits = bits[:simulated]
+                x_values = x_values[:simulated]
+                y_values = y_values[:simulated]
+            elif not chunk_period_ok:
+                self.period_ok = False
+                self.generation_finished = True
+
+            self._store_chunk(bits, x_values, y_values)
+            if stopped:
+                break
+            if writer and self.checkpoint_interval and self.steps_done - last_checkpoint >= self.checkpoint_interval:
+                self._submit_checkpoint(writer)
+                last_checkpoint = self.steps_done
+
+        return stopped
+
+    def _submit_checkpoint(self, writer):
+        """
+        Envía el estado actual al escritor de checkpoints. Al reanudar, el checkpoint da por
+        escritas sus filas del flujo continuo y de los archivos np.memmap, así que estas
+        deben llegar a disco antes que él: los np.memmap se sincronizan aquí (msync) y el
+        escritor espera el fsync del flujo antes de guardar el checkpoint.
+        """
+        with self.profiler.span('checkpoint'):
+            ready = []
+            if self.bit_store is not None:
+                self.load_simulator.history.flush()
+                self.bit_store.flush()
+            if self.sink is not None:
+                sink, synced = self.sink, self.sink.sync()
+                ready.append(lambda: sink.wait_synced(synced))
+            writer.submit(self.get_checkpoint_state(), ready=ready)
+
+    def _cached_test_results(self):
+        """Resultados de las pruebas guardados para esta configuración del generador, o None."""
+        if self.test_cache is None:
+            return None
+        from src.utils.result_cache import config_key
+        key = config_key(self.config_params)
+        results = {}
+        for result_key, name in TEST_RESULT_NAMES.items():
+            results[result_key] = self.test_cache.get(key, name, RandomnessTests.TEST_VERSIONS[name])
+            if results[result_key] is None:
+                return None
+        return results
+
+    def _store_test_results(self, test_results: dict):
+        """Guarda los resultados por configuración y, si se conservan los bits, por contenido."""
+        from src.utils.result_cache import config_key, sequence_digest
+        keys = [config_key(self.config_params)]
+        if self.keep_history or self.bit_store is not None:
+            keys.append(sequence_digest(self._stored_bits()[0]))
+        for key in keys:
+            for result_key, name in TEST_RESULT_NAMES.items():
+                self.test_cache.put(key, name, RandomnessTests.TEST_VERSIONS[name], test_results[result_key])
+
+    def _stop_requested(self) -> bool:
+        return self.should_stop() or (self.progress is not None and self.progress.cancelled)
+
+    def _generate(self, n: int):
+        """
+        Genera el siguiente bloque de n bits; entre tramos de PROGRESS_BLOCK_BITS comprueba
+        si se pidió detener (el bloque a medias se descarta y devuelve None).
+        """
+        return self.chaotic_generator.generate_cccbg_block(
+            self.config_params['alpha'], self.x, self.y, n, self._seen, should_stop=self._stop_requested)
+
+    def _last_steps(self, count: int) -> np.ndarray:
+        history = self.load_simulator.history
+        return np.array([history[key][-count:] for key in STEP_COLUMNS], dtype=np.float64)
+
+    def _store_chunk(self, bits, x_values, y_values, steps=None):
+        """
+        Almacena un bloque ya simulado. Con steps (filas de STEP_COLUMNS que trae un bloque
+        del Pipeline) el historial y los conteos de las pruebas ya los maneja su etapa.
+        """
+        if len(x_values) == 0:
+            return
+        # Tras una repetición de periodo los valores x/y incluyen el estado repetido, que no
+        # produce bit: en disco se guarda una fila por paso
+        step_x_values = x_values[:len(bits)]
+        if self.sink is not None:
+            # Sin steps, los pasos del bloque son los últimos del historial
+            with self.profiler.span('exportación continua'):
+                self.sink.append(self._last_steps(len(bits)) if steps is None else steps, bits, step_x_values)
+        if self.bit_store is not None:
+            # El historial ya quedó en sus columnas np.memmap al simular
+            self.bit_store.append_rows({'bits': bits, 'x_values': step_x_values})
+        elif self.keep_history:
+            self._bits.extend(bits)
+            self._x_values.extend(x_values)
+            self._y_values.extend(y_values)
+        elif steps is None:
+            self.load_simulator.clear_history()
+        if self._accumulate and steps is None:
+            with self.profiler.span('pruebas'):
+                self.accumulator.update(bits)
+        self.profiler.count('bloques')
+        self.profiler.count('pasos', len(bits))
+        self.steps_done += len(bits)
+        # El estado del generador avanza hasta el último par almacenado
+        self.x = float(x_values[-1])
+        self.y = float(y_values[-1])
+
+    def _open_history_store(self):
+        """
+        Pasa el historial del simulador y los bits a archivos np.memmap en history_dir,
+        preasignados para num_bits pasos. Al reanudar se conservan los steps_done pasos del
+        checkpoint y se descarta lo escrito después.
+        """
+        capacity = self.config_params['num_bits']
+        # Mismo orden de columnas que el historial en memoria (y que sus exportaciones)
+        dtypes = {key: HISTORY_DTYPES[key] for key in self.load_simulator.history}
+        self.load_simulator.history = MemmapHistory(self.history_dir, dtypes, capacity=capacity,
+                                                    start_rows=self.steps_done)
+        self.bit_store = MemmapHistory(self.history_dir, RUN_BITS_DTYPES, capacity=capacity,
+                                       name=BITS_NAME, start_rows=self.steps_done)
+
+    def _stored_bits(self):
+        """Bits y valores x almacenados: vistas de los archivos con history_dir, si no arreglos."""
+        if self.bit_store is not None:
+            return np.asarray(self.bit_store['bits']), np.asarray(self.bit_store['x_values'])
+        return self._bits.view(), self._x_values.view()
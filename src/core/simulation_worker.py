@@ -0,0 +1,193 @@
+import multiprocessing as mp
+import queue
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.core.checkpoint import HISTORY_KEYS
+from src.core.memmap_history import open_memmap_run
+from src.core.progress import CancellationToken, ProgressReporter
+from src.core.simulation_runner import SimulationRunner
+
+
+def export_shared_arrays(arrays: dict):
+    """
+    Copia cada arreglo a un segmento de memoria compartida.
+
+    Returns:
+        tuple: (descriptores serializables {nombre: (segmento, dtype, forma)}, segmentos).
+        El proceso que exporta debe cerrar los segmentos (sin unlink) tras enviar los
+        descriptores; import_shared_arrays los libera del sistema.
+    """
+    descriptors = {}
+    segments = []
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        segment = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+        descriptors[name] = (segment.name, array.dtype.str, array.shape)
+        segments.append(segment)
+    return descriptors, segments
+
+
+def import_shared_arrays(descriptors: dict) -> dict:
+    """Copia los arreglos descritos fuera de la memoria compartida y libera los segmentos."""
+    arrays = {}
+    for name, (segment_name, dtype, shape) in descriptors.items():
+        segment = shared_memory.SharedMemory(name=segment_name)
+        try:
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=segment.buf).copy()
+        finally:
+            segment.close()
+            segment.unlink()
+    return arrays
+
+
+def _worker_main(config_params, checkpoint_path, chunk_size, messages, stop_event, stream_metrics):
+    """
+    Punto de entrada del proceso de simulación. Envía por `messages`:
+      ('metrics', arreglo (5, k))        lotes de métricas (filas según STEP_COLUMNS)
+      ('progress', dict)                 avance (ver ProgressReporter), unas 10 veces por segundo
+      ('result', dict)                   resultado final; los arreglos van en memoria compartida
+                                         (o quedan en 'history_dir', si la ejecución lo usa)
+      ('error', mensaje, traceback)      si la ejecución falla
+    """
+    try:
+        progress = ProgressReporter(callback=lambda update: messages.put(('progress', update)),
+                                    token=CancellationToken(stop_event))
+        runner_options = {'chunk_size': chunk_size, 'progress': progress}
+        if checkpoint_path is not None:
+            runner = SimulationRunner.from_checkpoint(checkpoint_path, **runner_options)
+            config_params = runner.config_params
+        else:
+            runner = SimulationRunner(
+                config_params,
+                checkpoint_path=config_params.get('checkpoint_path') or None,
+                checkpoint_interval=config_params.get('checkpoint_interval', 0),
+                **runner_options
+            )
+        if stream_metrics:
+            runner.on_steps = lambda columns: messages.put(('metrics', columns))
+
+        result = runner.run()
+        history = result['simulation_history']
+        if 'history_dir' in result:
+            # Historial en disco: basta con la carpeta, la GUI abre los mismos archivos
+            descriptors, segments = None, []
+        else:
+            with runner.profiler.span('memoria compartida'):
+                arrays = {'bits': result['bits'], 'x_values': result['x_values']}
+                for key in HISTORY_KEYS:
+                    arrays['history_' + key] = np.asarray(history[key], dtype=np.int64 if key == 'time_steps' else np.float64)
+                descriptors, segments = export_shared_arrays(arrays)
+        summary = {key: value for key, value in result.items() if key not in ('bits', 'x_values', 'simulation_history')}
+        if runner.profiler.enabled:
+            summary['profile'] = runner.profiler.report()
+        summary['config_params'] = config_params
+        summary['checkpoint_path'] = runner.checkpoint_path
+        summary['arrays'] = descriptors
+        messages.put(('result', summary))
+        for segment in segments:
+            segment.close()
+    except Exception as e:
+        messages.put(('error', str(e), traceback.format_exc()))
+
+
+class SimulationWorker:
+    """
+    Ejecuta SimulationRunner en un proceso aparte para que la generación, la simulación y
+    las pruebas no compitan por el GIL con la interfaz.
+
+    Los arreglos grandes del resultado (bits, valores x, historial) vuelven por memoria
+    compartida; por la cola solo viajan mensajes pequeños, el progreso y los lotes de
+    métricas. La detención se pide con un multiprocessing.Event que el runner consulta (como
+    CancellationToken) cada pocos milisegundos, también durante la generación.
+    """
+    def __init__(self, config_params: dict = None, checkpoint_path: str = None,
+                 chunk_size: int = 4096, stream_metrics: bool = True, start_method: str = 'spawn'):
+        """
+        Args:
+            config_params (dict): Parámetros de una ejecución nueva.
+            checkpoint_path (str): Alternativa a config_params: checkpoint a reanudar.
+            chunk_size (int): Pasos por bloque del runner (y por lote de métricas).
+            stream_metrics (bool): Enviar las métricas de cada lote para la vista en vivo.
+            start_method (str): 'spawn' por defecto, seguro con la GUI de Tk abierta.
+        """
+        if (config_params is None) == (checkpoint_path is None):
+            raise ValueError("Indique config_params o checkpoint_path.")
+        context = mp.get_context(start_method)
+        self.messages = context.Queue()
+        self.stop_event = context.Event()
+        # Un proceso daemon no puede crear procesos: con etapas concurrentes en procesos, el
+        # proceso de simulación no es daemon (la GUI lo termina igual al cerrarse)
+        stage_processes = config_params is not None and config_params.get('pipeline') == 'process'
+        self.process = context.Process(
+            target=_worker_main,
+            args=(config_params, checkpoint_path, chunk_size, self.messages, self.stop_event, stream_metrics),
+            daemon=not stage_processes
+        )
+
+    def start(self):
+        self.process.start()
+
+    def stop(self):
+        """Pide al proceso que se detenga (lo hace en pocos milisegundos, con checkpoint final)."""
+        self.stop_event.set()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def terminate(self, timeout: float = 2.0):
+        """Detiene el proceso: primero lo pide y, si no termina a tiempo, lo fuerza."""
+        self.stop()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+
+    def get_message(self, timeout: float = None):
+        """
+        Devuelve el siguiente mensaje del proceso (ver _worker_main), o None si no llega
+        ninguno en timeout segundos. En los mensajes 'result' los arreglos ya se han
+        recuperado de la memoria compartida: bits, x_values y simulation_history (arreglos
+        NumPy, una sola copia). Con 'history_dir' se abren en cambio sus archivos
+        (open_memmap_run), sin copiarlos a memoria.
+        """
+        try:
+            message = self.messages.get(timeout=timeout)
+        except queue.Empty:
+            if not self.process.is_alive() and self.messages.empty():
+                return ('error', "El proceso de simulación terminó sin devolver resultados.", '')
+            return None
+        if message[0] == 'result':
+            summary = dict(message[1])
+            descriptors = summary.pop('arrays')
+            if descriptors is None:
+                summary.update(open_memmap_run(summary['history_dir']))
+            else:
+                arrays = import_shared_arrays(descriptors)
+                summary['bits'] = arrays['bits']
+                summary['x_values'] = arrays['x_values']
+                summary['simulation_history'] = {key: arrays['history_' + key] for key in HISTORY_KEYS}
+            self.process.join()
+            return ('result', summary)
+        return message
+
+    def run(self, on_message=None) -> dict:
+        """
+        Inicia el proceso y espera su resultado; on_message recibe los mensajes de métricas
+        y progreso. Lanza RuntimeError si la ejecución falla.
+        """
+        self.start()
+        while True:
+            message = self.get_message(timeout=0.5)
+            if message is None:
+                continue
+            if message[0] == 'result':
+                return message[1]
+            if message[0] == 'error':
+                self.process.join()
+                raise RuntimeError(message[1])
+            if on_message is not None:
+                on_message(message)
@@ -0,0 +1,342 @@
+import io
+import mmap
+import numpy as np
+
+# Columnas esperadas en una traza de producción
+TRACE_COLUMNS = ['timestamp', 'requests', 'latency_ms', 'cpu', 'memory']
+
+# Correspondencia entre columnas de la traza y claves de LoadSimulator.history
+HISTORY_KEY_FOR_COLUMN = {
+    'requests': 'simulated_requests',
+    'latency_ms': 'latency',
+    'cpu': 'cpu',
+    'memory': 'memory'
+}
+
+
+class TraceReader:
+    """
+    Lee trazas de producción por bloques sin cargarlas completas en memoria.
+
+    Formatos:
+      - CSV con encabezado (timestamp, requests, latency_ms y opcionalmente cpu, memory):
+        el archivo se mapea en memoria y se analiza por bloques cortados en fin de línea.
+      - .npy con una matriz 2-D (filas x columnas): se abre con mmap_mode='r'.
+      - Binario crudo float64 (cualquier otra extensión): requiere indicar las columnas.
+    """
+    def __init__(self, path: str, columns: list = None, chunk_rows: int = 1_000_000, delimiter: str = ','):
+        """
+        Args:
+            path (str): Archivo de la traza.
+            columns (list): Nombres de columnas (obligatorio para binario crudo; en CSV se
+                toman del encabezado si no se indican).
+            chunk_rows (int): Filas aproximadas por bloque.
+            delimiter (str): Separador del CSV.
+        """
+        if chunk_rows <= 0:
+            raise ValueError("El tamaño de bloque debe ser un entero positivo.")
+        self.path = path
+        self.columns = columns
+        self.chunk_rows = chunk_rows
+        self.delimiter = delimiter
+        lower = path.lower()
+        self.format = 'csv' if lower.endswith('.csv') else ('npy' if lower.endswith('.npy') else 'raw')
+        if self.format == 'raw' and not columns:
+            raise ValueError("Las trazas binarias crudas requieren la lista de columnas.")
+
+    def iter_chunks(self):
+        """Genera diccionarios {columna: np.ndarray} con bloques consecutivos de filas."""
+        if self.format == 'csv':
+            yield from self._iter_csv()
+        else:
+            if self.format == 'npy':
+                data = np.load(self.path, mmap_mode='r')
+            else:
+                data = np.memmap(self.path, dtype=np.float64, mode='r').reshape(-1, len(self.columns))
+            columns = self.columns or TRACE_COLUMNS[:data.shape[1]]
+            for start in range(0, data.shape[0], self.chunk_rows):
+                block = np.asarray(data[start:start + self.chunk_rows], dtype=np.float64)
+                yield {name: block[:, j] for j, name in enumerate(columns)}
+
+    def _iter_csv(self):
+        with open(self.path, 'rb') as f:
+            if f.seek(0, 2) == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                header_end = mm.find(b'\n')
+                if header_end < 0:
+                    return
+                header = mm[:header_end].decode('utf-8').strip()
+                columns = self.columns or [c.strip() for c in header.split(self.delimiter)]
+                # Tamaño de bloque en bytes estimado a partir de la primera línea de datos
+                first_line_end = mm.find(b'\n', header_end + 1)
+                line_bytes = max(1, (first_line_end if first_line_end > 0 else len(mm)) - header_end)
+                chunk_bytes = max(line_bytes, line_bytes * self.chunk_rows)
+                pos = header_end + 1
+                size = len(mm)
+                while pos < size:
+                    end = min(size, pos + chunk_bytes)
+                    if end < size:
+                        cut = mm.rfind(b'\n', pos, end)
+                        end = cut + 1 if cut >= pos else (mm.find(b'\n', end) + 1 or size)
+                    block = np.loadtxt(io.BytesIO(mm[pos:end]), delimiter=self.delimiter, ndmin=2)
+                    pos = end
+                    if block.size:
+                        yield {name: block[:, j] for j, name in enumerate(columns)}
+
+
+def align_to_steps(chunks, step_seconds: float, t0: float = None, request_mode: str = 'rate'):
+    """
+    Agrupa filas de la traza en pasos de simulación de step_seconds, por bloques.
+    Supone marcas de tiempo no decrecientes; el paso incompleto al final de cada bloque
+    se acumula con el siguiente. Los pasos sin filas quedan como NaN.
+
+    Args:
+        chunks: Iterable de bloques {columna: arreglo} (p. ej. TraceReader.iter_chunks()).
+        step_seconds (float): Duración de un paso de simulación.
+        t0 (float): Instante del paso 0; por defecto la primera marca de tiempo.
+        request_mode (str): 'rate' si 'requests' es una tasa (req/s) o 'count' si es un
+            conteo por fila.
+
+    Yields:
+        dict: 'time_steps' y las claves de LoadSimulator.history presentes en la traza.
+    """
+    if step_seconds <= 0:
+        raise ValueError("La duración del paso debe ser positiva.")
+    if request_mode not in ('rate', 'count'):
+        raise ValueError("request_mode debe ser 'rate' o 'count'.")
+    pending = None  # (paso, {columna: suma}, conteo de filas) del paso aún incompleto
+    next_step = 0
+
+    def finalize(first, sums, counts, columns):
+        out = {'time_steps': np.arange(first, first + len(counts))}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for name in columns:
+                if name == 'requests' and request_mode == 'count':
+                    values = np.where(counts > 0, sums[name], np.nan)
+                else:
+                    values = sums[name] / counts
+                    if name == 'requests':
+                        values = values * step_seconds
+                out[HISTORY_KEY_FOR_COLUMN[name]] = values
+        return out
+
+    for chunk in chunks:
+        timestamps = chunk['timestamp']
+        if len(timestamps) == 0:
+            continue
+        if t0 is None:
+            t0 = float(timestamps[0])
+        columns = [c for c in HISTORY_KEY_FOR_COLUMN if c in chunk]
+        steps = np.floor((timestamps - t0) / step_seconds).astype(np.int64)
+        if np.any(np.diff(steps) < 0) or steps[0] < next_step:
+            raise ValueError("Las marcas de tiempo de la traza deben estar ordenadas.")
+        first = next_step
+        last = int(steps[-1])
+        width = last - first + 1
+        local = steps - first
+        counts = np.bincount(local, minlength=width).astype(np.float64)
+        sums = {name: np.bincount(local, weights=chunk[name], minlength=width) for name in columns}
+        if pending is not None:
+            idx = pending[0] - first
+            counts[idx] += pending[2]
+            for name in columns:
+                sums[name][idx] += pending[1][name]
+        # El último paso puede continuar en el siguiente bloque
+        pending = (last, {name: sums[name][-1] for name in columns}, counts[-1])
+        if width > 1:
+            yield finalize(first, {n: s[:-1] for n, s in sums.items()}, counts[:-1], columns)
+        next_step = last
+        last_columns = columns
+    if pending is not None:
+        yield finalize(pending[0], {n: np.array([v]) for n, v in pending[1].items()},
+                       np.array([pending[2]]), last_columns)
+
+
+class ErrorMetrics:
+    """Acumula por bloques MAE, RMSE, MAPE, sesgo y correlación entre simulación y traza."""
+    def __init__(self):
+        self.n = 0
+        self.sum_abs = 0.0
+        self.sum_sq = 0.0
+        self.sum_ape = 0.0
+        self.n_ape = 0
+        self.sum_err = 0.0
+        self.sum_p = self.sum_o = self.sum_pp = self.sum_oo = self.sum_po = 0.0
+
+    def update(self, predicted: np.ndarray, observed: np.ndarray):
+        predicted = np.asarray(predicted, dtype=np.float64)
+        observed = np.asarray(observed, dtype=np.float64)
+        ok = ~(np.isnan(predicted) | np.isnan(observed))
+        p, o = predicted[ok], observed[ok]
+        err = p - o
+        nonzero = o != 0
+        self.n += len(p)
+        self.sum_abs += float(np.sum(np.abs(err)))
+        self.sum_sq += float(np.sum(err * err))
+        self.sum_ape += float(np.sum(np.abs(err[nonzero] / o[nonzero])))
+        self.n_ape += int(np.count_nonzero(nonzero))
+        self.sum_err += float(np.sum(err))
+        self.sum_p += float(np.sum(p))
+        self.sum_o += float(np.sum(o))
+        self.sum_pp += float(np.sum(p * p))
+        self.sum_oo += float(np.sum(o * o))
+        self.sum_po += float(np.sum(p * o))
+
+    def result(self) -> dict:
+        n = self.n
+        if n == 0:
+            return {'n': 0, 'mae': np.nan, 'rmse': np.nan, 'mape': np.nan, 'bias': np.nan, 'correlation': np.nan}
+        cov = self.sum_po - self.sum_p * self.sum_o / n
+        var_p = self.sum_pp - self.sum_p ** 2 / n
+        var_o = self.sum_oo - self.sum_o ** 2 / n
+        return {
+            'n': n,
+            'mae': self.sum_abs / n,
+            'rmse': np.sqrt(self.sum_sq / n),
+            'mape': 100.0 * self.sum_ape / self.n_ape if self.n_ape else np.nan,
+            'bias': self.sum_err / n,
+            'correlation': cov / np.sqrt(var_p * var_o) if var_p > 0 and var_o > 0 else np.nan
+        }
+
+
+def compare_to_simulation(aligned_chunks, simulation_history: dict) -> dict:
+    """
+    Compara paso a paso una traza alineada con un historial de LoadSimulator.
+
+    Returns:
+        dict: {clave de métrica: resultado de ErrorMetrics} para cada métrica presente en
+        ambos lados, considerando solo los pasos comunes.
+    """
+    metrics = {}
+    columns = {}
+    num_sim_steps = len(simulation_history['time_steps'])
+    for chunk in aligned_chunks:
+        steps = chunk['time_steps']
+        in_range = steps < num_sim_steps
+        if not np.any(in_range):
+            break
+        steps = steps[in_range]
+        for key, observed in chunk.items():
+            if key == 'time_steps' or key not in simulation_history:
+                continue
+            if key not in columns:
+                columns[key] = np.asarray(simulation_history[key], dtype=np.float64)
+            predicted = columns[key][steps]
+            metrics.setdefault(key, ErrorMetrics()).update(predicted, observed[in_range])
+    return {key: m.result() for key, m in metrics.items()}
+
+
+class CalibrationAccumulator:
+    """
+    Acumula por bloques las estadísticas suficientes para ajustar las sensibilidades y la
+    tasa de recuperación de LoadSimulator a una traza alineada.
+
+    Con u_t = solicitudes_t / num_users y b_t = 1 si u_t > 1.5 (el umbral que separa los
+    rangos de carga de LoadSimulator), el modelo sin saturación es
+        Δm_t = s_m * (b_t * u_t - rr * (1 - b_t) * u_t) = s_m * (p_t - rr * q_t)
+    para cada métrica m. Para rr fijo, el s_m óptimo por mínimos cuadrados es cerrado y
+    solo depende de Σp², Σq², ΣpΔ, ΣqΔ y ΣΔ², por lo que la traza se recorre una vez.
+    Se descartan los pasos en los que la métrica toca sus límites (saturación).
+    """
+    METRIC_BOUNDS = {
+        'latency': ('base_latency_ms', 'max_latency_ms'),
+        'cpu': ('base_cpu_usage_percent', 'max_cpu_usage_percent'),
+        'memory': ('base_memory_usage_percent', 'max_memory_usage_percent')
+    }
+
+    def __init__(self, num_users: int = 100, base_latency_ms: float = 1.0, base_cpu_usage_percent: float = 10.0,
+                 base_memory_usage_percent: float = 20.0, max_latency_ms: float = 1000.0,
+                 max_cpu_usage_percent: float = 98.0, max_memory_usage_percent: float = 95.0):
+        self.num_users = num_users
+        self.bounds = {
+            'base_latency_ms': base_latency_ms, 'max_latency_ms': max_latency_ms,
+            'base_cpu_usage_percent': base_cpu_usage_percent, 'max_cpu_usage_percent': max_cpu_usage_percent,
+            'base_memory_usage_percent': base_memory_usage_percent, 'max_memory_usage_percent': max_memory_usage_percent
+        }
+        # Por métrica: [Σp², Σq², ΣpΔ, ΣqΔ, ΣΔ², n]
+        self.stats = {}
+        self._previous = {}
+
+    def update(self, aligned_chunk: dict):
+        if 'simulated_requests' not in aligned_chunk:
+            raise ValueError("La traza necesita la columna de solicitudes para calibrar.")
+        u = aligned_chunk['simulated_requests'] / self.num_users
+        peak = u > 1.5
+        p = np.where(peak, u, 0.0)
+        q = np.where(peak, 0.0, u)
+        for metric, (base_key, max_key) in self.METRIC_BOUNDS.items():
+            if metric not in aligned_chunk:
+                continue
+            values = aligned_chunk[metric]
+            previous = np.concatenate(([self._previous.get(metric, np.nan)], values[:-1]))
+            self._previous[metric] = values[-1]
+            delta = values - previous
+            base, upper = self.bounds[base_key], self.bounds[max_key]
+            tolerance = 1e-9 * max(1.0, abs(upper))
+            ok = ~(np.isnan(delta) | np.isnan(u) | (values <= base + tolerance) | (values >= upper - tolerance))
+            d, pp, qq = delta[ok], p[ok], q[ok]
+            chunk_stats = np.array([np.dot(pp, pp), np.dot(qq, qq), np.dot(pp, d), np.dot(qq, d), np.dot(d, d), len(d)])
+            self.stats[metric] = self.stats.get(metric, np.zeros(6)) + chunk_stats
+
+    def fit(self, recovery_grid: np.ndarray = None) -> dict:
+        """
+        Ajusta recovery_rate (compartida entre métricas) y una sensibilidad por métrica.
+        recovery_rate se elige en una malla, evaluada de forma vectorizada, y se refina con
+        una segunda malla alrededor del mejor valor.
+
+        Returns:
+            dict: latency_sensitivity, cpu_sensitivity, memory_sensitivity, recovery_rate,
+            y 'fit' con el R² y los pasos usados por métrica.
+        """
+        if not self.stats:
+            raise ValueError("No hay datos suficientes para calibrar.")
+        grid = np.linspace(0.0, 2.0, 2001) if recovery_grid is None else np.asarray(recovery_grid, dtype=np.float64)
+        best = self._best_recovery(grid)
+        step = (grid[-1] - grid[0]) / max(len(grid) - 1, 1)
+        fine = np.linspace(max(0.0, best - step), best + step, 201)
+        best = self._best_recovery(fine)
+
+        result = {'recovery_rate': float(best), 'fit': {}}
+        for metric, sensitivity, sse in self._solve(np.array([best])):
+            s_pp, s_qq, s_pd, s_qd, s_dd, n = self.stats[metric]
+            result[f"{metric}_sensitivity"] = float(sensitivity[0])
+            result['fit'][metric] = {'steps_used': int(n),
+                                     'r2': float(1.0 - sse[0] / s_dd) if s_dd > 0 else np.nan}
+        return result
+
+    def _solve(self, rr: np.ndarray):
+        for metric, (s_pp, s_qq, s_pd, s_qd, s_dd, n) in self.stats.items():
+            s_aa = s_pp + rr * rr * s_qq          # Σa², con a = p - rr·q (p·q = 0)
+            s_ad = s_pd - rr * s_qd               # ΣaΔ
+            with np.errstate(invalid='ignore', divide='ignore'):
+                sensitivity = np.where(s_aa > 0, s_ad / s_aa, np.nan)
+                sse = np.where(s_aa > 0, s_dd - s_ad * s_ad / s_aa, s_dd)
+            yield metric, sensitivity, sse
+
+    def _best_recovery(self, rr: np.ndarray) -> float:
+        # Error relativo total: cada métrica pesa según su varianza propia
+        total = np.zeros(len(rr))
+        for metric, _, sse in self._solve(rr):
+            s_dd = self.stats[metric][4]
+            if s_dd > 0:
+                total += sse / s_dd
+        return float(rr[int(np.nanargmin(total))])
+
+
+def calibrate_from_trace(path: str, step_seconds: float, num_users: int = 100, columns: list = None,
+                         chunk_rows: int = 1_000_000, request_mode: str = 'rate', **bounds) -> dict:
+    """Lee una traza por bloques y ajusta los parámetros de LoadSimulator (ver CalibrationAccumulator)."""
+    reader = TraceReader(path, columns=columns, chunk_rows=chunk_rows)
+    accumulator = CalibrationAccumulator(num_users=num_users, **bounds)
+    for aligned in align_to_steps(reader.iter_chunks(), step_seconds, request_mode=request_mode):
+        accumulator.update(aligned)
+    return accumulator.fit()
+
+
+def replay_trace(path: str, simulation_history: dict, step_seconds: float, columns: list = None,
+                 chunk_rows: int = 1_000_000, request_mode: str = 'rate') -> dict:
+    """Lee una traza por bloques y calcula sus métricas de error frente a una simulación."""
+    reader = TraceReader(path, columns=columns, chunk_rows=chunk_rows)
+    return compare_to_simulation(align_to_steps(reader.iter_chunks(), step_seconds, request_mode=request_mode),
+                                 simulation_history)
@@ -1,13 +1,20 @@
 # src/gui/config_tab.py
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+import threading
 import time
 
+from src.core.cost_model import cached_calibration, load_calibration, plan_run, format_estimate
+
+# Opciones de 'pipeline': bloque a bloque, etapas en hilos o en procesos
+PIPELINE_CHOICES = [("No (bloque a bloque)", None), ("Hilos", 'thread'), ("Procesos", 'process')]
+
 class ConfigTab(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.parent = parent
         self.simulation_callback = None
+        self.resume_callback = None
 
         # Calcular alpha en el rango [0.4900, 0.5000] usando el tiempo actual
         current_time = int(time.time())
@@ -86,11 +93,64 @@ class ConfigTab(ttk.Frame):
         self.recovery_rate_entry.insert(0, "0.05")
         self.recovery_rate_entry.grid(row=4, column=1, padx=5, pady=2, sticky="ew")
 
+        ttk.Label(load_sim_frame, text="Pasos por segundo (0 = sin límite):").grid(row=5, column=0, padx=5, pady=2, sticky="w")
+        self.steps_per_second_entry = ttk.Entry(load_sim_frame)
+        self.steps_per_second_entry.insert(0, "0")
+        self.steps_per_second_entry.grid(row=5, column=1, padx=5, pady=2, sticky="ew")
+
         load_sim_frame.columnconfigure(1, weight=1)
 
-        # Botón para iniciar simulación
-        start_button = ttk.Button(config_frame, text="Iniciar Simulación", command=self._start_simulation)
-        start_button.pack(pady=10)
+        # --- Sección de Checkpoints ---
+        checkpoint_frame = ttk.LabelFrame(config_frame, text="Checkpoints")
+        checkpoint_frame.pack(fill="x", padx=5, pady=5)
+
+        ttk.Label(checkpoint_frame, text="Intervalo de checkpoint (pasos, 0 = desactivado):").grid(row=0, column=0, padx=5, pady=2, sticky="w")
+        self.checkpoint_interval_entry = ttk.Entry(checkpoint_frame)
+        self.checkpoint_interval_entry.insert(0, "0")
+        self.checkpoint_interval_entry.grid(row=0, column=1, padx=5, pady=2, sticky="ew")
+
+        ttk.Label(checkpoint_frame, text="Archivo de checkpoint:").grid(row=1, column=0, padx=5, pady=2, sticky="w")
+        self.checkpoint_path_entry = ttk.Entry(checkpoint_frame)
+        self.checkpoint_path_entry.insert(0, "checkpoint_simulacion.npz")
+        self.checkpoint_path_entry.grid(row=1, column=1, padx=5, pady=2, sticky="ew")
+
+        # Historial y bits escritos en disco durante la simulación (sincronizados en cada checkpoint)
+        ttk.Label(checkpoint_frame, text="Carpeta de exportación continua (vacío = desactivada):").grid(row=2, column=0, padx=5, pady=2, sticky="w")
+        self.stream_dir_entry = ttk.Entry(checkpoint_frame)
+        self.stream_dir_entry.grid(row=2, column=1, padx=5, pady=2, sticky="ew")
+
+        checkpoint_frame.columnconfigure(1, weight=1)
+
+        # --- Sección de Ejecución ---
+        execution_frame = ttk.LabelFrame(config_frame, text="Ejecución")
+        execution_frame.pack(fill="x", padx=5, pady=5)
+        ttk.Label(execution_frame, text="Etapas concurrentes (generación, simulación, pruebas):").grid(row=0, column=0, padx=5, pady=2, sticky="w")
+        self.pipeline_var = tk.StringVar(value=PIPELINE_CHOICES[0][0])
+        ttk.Combobox(execution_frame, textvariable=self.pipeline_var, state="readonly",
+                     values=[label for label, _ in PIPELINE_CHOICES]).grid(row=0, column=1, padx=5, pady=2, sticky="ew")
+        # Registrar la ejecución terminada en el almacén local (copia bits, valores x e historial)
+        self.save_run_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(execution_frame, text="Guardar la ejecución en el almacén local de ejecuciones",
+                        variable=self.save_run_var).grid(row=1, column=0, columnspan=2, padx=5, pady=2, sticky="w")
+        execution_frame.columnconfigure(1, weight=1)
+
+        # --- Sección de Diagnóstico ---
+        profile_frame = ttk.LabelFrame(config_frame, text="Diagnóstico")
+        profile_frame.pack(fill="x", padx=5, pady=5)
+        self.profile_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(profile_frame, text="Perfilar fases (tiempo de pared, CPU y memoria residente)",
+                        variable=self.profile_var).grid(row=0, column=0, padx=5, pady=2, sticky="w")
+        self.profile_memory_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(profile_frame, text="Incluir memoria asignada por fase (tracemalloc, más lento)",
+                        variable=self.profile_memory_var).grid(row=1, column=0, padx=5, pady=2, sticky="w")
+
+        # Botones para iniciar o reanudar simulación
+        self.start_button = ttk.Button(config_frame, text="Iniciar Simulación", command=self._start_simulation)
+        self.start_button.pack(pady=10)
+        resume_button = ttk.Button(config_frame, text="Reanudar desde Checkpoint", command=self._resume_simulation)
+        resume_button.pack(pady=(0, 10))
+        self.status_label = ttk.Label(config_frame, text="")
+        self.status_label.pack(pady=(0, 10))
 
     def _update_param_labels(self, event=None):
         pass
@@ -108,6 +168,14 @@ class ConfigTab(ttk.Frame):
                 'cpu_sensitivity': float(self.cpu_sens_entry.get()),
                 'memory_sensitivity': float(self.mem_sens_entry.get()),
                 'recovery_rate': float(self.recovery_rate_entry.get()),
+                'steps_per_second': float(self.steps_per_second_entry.get()),
+                'checkpoint_interval': int(self.checkpoint_interval_entry.get()),
+                'checkpoint_path': self.checkpoint_path_entry.get().strip(),
+                'stream_dir': self.stream_dir_entry.get().strip(),
+                'profile': self.profile_var.get() or self.profile_memory_var.get(),
+                'profile_memory': self.profile_memory_var.get(),
+                'pipeline': dict(PIPELINE_CHOICES)[self.pipeline_var.get()],
+                'save_run': self.save_run_var.get(),
             }
 
             # Validaciones para Skew Tent Map
@@ -130,14 +198,80 @@ class ConfigTab(ttk.Frame):
             if config_params['num_users'] <= 0:
                 messagebox.showerror("Error de Validación", "El número de usuarios simulados debe ser un entero positivo.")
                 return
+            if config_params['steps_per_second'] < 0:
+                messagebox.showerror("Error de Validación", "Los pasos por segundo no pueden ser negativos.")
+                return
+            if config_params['checkpoint_interval'] < 0:
+                messagebox.showerror("Error de Validación", "El intervalo de checkpoint no puede ser negativo.")
+                return
+            if config_params['checkpoint_interval'] > 0 and not config_params['checkpoint_path']:
+                messagebox.showerror("Error de Validación", "Indique un archivo de checkpoint.")
+                return
 
-            if self.simulation_callback:
-                self.simulation_callback(config_params)
+            # Estimar tiempo y memoria antes de lanzar; la primera vez en este equipo se calibra
+            # el modelo con una ejecución corta (unos segundos), fuera del hilo de la GUI
+            calibration = cached_calibration()
+            if calibration is None:
+                self._calibrate_and_start(config_params)
+                return
+            self._plan_and_start(config_params, calibration)
 
         except ValueError as e:
             messagebox.showerror("Error de Entrada", f"Por favor, revise los valores ingresados. Error: {e}")
         except Exception as e:
             messagebox.showerror("Error", f"Ocurrió un error inesperado: {e}")
 
+    def _calibrate_and_start(self, config_params):
+        """Calibra el modelo de costos en un hilo de fondo y luego continúa con el inicio."""
+        self.start_button.config(state="disabled")
+        self.status_label.config(text="Calibrando el modelo de costos en este equipo (unos segundos)...")
+
+        def calibrate():
+            try:
+                calibration, error = load_calibration(), None
+            except Exception as e:
+                calibration, error = None, e
+            self.after(0, self._on_calibrated, config_params, calibration, error)
+
+        threading.Thread(target=calibrate, daemon=True).start()
+
+    def _on_calibrated(self, config_params, calibration, error):
+        self.start_button.config(state="normal")
+        self.status_label.config(text="")
+        if error is not None:
+            messagebox.showerror("Error", f"No se pudo calibrar el modelo de costos: {error}")
+            return
+        self._plan_and_start(config_params, calibration)
+
+    def _plan_and_start(self, config_params, calibration):
+        """Estima la ejecución, pide confirmación si el plan cambia algo y la lanza."""
+        try:
+            plan = plan_run(config_params, calibration)
+            summary = format_estimate(plan['estimate'])
+            if not plan['fits']:
+                messagebox.showerror("Ejecución demasiado grande", f"{plan['reason']}\n\n{summary}")
+                return
+            if plan['changes'] or plan['warnings']:
+                details = "\n".join(plan['changes'] + plan['warnings'])
+                if not messagebox.askyesno("Estimación de la ejecución", f"{details}\n\n{summary}\n\n¿Desea continuar?"):
+                    return
+
+            if self.simulation_callback:
+                self.simulation_callback(plan['config_params'])
+        except Exception as e:
+            messagebox.showerror("Error", f"Ocurrió un error inesperado: {e}")
+
+    def _resume_simulation(self):
+        """Pide un archivo de checkpoint y llama al callback de reanudación."""
+        checkpoint_path = filedialog.askopenfilename(
+            title="Reanudar Simulación desde Checkpoint",
+            filetypes=[("Checkpoints", "*.npz")]
+        )
+        if checkpoint_path and self.resume_callback:
+            self.resume_callback(checkpoint_path)
+
     def set_simulation_callback(self, callback):
-        self.simulation_callback = callback
\ No newline at end of file
+        self.simulation_callback = callback
+
+    def set_resume_callback(self, callback):
+        self.resume_callback = callback
\ No newline at end of file
@@ -6,14 +6,16 @@ import numpy as np
 import os
 
 # Importar las clases del core
-from src.core.chaotic_generator import ChaoticBitGenerator
-from src.core.randomness_tests import RandomnessTests
-from src.core.simulation_engine import LoadSimulator
-
-# Importar las pestañas de la GUI
+from src.core.simulation_worker import SimulationWorker
+from src.core.simulation_runner import STEP_COLUMNS
+from src.core.profiling import Profiler, NULL_PROFILER
+from src.utils.metrics_buffer import ColumnMetricsBuffer
+from src.utils.run_store import RunStore, DEFAULT_RUN_STORE_DIR, MAX_GUI_SAVE_BYTES, estimate_run_bytes
+from src.utils.result_cache import DEFAULT_RESULT_CACHE_DIR
+
+# Importar las pestañas de la GUI (SimulationTab y ResultsTab, que cargan matplotlib, se
+# importan en _create_plot_tabs, cuando la ventana ya es visible)
 from src.gui.config_tab import ConfigTab
-from src.gui.simulation_tab import SimulationTab
-from src.gui.results_tab import ResultsTab
 
 class MainWindow(tk.Tk):
     def __init__(self):
@@ -21,10 +23,6 @@ class MainWindow(tk.Tk):
         self.title("BitGen")
         self.geometry("1920x1080") # Aumentar tamaño para mejor visualización
 
-        self.chaotic_generator = ChaoticBitGenerator()
-        self.randomness_tester = RandomnessTests()
-        self.load_simulator = None # Se inicializará al iniciar la simulación
-
         self._create_notebook()
         self._setup_simulation_threading()
         self.protocol("WM_DELETE_WINDOW", self._on_close)
@@ -36,19 +34,43 @@ class MainWindow(tk.Tk):
         self.config_tab = ConfigTab(self.notebook)
         self.notebook.add(self.config_tab, text="Configuración")
 
-        # Crear ResultsTab primero para pasar referencia a SimulationTab
-        self.results_tab = ResultsTab(self.notebook)
-        self.simulation_tab = SimulationTab(self.notebook, results_tab=self.results_tab)
-        self.notebook.add(self.simulation_tab, text="Simulación en Tiempo Real")
-        self.notebook.add(self.results_tab, text="Análisis de Resultados")
-
         # Conectar el callback de la pestaña de configuración
         self.config_tab.set_simulation_callback(self.start_simulation)
+        self.config_tab.set_resume_callback(self.resume_simulation)
+
+        # Las pestañas con gráficos se crean después de mostrar la ventana
+        self.simulation_tab = None
+        self.results_tab = None
+        self.bind("<Map>", self._on_first_map)
         
         # Limpiar resultados al cambiar de pestaña a config
         self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_change)
 
+    def _on_first_map(self, event):
+        # <Map> también llega por los widgets hijos; solo interesa la ventana principal
+        if event.widget is self:
+            self.unbind("<Map>")
+            self.after_idle(self._create_plot_tabs)
+
+    def _create_plot_tabs(self):
+        """Crea SimulationTab y ResultsTab (importa matplotlib la primera vez)."""
+        if self.simulation_tab is not None:
+            return
+        from src.gui.simulation_tab import SimulationTab
+        from src.gui.results_tab import ResultsTab
+
+        # Crear ResultsTab primero para pasar referencia a SimulationTab
+        self.results_tab = ResultsTab(self.notebook)
+        self.simulation_tab = SimulationTab(self.notebook, results_tab=self.results_tab)
+        self.notebook.add(self.simulation_tab, text="Simulación en Tiempo Real")
+        self.notebook.add(self.results_tab, text="Análisis de Resultados")
+        self.simulation_tab.set_stop_callback(self.stop_simulation)
+        self.results_tab.run_store_dir = DEFAULT_RUN_STORE_DIR
+        self.results_tab.on_run_loaded = self.simulation_tab.plot_paper_figures
+
     def _on_tab_change(self, event):
+        if self.simulation_tab is None:
+            return
         selected_tab = self.notebook.tab(self.notebook.select(), "text")
         if selected_tab == "Configuración":
             # Si volvemos a Configuración, preparamos las otras pestañas para una nueva simulación
@@ -58,19 +80,30 @@ class MainWindow(tk.Tk):
 
     def _setup_simulation_threading(self):
         self.simulation_thread = None
-        self.stop_simulation_flag = False
+        self.simulation_worker = None
         self.simulation_running = False
 
     def start_simulation(self, config_params: dict):
         """
-        Inicia la simulación en un hilo separado.
+        Inicia la simulación en un proceso separado. Las pruebas de una configuración del
+        generador ya ejecutada se toman de la caché de resultados.
+        """
+        config_params.setdefault('test_cache_dir', DEFAULT_RESULT_CACHE_DIR)
+        self._launch_simulation(config_params, checkpoint_state_path=None)
+
+    def resume_simulation(self, checkpoint_path: str):
+        """
+        Reanuda en un proceso separado una simulación guardada en un checkpoint.
         """
+        self._launch_simulation(None, checkpoint_state_path=checkpoint_path)
+
+    def _launch_simulation(self, config_params, checkpoint_state_path):
         if self.simulation_running:
             messagebox.showinfo("Simulación", "Una simulación ya está en curso.")
             return
 
-        self.stop_simulation_flag = False
         self.simulation_running = True
+        self._create_plot_tabs()
         
         # Resetear las pestañas de simulación y resultados para la nueva ejecución
         self.simulation_tab.reset_charts()
@@ -80,92 +113,135 @@ class MainWindow(tk.Tk):
         # Pasar a la pestaña de simulación
         self.notebook.select(self.simulation_tab)
 
-        # Iniciar la simulación en un hilo separado para no bloquear la GUI
-        self.simulation_thread = threading.Thread(target=self._run_simulation_logic, args=(config_params,))
+        # Las métricas del proceso de simulación se dejan en el búfer y la pestaña las dibuja a
+        # ritmo fijo; el búfer guarda solo los pasos que caben en la ventana visible y los máximos
+        from src.gui.simulation_tab import VISIBLE_WINDOW
+        self.metrics_buffer = ColumnMetricsBuffer(VISIBLE_WINDOW, len(STEP_COLUMNS))
+        # Fases medidas en el hilo de la GUI (vista en vivo y resultados); al reanudar un
+        # checkpoint la configuración se conoce recién al final y solo se perfila el proceso
+        self.gui_profiler = Profiler() if config_params and config_params.get('profile') else NULL_PROFILER
+        self.results_tab.display_profile(None)
+        self.simulation_tab.start_live_updates(self.metrics_buffer, profiler=self.gui_profiler)
+        self.simulation_tab.set_running(True)
+
+        # La generación, la simulación y las pruebas corren en otro proceso (sin competir por
+        # el GIL con la GUI); un hilo liviano solo recibe sus mensajes
+        chunk_size = config_params.get('chunk_size', 4096) if config_params else 4096
+        self.simulation_worker = SimulationWorker(config_params, checkpoint_path=checkpoint_state_path,
+                                                  chunk_size=chunk_size)
+        self.simulation_thread = threading.Thread(target=self._run_simulation_logic, args=(config_params, checkpoint_state_path), daemon=True)
         self.simulation_thread.start()
 
-    def _run_simulation_logic(self, config_params: dict):
+    def _run_simulation_logic(self, config_params, checkpoint_state_path=None):
         """
-        La lógica principal de la simulación que se ejecuta en un hilo separado.
+        Recibe los mensajes de SimulationWorker en un hilo separado. El proceso genera,
+        simula y acumula las pruebas por bloques mediante SimulationRunner, guardando
+        checkpoints si la configuración lo indica; aquí solo se reenvían las métricas al
+        búfer de la vista en vivo y se muestran los resultados.
         """
+        # Este Profiler solo se usa en el hilo oyente hasta que se agenda _show_profile
+        listener_profiler = Profiler()
         try:
-            # 1. Generar bits caóticos y valores reales y periodo
-            messagebox.showinfo("Simulación", f"Generando {config_params['num_bits']} bits caóticos. Esto puede tomar un momento para grandes N.")
-            chaotic_bits, chaotic_x_values, period_ok = self.chaotic_generator.generate_cccbg_bits(
-                alpha=config_params['alpha'],
-                x0=config_params['x0'],
-                y0=config_params['y0'],
-                num_bits=config_params['num_bits']
-            )
-            
-            # 2. Inicializar el simulador de carga
-            self.load_simulator = LoadSimulator(
-                num_users=config_params['num_users'],
-                latency_sensitivity=config_params['latency_sensitivity'],
-                cpu_sensitivity=config_params['cpu_sensitivity'],
-                memory_sensitivity=config_params['memory_sensitivity'],
-                recovery_rate=config_params['recovery_rate']
-            )
-            self.load_simulator.reset_simulation() # Asegurar que está reseteado
-
-            # 3. Ejecutar la simulación paso a paso
-            for i, bit in enumerate(chaotic_bits):
-                if self.stop_simulation_flag:
-                    break
-                
-                # Actualizar métricas
-                current_metrics = self.load_simulator.simulate_step(bit)
-                
-                # Actualizar GUI (usar after para hacerlo en el hilo principal de Tkinter)
-                self.after(1, self.simulation_tab.update_realtime_charts, current_metrics['time_step'], current_metrics)
-                
-                # Pequeña pausa para ver el progreso (ajustable)
-                # time.sleep(0.001) # Esto puede ralentizar para muchos pasos
+            def on_message(message):
+                if message[0] == 'metrics':
+                    self.metrics_buffer.push(message[1])
+                elif message[0] == 'progress':
+                    # Fase, avance, ritmo y tiempo restante en lugar de un aviso bloqueante
+                    self.after(0, self.simulation_tab.show_progress, message[1])
+
+            # 1-3. Generar bits caóticos, simular la carga y acumular las pruebas por bloques
+            with listener_profiler.span('proceso de simulación'):
+                run_result = self.simulation_worker.run(on_message=on_message)
+            config_params = run_result['config_params']
+            self.metrics_buffer.close()
+            self.after(1, self.simulation_tab.stop_live_updates)
+            chaotic_bits = run_result['bits']
+            chaotic_x_values = run_result['x_values']
+            period_ok = run_result['period_ok']
 
             # 4. Finalizar simulación y mostrar resultados
-            simulation_history = self.load_simulator.get_simulation_history()
+            simulation_history = run_result['simulation_history']
             
-            # 5. Ejecutar pruebas de aleatoriedad
-            test_results = {}
-            test_results['monobit'] = self.randomness_tester.monobit_test(chaotic_bits)
-            test_results['serial'] = self.randomness_tester.serial_test(chaotic_bits, m=2) # m=2 para díadas
-            test_results['autocorr'] = self.randomness_tester.auto_correlation_test(chaotic_bits, d=1) # d=1 como en el paper
-            test_results['poker'] = self.randomness_tester.poker_test(chaotic_bits, m=4) # m=4 como en el paper
-            # Añadir resultado de periodo
-            test_results['period_ok'] = period_ok
+            # 5. Resultados de las pruebas de aleatoriedad (incluye el resultado de periodo)
+            test_results = run_result['test_results']
 
             # Actualizar GUI con resultados finales
-            self.after(1, self.results_tab.display_simulation_summary, simulation_history)
-            self.after(1, self.results_tab.display_test_results, test_results, chaotic_bits)
+            self.after(1, self._profiled, 'resumen', self.results_tab.display_simulation_summary, simulation_history)
+            self.after(1, self._profiled, 'gráficos de pruebas', self.results_tab.display_test_results, test_results, chaotic_bits)
             
             # Guardar los valores reales y periodo para exportación
             self.results_tab.chaotic_x_values = chaotic_x_values
             self.results_tab.period_ok = period_ok
+            self.results_tab.config_params = config_params
             
             # Graficar órbitas y mapas tipo paper
-            self.after(1, self.simulation_tab.plot_paper_figures, config_params)
+            self.after(1, self._profiled, 'figuras de variabilidad', self.simulation_tab.plot_paper_figures, config_params)
+            if 'profile' in run_result:
+                self.after(1, self._show_profile, listener_profiler, run_result['profile'])
+
+            if config_params.get('save_run'):
+                self._save_run(config_params, run_result)
 
             self.after(1, lambda: self.notebook.select(self.results_tab)) # Mover a la pestaña de resultados
-            self.after(1, lambda: messagebox.showinfo("Simulación Completa", "La simulación ha finalizado con éxito."))
+            if run_result['stopped'] and run_result['checkpoint_path']:
+                self.after(1, lambda: messagebox.showinfo("Simulación Detenida", f"Simulación detenida. Puede reanudarla desde el checkpoint:\n{run_result['checkpoint_path']}"))
+            else:
+                self.after(1, lambda: messagebox.showinfo("Simulación Completa", "La simulación ha finalizado con éxito."))
 
         except Exception as e:
             self.after(1, lambda: messagebox.showerror("Error de Simulación", f"Ocurrió un error durante la simulación: {e}"))
             import traceback
             traceback.print_exc() # Imprimir el stack trace en la consola para depuración
         finally:
+            self.metrics_buffer.close()
+            self.after(0, self.simulation_tab.set_running, False)
             self.simulation_running = False
 
+    def _save_run(self, config_params, run_result):
+        """
+        Registra la ejecución en el almacén local desde un hilo propio (la conexión SQLite es
+        de ese hilo), salvo que sus arreglos superen MAX_GUI_SAVE_BYTES.
+        """
+        size = estimate_run_bytes(run_result)
+        if size > MAX_GUI_SAVE_BYTES:
+            self.after(1, lambda: messagebox.showwarning(
+                "Ejecución no guardada",
+                f"La ejecución ocupa unos {size / 1024 ** 2:.0f} MB (límite: {MAX_GUI_SAVE_BYTES / 1024 ** 2:.0f} MB) "
+                f"y no se guardó en '{DEFAULT_RUN_STORE_DIR}'. Use la exportación continua para ejecuciones largas."))
+            return
+
+        def save():
+            try:
+                with RunStore(DEFAULT_RUN_STORE_DIR) as store:
+                    store.save_run(config_params, run_result)
+            except Exception as e:
+                self.after(1, lambda: messagebox.showerror(
+                    "Error al Guardar", f"No se pudo guardar la ejecución en '{DEFAULT_RUN_STORE_DIR}': {e}"))
+
+        threading.Thread(target=save, daemon=True).start()
+
+    def _profiled(self, name, function, *args):
+        """Ejecuta function en el hilo de la GUI midiéndola como una fase de gui_profiler."""
+        with self.gui_profiler.span(name):
+            return function(*args)
+
+    def _show_profile(self, listener_profiler, worker_profile):
+        """Combina los perfiles del proceso, del hilo oyente y de la GUI y los muestra."""
+        listener_profiler.merge(worker_profile, prefix='proceso de simulación')
+        listener_profiler.merge(self.gui_profiler.report(), prefix='gui')
+        self.results_tab.display_profile(listener_profiler.report())
+
     def stop_simulation(self):
         """Detiene la simulación en curso."""
         if self.simulation_running:
-            self.stop_simulation_flag = True
-            messagebox.showinfo("Simulación", "Solicitud de detención de simulación enviada. Esperando finalización del paso actual.")
+            self.simulation_worker.stop()
         else:
             messagebox.showinfo("Simulación", "No hay simulación en curso para detener.")
 
     def _on_close(self):
-        """Cierra completamente la aplicación y todos los hilos."""
-        self.stop_simulation_flag = True
+        """Cierra completamente la aplicación, el proceso de simulación y todos los hilos."""
+        if self.simulation_worker is not None and self.simulation_worker.is_alive():
+            self.simulation_worker.terminate()
         self.simulation_running = False
         self.destroy()
         os._exit(0)  # Forzar cierre de todos los procesos/hilos
@@ -1,10 +1,17 @@
 # src/gui/results_tab.py
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
+from tkinter import ttk, messagebox, filedialog
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import numpy as np
+from src.core.randomness_tests import RandomnessTests, find_test_result
+from src.core.simulation_engine import summarize_history
 from src.utils.data_exporter import DataExporter
+from src.utils.downsampling import LODPyramid, max_points_for_axes
+from src.utils.run_store import RunStore, DEFAULT_RUN_STORE_DIR
+from src.core.profiling import SPAN_SEPARATOR, write_profile
+from src.core.progress import CancellationToken, OperationCancelled, ProgressReporter, format_progress
 
 class ResultsTab(ttk.Frame):
     def __init__(self, parent):
@@ -19,7 +26,12 @@ class ResultsTab(ttk.Frame):
         self.all_figures = []
         self.chaotic_x_values = None
         self.period_ok = None
+        self.config_params = None
         self.variability_data = None  # Nuevo atributo para datos de variabilidad
+        self.run_store_dir = DEFAULT_RUN_STORE_DIR
+        self.on_run_loaded = None  # Recibe config_params al cargar una ejecución guardada
+        self.profile = None  # Perfil por fases de la última ejecución (ver Profiler.report)
+        self._lod_lines = {}  # eje -> (pirámide de detalle, línea) de las métricas
         self._create_widgets()
 
     def _create_widgets(self):
@@ -41,16 +53,21 @@ class ResultsTab(ttk.Frame):
         self.max_mem_label = ttk.Label(sim_summary_frame, text="Uso de Memoria Máximo: N/D")
         self.max_mem_label.pack(anchor="w", padx=10, pady=2)
 
-        export_btn = ttk.Button(results_frame, text="Exportar Datos", command=self._export_data_dialog)
-        export_btn.pack(anchor="center", padx=10, pady=(0, 5))
+        buttons_frame = ttk.Frame(results_frame)
+        buttons_frame.pack(anchor="center", padx=10, pady=(0, 5))
+        export_btn = ttk.Button(buttons_frame, text="Exportar Datos", command=self._export_data_dialog)
+        export_btn.pack(side=tk.LEFT, padx=5)
+        runs_btn = ttk.Button(buttons_frame, text="Ejecuciones guardadas", command=self._runs_dialog)
+        runs_btn.pack(side=tk.LEFT, padx=5)
 
         # Notebook para navegar entre todas las gráficas generadas
         self.figures_notebook = ttk.Notebook(results_frame)
         self.figures_notebook.pack(fill="both", expand=True, padx=5, pady=10)
 
         # --- Tab: Pruebas de Aleatoriedad ---
-        self.fig_tests, self.axs_tests = plt.subplots(2, 2, figsize=(14, 10))
-        plt.tight_layout(rect=[0, 0.03, 1, 0.96])
+        self.fig_tests = Figure(figsize=(14, 10))
+        self.axs_tests = self.fig_tests.subplots(2, 2)
+        self.fig_tests.tight_layout(rect=[0, 0.03, 1, 0.96])
         self.tab_tests = ttk.Frame(self.figures_notebook)
         self.canvas_tests = FigureCanvasTkAgg(self.fig_tests, master=self.tab_tests)
         self.canvas_tests.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
@@ -60,8 +77,9 @@ class ResultsTab(ttk.Frame):
         self.figures_notebook.add(self.tab_tests, text="Pruebas de Aleatoriedad")
 
         # --- Tab: Métricas de Recursos ---
-        self.fig_metrics, self.axs_metrics = plt.subplots(2, 2, figsize=(14, 10))
-        plt.tight_layout(rect=[0, 0.03, 1, 0.96])
+        self.fig_metrics = Figure(figsize=(14, 10))
+        self.axs_metrics = self.fig_metrics.subplots(2, 2)
+        self.fig_metrics.tight_layout(rect=[0, 0.03, 1, 0.96])
         self.tab_metrics = ttk.Frame(self.figures_notebook)
         self.canvas_metrics = FigureCanvasTkAgg(self.fig_metrics, master=self.tab_metrics)
         self.canvas_metrics.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
@@ -75,6 +93,21 @@ class ResultsTab(ttk.Frame):
         self.paper_canvases = []
         self.figures_notebook.add(self.tab_paper, text="Variabilidad")
 
+        # --- Tab: Perfil de la ejecución (solo con el perfilado activado) ---
+        self.tab_profile = ttk.Frame(self.figures_notebook)
+        profile_columns = ("llamadas", "pared_s", "cpu_s", "asignado_mb", "rss_mb")
+        self.profile_tree = ttk.Treeview(self.tab_profile, columns=profile_columns)
+        self.profile_tree.heading("#0", text="Fase")
+        self.profile_tree.column("#0", width=320)
+        for column, title in zip(profile_columns, ("Llamadas", "Pared (s)", "CPU (s)", "Asignado (MB)", "RSS máx. (MB)")):
+            self.profile_tree.heading(column, text=title)
+            self.profile_tree.column(column, width=110, anchor="e")
+        self.profile_tree.pack(fill="both", expand=True, padx=5, pady=5)
+        self.profile_counters_label = ttk.Label(self.tab_profile, text="Active el perfilado en la configuración para ver los tiempos por fase.")
+        self.profile_counters_label.pack(anchor="w", padx=5)
+        ttk.Button(self.tab_profile, text="Guardar perfil (JSON)", command=self._save_profile).pack(anchor="e", padx=5, pady=5)
+        self.figures_notebook.add(self.tab_profile, text="Perfil")
+
     def _clear_tab(self, tab):
         for widget in tab.winfo_children():
             widget.destroy()
@@ -108,44 +141,219 @@ class ResultsTab(ttk.Frame):
             if self.simulation_history is None or self.bit_sequence is None:
                 messagebox.showerror("Error", "No hay datos para exportar.")
                 return
+            # Las rutas se piden aquí; la escritura corre en otro hilo (_run_export)
             if export_type == "CSV":
-                DataExporter.export_to_csv(
+                task = DataExporter.export_to_csv(
                     self.simulation_history,
                     self.bit_sequence,
                     x_values=self.chaotic_x_values,
                     period_ok=self.period_ok,
                     variability_data=self.variability_data
                 )
+            elif export_type == "Binario":
+                task = DataExporter.export_to_columnar(
+                    self.simulation_history,
+                    self.bit_sequence,
+                    x_values=self.chaotic_x_values,
+                    period_ok=self.period_ok,
+                    variability_data=self.variability_data,
+                    config_params=self.config_params
+                )
+            elif export_type == "Bits":
+                task = DataExporter.export_bitstream(self.bit_sequence)
             elif export_type == "PDF":
-                figs = self.all_figures if self.all_figures else []
-                DataExporter.export_to_pdf(self.simulation_history, self.bit_sequence, self.test_results, figs)
+                # El reporte se dibuja a partir de los datos, no de las figuras de la pestaña
+                task = DataExporter.export_to_pdf(self.simulation_history, self.bit_sequence, self.test_results,
+                                                  variability_data=self.variability_data)
             export_win.destroy()
+            if task is not None:
+                self._run_export(f"Exportación {export_type}", task)
 
         export_win = tk.Toplevel(self)
         export_win.title("Exportar Datos")
-        export_win.geometry("250x120")
+        export_win.geometry("320x200")
         ttk.Label(export_win, text="¿Qué formato desea exportar?").pack(pady=10)
         btn_csv = ttk.Button(export_win, text="Exportar a CSV", command=lambda: do_export("CSV"))
         btn_csv.pack(pady=5)
+        formats = "/".join(fmt.upper() for fmt in DataExporter.available_columnar_formats())
+        btn_binary = ttk.Button(export_win, text=f"Exportar binario ({formats})", command=lambda: do_export("Binario"))
+        btn_binary.pack(pady=5)
+        btn_bits = ttk.Button(export_win, text="Exportar bits (NIST STS / dieharder / TestU01)", command=lambda: do_export("Bits"))
+        btn_bits.pack(pady=5)
         btn_pdf = ttk.Button(export_win, text="Exportar a PDF", command=lambda: do_export("PDF"))
         btn_pdf.pack(pady=5)
 
+    def _run_export(self, title, task):
+        """
+        Ejecuta una tarea de exportación de DataExporter (task(progress) -> mensaje) en un
+        hilo aparte, con una ventana de progreso y un botón Cancelar; el resultado se
+        muestra de vuelta en el hilo de Tk.
+        """
+        progress_win = tk.Toplevel(self)
+        progress_win.title(title)
+        progress_win.geometry("480x120")
+        progress_bar = ttk.Progressbar(progress_win, orient="horizontal", mode="determinate", maximum=1.0)
+        progress_bar.pack(fill="x", padx=10, pady=(15, 5))
+        progress_label = ttk.Label(progress_win, text="")
+        progress_label.pack(anchor="w", padx=10)
+        token = CancellationToken()
+        cancel_btn = ttk.Button(progress_win, text="Cancelar", command=token.cancel)
+        cancel_btn.pack(pady=5)
+        progress_win.protocol("WM_DELETE_WINDOW", token.cancel)
+
+        def show_progress(update):
+            if progress_win.winfo_exists():
+                progress_bar.config(value=min(1.0, update['done'] / (update['total'] or 1)))
+                progress_label.config(text=format_progress(update))
+
+        def finish(kind, message):
+            progress_win.destroy()
+            if kind == 'info':
+                messagebox.showinfo("Exportación Exitosa", message)
+            elif kind == 'cancelled':
+                messagebox.showinfo(title, "Exportación cancelada.")
+            else:
+                messagebox.showerror("Error de Exportación", f"No se pudo exportar los datos: {message}")
+
+        def worker():
+            progress = ProgressReporter(callback=lambda update: self.after(0, show_progress, update), token=token)
+            try:
+                result = ('info', task(progress))
+            except OperationCancelled:
+                result = ('cancelled', None)
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                result = ('error', e)
+            self.after(0, finish, *result)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _runs_dialog(self):
+        """Lista las ejecuciones del almacén, con filtros por alpha y p-valor, y carga la elegida."""
+        runs_win = tk.Toplevel(self)
+        runs_win.title("Ejecuciones guardadas")
+        runs_win.geometry("900x420")
+
+        filters_frame = ttk.Frame(runs_win)
+        filters_frame.pack(fill="x", padx=10, pady=5)
+        ttk.Label(filters_frame, text="alpha entre").pack(side=tk.LEFT)
+        alpha_min = ttk.Entry(filters_frame, width=8)
+        alpha_min.pack(side=tk.LEFT, padx=2)
+        ttk.Label(filters_frame, text="y").pack(side=tk.LEFT)
+        alpha_max = ttk.Entry(filters_frame, width=8)
+        alpha_max.pack(side=tk.LEFT, padx=2)
+        ttk.Label(filters_frame, text="  p-valor de").pack(side=tk.LEFT)
+        test_combo = ttk.Combobox(filters_frame, values=["", "monobit", "serial", "autocorr", "poker"], width=10, state="readonly")
+        test_combo.pack(side=tk.LEFT, padx=2)
+        ttk.Label(filters_frame, text="<").pack(side=tk.LEFT)
+        p_max = ttk.Entry(filters_frame, width=8)
+        p_max.pack(side=tk.LEFT, padx=2)
+
+        columns = ("id", "fecha", "nombre", "alpha", "usuarios", "pasos", "monobit", "serial", "autocorr", "poker")
+        tree = ttk.Treeview(runs_win, columns=columns, show="headings")
+        for column in columns:
+            tree.heading(column, text=column)
+            tree.column(column, width=140 if column in ("fecha", "nombre") else 70, anchor="center")
+        tree.pack(fill="both", expand=True, padx=10, pady=5)
+
+        def number(entry):
+            text = entry.get().strip()
+            return float(text) if text else None
+
+        def refresh():
+            try:
+                filters = {}
+                if number(alpha_min) is not None or number(alpha_max) is not None:
+                    filters['alpha'] = (number(alpha_min), number(alpha_max))
+                if test_combo.get() and number(p_max) is not None:
+                    filters['p_values'] = {test_combo.get(): ('<', number(p_max))}
+                with RunStore(self.run_store_dir) as store:
+                    runs = store.query(limit=500, **filters)
+            except ValueError as e:
+                messagebox.showerror("Error", f"Filtro no válido: {e}", parent=runs_win)
+                return
+            tree.delete(*tree.get_children())
+            for run in runs:
+                p_values = [run['p_values'].get(test) for test in columns[6:]]
+                tree.insert("", tk.END, iid=str(run['id']), values=(
+                    run['id'], run['created'], run['name'] or "", run['alpha'], run['num_users'],
+                    "" if run['num_steps'] is None else int(run['num_steps']),
+                    *["" if p is None else f"{p:.4f}" for p in p_values]))
+
+        def load_selected():
+            selection = tree.selection()
+            if not selection:
+                return
+            with RunStore(self.run_store_dir) as store:
+                run = store.load_run(int(selection[0]))
+            self.load_run(run)
+            runs_win.destroy()
+
+        buttons_frame = ttk.Frame(runs_win)
+        buttons_frame.pack(pady=5)
+        ttk.Button(filters_frame, text="Buscar", command=refresh).pack(side=tk.LEFT, padx=10)
+        ttk.Button(buttons_frame, text="Cargar", command=load_selected).pack(side=tk.LEFT, padx=5)
+        tree.bind("<Double-1>", lambda event: load_selected())
+        refresh()
+
+    def load_run(self, run: dict):
+        """Muestra una ejecución cargada con RunStore.load_run como si acabara de terminar."""
+        self.chaotic_x_values = run['x_values']
+        self.period_ok = run['period_ok']
+        self.config_params = run['config_params']
+        self.display_simulation_summary(run['simulation_history'])
+        self.display_test_results(run['test_results'], run['bits'])
+        if self.on_run_loaded is not None:
+            self.on_run_loaded(run['config_params'])
+
+    def display_profile(self, profile: dict):
+        """Muestra un perfil de Profiler.report() como árbol de fases."""
+        self.profile = profile
+        self.profile_tree.delete(*self.profile_tree.get_children())
+        if not profile:
+            self.profile_counters_label.config(text="")
+            return
+
+        def ensure_node(path):
+            # Los prefijos de merge ('proceso', 'gui') agrupan fases sin ser fases medidas
+            if path and not self.profile_tree.exists(path):
+                parent, _, name = path.rpartition(SPAN_SEPARATOR)
+                ensure_node(parent)
+                self.profile_tree.insert(parent, tk.END, iid=path, text=name, open=True)
+
+        for span in profile['spans']:
+            ensure_node(span['path'])
+            megabytes = ["" if span[key] is None else f"{span[key] / 1e6:.1f}" for key in ('alloc_peak_bytes', 'rss_peak_bytes')]
+            self.profile_tree.item(span['path'], values=(
+                span['calls'], f"{span['wall_seconds']:.3f}", f"{span['cpu_seconds']:.3f}", *megabytes))
+        counters = ", ".join(f"{name}: {value}" for name, value in profile['counters'].items())
+        self.profile_counters_label.config(text=f"Total {profile['total_wall_seconds']:.2f} s. {counters}")
+
+    def _save_profile(self):
+        if not self.profile:
+            messagebox.showerror("Error", "No hay perfil para guardar.")
+            return
+        file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")],
+                                                 title="Guardar perfil de la ejecución")
+        if file_path:
+            write_profile(file_path, self.profile)
+
     def set_variability_data(self, variability_data):
         """Establece los datos de variabilidad para exportación."""
         self.variability_data = variability_data
 
     def display_simulation_summary(self, history_data: dict):
-        if not history_data['latency']:
+        if len(history_data['latency']) == 0:
             self.reset_summary_labels()
             self._clear_charts()
             return
 
-        avg_lat = np.mean(history_data['latency'])
-        max_lat = np.max(history_data['latency'])
-        avg_cpu = np.mean(history_data['cpu'])
-        max_cpu = np.max(history_data['cpu'])
-        avg_mem = np.mean(history_data['memory'])
-        max_mem = np.max(history_data['memory'])
+        # Por bloques: el historial puede estar en disco (MemmapHistory)
+        summary = summarize_history(history_data)
+        avg_lat, max_lat = summary['avg_latency'], summary['max_latency']
+        avg_cpu, max_cpu = summary['avg_cpu'], summary['max_cpu']
+        avg_mem, max_mem = summary['avg_memory'], summary['max_memory']
 
         self.avg_latency_label.config(text=f"Latencia Promedio: {avg_lat:.2f} ms")
         self.max_latency_label.config(text=f"Latencia Máxima: {max_lat:.2f} ms")
@@ -158,6 +366,11 @@ class ResultsTab(ttk.Frame):
         self.simulation_history = history_data
         self._update_all_figures()
 
+    @staticmethod
+    def _test_counts(test_results, keys):
+        result = find_test_result(test_results, keys)
+        return None if result is None else result.get('counts')
+
     def display_test_results(self, test_results: dict, bit_sequence: np.ndarray):
         def safe_float(p_val):
             try:
@@ -168,11 +381,32 @@ class ResultsTab(ttk.Frame):
         self.bit_sequence = bit_sequence
         self.test_results = test_results
 
+        # Las tablas de conteos vienen con los resultados de las pruebas (calculadas fuera del
+        # hilo de la GUI); solo si faltan se calculan aquí, de forma vectorizada
+        n_bits = len(bit_sequence) if bit_sequence is not None else 0
+        monobit_counts = self._test_counts(test_results, ('monobit', 'Monobit Test'))
+        if monobit_counts is None and n_bits > 0:
+            ones = int(np.count_nonzero(bit_sequence))
+            monobit_counts = np.array([n_bits - ones, ones])
+        serial_counts = self._test_counts(test_results, ('serial', 'Serial Test'))
+        if serial_counts is None and n_bits > 1:
+            serial_counts = RandomnessTests.pair_counts(bit_sequence, d=1)
+        autocorr_result = find_test_result(test_results, ('autocorr', 'Auto-correlation Test (d=1)'))
+        if autocorr_result is not None and autocorr_result.get('counts') is not None:
+            corr = autocorr_result.get('correlation', RandomnessTests.correlation_from_pair_counts(autocorr_result['counts']))
+        elif n_bits > 1:
+            corr = RandomnessTests.correlation_from_pair_counts(RandomnessTests.pair_counts(bit_sequence, d=1))
+        else:
+            corr = None
+        m = 4
+        poker_counts = self._test_counts(test_results, ('poker', 'Poker Test (m=4)'))
+        if poker_counts is None and n_bits >= m:
+            poker_counts = RandomnessTests.block_counts(bit_sequence, m)
+
         self.axs_tests[0, 0].clear()
-        if bit_sequence is not None and len(bit_sequence) > 0:
-            n0 = np.sum(bit_sequence == 0)
-            n1 = np.sum(bit_sequence == 1)
-            total_bits = len(bit_sequence)
+        if monobit_counts is not None and n_bits > 0:
+            n0, n1 = monobit_counts
+            total_bits = int(n0 + n1)
             self.axs_tests[0, 0].bar(['0', '1'], [n0, n1], color=['blue', 'red'], width=0.8)
             self.axs_tests[0, 0].set_title(f"Prueba Monobit: Distribución de Bits (Total: {total_bits})")
             self.axs_tests[0, 0].set_xlabel("Valor del Bit", labelpad=2)
@@ -185,12 +419,9 @@ class ResultsTab(ttk.Frame):
             self.axs_tests[0, 0].set_title("Prueba Monobit: Distribución de Bits")
 
         self.axs_tests[0, 1].clear()
-        if bit_sequence is not None and len(bit_sequence) > 1:
-            pairs = [str(int(bit_sequence[i])) + str(int(bit_sequence[i+1])) for i in range(len(bit_sequence)-1)]
-            unique, counts = np.unique(pairs, return_counts=True)
+        if serial_counts is not None and n_bits > 1:
             pair_labels = ['00', '01', '10', '11']
-            pair_counts = [dict(zip(unique, counts)).get(label, 0) for label in pair_labels]
-            self.axs_tests[0, 1].bar(pair_labels, pair_counts, color='purple', alpha=0.7)
+            self.axs_tests[0, 1].bar(pair_labels, serial_counts, color='purple', alpha=0.7)
             self.axs_tests[0, 1].set_title("Prueba Serial: Frecuencia de Díadas")
             self.axs_tests[0, 1].set_xlabel("Díada", labelpad=2)
             self.axs_tests[0, 1].set_ylabel("Frecuencia")
@@ -200,11 +431,7 @@ class ResultsTab(ttk.Frame):
             self.axs_tests[0, 1].set_title("Prueba Serial: Frecuencia de Díadas")
 
         self.axs_tests[1, 0].clear()
-        if bit_sequence is not None and len(bit_sequence) > 1:
-            d = 1
-            x = bit_sequence[:-d]
-            y = bit_sequence[d:]
-            corr = np.corrcoef(x, y)[0, 1]
+        if corr is not None and n_bits > 1:
             self.axs_tests[1, 0].bar(['Correlación (d=1)'], [corr], color='teal')
             self.axs_tests[1, 0].set_ylim([-1, 1])
             self.axs_tests[1, 0].set_title("Prueba de Autocorrelación (d=1)")
@@ -216,14 +443,9 @@ class ResultsTab(ttk.Frame):
             self.axs_tests[1, 0].set_title("Prueba de Autocorrelación (d=1)")
 
         self.axs_tests[1, 1].clear()
-        m = 4
-        if bit_sequence is not None and len(bit_sequence) >= m:
-            num_blocks = len(bit_sequence) // m
-            blocks = [''.join(str(int(b)) for b in bit_sequence[i*m:(i+1)*m]) for i in range(num_blocks)]
-            unique, counts = np.unique(blocks, return_counts=True)
+        if poker_counts is not None and n_bits >= m:
             block_labels = [f"{i:0{m}b}" for i in range(2**m)]
-            block_counts = [dict(zip(unique, counts)).get(label, 0) for label in block_labels]
-            self.axs_tests[1, 1].bar(block_labels, block_counts, color='orange', alpha=0.7)
+            self.axs_tests[1, 1].bar(block_labels, poker_counts, color='orange', alpha=0.7)
             self.axs_tests[1, 1].set_title("Prueba Poker: Frecuencia de Bloques (m=4)")
             self.axs_tests[1, 1].set_xlabel("Bloque de 4 bits", labelpad=2)
             self.axs_tests[1, 1].set_ylabel("Frecuencia")
@@ -237,31 +459,50 @@ class ResultsTab(ttk.Frame):
         self.fig_tests.canvas.draw_idle()
         self._update_all_figures()
 
+    def _plot_decimated(self, ax, x, y, color):
+        """
+        Dibuja una métrica a partir de su pirámide de detalle: solo se dibujan unos dos puntos
+        por píxel del eje, conservando mínimos y máximos. Al hacer zoom o desplazarse con la
+        barra de navegación, se vuelve a consultar el nivel que corresponde al rango visible.
+        """
+        pyramid = LODPyramid(x, np.asarray(y))
+        line, = ax.plot(*pyramid.query(max_points=max_points_for_axes(ax)), color=color)
+        self._lod_lines[ax] = (pyramid, line)
+        ax.callbacks.connect('xlim_changed', self._on_metrics_xlim_changed)
+
+    def _on_metrics_xlim_changed(self, ax):
+        pyramid, line = self._lod_lines[ax]
+        x_min, x_max = ax.get_xlim()
+        line.set_data(*pyramid.query(x_min, x_max, max_points=max_points_for_axes(ax)))
+        ax.figure.canvas.draw_idle()
+
     def _update_simulation_charts(self, history_data: dict):
         for ax in self.axs_metrics.flat:
             ax.clear()
-        if history_data['latency']:
-            self.axs_metrics[0, 0].plot(history_data['time_steps'], history_data['latency'], color='orange')
+        self._lod_lines = {}
+        time_steps = np.asarray(history_data['time_steps'])
+        if len(history_data['latency']) > 0:
+            self._plot_decimated(self.axs_metrics[0, 0], time_steps, history_data['latency'], color='orange')
             self.axs_metrics[0, 0].set_title("Latencia en el Tiempo")
             self.axs_metrics[0, 0].set_xlabel("Tiempo (pasos)", labelpad=2)
             self.axs_metrics[0, 0].set_ylabel("Latencia (ms)")
             self.axs_metrics[0, 0].grid(True)
-        if history_data['cpu']:
-            self.axs_metrics[0, 1].plot(history_data['time_steps'], history_data['cpu'], color='red')
+        if len(history_data['cpu']) > 0:
+            self._plot_decimated(self.axs_metrics[0, 1], time_steps, history_data['cpu'], color='red')
             self.axs_metrics[0, 1].set_title("Uso de CPU en el Tiempo")
             self.axs_metrics[0, 1].set_xlabel("Tiempo (pasos)", labelpad=2)
             self.axs_metrics[0, 1].set_ylabel("CPU (%)")
             self.axs_metrics[0, 1].set_ylim([0, 100])
             self.axs_metrics[0, 1].grid(True)
-        if history_data['memory']:
-            self.axs_metrics[1, 0].plot(history_data['time_steps'], history_data['memory'], color='green')
+        if len(history_data['memory']) > 0:
+            self._plot_decimated(self.axs_metrics[1, 0], time_steps, history_data['memory'], color='green')
             self.axs_metrics[1, 0].set_title("Uso de Memoria en el Tiempo")
             self.axs_metrics[1, 0].set_xlabel("Tiempo (pasos)", labelpad=2)
             self.axs_metrics[1, 0].set_ylabel("Memoria (%)")
             self.axs_metrics[1, 0].set_ylim([0, 100])
             self.axs_metrics[1, 0].grid(True)
-        if history_data['simulated_requests']:
-            self.axs_metrics[1, 1].plot(history_data['time_steps'], history_data['simulated_requests'], color='blue')
+        if len(history_data['simulated_requests']) > 0:
+            self._plot_decimated(self.axs_metrics[1, 1], time_steps, history_data['simulated_requests'], color='blue')
             self.axs_metrics[1, 1].set_title("Solicitudes Simuladas en el Tiempo")
             self.axs_metrics[1, 1].set_xlabel("Tiempo (pasos)", labelpad=2)
             self.axs_metrics[1, 1].set_ylabel("Solicitudes")
@@ -311,6 +552,7 @@ class ResultsTab(ttk.Frame):
                     ax.set_xlim([0, 100])
                     ax.grid(True)
         self.fig_tests.canvas.draw_idle()
+        self._lod_lines = {}
         for row in range(self.axs_metrics.shape[0]):
             for col in range(self.axs_metrics.shape[1]):
                 ax = self.axs_metrics[row, col]
@@ -1,18 +1,39 @@
 # src/gui/simulation_tab.py
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
+# Figure en lugar de pyplot: pyplot (y su gestión de figuras) solo se carga al crear las
+# figuras tipo paper y de órbitas
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
+from src.core.chaotic_maps import SkewTentMap
+from src.core.progress import format_progress
+from src.core.profiling import NULL_PROFILER
+from src.utils.ring_buffer import RingBuffer
+from src.utils.downsampling import decimate_minmax, lttb, DEFAULT_MAX_POINTS
+
+# Ancho en pasos de la ventana del eje X y salto con que avanza (50 atrás + margen de 10).
+# El eje avanza a saltos para que los límites cambien pocas veces y casi todas las
+# actualizaciones se puedan resolver con blitting.
+X_WINDOW_SPAN = 60
+X_WINDOW_JUMP = 10
+# Pasos que pueden llegar a verse dentro de la ventana
+VISIBLE_WINDOW = X_WINDOW_SPAN + 1
+# Iteraciones como máximo de las figuras tipo paper (se calculan en el hilo de la GUI y no
+# necesitan más puntos aunque la ejecución tenga 10^8 pasos)
+PAPER_FIGURE_MAX_STEPS = 5000
 
 class SimulationTab(ttk.Frame):
-    def __init__(self, parent, results_tab=None):
+    def __init__(self, parent, results_tab=None, use_blit: bool = True):
         super().__init__(parent)
         self.parent = parent
         self.results_tab = results_tab  # Referencia a ResultsTab si es necesario
         self.orbit_figures = []
         self.paper_figures = []  # Para figuras tipo paper si las usas
+        self.profiler = NULL_PROFILER
 
-        self.fig, self.axs = plt.subplots(4, 1, figsize=(10, 8), sharex=True) # 4 subplots
+        self.fig = Figure(figsize=(10, 8))
+        self.axs = self.fig.subplots(4, 1, sharex=True) # 4 subplots
         self.fig.suptitle('Simulación de Carga en Tiempo Real')
         
         # Canvas de Matplotlib
@@ -24,6 +45,17 @@ class SimulationTab(ttk.Frame):
         self.step_label = ttk.Label(self, text="Paso actual: 0")
         self.step_label.pack(side=tk.TOP, anchor="w", padx=10, pady=2)
 
+        # Progreso de la fase en curso (avance, ritmo y tiempo restante) y botón de detención
+        progress_frame = ttk.Frame(self)
+        progress_frame.pack(side=tk.TOP, fill=tk.X, padx=10, pady=2)
+        self.progress_bar = ttk.Progressbar(progress_frame, orient="horizontal", mode="determinate", maximum=1.0)
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.stop_button = ttk.Button(progress_frame, text="Detener", command=self._stop_requested, state="disabled")
+        self.stop_button.pack(side=tk.LEFT, padx=(10, 0))
+        self.progress_label = ttk.Label(self, text="")
+        self.progress_label.pack(side=tk.TOP, anchor="w", padx=10, pady=2)
+        self.stop_callback = None
+
         # Líneas para los gráficos (para actualización eficiente)
         self.line_requests, = self.axs[0].plot([], [], label='Solicitudes Simuladas')
         self.line_latency, = self.axs[1].plot([], [], label='Latencia (ms)', color='orange')
@@ -56,13 +88,109 @@ class SimulationTab(ttk.Frame):
         self.axs[3].grid(True)
         self.axs[3].set_ylim(0, 100) # Memoria hasta 100% (fijo)
         
-        plt.tight_layout(rect=[0, 0.03, 1, 0.96]) # Ajustar layout para título principal
-
-        self.x_data = []
-        self.y_requests = []
-        self.y_latency = []
-        self.y_cpu = []
-        self.y_memory = []
+        self.fig.tight_layout(rect=[0, 0.03, 1, 0.96]) # Ajustar layout para título principal
+
+        self.lines = [self.line_requests, self.line_latency, self.line_cpu, self.line_memory]
+        # Con blitting se guarda el fondo estático de cada eje (rejilla, ticks, leyendas,
+        # títulos) y en cada actualización solo se dibujan las cuatro líneas encima.
+        # El fondo se vuelve a capturar en cada redibujo completo (cambio de límites,
+        # redimensionado de la ventana).
+        self.use_blit = use_blit and self.canvas.supports_blit
+        self._backgrounds = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+        self._set_lines_animated(self.use_blit)
+
+        # Solo se guardan los pasos visibles (paso, solicitudes, latencia, CPU, memoria);
+        # el historial completo lo mantiene LoadSimulator y se muestra en ResultsTab
+        self.visible_data = RingBuffer(VISIBLE_WINDOW, 5)
+        # Máximos acumulados para escalar los ejes sin recorrer todo el historial
+        self.max_requests_seen = 0.0
+        self.max_latency_seen = 0.0
+
+    def set_stop_callback(self, callback):
+        self.stop_callback = callback
+
+    def _stop_requested(self):
+        if self.stop_callback:
+            self.stop_callback()
+
+    def show_progress(self, update: dict):
+        """Muestra un diccionario de ProgressReporter (fase, avance, ritmo y tiempo restante)."""
+        total = update['total'] or 1
+        self.progress_bar.config(value=min(1.0, update['done'] / total))
+        self.progress_label.config(text=format_progress(update))
+
+    def set_running(self, running: bool):
+        """Habilita el botón Detener mientras hay una simulación en curso."""
+        self.stop_button.config(state="normal" if running else "disabled")
+        if running:
+            self.progress_bar.config(value=0)
+            self.progress_label.config(text="")
+
+    def _set_lines_animated(self, animated: bool):
+        # Las líneas animadas quedan fuera de los redibujos completos (y por tanto del fondo
+        # capturado); savefig las incluye igualmente al exportar
+        for line in self.lines:
+            line.set_animated(animated)
+
+    def _on_draw(self, event):
+        """Tras un redibujo completo: captura los fondos y dibuja las líneas encima."""
+        if not self.use_blit:
+            return
+        self._backgrounds = [self.canvas.copy_from_bbox(ax.bbox) for ax in self.axs]
+        for ax, line in zip(self.axs, self.lines):
+            ax.draw_artist(line)
+
+    def _blit_lines(self):
+        """Restaura el fondo de cada eje y redibuja solo su línea."""
+        for ax, line, background in zip(self.axs, self.lines, self._backgrounds):
+            self.canvas.restore_region(background)
+            ax.draw_artist(line)
+            self.canvas.blit(ax.bbox)
+
+    def start_live_updates(self, metrics_buffer, interval_ms: int = 16, profiler=None):
+        """
+        Empieza a vaciar metrics_buffer en un temporizador de ritmo fijo (por defecto ~60 fps).
+        Cada vaciado aplica todas las métricas pendientes en una sola actualización; con
+        profiler, cada una se mide como la fase 'vista en vivo'.
+        """
+        self.stop_live_updates(final_drain=False)
+        self.metrics_buffer = metrics_buffer
+        self.profiler = profiler if profiler is not None else NULL_PROFILER
+        self.live_update_interval_ms = interval_ms
+        self._live_update_job = self.after(interval_ms, self._drain_metrics_buffer)
+
+    def stop_live_updates(self, final_drain: bool = True):
+        """Detiene el temporizador; opcionalmente aplica las métricas que queden pendientes."""
+        job = getattr(self, '_live_update_job', None)
+        if job is not None:
+            self.after_cancel(job)
+            self._live_update_job = None
+        if final_drain and getattr(self, 'metrics_buffer', None) is not None:
+            self._apply_pending_metrics(self.metrics_buffer.drain())
+
+    def _apply_pending_metrics(self, pending):
+        # MetricsBuffer entrega diccionarios por paso (simulación en el mismo proceso) o lotes
+        # en columnas; ColumnMetricsBuffer (SimulationWorker), los últimos pasos y sus máximos
+        if isinstance(pending, tuple):
+            columns, maxima = pending
+            if columns is not None:
+                with self.profiler.span('vista en vivo'):
+                    self.update_realtime_charts_columns(columns, maxima)
+            return
+        if not pending:
+            return
+        with self.profiler.span('vista en vivo'):
+            if isinstance(pending[0], np.ndarray):
+                self.update_realtime_charts_columns(np.concatenate(pending, axis=1))
+            else:
+                self.update_realtime_charts_batch(pending)
+
+    def _drain_metrics_buffer(self):
+        self._live_update_job = None
+        self._apply_pending_metrics(self.metrics_buffer.drain())
+        if not (self.metrics_buffer.closed and len(self.metrics_buffer) == 0):
+            self._live_update_job = self.after(self.live_update_interval_ms, self._drain_metrics_buffer)
 
     def update_realtime_charts(self, time_step: int, metrics: dict):
         """
@@ -72,49 +200,82 @@ class SimulationTab(ttk.Frame):
             time_step (int): El paso de tiempo actual de la simulación.
             metrics (dict): Diccionario con 'latency_ms', 'cpu_usage_percent', 'memory_usage_percent', 'simulated_requests'.
         """
-        self.x_data.append(time_step)
-        self.y_requests.append(metrics['simulated_requests'])
-        self.y_latency.append(metrics['latency_ms'])
-        self.y_cpu.append(metrics['cpu_usage_percent'])
-        self.y_memory.append(metrics['memory_usage_percent'])
+        self.update_realtime_charts_batch([dict(metrics, time_step=time_step)])
 
-        self.line_requests.set_data(self.x_data, self.y_requests)
-        self.line_latency.set_data(self.x_data, self.y_latency)
-        self.line_cpu.set_data(self.x_data, self.y_cpu)
-        self.line_memory.set_data(self.x_data, self.y_memory)
+    def update_realtime_charts_batch(self, metrics_list: list):
+        """
+        Aplica varias métricas (en orden, cada una con 'time_step') y redibuja una sola vez.
+        """
+        if not metrics_list:
+            return
+        batch = np.array([[m['time_step'], m['simulated_requests'], m['latency_ms'],
+                           m['cpu_usage_percent'], m['memory_usage_percent']] for m in metrics_list]).T
+        self.update_realtime_charts_columns(batch)
+
+    def update_realtime_charts_columns(self, batch: np.ndarray, maxima=None):
+        """
+        Igual que update_realtime_charts_batch, con las métricas como arreglo (5, k) de filas
+        paso, solicitudes, latencia, CPU y memoria (el formato que envía SimulationWorker).
+        maxima (máximo de cada fila) incluye pasos anteriores a batch ya descartados; si es
+        None se calcula de batch.
+        """
+        if batch.shape[1] == 0:
+            return
+        if maxima is None:
+            maxima = np.max(batch, axis=1)
+        # Solo los últimos pasos llegan a verse; el resto solo cuenta para los máximos
+        self.max_requests_seen = max(self.max_requests_seen, float(maxima[1]))
+        self.max_latency_seen = max(self.max_latency_seen, float(maxima[2]))
+        self.visible_data.extend(batch[:, -VISIBLE_WINDOW:])
+        time_step = int(batch[0, -1])
+
+        x_data, y_requests, y_latency, y_cpu, y_memory = self.visible_data.view()
+        self.line_requests.set_data(x_data, y_requests)
+        self.line_latency.set_data(x_data, y_latency)
+        self.line_cpu.set_data(x_data, y_cpu)
+        self.line_memory.set_data(x_data, y_memory)
 
         # Ajustar límites del eje X automáticamente
-        # Mostrar una ventana deslizante de los últimos 50 pasos + un margen de 10
-        self.axs[0].set_xlim(max(0, time_step - 50), time_step + 10) 
+        # Ventana de los últimos 50 pasos + un margen de 10, que avanza a saltos de
+        # X_WINDOW_JUMP pasos cuando el paso actual alcanza el borde derecho
+        x_min, x_max = self.axs[0].get_xlim()
+        x_limits_changed = not (x_min < time_step < x_max) or x_max - x_min > X_WINDOW_SPAN
+        if x_limits_changed:
+            new_x_max = time_step + X_WINDOW_JUMP
+            self.axs[0].set_xlim(max(0, new_x_max - X_WINDOW_SPAN), new_x_max)
 
         # Ajustar límites del eje Y para solicitudes (dinámico)
         # Un valor mínimo para evitar que el eje sea 0 si no hay solicitudes
         min_y_requests = 0
-        max_y_requests = max(200, max(self.y_requests) * 1.1 if self.y_requests else 200)
-        self.axs[0].set_ylim(min_y_requests, max_y_requests)
+        max_y_requests = max(200, self.max_requests_seen * 1.1)
 
         # Ajustar límites del eje Y para latencia (dinámico con mínimo)
-        current_max_latency = max(self.y_latency) if self.y_latency else 0
         # Establece un límite mínimo de 1000ms, pero expande si se supera
-        new_y_limit_latency = max(1000, current_max_latency * 1.1) 
-        self.axs[1].set_ylim(0, new_y_limit_latency) # Latencia hasta 1000ms
+        new_y_limit_latency = max(1000, self.max_latency_seen * 1.1) 
 
         # CPU y Memoria se mantienen fijos (0-100)
-        # self.axs[2].set_ylim(0, 100)
-        # self.axs[3].set_ylim(0, 100)
-
-        self.canvas.draw_idle() # Redibuja el lienzo
+        y_limits_changed = (self.axs[0].get_ylim() != (min_y_requests, max_y_requests)
+                            or self.axs[1].get_ylim() != (0, new_y_limit_latency))
+        if y_limits_changed:
+            self.axs[0].set_ylim(min_y_requests, max_y_requests)
+            self.axs[1].set_ylim(0, new_y_limit_latency) # Latencia hasta 1000ms
+
+        if not self.use_blit:
+            self.canvas.draw_idle() # Redibuja el lienzo
+        elif x_limits_changed or y_limits_changed or self._backgrounds is None:
+            # Cambiaron ticks o etiquetas: redibujo completo, que vuelve a capturar los fondos
+            self.canvas.draw()
+        else:
+            self._blit_lines()
 
         # Actualizar la etiqueta del paso actual
         self.step_label.config(text=f"Paso actual: {time_step}")
 
     def reset_charts(self):
         """Limpia los datos y gráficos para una nueva simulación."""
-        self.x_data = []
-        self.y_requests = []
-        self.y_latency = []
-        self.y_cpu = []
-        self.y_memory = []
+        self.visible_data.clear()
+        self.max_requests_seen = 0.0
+        self.max_latency_seen = 0.0
 
         self.line_requests.set_data([], [])
         self.line_latency.set_data([], [])
@@ -130,6 +291,7 @@ class SimulationTab(ttk.Frame):
         self.axs[2].set_ylim(0, 100) # CPU
         self.axs[3].set_ylim(0, 100) # Memoria
 
+        self._backgrounds = None
         self.canvas.draw_idle()
 
     def plot_paper_figures(self, config_params):
@@ -144,36 +306,30 @@ class SimulationTab(ttk.Frame):
 
         alpha = config_params.get('alpha', 0.499)
         x0 = config_params.get('x0', 0.3)
-        # Usar N de la simulación, mínimo 2 para evitar errores
-        N = max(2, int(config_params.get('num_bits', 100)))
+        # Usar N de la simulación, mínimo 2 para evitar errores y como mucho PAPER_FIGURE_MAX_STEPS
+        N = min(max(2, int(config_params.get('num_bits', 100))), PAPER_FIGURE_MAX_STEPS)
         N2 = N  # Usar el mismo N para la sensibilidad
 
         # Figura 1: Órbita del Skew Tent Map para el alpha dado
-        X = np.zeros(N)
-        X[0] = x0
-        def skew_tent_map(x, alpha):
-            return x / alpha if x < alpha else (1 - x) / (1 - alpha)
-        for i in range(1, N):
-            X[i] = skew_tent_map(X[i-1], alpha)
+        tent_map = SkewTentMap(alpha=alpha)
+        X = np.concatenate(([x0], tent_map.output(tent_map.iterate([x0], N - 1))))
+        # Las figuras dibujan una versión reducida de las series (el detalle completo queda
+        # en variability_data para exportación)
         fig1, ax1 = plt.subplots(figsize=(6, 4))
-        ax1.plot(range(N), X, marker='o', markersize=2, linestyle='-', color='blue')
+        ax1.plot(*lttb(np.arange(N), X, DEFAULT_MAX_POINTS), marker='o', markersize=2, linestyle='-', color='blue')
         ax1.set_title(f"Órbita Skew Tent Map (α={alpha:.4f}, x₀={x0}, N={N})")
         ax1.set_xlabel("Iteración")
         ax1.set_ylabel("$x_i$")
         ax1.set_ylim([0, 1])
         ax1.grid(True)
 
-        # Figura 2: Sensibilidad a condiciones iniciales
-        X1 = np.zeros(N2)
-        X2 = np.zeros(N2)
-        X1[0] = x0
-        X2[0] = x0 + 0.001  # valor inicial muy cercano
-        for i in range(1, N2):
-            X1[i] = skew_tent_map(X1[i-1], alpha)
-            X2[i] = skew_tent_map(X2[i-1], alpha)
+        # Figura 2: Sensibilidad a condiciones iniciales (valor inicial muy cercano), ambas
+        # órbitas en un mismo lote
+        initial = np.array([[x0], [x0 + 0.001]])
+        X1, X2 = np.concatenate((initial.T, tent_map.output(tent_map.iterate(initial, N2 - 1)))).T
         fig2, ax2 = plt.subplots(figsize=(6, 4))
-        ax2.plot(range(N2), X1, 'b-', label=f"x₀={x0:.3f}")
-        ax2.plot(range(N2), X2, 'r--', label=f"x₀={x0+0.001:.3f}")
+        ax2.plot(*decimate_minmax(np.arange(N2), X1), 'b-', label=f"x₀={x0:.3f}")
+        ax2.plot(*decimate_minmax(np.arange(N2), X2), 'r--', label=f"x₀={x0+0.001:.3f}")
         ax2.set_title(f"Sensibilidad a Condiciones Iniciales (α={alpha:.4f}, N={N2})")
         ax2.set_xlabel("Iteración")
         ax2.set_ylabel("$x_i$")
@@ -203,6 +359,7 @@ class SimulationTab(ttk.Frame):
         Genera y muestra las gráficas de órbitas.
         Guarda las figuras en self.orbit_figures para exportación.
         """
+        import matplotlib.pyplot as plt
         self.orbit_figures = []  # Limpiar figuras previas
         for i, orbit_data in enumerate(orbit_data_list):
             fig, ax = plt.subplots()
@@ -0,0 +1,220 @@
+"""
+Exportación de secuencias de bits en los formatos que leen las baterías externas:
+
+  packed     bytes empaquetados, el primer bit en el bit más significativo (NIST STS en
+             modo binario, TestU01 ufile_CreateReadBin)
+  ascii      un carácter '0'/'1' por bit, sin separadores (NIST STS en modo ASCII)
+  words32    enteros de 32 bits sin signo en binario crudo (dieharder -g 201)
+  dieharder  encabezado de dieharder y un entero de 32 bits por línea (dieharder -g 202)
+
+Uso sin GUI, generando y escribiendo por bloques:
+    python main.py bits salida.bin --num-bits 100000000 --format packed
+"""
+import argparse
+import os
+import sys
+import numpy as np
+
+from src.core.progress import OperationCancelled
+
+BITSTREAM_FORMATS = ('packed', 'ascii', 'words32', 'dieharder')
+BITSTREAM_EXTENSIONS = {'.bin': 'packed', '.txt': 'ascii', '.u32': 'words32', '.dh': 'dieharder'}
+# Bits procesados por bloque al escribir un arreglo (o un np.memmap) ya existente
+WRITE_CHUNK_BITS = 1 << 23
+# Bits generados por bloque al exportar directamente desde el generador
+GENERATOR_CHUNK_BITS = 1 << 16
+# Ancho fijo del contador del encabezado de dieharder, que se reescribe al cerrar
+_COUNT_WIDTH = 20
+
+
+class BitstreamWriter:
+    """
+    Escribe bits (arreglos de 0 y 1) en uno de BITSTREAM_FORMATS a medida que llegan.
+
+    Los bits que no completan un byte (o una palabra de 32 bits) quedan pendientes para el
+    siguiente write. Al cerrar, packed completa el último byte con ceros; words32 y dieharder
+    descartan la palabra incompleta. Los bloques se escriben desde el búfer de NumPy sin
+    convertirlos a bytes de Python.
+    """
+    def __init__(self, path: str, fmt: str = 'packed', byteorder: str = 'little', generator_name: str = 'cccbg'):
+        """
+        Args:
+            path (str): Archivo de salida.
+            fmt (str): Uno de BITSTREAM_FORMATS.
+            byteorder (str): Orden de bytes de words32 ('little' es el que lee dieharder en x86).
+            generator_name (str): Nombre que aparece en el encabezado de dieharder.
+        """
+        if fmt not in BITSTREAM_FORMATS:
+            raise ValueError(f"Formato de bits desconocido: '{fmt}'.")
+        if byteorder not in ('little', 'big'):
+            raise ValueError("byteorder debe ser 'little' o 'big'.")
+        self.path = path
+        self.fmt = fmt
+        self.byteorder = byteorder
+        self.bits_written = 0
+        self._unit = {'packed': 8, 'ascii': 1, 'words32': 32, 'dieharder': 32}[fmt]
+        self._pending = np.zeros(0, dtype=np.uint8)
+        self._file = open(path, 'wb')
+        self._count_offset = None
+        if fmt == 'dieharder':
+            self._file.write(("#" + "=" * 66 + "\n"
+                              f"# generator {generator_name}\n"
+                              "#" + "=" * 66 + "\n"
+                              "type: d\n").encode('ascii'))
+            self._count_offset = self._file.tell() + len("count: ")
+            self._file.write(f"count: {0:>{_COUNT_WIDTH}d}\nnumbit: 32\n".encode('ascii'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, bits):
+        """Agrega un bloque de bits."""
+        bits = np.asarray(bits, dtype=np.uint8)
+        if len(self._pending):
+            bits = np.concatenate((self._pending, bits))
+        usable = len(bits) - len(bits) % self._unit
+        self._pending = bits[usable:].copy()
+        if usable:
+            self._write_units(bits[:usable])
+
+    def _write_units(self, bits):
+        self.bits_written += len(bits)
+        if self.fmt == 'ascii':
+            # '0' = 0x30 y '1' = 0x31
+            self._file.write(memoryview(bits | 0x30))
+            return
+        packed = np.packbits(bits, bitorder='big')
+        if self.fmt == 'packed' or (self.fmt == 'words32' and self.byteorder == 'big'):
+            # Bytes en orden de bits big-endian: también son las palabras de 32 bits big-endian
+            self._file.write(memoryview(packed))
+        elif self.fmt == 'words32':
+            self._file.write(memoryview(packed.view('>u4').astype('<u4')))
+        else:
+            words = packed.view('>u4')
+            self._file.write(('\n'.join(map(str, words.tolist())) + '\n').encode('ascii'))
+
+    def close(self) -> int:
+        """Escribe lo pendiente, cierra el archivo y devuelve los bits escritos."""
+        if self._file.closed:
+            return self.bits_written
+        if self.fmt == 'packed' and len(self._pending):
+            self.bits_written += len(self._pending)
+            self._file.write(memoryview(np.packbits(self._pending, bitorder='big')))
+        self._pending = np.zeros(0, dtype=np.uint8)
+        if self._count_offset is not None:
+            self._file.seek(self._count_offset)
+            self._file.write(f"{self.bits_written // 32:>{_COUNT_WIDTH}d}".encode('ascii'))
+        self._file.close()
+        return self.bits_written
+
+    def abort(self):
+        """Cierra y borra el archivo a medias."""
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def format_for_path(path: str) -> str:
+    """Formato que corresponde a la extensión de path (ver BITSTREAM_EXTENSIONS)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in BITSTREAM_EXTENSIONS:
+        raise ValueError(f"Extensión no soportada para exportar bits: '{extension}'.")
+    return BITSTREAM_EXTENSIONS[extension]
+
+
+def write_bitstream(path: str, bits, fmt: str = None, byteorder: str = 'little',
+                    chunk_bits: int = WRITE_CHUNK_BITS, progress=None) -> int:
+    """
+    Escribe una secuencia de bits ya existente (arreglo o np.memmap, por ejemplo los bits
+    de read_stream) por bloques de chunk_bits. Devuelve los bits escritos.
+    """
+    fmt = fmt or format_for_path(path)
+    if progress is not None:
+        progress.start_phase("Exportación de bits", len(bits))
+    with BitstreamWriter(path, fmt, byteorder) as writer:
+        for start in range(0, len(bits), chunk_bits):
+            writer.write(bits[start:start + chunk_bits])
+            if progress is not None:
+                progress.update(min(start + chunk_bits, len(bits)))
+    if progress is not None:
+        progress.finish_phase()
+    return writer.bits_written
+
+
+def stream_generator_bitstream(path: str, alpha: float, x0: float, y0: float, num_bits: int,
+                               fmt: str = None, byteorder: str = 'little',
+                               chunk_bits: int = GENERATOR_CHUNK_BITS, progress=None) -> dict:
+    """
+    Genera num_bits bits con ChaoticBitGenerator y los escribe bloque a bloque, sin guardar
+    la secuencia en memoria. La verificación de periodo se hace dentro de cada bloque
+    (guardar todos los estados de una secuencia de varios GB no es viable); si un bloque
+    detecta una repetición, la exportación termina ahí.
+
+    Returns:
+        dict: 'bits_written' y 'period_ok'.
+    """
+    from src.core.chaotic_generator import ChaoticBitGenerator
+
+    fmt = fmt or format_for_path(path)
+    generator = ChaoticBitGenerator()
+    x, y = x0, y0
+    generated = 0
+    period_ok = True
+    if progress is not None:
+        progress.start_phase("Exportación de bits", num_bits)
+    with BitstreamWriter(path, fmt, byteorder) as writer:
+        while generated < num_bits:
+            bits, x_values, y_values, period_ok = generator.generate_cccbg_chunk(
+                alpha, x, y, min(chunk_bits, num_bits - generated))
+            writer.write(bits)
+            generated += len(bits)
+            if not period_ok:
+                break
+            x, y = float(x_values[-1]), float(y_values[-1])
+            if progress is not None:
+                progress.update(generated)
+    if progress is not None:
+        progress.finish_phase()
+    return {'bits_written': writer.bits_written, 'period_ok': period_ok}
+
+
+def main(argv=None) -> int:
+    from src.core.progress import ProgressReporter, format_progress
+    from src.core.simulation_runner import DEFAULT_CONFIG
+
+    parser = argparse.ArgumentParser(
+        prog='main.py bits',
+        description="Genera bits caóticos y los escribe en formatos de baterías externas (NIST STS, dieharder, TestU01).")
+    parser.add_argument('output', help="Archivo de salida (.bin, .txt, .u32 o .dh si no se indica --format)")
+    parser.add_argument('--num-bits', type=int, required=True, help="Bits a generar")
+    parser.add_argument('--format', choices=BITSTREAM_FORMATS, default=None, help="Formato de salida")
+    parser.add_argument('--byteorder', choices=('little', 'big'), default='little', help="Orden de bytes de words32")
+    parser.add_argument('--alpha', type=float, default=DEFAULT_CONFIG['alpha'])
+    parser.add_argument('--x0', type=float, default=DEFAULT_CONFIG['x0'])
+    parser.add_argument('--y0', type=float, default=DEFAULT_CONFIG['y0'])
+    args = parser.parse_args(argv)
+
+    progress = ProgressReporter(lambda update: print(format_progress(update), file=sys.stderr), min_interval=2.0)
+    try:
+        result = stream_generator_bitstream(args.output, args.alpha, args.x0, args.y0, args.num_bits,
+                                            fmt=args.format, byteorder=args.byteorder, progress=progress)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    except (KeyboardInterrupt, OperationCancelled):
+        print("Exportación cancelada.", file=sys.stderr)
+        return 1
+    print(f"{result['bits_written']} bits escritos en {args.output}")
+    if not result['period_ok']:
+        print("Aviso: se detectó una repetición de estado; la secuencia se detuvo.", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
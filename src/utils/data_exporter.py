@@ -1,23 +1,426 @@
-import pandas as pd
+import os
+import json
+import zipfile
+import importlib.util
 import numpy as np
 import datetime
-from tkinter import filedialog, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
+from src.core.progress import OperationCancelled
+
+# Filas escritas entre dos avisos de progreso al exportar a CSV
+EXPORT_CHUNK_ROWS = 100000
+
+# Formatos binarios por columnas: extensión -> formato, y módulo opcional que requiere cada uno
+COLUMNAR_EXTENSIONS = {'.parquet': 'parquet', '.feather': 'feather', '.arrow': 'feather',
+                       '.h5': 'hdf5', '.hdf5': 'hdf5', '.npz': 'npz'}
+COLUMNAR_REQUIREMENTS = {'parquet': 'pyarrow', 'feather': 'pyarrow', 'hdf5': 'h5py', 'npz': None}
+# Compresión por defecto de cada formato (compression=True)
+COLUMNAR_DEFAULT_CODECS = {'parquet': 'zstd', 'feather': 'zstd', 'hdf5': 'gzip', 'npz': 'deflate'}
+# Filas por grupo (Parquet), lote (Feather) o bloque (HDF5); también el paso del progreso
+COLUMNAR_ROW_GROUP_ROWS = 1 << 20
+# Clave bajo la que se guardan los metadatos (configuración) en cada formato
+COLUMNAR_METADATA_KEY = 'bitgen'
+COLUMNAR_FORMAT_VERSION = 1
 
 class DataExporter:
     """
     Clase de utilidad para exportar datos de simulación y resultados de pruebas
     a varios formatos (CSV, PDF).
     """
+    @staticmethod
+    def _write_columns_csv(file_path: str, columns: dict, index_label: str, progress=None, phase: str = None):
+        """
+        Escribe las columnas ({nombre: valores}) en CSV por bloques de EXPORT_CHUNK_ROWS
+        filas: cada bloque se lee de sus columnas al escribirlo, de modo que un historial en
+        disco (MemmapHistory) nunca se carga completo. Informa el avance a progress; si se
+        cancela, borra el archivo a medias y relanza OperationCancelled.
+        """
+        import pandas as pd
+        num_rows = len(next(iter(columns.values())))
+        if progress is not None:
+            progress.start_phase(phase, num_rows)
+        try:
+            for start in range(0, max(num_rows, 1), EXPORT_CHUNK_ROWS):
+                stop = min(start + EXPORT_CHUNK_ROWS, num_rows)
+                chunk = pd.DataFrame({key: np.asarray(values[start:stop]) for key, values in columns.items()},
+                                     index=pd.RangeIndex(start, stop))
+                chunk.to_csv(file_path, index_label=index_label, mode='w' if start == 0 else 'a', header=start == 0)
+                if progress is not None:
+                    progress.advance(len(chunk))
+        except OperationCancelled:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+        if progress is not None:
+            progress.finish_phase()
+
+    @staticmethod
+    def write_history_csv(file_path: str, simulation_history: dict, progress=None):
+        """Escribe el historial de métricas en file_path, sin diálogos (uso sin GUI)."""
+        DataExporter._write_columns_csv(file_path, simulation_history, 'paso', progress, "Exportación del historial")
+
+    @staticmethod
+    def write_bits_csv(file_path: str, bit_sequence: np.ndarray, x_values=None, period_ok=None, progress=None):
+        """
+        Escribe la secuencia de bits (y sus valores reales, si coinciden en longitud) en
+        file_path, con el resultado de periodo como comentario final. Sin diálogos.
+        """
+        # Columnas con valor real y bit
+        if x_values is not None and len(x_values) == len(bit_sequence):
+            columns = {'valor_real': x_values, 'valor_bit': bit_sequence}
+        else:
+            columns = {'valor_bit': bit_sequence}
+        DataExporter._write_columns_csv(file_path, columns, 'indice_bit', progress, "Exportación de bits")
+        # Escribir el resultado de periodo al final del archivo
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write("\n")
+            if period_ok is not None:
+                msg = "PERIODO: CUMPLIDO" if period_ok else "PERIODO: NO CUMPLIDO"
+                f.write(f"# {msg}\n")
+
+    @staticmethod
+    def available_columnar_formats() -> list:
+        """Formatos binarios utilizables en este entorno (npz siempre lo está)."""
+        return [fmt for fmt, module in COLUMNAR_REQUIREMENTS.items()
+                if module is None or importlib.util.find_spec(module) is not None]
+
+    @staticmethod
+    def resolve_columnar_format(file_path: str):
+        """
+        Formato según la extensión de file_path. Si falta la librería opcional que requiere,
+        se usa HDF5 o, en último caso, NPZ, cambiando la extensión.
+
+        Returns:
+            tuple: (ruta final, formato)
+        """
+        root, extension = os.path.splitext(file_path)
+        fmt = COLUMNAR_EXTENSIONS.get(extension.lower())
+        if fmt is None:
+            raise ValueError(f"Extensión no soportada para exportación binaria: '{extension}'.")
+        available = DataExporter.available_columnar_formats()
+        if fmt in available:
+            return file_path, fmt
+        fallback = 'hdf5' if 'hdf5' in available else 'npz'
+        return root + ('.h5' if fallback == 'hdf5' else '.npz'), fallback
+
+    @staticmethod
+    def history_columns(simulation_history: dict) -> dict:
+        """Columnas del historial como arreglos NumPy (sin copia si ya lo son)."""
+        return {key: np.asarray(values, dtype=np.int64 if key == 'time_steps' else np.float64)
+                for key, values in simulation_history.items()}
+
+    @staticmethod
+    def bits_columns(bit_sequence: np.ndarray, x_values=None) -> dict:
+        """Columnas de la secuencia de bits (y sus valores reales, si coinciden en longitud)."""
+        columns = {}
+        if x_values is not None and len(x_values) == len(bit_sequence):
+            columns['valor_real'] = np.asarray(x_values, dtype=np.float64)
+        columns['valor_bit'] = np.asarray(bit_sequence, dtype=np.uint8)
+        return columns
+
+    @staticmethod
+    def write_columnar(file_path: str, columns: dict, metadata: dict = None, fmt: str = None,
+                       compression=True, row_group_rows: int = COLUMNAR_ROW_GROUP_ROWS, progress=None) -> str:
+        """
+        Escribe una tabla (columnas NumPy de igual longitud) en formato binario por columnas,
+        directamente desde los arreglos y por bloques de row_group_rows filas.
+
+        Args:
+            file_path (str): Ruta de salida; su extensión elige el formato si fmt es None.
+            columns (dict): {nombre: arreglo 1-D}.
+            metadata (dict): Se guarda como JSON (configuración de la ejecución, etc.).
+            fmt (str): 'parquet', 'feather', 'hdf5' o 'npz'.
+            compression: True (códec por defecto del formato), False, o el nombre del códec.
+            row_group_rows (int): Filas por grupo de Parquet, lote de Feather o bloque de HDF5.
+            progress (ProgressReporter): Avance en valores escritos; si se cancela se borra
+                el archivo a medias y se relanza OperationCancelled.
+
+        Returns:
+            str: Ruta escrita (puede cambiar la extensión si se recurre a otro formato).
+        """
+        if fmt is None:
+            file_path, fmt = DataExporter.resolve_columnar_format(file_path)
+        if fmt not in COLUMNAR_REQUIREMENTS:
+            raise ValueError(f"Formato binario desconocido: '{fmt}'.")
+        columns = {name: np.ascontiguousarray(column) for name, column in columns.items()}
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Todas las columnas deben tener la misma longitud.")
+        num_rows = lengths.pop() if lengths else 0
+        if compression is True:
+            compression = COLUMNAR_DEFAULT_CODECS[fmt]
+        elif not compression:
+            compression = None
+        row_group_rows = max(1, int(row_group_rows))
+        meta = {'format_version': COLUMNAR_FORMAT_VERSION,
+                'created': datetime.datetime.now().isoformat(timespec='seconds')}
+        meta.update(metadata or {})
+        meta_json = json.dumps(meta, ensure_ascii=False, default=str)
+
+        if progress is not None:
+            progress.start_phase(f"Exportación {fmt}", num_rows * len(columns))
+        writer = getattr(DataExporter, f'_write_{fmt}')
+        try:
+            writer(file_path, columns, num_rows, meta_json, compression, row_group_rows, progress)
+        except OperationCancelled:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+        if progress is not None:
+            progress.finish_phase()
+        return file_path
+
+    @staticmethod
+    def _row_blocks(num_rows, row_group_rows):
+        return [(start, min(start + row_group_rows, num_rows)) for start in range(0, num_rows, row_group_rows)]
+
+    @staticmethod
+    def _arrow_schema(columns, meta_json):
+        import pyarrow as pa
+        fields = [pa.field(name, pa.from_numpy_dtype(column.dtype)) for name, column in columns.items()]
+        return pa.schema(fields, metadata={COLUMNAR_METADATA_KEY: meta_json})
+
+    @staticmethod
+    def _arrow_batches(columns, num_rows, schema, row_group_rows, progress):
+        import pyarrow as pa
+        # pa.array sobre una rebanada numérica sin nulos no copia los datos
+        for start, stop in DataExporter._row_blocks(num_rows, row_group_rows):
+            arrays = [pa.array(column[start:stop]) for column in columns.values()]
+            yield pa.Table.from_arrays(arrays, schema=schema)
+            if progress is not None:
+                progress.advance((stop - start) * len(columns))
+
+    @staticmethod
+    def _write_parquet(file_path, columns, num_rows, meta_json, compression, row_group_rows, progress):
+        import pyarrow.parquet as pq
+        schema = DataExporter._arrow_schema(columns, meta_json)
+        with pq.ParquetWriter(file_path, schema, compression=compression or 'none') as writer:
+            for table in DataExporter._arrow_batches(columns, num_rows, schema, row_group_rows, progress):
+                writer.write_table(table, row_group_size=row_group_rows)
+
+    @staticmethod
+    def _write_feather(file_path, columns, num_rows, meta_json, compression, row_group_rows, progress):
+        # Feather v2 es el formato de archivo IPC de Arrow; se escribe lote a lote
+        import pyarrow as pa
+        schema = DataExporter._arrow_schema(columns, meta_json)
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        with pa.OSFile(file_path, 'wb') as sink, pa.ipc.new_file(sink, schema, options=options) as writer:
+            for table in DataExporter._arrow_batches(columns, num_rows, schema, row_group_rows, progress):
+                writer.write_table(table)
+
+    @staticmethod
+    def _write_hdf5(file_path, columns, num_rows, meta_json, compression, row_group_rows, progress):
+        import h5py
+        with h5py.File(file_path, 'w') as f:
+            f.attrs[COLUMNAR_METADATA_KEY] = meta_json
+            datasets = {}
+            for name, column in columns.items():
+                options = {'chunks': (min(row_group_rows, num_rows),), 'compression': compression} if num_rows else {}
+                datasets[name] = f.create_dataset(name, shape=(num_rows,), dtype=column.dtype, **options)
+            for start, stop in DataExporter._row_blocks(num_rows, row_group_rows):
+                for name, column in columns.items():
+                    datasets[name][start:stop] = column[start:stop]
+                if progress is not None:
+                    progress.advance((stop - start) * len(columns))
+
+    @staticmethod
+    def _write_npz(file_path, columns, num_rows, meta_json, compression, row_group_rows, progress):
+        # Se escribe cada .npy dentro del zip por bloques (np.savez necesita todo el arreglo a la vez)
+        zip_compression = zipfile.ZIP_STORED if compression is None else zipfile.ZIP_DEFLATED
+        # Nivel 1: la mayor parte de la reducción de tamaño a una fracción del costo
+        with zipfile.ZipFile(file_path, 'w', compression=zip_compression, compresslevel=1, allowZip64=True) as archive:
+            for name, column in columns.items():
+                with archive.open(name + '.npy', 'w', force_zip64=True) as member:
+                    np.lib.format.write_array_header_1_0(member, np.lib.format.header_data_from_array_1_0(column))
+                    for start, stop in DataExporter._row_blocks(num_rows, row_group_rows):
+                        member.write(column[start:stop].tobytes())
+                        if progress is not None:
+                            progress.advance(stop - start)
+            with archive.open(COLUMNAR_METADATA_KEY + '.npy', 'w') as member:
+                np.lib.format.write_array(member, np.array(meta_json))
+
+    @staticmethod
+    def read_columnar(file_path: str):
+        """
+        Lee un archivo escrito por write_columnar.
+
+        Returns:
+            tuple: ({nombre: arreglo NumPy}, metadatos dict)
+        """
+        fmt = COLUMNAR_EXTENSIONS.get(os.path.splitext(file_path)[1].lower())
+        if fmt in ('parquet', 'feather'):
+            if fmt == 'parquet':
+                import pyarrow.parquet as pq
+                table = pq.read_table(file_path)
+            else:
+                import pyarrow.feather as feather
+                table = feather.read_table(file_path)
+            columns = {name: table.column(name).to_numpy() for name in table.column_names}
+            meta_json = (table.schema.metadata or {}).get(COLUMNAR_METADATA_KEY.encode(), b'{}').decode('utf-8')
+        elif fmt == 'hdf5':
+            import h5py
+            with h5py.File(file_path, 'r') as f:
+                columns = {name: f[name][()] for name in f.keys()}
+                meta_json = f.attrs.get(COLUMNAR_METADATA_KEY, '{}')
+        elif fmt == 'npz':
+            with np.load(file_path, allow_pickle=False) as data:
+                columns = {name: data[name] for name in data.files if name != COLUMNAR_METADATA_KEY}
+                meta_json = str(data[COLUMNAR_METADATA_KEY]) if COLUMNAR_METADATA_KEY in data.files else '{}'
+        else:
+            raise ValueError(f"Extensión no soportada para exportación binaria: '{file_path}'.")
+        if isinstance(meta_json, bytes):
+            meta_json = meta_json.decode('utf-8')
+        return columns, json.loads(meta_json)
+
+    @staticmethod
+    def write_columnar_export(file_path: str, simulation_history: dict, bit_sequence: np.ndarray,
+                              x_values=None, period_ok=None, variability_data=None, config_params=None,
+                              compression=True, progress=None) -> list:
+        """
+        Exporta historial, bits y variabilidad en formato binario por columnas, una tabla por
+        archivo (file_path, *_bits, *_variabilidad_orbita, *_variabilidad_sensibilidad), con
+        la configuración en los metadatos. Sin diálogos.
+
+        Returns:
+            list: Rutas escritas.
+        """
+        file_path, fmt = DataExporter.resolve_columnar_format(file_path)
+        root, extension = os.path.splitext(file_path)
+        if config_params is None and variability_data is not None:
+            config_params = variability_data.get('config_params')
+        base_meta = {'config_params': config_params, 'period_ok': period_ok}
+
+        tables = []
+        if simulation_history and any(len(v) > 0 for v in simulation_history.values()):
+            tables.append(('', 'historial', DataExporter.history_columns(simulation_history)))
+        if bit_sequence is not None and len(bit_sequence) > 0:
+            tables.append(('_bits', 'bits', DataExporter.bits_columns(bit_sequence, x_values)))
+        if variability_data is not None and 'orbit_x' in variability_data and 'orbit_iterations' in variability_data:
+            tables.append(('_variabilidad_orbita', 'variabilidad_orbita', {
+                'iteracion': np.asarray(variability_data['orbit_iterations'], dtype=np.int64),
+                'x_valor': np.asarray(variability_data['orbit_x'], dtype=np.float64)
+            }))
+            if 'sensitivity_x1' in variability_data and 'sensitivity_x2' in variability_data:
+                tables.append(('_variabilidad_sensibilidad', 'variabilidad_sensibilidad', {
+                    'iteracion': np.asarray(variability_data['sensitivity_iterations'], dtype=np.int64),
+                    'x1_valor': np.asarray(variability_data['sensitivity_x1'], dtype=np.float64),
+                    'x2_valor': np.asarray(variability_data['sensitivity_x2'], dtype=np.float64)
+                }))
+
+        written = []
+        for suffix, table_name, columns in tables:
+            metadata = dict(base_meta, table=table_name)
+            written.append(DataExporter.write_columnar(root + suffix + extension, columns, metadata, fmt=fmt,
+                                                       compression=compression, progress=progress))
+        return written
+
+    @staticmethod
+    def write_variability_csv(file_path: str, variability_data: dict) -> bool:
+        """
+        Escribe la órbita del mapa, la sensibilidad a condiciones iniciales (si están) y los
+        parámetros de configuración en file_path. Sin diálogos; devuelve False si faltan
+        los datos de la órbita.
+        """
+        import pandas as pd
+        if 'orbit_x' not in variability_data or 'orbit_iterations' not in variability_data:
+            return False
+        df_orbit = pd.DataFrame({
+            'iteracion': variability_data['orbit_iterations'],
+            'x_valor': variability_data['orbit_x']
+        })
+        df_orbit.to_csv(file_path, index=False)
+
+        # Agregar datos de sensibilidad si están disponibles
+        if 'sensitivity_x1' in variability_data and 'sensitivity_x2' in variability_data:
+            with open(file_path, "a", encoding="utf-8") as f:
+                f.write("\n# DATOS DE SENSIBILIDAD A CONDICIONES INICIALES\n")
+            df_sensitivity = pd.DataFrame({
+                'iteracion': variability_data['sensitivity_iterations'],
+                'x1_valor': variability_data['sensitivity_x1'],
+                'x2_valor': variability_data['sensitivity_x2']
+            })
+            df_sensitivity.to_csv(file_path, mode='a', index=False)
+
+        # Agregar parámetros de configuración
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write("\n# PARÁMETROS DE CONFIGURACIÓN\n")
+            if 'config_params' in variability_data:
+                for key, value in variability_data['config_params'].items():
+                    f.write(f"# {key}: {value}\n")
+        return True
+
+    # Las funciones export_to_* piden la ruta con un diálogo (en el hilo de Tk) y devuelven
+    # la tarea de exportación: una función task(progress) sin diálogos que escribe los
+    # archivos informando su avance a un ProgressReporter (cancelable: los archivos a medias
+    # se borran y se lanza OperationCancelled) y devuelve el mensaje para el usuario. La
+    # tarea se ejecuta en un hilo aparte (ResultsTab._run_export); None si no hay nada que
+    # hacer (diálogo cancelado).
+
+    @staticmethod
+    def export_to_columnar(simulation_history: dict, bit_sequence: np.ndarray, x_values=None, period_ok=None,
+                           variability_data=None, config_params=None):
+        """
+        Pide la ruta para exportar en Parquet/Feather (si pyarrow está disponible), HDF5
+        (h5py) o NPZ. El formato se elige por la extensión.
+        """
+        from tkinter import filedialog
+
+        available = DataExporter.available_columnar_formats()
+        labels = {'parquet': ("Parquet", "*.parquet"), 'feather': ("Feather", "*.feather"),
+                  'hdf5': ("HDF5", "*.h5"), 'npz': ("NumPy comprimido", "*.npz")}
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=labels[available[0]][1][1:],
+            initialfile=f"simulacion_carga_{timestamp}",
+            title="Guardar Datos en Formato Binario",
+            filetypes=[labels[fmt] for fmt in available]
+        )
+        if not file_path:
+            return None
+
+        def task(progress):
+            written = DataExporter.write_columnar_export(
+                file_path, simulation_history, bit_sequence, x_values=x_values, period_ok=period_ok,
+                variability_data=variability_data, config_params=config_params, progress=progress
+            )
+            return "Datos guardados en:\n" + "\n".join(written) if written else "No hay datos para exportar."
+        return task
+
+    @staticmethod
+    def export_bitstream(bit_sequence: np.ndarray):
+        """
+        Pide la ruta para escribir la secuencia de bits en un formato de baterías externas
+        (bytes empaquetados, ASCII '0'/'1', palabras de 32 bits o archivo de dieharder).
+        """
+        from tkinter import filedialog
+        from src.utils.bitstream_export import write_bitstream
+
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".bin",
+            initialfile=f"secuencia_bits_{timestamp}",
+            title="Guardar Secuencia de Bits",
+            filetypes=[("Bytes empaquetados (NIST STS, TestU01)", "*.bin"), ("ASCII 0/1 (NIST STS)", "*.txt"),
+                       ("Palabras de 32 bits (dieharder -g 201)", "*.u32"), ("Archivo de dieharder (-g 202)", "*.dh")]
+        )
+        if not file_path:
+            return None
+
+        def task(progress):
+            bits_written = write_bitstream(file_path, bit_sequence, progress=progress)
+            return f"{bits_written} bits guardados en:\n{file_path}"
+        return task
+
     @staticmethod
     def export_to_csv(simulation_history: dict, bit_sequence: np.ndarray, x_values=None, period_ok=None, variability_data=None):
         """
-        Exporta el historial de la simulación y la secuencia de bits a archivos CSV.
+        Pide las rutas para exportar el historial de la simulación y la secuencia de bits a
+        archivos CSV.
         x_values: valores reales antes de decidir el bit (opcional)
         period_ok: bool, si la semilla cumple su periodo (opcional)
         variability_data: dict con datos de variabilidad/órbitas (opcional)
         """
+        from tkinter import filedialog
+
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         file_path_base = filedialog.asksaveasfilename(
             defaultextension=".csv",
@@ -26,100 +429,63 @@ class DataExporter:
             filetypes=[("Archivos CSV", "*.csv")]
         )
         if not file_path_base:
-            return
+            return None
 
-        try:
-            exported_any = False
+        has_history = bool(simulation_history) and any(len(v) > 0 for v in simulation_history.values())
+        has_bits = bit_sequence is not None and len(bit_sequence) > 0
+        bit_file_path = file_path_base.replace(".csv", "_bits.csv")
+        if has_bits and not has_history:
+            bit_file_path = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                initialfile=f"secuencia_bits_{timestamp}",
+                title="Guardar Secuencia de Bits CSV",
+                filetypes=[("Archivos CSV", "*.csv")]
+            )
+            if not bit_file_path:
+                return None
+
+        def task(progress):
+            messages = []
             # Exportar historial de métricas
-            if simulation_history and any(len(v) > 0 for v in simulation_history.values()):
-                df_history = pd.DataFrame(simulation_history)
-                df_history.index.name = 'paso'
-                df_history.to_csv(file_path_base)
-                exported_any = True
-                messagebox.showinfo("Exportación Exitosa", f"Historial de simulación guardado en:\n{file_path_base}")
+            if has_history:
+                DataExporter.write_history_csv(file_path_base, simulation_history, progress=progress)
+                messages.append(f"Historial de simulación guardado en:\n{file_path_base}")
             else:
-                messagebox.showinfo("Exportación CSV", "No hay historial de simulación para exportar.")
+                messages.append("No hay historial de simulación para exportar.")
 
             # Exportar secuencia de bits
-            if bit_sequence is not None and len(bit_sequence) > 0:
-                bit_file_path = file_path_base.replace(".csv", "_bits.csv") if exported_any else file_path_base
-                if not exported_any:
-                    bit_file_path = filedialog.asksaveasfilename(
-                        defaultextension=".csv",
-                        initialfile=f"secuencia_bits_{timestamp}",
-                        title="Guardar Secuencia de Bits CSV",
-                        filetypes=[("Archivos CSV", "*.csv")]
-                    )
-                    if not bit_file_path:
-                        return
-                # Crear DataFrame con valor real y bit
-                if x_values is not None and len(x_values) == len(bit_sequence):
-                    df_bits = pd.DataFrame({
-                        'valor_real': x_values,
-                        'valor_bit': bit_sequence
-                    })
-                else:
-                    df_bits = pd.DataFrame({'valor_bit': bit_sequence})
-                df_bits.index.name = 'indice_bit'
-                df_bits.to_csv(bit_file_path)
-                # Escribir el resultado de periodo al final del archivo
-                with open(bit_file_path, "a", encoding="utf-8") as f:
-                    f.write("\n")
-                    if period_ok is not None:
-                        msg = "PERIODO: CUMPLIDO" if period_ok else "PERIODO: NO CUMPLIDO"
-                        f.write(f"# {msg}\n")
-                messagebox.showinfo("Exportación Exitosa", f"Secuencia de bits guardada en:\n{bit_file_path}")
+            if has_bits:
+                DataExporter.write_bits_csv(bit_file_path, bit_sequence, x_values=x_values, period_ok=period_ok,
+                                            progress=progress)
+                messages.append(f"Secuencia de bits guardada en:\n{bit_file_path}")
             else:
-                messagebox.showinfo("Exportación CSV", "No hay secuencia de bits para exportar.")
+                messages.append("No hay secuencia de bits para exportar.")
 
             # Exportar datos de variabilidad
             if variability_data is not None:
                 variability_file_path = file_path_base.replace(".csv", "_variabilidad.csv")
                 try:
-                    # Exportar órbita del mapa
-                    if 'orbit_x' in variability_data and 'orbit_iterations' in variability_data:
-                        df_orbit = pd.DataFrame({
-                            'iteracion': variability_data['orbit_iterations'],
-                            'x_valor': variability_data['orbit_x']
-                        })
-                        df_orbit.to_csv(variability_file_path, index=False)
-                        
-                        # Agregar datos de sensibilidad si están disponibles
-                        if 'sensitivity_x1' in variability_data and 'sensitivity_x2' in variability_data:
-                            with open(variability_file_path, "a", encoding="utf-8") as f:
-                                f.write("\n# DATOS DE SENSIBILIDAD A CONDICIONES INICIALES\n")
-                            
-                            df_sensitivity = pd.DataFrame({
-                                'iteracion': variability_data['sensitivity_iterations'],
-                                'x1_valor': variability_data['sensitivity_x1'],
-                                'x2_valor': variability_data['sensitivity_x2']
-                            })
-                            df_sensitivity.to_csv(variability_file_path, mode='a', index=False)
-                        
-                        # Agregar parámetros de configuración
-                        with open(variability_file_path, "a", encoding="utf-8") as f:
-                            f.write("\n# PARÁMETROS DE CONFIGURACIÓN\n")
-                            if 'config_params' in variability_data:
-                                for key, value in variability_data['config_params'].items():
-                                    f.write(f"# {key}: {value}\n")
-                        
-                        messagebox.showinfo("Exportación Exitosa", f"Datos de variabilidad guardados en:\n{variability_file_path}")
+                    if DataExporter.write_variability_csv(variability_file_path, variability_data):
+                        messages.append(f"Datos de variabilidad guardados en:\n{variability_file_path}")
                     else:
-                        messagebox.showinfo("Exportación CSV", "No hay datos de variabilidad completos para exportar.")
-                        
+                        messages.append("No hay datos de variabilidad completos para exportar.")
                 except Exception as e:
-                    messagebox.showwarning("Advertencia", f"Error al exportar datos de variabilidad: {e}")
-
-        except Exception as e:
-            messagebox.showerror("Error de Exportación CSV", f"No se pudo exportar los datos a CSV: {e}")
+                    messages.append(f"Error al exportar datos de variabilidad: {e}")
+            return "\n\n".join(messages)
+        return task
 
     @staticmethod
-    def export_to_pdf(simulation_history: dict, bit_sequence: np.ndarray, test_results: dict, figures):
+    def export_to_pdf(simulation_history: dict, bit_sequence: np.ndarray, test_results: dict, figures=None,
+                      variability_data=None):
         """
-        Exporta un reporte completo de la simulación a un archivo PDF.
-        Incluye un resumen textual de los resultados y los gráficos.
-        Admite una lista de figuras o una lista de listas de figuras.
+        Pide la ruta de un reporte completo de la simulación en PDF, generado con
+        ReportBuilder: resumen textual, métricas, pruebas y variabilidad, dibujados a partir
+        de los datos reducidos y con las líneas rasterizadas. figures (una lista de figuras,
+        o de listas de figuras) se agregan al final.
         """
+        from tkinter import filedialog
+        from src.utils.report_builder import ReportBuilder
+
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         file_path = filedialog.asksaveasfilename(
             defaultextension=".pdf",
@@ -128,96 +494,21 @@ class DataExporter:
             filetypes=[("Archivos PDF", "*.pdf")]
         )
         if not file_path:
-            return
+            return None
 
-        try:
-            with PdfPages(file_path) as pdf:
-                # Página de Título/Resumen
-                fig_summary = plt.figure(figsize=(8.5, 11))
-                ax_summary = fig_summary.add_subplot(111)
-                ax_summary.axis('off')
-
-                summary_text = "Reporte de Simulación de Carga con Mapas Caóticos\n\n"
-                summary_text += f"Fecha del Reporte: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-
-                # Métricas de simulación
-                if simulation_history and any(len(v) > 0 for v in simulation_history.values()):
-                    summary_text += "--- Métricas de Simulación ---\n"
-                    num_steps = len(simulation_history.get('simulated_requests', []))
-                    summary_text += f"Número de Pasos Simulados: {num_steps}\n"
-                    if simulation_history.get('simulated_requests'):
-                        avg_req = np.mean(simulation_history['simulated_requests'])
-                        summary_text += f"Solicitudes Promedio: {avg_req:.2f}\n"
-                    if simulation_history.get('latency'):
-                        avg_lat = np.mean(simulation_history['latency'])
-                        summary_text += f"Latencia Promedio (ms): {avg_lat:.2f}\n"
-                        max_lat = np.max(simulation_history['latency'])
-                        summary_text += f"Latencia Máxima (ms): {max_lat:.2f}\n"
-                    if simulation_history.get('cpu'):
-                        avg_cpu = np.mean(simulation_history['cpu'])
-                        summary_text += f"Uso de CPU Promedio (%): {avg_cpu:.2f}\n"
-                    if simulation_history.get('memory'):
-                        avg_mem = np.mean(simulation_history['memory'])
-                        summary_text += f"Uso de Memoria Promedio (%): {avg_mem:.2f}\n"
-                    summary_text += "\n"
-
-                # Secuencia de bits
-                if bit_sequence is not None and len(bit_sequence) > 0:
-                    n0 = np.sum(bit_sequence == 0)
-                    n1 = np.sum(bit_sequence == 1)
-                    summary_text += f"--- Secuencia de Bits ---\n"
-                    summary_text += f"Longitud de Secuencia de Bits: {len(bit_sequence)}\n"
-                    summary_text += f"Cantidad de 0s: {n0} ({n0/len(bit_sequence)*100:.2f}%)\n"
-                    summary_text += f"Cantidad de 1s: {n1} ({n1/len(bit_sequence)*100:.2f}%)\n\n"
-
-                # Resultados de pruebas
-                if test_results:
-                    summary_text += "--- Resultados de Pruebas de Aleatoriedad ---\n"
-                    # Solo incluir Monobit Test en el PDF
-                    monobit_result = test_results.get('Monobit Test') or test_results.get('monobit')
-                    if monobit_result:
-                        p_value = monobit_result.get('p_value', np.nan)
-                        test_message = monobit_result.get('message', '')
-                        test_status = "N/A"
-                        if not np.isnan(p_value):
-                            test_status = "APROBADA" if p_value >= 0.01 else "NO APROBADA"
-                        summary_text += f"Monobit Test:\n"
-                        summary_text += f"  P-valor: {p_value:.4f}\n"
-                        summary_text += f"  Resultado: {test_status}\n"
-                        if test_message and test_message != "OK":
-                            summary_text += f"  Mensaje: {test_message}\n"
-                        summary_text += "\n"
-                    else:
-                        summary_text += "No hay resultados de Monobit Test disponibles.\n\n"
-                else:
-                    summary_text += "No hay resultados de pruebas de aleatoriedad disponibles.\n\n"
-
-                ax_summary.text(0.05, 0.95, summary_text,
-                                verticalalignment='top',
-                                horizontalalignment='left',
-                                transform=ax_summary.transAxes,
-                                fontsize=10,
-                                fontfamily='monospace')
-                pdf.savefig(fig_summary)
-                plt.close(fig_summary)
-
-                # Añadir todas las figuras proporcionadas (pueden ser listas anidadas de cualquier profundidad)
-                def flatten_figures(figs):
-                    result = []
-                    if isinstance(figs, list) or isinstance(figs, tuple):
-                        for f in figs:
-                            result.extend(flatten_figures(f))
-                    elif figs is not None:
-                        result.append(figs)
-                    return result
-
-                figs_to_export = flatten_figures(figures)
-                for fig in figs_to_export:
-                    if fig is not None:
-                        pdf.savefig(fig)
-            messagebox.showinfo("Exportación Exitosa", f"Reporte PDF guardado en:\n{file_path}")
-
-        except Exception as e:
-            messagebox.showerror("Error de Exportación PDF", f"No se pudo generar el reporte PDF: {e}")
-            import traceback
-            traceback.print_exc()
\ No newline at end of file
+        # Añadir todas las figuras proporcionadas (pueden ser listas anidadas de cualquier profundidad)
+        def flatten_figures(figs):
+            result = []
+            if isinstance(figs, list) or isinstance(figs, tuple):
+                for f in figs:
+                    result.extend(flatten_figures(f))
+            elif figs is not None:
+                result.append(figs)
+            return result
+
+        def task(progress):
+            ReportBuilder(progress=progress).build(file_path, simulation_history, bit_sequence, test_results,
+                                                   variability_data=variability_data,
+                                                   extra_figures=flatten_figures(figures))
+            return f"Reporte PDF guardado en:\n{file_path}"
+        return task
@@ -0,0 +1,192 @@
+import numpy as np
+
+# Puntos por columna de píxeles que se dibujan como máximo (un mínimo y un máximo)
+POINTS_PER_PIXEL = 2
+# Puntos a dibujar cuando no se conoce el ancho del eje
+DEFAULT_MAX_POINTS = 4000
+# Series más largas construyen su primer nivel por bloques, sin arreglos de índices de
+# tamaño n (p. ej. columnas np.memmap de un historial en disco)
+CHUNKED_LEVEL_POINTS = 1 << 22
+# Filas leídas por bloque al construir ese primer nivel
+LEVEL_CHUNK_ROWS = 1 << 20
+
+
+def minmax_indices(y: np.ndarray, bucket_size: int) -> np.ndarray:
+    """
+    Índices (ordenados) del mínimo y el máximo de cada grupo de bucket_size valores, más el
+    primero y el último. Conserva los picos de la serie, a diferencia de tomar uno de cada k.
+    """
+    y = np.asarray(y)
+    n = len(y)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if bucket_size <= 2 or n <= 2:
+        return np.arange(n)
+    num_full = n // bucket_size
+    lows, highs = [], []
+    if num_full:
+        blocks = y[:num_full * bucket_size].reshape(num_full, bucket_size)
+        offsets = np.arange(num_full) * bucket_size
+        lows.append(offsets + blocks.argmin(axis=1))
+        highs.append(offsets + blocks.argmax(axis=1))
+    if n % bucket_size:
+        start = num_full * bucket_size
+        tail = y[start:]
+        lows.append(np.array([start + tail.argmin()]))
+        highs.append(np.array([start + tail.argmax()]))
+    return _interleave(np.concatenate(lows), np.concatenate(highs), n)
+
+
+def _interleave(lows, highs, n):
+    # Dentro de cada grupo, el mínimo y el máximo en el orden en que aparecen; como los
+    # grupos son consecutivos el resultado ya queda ordenado y solo hay que quitar repetidos
+    indices = np.column_stack((np.minimum(lows, highs), np.maximum(lows, highs))).ravel()
+    indices = np.concatenate(([0], indices, [n - 1]))
+    keep = np.ones(len(indices), dtype=bool)
+    keep[1:] = indices[1:] != indices[:-1]
+    return indices[keep]
+
+
+def _reduce_groups(indices, y, factor, arg_function):
+    """Agrupa índices consecutivos de a factor y deja el del extremo (argmin/argmax) de cada grupo."""
+    pad = (-len(indices)) % factor
+    if pad:
+        indices = np.concatenate((indices, np.repeat(indices[-1], pad)))
+    groups = indices.reshape(-1, factor)
+    chosen = arg_function(y[groups], axis=1)
+    return groups[np.arange(len(groups)), chosen]
+
+
+def _chunked_extrema(y, bucket_size, chunk_rows):
+    """Índices del mínimo y el máximo de cada grupo de bucket_size valores, leyendo y por bloques."""
+    chunk_rows = max(bucket_size, chunk_rows // bucket_size * bucket_size)
+    lows, highs = [], []
+    for start in range(0, len(y), chunk_rows):
+        block = np.asarray(y[start:start + chunk_rows])
+        pad = (-len(block)) % bucket_size
+        if pad:
+            block = np.concatenate((block, np.repeat(block[-1:], pad)))
+        groups = block.reshape(-1, bucket_size)
+        offsets = start + np.arange(len(groups)) * bucket_size
+        # El relleno repite el último valor, que argmin/argmax solo eligen si es el primero
+        lows.append(offsets + groups.argmin(axis=1))
+        highs.append(offsets + groups.argmax(axis=1))
+    return np.concatenate(lows), np.concatenate(highs)
+
+
+def decimate_minmax(x, y, max_points: int = DEFAULT_MAX_POINTS):
+    """Reduce (x, y) a unos max_points puntos con mínimo/máximo por grupo."""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) <= max_points:
+        return x, y
+    bucket_size = int(np.ceil(len(y) * 2 / max_points))
+    indices = minmax_indices(y, bucket_size)
+    return x[indices], y[indices]
+
+
+def minmax_envelope(x, y, num_buckets: int):
+    """
+    Envolvente de la serie: para cada uno de num_buckets grupos consecutivos devuelve el x
+    inicial, el mínimo y el máximo. Dibujada con fill_between equivale a la línea completa a
+    esa resolución, con un solo polígono en lugar de miles de segmentos en zigzag.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    bucket_size = max(1, int(np.ceil(len(y) / max(1, num_buckets))))
+    starts = np.arange(0, len(y), bucket_size)
+    return x[starts], np.minimum.reduceat(y, starts), np.maximum.reduceat(y, starts)
+
+
+def lttb(x, y, threshold: int):
+    """
+    Largest-Triangle-Three-Buckets: elige threshold puntos que conservan la forma visual de
+    la serie (de cada grupo, el que forma el triángulo de mayor área con el punto elegido
+    anterior y el promedio del grupo siguiente).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_end = edges[i + 2]
+            avg_x = x[end:next_end].mean()
+            avg_y = y[end:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        areas = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(areas.argmax())
+        selected[i + 1] = previous
+    return x[selected], y[selected]
+
+
+class LODPyramid:
+    """
+    Pirámide de niveles de detalle de una serie (x creciente, y).
+
+    El nivel 0 son los datos originales; cada nivel siguiente guarda el mínimo y el máximo de
+    grupos `factor` veces más grandes. query elige el nivel más fino que cabe en el número de
+    puntos pedido para el rango visible, de modo que el costo de dibujo queda acotado y al
+    hacer zoom se recupera el detalle.
+    """
+    def __init__(self, x, y, factor: int = 4, min_points: int = DEFAULT_MAX_POINTS // 2):
+        if factor < 2:
+            raise ValueError("El factor de la pirámide debe ser al menos 2.")
+        x = np.asarray(x)
+        y = np.asarray(y)
+        if len(x) != len(y):
+            raise ValueError("x e y deben tener la misma longitud.")
+        self.levels = [(x, y)]
+        if len(y) == 0:
+            return
+        # Cada nivel se obtiene de los extremos del anterior (el mínimo de los mínimos es el
+        # mínimo del grupo mayor), de modo que construir la pirámide es O(n)
+        if len(y) > CHUNKED_LEVEL_POINTS:
+            # Serie muy larga: el primer nivel agrupa de a factor^k leyendo y por bloques
+            bucket_size = factor
+            while len(y) > CHUNKED_LEVEL_POINTS * bucket_size:
+                bucket_size *= factor
+            lows, highs = _chunked_extrema(y, bucket_size, LEVEL_CHUNK_ROWS)
+            indices = _interleave(lows, highs, len(y))
+            self.levels.append((x[indices], y[indices]))
+        else:
+            lows = highs = np.arange(len(y))
+        while len(self.levels[-1][0]) > min_points:
+            lows = _reduce_groups(lows, y, factor, np.argmin)
+            highs = _reduce_groups(highs, y, factor, np.argmax)
+            indices = _interleave(lows, highs, len(y))
+            if len(indices) >= len(self.levels[-1][0]):
+                break
+            self.levels.append((x[indices], y[indices]))
+
+    def __len__(self):
+        return len(self.levels[0][0])
+
+    def query(self, x_min=None, x_max=None, max_points: int = DEFAULT_MAX_POINTS):
+        """
+        Devuelve (x, y) del rango [x_min, x_max] con como mucho ~max_points puntos (salvo en
+        el nivel más grueso). Incluye un punto a cada lado para que la línea llegue al borde.
+        """
+        for level_x, level_y in self.levels:
+            start = 0 if x_min is None else max(0, np.searchsorted(level_x, x_min, side='left') - 1)
+            stop = len(level_x) if x_max is None else min(len(level_x), np.searchsorted(level_x, x_max, side='right') + 1)
+            if stop - start <= max_points:
+                break
+        return level_x[start:stop], level_y[start:stop]
+
+
+def max_points_for_axes(ax) -> int:
+    """Puntos a dibujar en un eje según su ancho en píxeles."""
+    width = ax.bbox.width if ax is not None else 0
+    if not width or not np.isfinite(width):
+        return DEFAULT_MAX_POINTS
+    return max(200, int(width * POINTS_PER_PIXEL))
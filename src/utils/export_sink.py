@@ -0,0 +1,212 @@
+import json
+import os
+import queue
+import threading
+import numpy as np
+
+STREAM_FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+# Columnas de cada tabla y su tipo en disco (binario crudo, una columna por archivo). El
+# historial sigue el orden de STEP_COLUMNS, el mismo de los lotes que recibe on_steps.
+HISTORY_DTYPES = {'time_steps': '<i8', 'simulated_requests': '<f8', 'latency': '<f8', 'cpu': '<f8', 'memory': '<f8'}
+BITS_DTYPES = {'bits': '|u1', 'x_values': '<f8'}
+# Filas acumuladas antes de pasar un lote al hilo escritor
+DEFAULT_BUFFER_ROWS = 65536
+
+
+def _column_files(directory):
+    files = {key: os.path.join(directory, f'history_{key}.bin') for key in HISTORY_DTYPES}
+    files.update({key: os.path.join(directory, f'{key}.bin') for key in BITS_DTYPES})
+    return files
+
+
+class StreamingExportSink:
+    """
+    Escribe en disco el historial y los bits a medida que se producen, para que una
+    ejecución larga no necesite conservarlos en memoria y un fallo no pierda lo ya simulado.
+
+    Cada columna se agrega a su propio archivo binario (legible con read_stream como
+    np.memmap). append acumula filas en memoria y, cada buffer_rows, pasa el lote a un hilo
+    escritor por una cola acotada (si el disco no da abasto, append espera). sync() fuerza
+    flush y fsync de todos los archivos y actualiza manifest.json con las filas ya seguras;
+    SimulationRunner lo llama en cada checkpoint, que se guarda recién cuando ese sync
+    termina (wait_synced).
+    """
+    def __init__(self, directory: str, config_params: dict = None, start_rows: int = 0,
+                 buffer_rows: int = DEFAULT_BUFFER_ROWS, max_pending: int = 8):
+        """
+        Args:
+            directory (str): Carpeta de salida (se crea si no existe).
+            config_params (dict): Configuración de la ejecución, guardada en el manifiesto.
+            start_rows (int): Filas a conservar de una escritura anterior (al reanudar desde
+                un checkpoint de start_rows pasos); 0 empieza archivos nuevos.
+            buffer_rows (int): Filas por lote escrito.
+            max_pending (int): Lotes en cola como máximo antes de bloquear append.
+        """
+        self.directory = directory
+        self.config_params = config_params
+        self.buffer_rows = max(1, int(buffer_rows))
+        self.rows = start_rows
+        self.error = None
+        self._pending = []
+        self._pending_rows = 0
+        self._closed = False
+
+        os.makedirs(directory, exist_ok=True)
+        self._files = {}
+        for key, path in _column_files(directory).items():
+            if start_rows:
+                itemsize = np.dtype({**HISTORY_DTYPES, **BITS_DTYPES}[key]).itemsize
+                if not os.path.exists(path) or os.path.getsize(path) < start_rows * itemsize:
+                    raise ValueError(f"El flujo en '{directory}' tiene menos de {start_rows} filas.")
+                f = open(path, 'r+b')
+                # Descartar lo escrito después del checkpoint desde el que se reanuda
+                f.truncate(start_rows * itemsize)
+                f.seek(0, os.SEEK_END)
+            else:
+                f = open(path, 'wb')
+            self._files[key] = f
+        self._write_manifest(complete=False)
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def append(self, steps: np.ndarray, bits, x_values):
+        """
+        Agrega k pasos: steps es un arreglo (5, k) con filas según HISTORY_DTYPES (como los
+        lotes de SimulationRunner.on_steps); bits y x_values tienen longitud k.
+        """
+        self._raise_error()
+        steps = np.asarray(steps)
+        if steps.shape[1] != len(bits) or len(bits) != len(x_values):
+            raise ValueError("steps, bits y x_values deben tener el mismo número de pasos.")
+        if len(bits) == 0:
+            return
+        columns = {key: np.asarray(row, dtype=dtype) for (key, dtype), row in zip(HISTORY_DTYPES.items(), steps)}
+        columns['bits'] = np.asarray(bits, dtype=BITS_DTYPES['bits'])
+        columns['x_values'] = np.asarray(x_values, dtype=BITS_DTYPES['x_values'])
+        self._pending.append(columns)
+        self._pending_rows += len(bits)
+        self.rows += len(bits)
+        if self._pending_rows >= self.buffer_rows:
+            self._flush_pending()
+
+    def sync(self, wait: bool = False) -> threading.Event:
+        """
+        Pasa lo pendiente al escritor y pide flush, fsync y manifiesto. Devuelve un Event que
+        se activa cuando las filas agregadas hasta ahora están en disco (o la escritura
+        falló); con wait=True espera a que ocurra (ver wait_synced).
+        """
+        self._raise_error()
+        self._flush_pending()
+        synced = threading.Event()
+        self._queue.put(('sync', self.rows, False, synced))
+        if wait:
+            self.wait_synced(synced)
+        return synced
+
+    def wait_synced(self, synced: threading.Event):
+        """Espera un sync pedido con sync() y relanza el error de escritura, si lo hubo."""
+        synced.wait()
+        self._raise_error()
+
+    def close(self):
+        """Escribe todo, sincroniza, marca el manifiesto como completo y detiene el hilo."""
+        if self._closed:
+            return
+        self._closed = True
+        self._flush_pending()
+        self._queue.put(('sync', self.rows, True, None))
+        self._queue.put(None)
+        self._thread.join()
+        for f in self._files.values():
+            f.close()
+        self._raise_error()
+
+    def _flush_pending(self):
+        if not self._pending:
+            return
+        batch = {key: np.concatenate([part[key] for part in self._pending]) for key in self._pending[0]}
+        self._pending = []
+        self._pending_rows = 0
+        self._queue.put(('write', batch))
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            try:
+                if self.error is not None:
+                    continue
+                if item[0] == 'write':
+                    for key, values in item[1].items():
+                        self._files[key].write(values.tobytes())
+                else:
+                    for f in self._files.values():
+                        f.flush()
+                        os.fsync(f.fileno())
+                    self._write_manifest(complete=item[2], rows=item[1])
+            except Exception as e:
+                self.error = e
+            finally:
+                # Quien espera este sync se libera también si falló (y ve self.error)
+                if item[0] == 'sync' and item[3] is not None:
+                    item[3].set()
+
+    def _write_manifest(self, complete: bool, rows: int = None):
+        manifest = {
+            'format_version': STREAM_FORMAT_VERSION,
+            'config_params': self.config_params,
+            'history_dtypes': HISTORY_DTYPES,
+            'bits_dtypes': BITS_DTYPES,
+            'rows_synced': self.rows if rows is None else rows,
+            'complete': complete
+        }
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+def read_stream(directory: str) -> dict:
+    """
+    Abre (sin cargarlo en memoria) un flujo escrito por StreamingExportSink.
+
+    Las columnas se leen como np.memmap de solo lectura, recortadas a la cantidad de filas
+    completas en todos los archivos (tras un fallo puede quedar una fila a medias).
+
+    Returns:
+        dict: 'simulation_history' (columna -> arreglo), 'bits', 'x_values', 'config_params',
+        'complete' y 'rows'.
+    """
+    with open(os.path.join(directory, MANIFEST_FILE), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest['format_version'] != STREAM_FORMAT_VERSION:
+        raise ValueError(f"Versión de flujo no soportada: {manifest['format_version']}")
+    dtypes = {**manifest['history_dtypes'], **manifest['bits_dtypes']}
+    files = _column_files(directory)
+    rows = min(os.path.getsize(files[key]) // np.dtype(dtype).itemsize for key, dtype in dtypes.items())
+    columns = {}
+    for key, dtype in dtypes.items():
+        if rows == 0:
+            columns[key] = np.zeros(0, dtype=dtype)
+        else:
+            columns[key] = np.memmap(files[key], dtype=dtype, mode='r', shape=(rows,))
+    return {
+        'simulation_history': {key: columns[key] for key in manifest['history_dtypes']},
+        'bits': columns['bits'],
+        'x_values': columns['x_values'],
+        'config_params': manifest['config_params'],
+        'complete': manifest['complete'],
+        'rows': rows
+    }
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+from http import HTTPStatus
+
+
+class LocalHttpServer:
+    """
+    Servidor HTTP/1.1 mínimo con keep-alive que sirve como sustituto local de un endpoint
+    real, para probar HttpLoadGenerator sin depender de servicios externos.
+    Corre su propio bucle asyncio en un hilo de fondo.
+
+    Uso:
+        with LocalHttpServer(delay_ms=2.0) as server:
+            generator = HttpLoadGenerator(server.url)
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, delay_ms: float = 0.0, body: bytes = b'ok',
+                 status: int = 200):
+        """
+        Args:
+            host (str): Dirección de escucha.
+            port (int): Puerto; 0 elige uno libre.
+            delay_ms (float): Retardo artificial por respuesta, para simular un servicio lento.
+            body (bytes): Cuerpo de todas las respuestas.
+            status (int): Código de estado de todas las respuestas (p. ej. 503 para un servicio caído).
+        """
+        self.host = host
+        self.port = port
+        self.delay_ms = delay_ms
+        self.body = body
+        self.status = status
+        self.requests_served = 0
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle_connection, self.host, self.port, backlog=1024))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    async def _handle_connection(self, reader, writer):
+        status_line = f"HTTP/1.1 {self.status} {HTTPStatus(self.status).phrase}\r\n".encode('ascii')
+        response = (status_line + b"Content-Type: text/plain\r\nConnection: keep-alive\r\n"
+                    b"Content-Length: " + str(len(self.body)).encode() + b"\r\n\r\n" + self.body)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                content_length = 0
+                keep_alive = True
+                for line in head.split(b"\r\n")[1:]:
+                    name, _, value = line.partition(b":")
+                    name = name.strip().lower()
+                    if name == b"content-length":
+                        content_length = int(value.strip())
+                    elif name == b"connection" and value.strip().lower() == b"close":
+                        keep_alive = False
+                if content_length:
+                    await reader.readexactly(content_length)
+                if self.delay_ms > 0:
+                    await asyncio.sleep(self.delay_ms / 1000.0)
+                writer.write(response)
+                await writer.drain()
+                self.requests_served += 1
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
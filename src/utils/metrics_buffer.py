@@ -0,0 +1,97 @@
+import threading
+from collections import deque
+
+import numpy as np
+
+from src.utils.ring_buffer import RingBuffer
+
+
+class MetricsBuffer:
+    """
+    Búfer seguro entre hilos para las métricas por paso de la simulación.
+
+    El hilo de simulación (productor) agrega métricas con push sin tocar la GUI; la GUI
+    (consumidor) las retira todas juntas con drain en un temporizador de ritmo fijo, de
+    modo que el costo de dibujo no depende del número de pasos.
+    """
+    def __init__(self, maxlen: int = None):
+        """
+        Args:
+            maxlen (int): Máximo de métricas pendientes; si se supera se descartan las más
+                antiguas (se cuentan en dropped). None = sin límite.
+        """
+        self._items = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.closed = False
+
+    def push(self, metrics: dict):
+        with self._lock:
+            if self._items.maxlen is not None and len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(metrics)
+
+    def drain(self) -> list:
+        """Retira y devuelve todas las métricas pendientes, en orden."""
+        with self._lock:
+            items = list(self._items)
+            self._items.clear()
+        return items
+
+    def close(self):
+        """Marca que el productor terminó; el consumidor puede detener su temporizador."""
+        self.closed = True
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+
+class ColumnMetricsBuffer:
+    """
+    Variante de MetricsBuffer con memoria fija para métricas en columnas (los lotes (5, k)
+    que envía SimulationWorker). Si la simulación produce pasos más rápido de lo que la GUI
+    los dibuja, solo se conservan los últimos `capacity` pasos pendientes (los que caben en
+    la ventana visible del gráfico) y el máximo de cada columna de todos los recibidos desde
+    el último drain, para que los límites de los ejes no pierdan los picos descartados.
+    """
+    def __init__(self, capacity: int, num_columns: int):
+        self._tail = RingBuffer(capacity, num_columns)
+        self._maxima = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.closed = False
+
+    def push(self, columns):
+        columns = np.asarray(columns, dtype=np.float64)
+        if columns.shape[1] == 0:
+            return
+        with self._lock:
+            self.dropped += max(0, len(self._tail) + columns.shape[1] - self._tail.capacity)
+            self._tail.extend(columns)
+            maxima = columns.max(axis=1)
+            self._maxima = maxima if self._maxima is None else np.maximum(self._maxima, maxima)
+
+    def drain(self) -> tuple:
+        """
+        Retira los pasos pendientes.
+
+        Returns:
+            tuple: (arreglo (columnas, k) con los últimos pasos, máximo de cada columna de
+            todos los pasos recibidos), o (None, None) si no hay pendientes.
+        """
+        with self._lock:
+            if len(self._tail) == 0:
+                return None, None
+            columns, maxima = self._tail.view(), self._maxima
+            self._tail.clear()
+            self._maxima = None
+        return columns, maxima
+
+    def close(self):
+        """Marca que el productor terminó; el consumidor puede detener su temporizador."""
+        self.closed = True
+
+    def __len__(self):
+        with self._lock:
+            return len(self._tail)
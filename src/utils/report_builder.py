@@ -0,0 +1,331 @@
+import datetime
+import importlib.util
+import io
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.core.progress import OperationCancelled
+from src.core.randomness_tests import find_test_result
+from src.utils.downsampling import decimate_minmax, lttb, minmax_envelope
+
+# Resolución a la que se rasterizan las líneas (el texto y los ejes quedan vectoriales)
+REPORT_DPI = 150
+# Puntos por serie en las figuras del reporte (unos dos por columna de píxeles a REPORT_DPI)
+REPORT_MAX_POINTS = 1500
+
+METRIC_PANELS = [
+    ('latency', "Latencia en el Tiempo", "Latencia (ms)", 'orange', None),
+    ('cpu', "Uso de CPU en el Tiempo", "CPU (%)", 'red', (0, 100)),
+    ('memory', "Uso de Memoria en el Tiempo", "Memoria (%)", 'green', (0, 100)),
+    ('simulated_requests', "Solicitudes Simuladas en el Tiempo", "Solicitudes", 'blue', None),
+]
+
+
+def summary_text(simulation_history: dict, bit_sequence, test_results: dict) -> str:
+    """Texto de la página de resumen del reporte."""
+    text = "Reporte de Simulación de Carga con Mapas Caóticos\n\n"
+    text += f"Fecha del Reporte: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+
+    if simulation_history and any(len(v) > 0 for v in simulation_history.values()):
+        text += "--- Métricas de Simulación ---\n"
+        text += f"Número de Pasos Simulados: {len(simulation_history.get('simulated_requests', []))}\n"
+        for key, label, function in [('simulated_requests', "Solicitudes Promedio", np.mean),
+                                     ('latency', "Latencia Promedio (ms)", np.mean),
+                                     ('latency', "Latencia Máxima (ms)", np.max),
+                                     ('cpu', "Uso de CPU Promedio (%)", np.mean),
+                                     ('memory', "Uso de Memoria Promedio (%)", np.mean)]:
+            if len(simulation_history.get(key, [])) > 0:
+                text += f"{label}: {function(simulation_history[key]):.2f}\n"
+        text += "\n"
+
+    if bit_sequence is not None and len(bit_sequence) > 0:
+        n1 = int(np.count_nonzero(bit_sequence))
+        n0 = len(bit_sequence) - n1
+        text += "--- Secuencia de Bits ---\n"
+        text += f"Longitud de Secuencia de Bits: {len(bit_sequence)}\n"
+        text += f"Cantidad de 0s: {n0} ({n0/len(bit_sequence)*100:.2f}%)\n"
+        text += f"Cantidad de 1s: {n1} ({n1/len(bit_sequence)*100:.2f}%)\n\n"
+
+    if test_results:
+        text += "--- Resultados de Pruebas de Aleatoriedad ---\n"
+        # Solo incluir Monobit Test en el resumen
+        monobit_result = find_test_result(test_results, ('Monobit Test', 'monobit'))
+        if monobit_result:
+            p_value = monobit_result.get('p_value', np.nan)
+            test_message = monobit_result.get('message', '')
+            test_status = "N/A"
+            if not np.isnan(p_value):
+                test_status = "APROBADA" if p_value >= 0.01 else "NO APROBADA"
+            text += "Monobit Test:\n"
+            text += f"  P-valor: {p_value:.4f}\n"
+            text += f"  Resultado: {test_status}\n"
+            if test_message and test_message != "OK":
+                text += f"  Mensaje: {test_message}\n"
+            text += "\n"
+        else:
+            text += "No hay resultados de Monobit Test disponibles.\n\n"
+    else:
+        text += "No hay resultados de pruebas de aleatoriedad disponibles.\n\n"
+    return text
+
+
+def build_report_pages(simulation_history: dict, bit_sequence, test_results: dict,
+                       variability_data: dict = None, max_points: int = REPORT_MAX_POINTS) -> list:
+    """
+    Describe las páginas del reporte como (tipo, datos) con las series ya reducidas a unos
+    max_points puntos, de modo que enviarlas a otro proceso y dibujarlas es barato.
+    """
+    from src.core.randomness_tests import RandomnessTests
+
+    pages = [('summary', {'text': summary_text(simulation_history, bit_sequence, test_results)})]
+
+    if simulation_history and len(simulation_history.get('latency', [])) > 0:
+        time_steps = np.asarray(simulation_history['time_steps'])
+        series = {}
+        for key, *_ in METRIC_PANELS:
+            values = np.asarray(simulation_history.get(key, []))
+            if len(values) > max_points:
+                # Serie densa: envolvente mínimo/máximo por columna de píxeles
+                series[key] = ('envelope', minmax_envelope(time_steps, values, max_points // 2))
+            elif len(values) > 0:
+                series[key] = ('line', (time_steps, values))
+        pages.append(('metrics', {'series': series}))
+
+    n_bits = len(bit_sequence) if bit_sequence is not None else 0
+    counts = {}
+    for name, keys in [('monobit', ('monobit', 'Monobit Test')), ('serial', ('serial', 'Serial Test')),
+                       ('poker', ('poker', 'Poker Test (m=4)'))]:
+        result = find_test_result(test_results, keys)
+        if result is not None and result.get('counts') is not None:
+            counts[name] = np.asarray(result['counts'])
+    autocorr = find_test_result(test_results, ('autocorr', 'Auto-correlation Test (d=1)'))
+    if autocorr is not None and autocorr.get('counts') is not None:
+        counts['correlation'] = autocorr.get('correlation', RandomnessTests.correlation_from_pair_counts(autocorr['counts']))
+    # Solo si faltan las tablas de conteos se calculan a partir de los bits
+    if 'monobit' not in counts and n_bits > 0:
+        ones = int(np.count_nonzero(bit_sequence))
+        counts['monobit'] = np.array([n_bits - ones, ones])
+    if n_bits > 1:
+        if 'serial' not in counts:
+            counts['serial'] = RandomnessTests.pair_counts(bit_sequence, d=1)
+        if 'correlation' not in counts:
+            counts['correlation'] = RandomnessTests.correlation_from_pair_counts(counts['serial'])
+    if 'poker' not in counts and n_bits >= 4:
+        counts['poker'] = RandomnessTests.block_counts(bit_sequence, 4)
+    if counts:
+        pages.append(('tests', counts))
+
+    if variability_data is not None and 'orbit_x' in variability_data:
+        config = variability_data.get('config_params') or {}
+        orbit_x = np.asarray(variability_data['orbit_x'])
+        pages.append(('orbit', {'series': lttb(np.arange(len(orbit_x)), orbit_x, max_points),
+                                'alpha': config.get('alpha'), 'x0': config.get('x0'), 'n': len(orbit_x)}))
+        if 'sensitivity_x1' in variability_data and 'sensitivity_x2' in variability_data:
+            x1 = np.asarray(variability_data['sensitivity_x1'])
+            x2 = np.asarray(variability_data['sensitivity_x2'])
+            iterations = np.arange(len(x1))
+            pages.append(('sensitivity', {'x1': decimate_minmax(iterations, x1, max_points),
+                                          'x2': decimate_minmax(iterations, x2, max_points),
+                                          'alpha': config.get('alpha'), 'x0': config.get('x0'), 'n': len(x1)}))
+    return pages
+
+
+def _figure(figsize):
+    from matplotlib.figure import Figure
+    return Figure(figsize=figsize)
+
+
+def _render_summary(data):
+    fig = _figure((8.5, 11))
+    ax = fig.add_subplot(111)
+    ax.axis('off')
+    ax.text(0.05, 0.95, data['text'], verticalalignment='top', horizontalalignment='left',
+            transform=ax.transAxes, fontsize=10, fontfamily='monospace')
+    return fig
+
+
+def _render_metrics(data):
+    fig = _figure((11, 8.5))
+    axs = fig.subplots(2, 2)
+    for ax, (key, title, ylabel, color, ylim) in zip(axs.flat, METRIC_PANELS):
+        if key not in data['series']:
+            ax.axis('off')
+            continue
+        # Las series se rasterizan; títulos, ejes y etiquetas siguen siendo texto
+        style, values = data['series'][key]
+        if style == 'envelope':
+            ax.fill_between(*values, color=color, linewidth=0.5, edgecolor=color, rasterized=True)
+        else:
+            ax.plot(*values, color=color, linewidth=0.8, rasterized=True)
+        ax.set_title(title)
+        ax.set_xlabel("Tiempo (pasos)", labelpad=2)
+        ax.set_ylabel(ylabel)
+        if ylim is not None:
+            ax.set_ylim(ylim)
+        ax.grid(True)
+    fig.tight_layout(rect=[0, 0.03, 1, 0.96])
+    return fig
+
+
+def _render_tests(data):
+    fig = _figure((11, 8.5))
+    axs = fig.subplots(2, 2)
+    if 'monobit' in data:
+        n0, n1 = data['monobit']
+        axs[0, 0].bar(['0', '1'], [n0, n1], color=['blue', 'red'], width=0.8)
+        axs[0, 0].set_title(f"Prueba Monobit: Distribución de Bits (Total: {int(n0 + n1)})")
+        axs[0, 0].set_ylabel("Frecuencia")
+    if 'serial' in data:
+        axs[0, 1].bar(['00', '01', '10', '11'], data['serial'], color='purple', alpha=0.7)
+        axs[0, 1].set_title("Prueba Serial: Frecuencia de Díadas")
+        axs[0, 1].set_ylabel("Frecuencia")
+    if 'correlation' in data:
+        axs[1, 0].bar(['Correlación (d=1)'], [data['correlation']], color='teal')
+        axs[1, 0].set_ylim([-1, 1])
+        axs[1, 0].set_title("Prueba de Autocorrelación (d=1)")
+        axs[1, 0].set_ylabel("Correlación")
+    if 'poker' in data:
+        axs[1, 1].bar([f"{i:04b}" for i in range(16)], data['poker'], color='orange', alpha=0.7)
+        axs[1, 1].set_title("Prueba Poker: Frecuencia de Bloques (m=4)")
+        axs[1, 1].set_ylabel("Frecuencia")
+        axs[1, 1].tick_params(axis='x', rotation=90)
+    for ax in axs.flat:
+        ax.grid(axis='y', linestyle='--')
+    fig.tight_layout(rect=[0, 0.03, 1, 0.96])
+    return fig
+
+
+def _render_orbit(data):
+    fig = _figure((8, 5))
+    ax = fig.add_subplot(111)
+    ax.plot(*data['series'], marker='o', markersize=2, linestyle='-', color='blue', rasterized=True)
+    ax.set_title(f"Órbita Skew Tent Map (α={data['alpha']}, x₀={data['x0']}, N={data['n']})")
+    ax.set_xlabel("Iteración")
+    ax.set_ylabel("$x_i$")
+    ax.set_ylim([0, 1])
+    ax.grid(True)
+    return fig
+
+
+def _render_sensitivity(data):
+    fig = _figure((8, 5))
+    ax = fig.add_subplot(111)
+    ax.plot(*data['x1'], 'b-', label="x₁", rasterized=True)
+    ax.plot(*data['x2'], 'r--', label="x₂ (x₀ + 0.001)", rasterized=True)
+    ax.set_title(f"Sensibilidad a Condiciones Iniciales (α={data['alpha']}, N={data['n']})")
+    ax.set_xlabel("Iteración")
+    ax.set_ylabel("$x_i$")
+    ax.set_ylim([0, 1])
+    ax.legend()
+    ax.grid(True)
+    return fig
+
+
+_RENDERERS = {
+    'summary': _render_summary,
+    'metrics': _render_metrics,
+    'tests': _render_tests,
+    'orbit': _render_orbit,
+    'sensitivity': _render_sensitivity,
+}
+
+
+def render_page(kind: str, data: dict, dpi: int = REPORT_DPI) -> bytes:
+    """Dibuja una página y la devuelve como un PDF de una página (se usa en los procesos del pool)."""
+    buffer = io.BytesIO()
+    _RENDERERS[kind](data).savefig(buffer, format='pdf', dpi=dpi)
+    return buffer.getvalue()
+
+
+class ReportBuilder:
+    """
+    Genera el reporte PDF a partir de los datos (no de las figuras de la GUI): las series se
+    reducen con decimate_minmax/lttb, las líneas se rasterizan a `dpi` manteniendo el texto
+    vectorial, y cada página se dibuja en un proceso del pool. Las páginas se unen con pypdf;
+    si no está instalado, se dibujan una tras otra en un único PdfPages.
+    """
+    def __init__(self, dpi: int = REPORT_DPI, max_points: int = REPORT_MAX_POINTS,
+                 workers: int = None, progress=None):
+        """
+        Args:
+            dpi (int): Resolución de los elementos rasterizados.
+            max_points (int): Puntos por serie en las figuras.
+            workers (int): Procesos del pool (por defecto, uno por página hasta los núcleos
+                disponibles); 1 dibuja en este proceso.
+            progress (ProgressReporter): Avance por página; cancelar borra el archivo a medias.
+        """
+        self.dpi = dpi
+        self.max_points = max_points
+        self.workers = workers
+        self.progress = progress
+
+    @staticmethod
+    def can_merge() -> bool:
+        return importlib.util.find_spec('pypdf') is not None
+
+    def build(self, file_path: str, simulation_history: dict, bit_sequence, test_results: dict,
+              variability_data: dict = None, extra_figures=None) -> str:
+        """
+        Escribe el reporte en file_path. extra_figures (figuras ya dibujadas) se agregan al final.
+        """
+        pages = build_report_pages(simulation_history, bit_sequence, test_results, variability_data, self.max_points)
+        extra_figures = [fig for fig in (extra_figures or []) if fig is not None]
+        workers = self.workers or min(len(pages), os.cpu_count() or 1)
+        if self.progress is not None:
+            self.progress.start_phase("Reporte PDF", len(pages) + len(extra_figures))
+        try:
+            if workers > 1 and self.can_merge():
+                self._build_parallel(file_path, pages, extra_figures, workers)
+            else:
+                self._build_sequential(file_path, pages, extra_figures)
+        except OperationCancelled:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+        if self.progress is not None:
+            self.progress.finish_phase()
+        return file_path
+
+    def _advance(self):
+        if self.progress is not None:
+            self.progress.advance(1)
+
+    def _build_sequential(self, file_path, pages, extra_figures):
+        from matplotlib.backends.backend_pdf import PdfPages
+        with PdfPages(file_path) as pdf:
+            for kind, data in pages:
+                pdf.savefig(_RENDERERS[kind](data), dpi=self.dpi)
+                self._advance()
+            for fig in extra_figures:
+                pdf.savefig(fig, dpi=self.dpi)
+                self._advance()
+
+    def _build_parallel(self, file_path, pages, extra_figures, workers):
+        from pypdf import PdfReader, PdfWriter
+        # spawn: seguro aunque el proceso tenga abierta la GUI de Tk
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context('spawn')) as pool:
+            futures = [pool.submit(render_page, kind, data, self.dpi) for kind, data in pages]
+            try:
+                documents = []
+                for future in futures:
+                    documents.append(future.result())
+                    self._advance()
+            except OperationCancelled:
+                for future in futures:
+                    future.cancel()
+                raise
+        for fig in extra_figures:
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='pdf', dpi=self.dpi)
+            documents.append(buffer.getvalue())
+            self._advance()
+
+        writer = PdfWriter()
+        for document in documents:
+            for page in PdfReader(io.BytesIO(document)).pages:
+                writer.add_page(page)
+        with open(file_path, 'wb') as f:
+            writer.write(f)
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+import numpy as np
+
+# Carpeta por defecto de la caché en disco (relativa al directorio de trabajo)
+DEFAULT_RESULT_CACHE_DIR = os.path.join('ejecuciones', 'cache_pruebas')
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_DISK_BYTES = 64 * 1024 * 1024
+# Bits leídos por bloque al calcular el resumen (también sirve para np.memmap)
+DIGEST_CHUNK_BITS = 1 << 24
+# Parámetros del generador que determinan la secuencia de bits
+GENERATOR_KEYS = ('alpha', 'x0', 'y0', 'num_bits')
+
+
+def sequence_digest(bit_sequence) -> str:
+    """
+    Resumen BLAKE2b del contenido de una secuencia de bits (0s y 1s): se empaqueta por
+    bloques con np.packbits, de modo que el costo es de una lectura de la secuencia.
+    La longitud forma parte del resumen (los bits de relleno del último byte son ceros).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    n = len(bit_sequence)
+    digest.update(f"bits:{n}:".encode('ascii'))
+    for start in range(0, n, DIGEST_CHUNK_BITS):
+        chunk = np.asarray(bit_sequence[start:start + DIGEST_CHUNK_BITS])
+        digest.update(np.packbits(chunk != 0).tobytes())
+    return digest.hexdigest()
+
+
+def config_key(config_params: dict) -> str:
+    """Clave alternativa a sequence_digest: los parámetros del generador que producen la secuencia."""
+    relevant = {key: config_params.get(key) for key in GENERATOR_KEYS}
+    return 'config:' + hashlib.blake2b(json.dumps(relevant, sort_keys=True).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _copy_result(result: dict) -> dict:
+    return {key: value.copy() if isinstance(value, np.ndarray) else value for key, value in result.items()}
+
+
+def _json_value(value):
+    if isinstance(value, np.ndarray):
+        return {'__array__': value.tolist(), 'dtype': value.dtype.str}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _from_json(value):
+    if isinstance(value, dict) and '__array__' in value:
+        return np.asarray(value['__array__'], dtype=value['dtype'])
+    return value
+
+
+class ResultCache:
+    """
+    Caché de resultados de pruebas de aleatoriedad por (secuencia, prueba, versión).
+
+    Un LRU en memoria atiende las consultas repetidas sin tocar el disco; si se indica
+    directory, cada resultado también se guarda como un JSON pequeño y, al superar
+    max_disk_bytes, se borran los menos usados (la fecha de modificación se renueva en cada
+    acierto). Las claves incluyen la versión de la prueba (RandomnessTests.TEST_VERSIONS):
+    al cambiar una implementación basta con subir su versión para ignorar lo guardado.
+    """
+    def __init__(self, directory: str = None, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES):
+        self.directory = directory
+        self.max_entries = max(1, int(max_entries))
+        self.max_disk_bytes = int(max_disk_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._disk_bytes = None  # Se calcula la primera vez que se escribe
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def entry_key(sequence_key: str, test: str, version) -> str:
+        return hashlib.blake2b(f"{sequence_key}|{test}|{version}".encode('utf-8'), digest_size=16).hexdigest()
+
+    def _path(self, entry_key: str) -> str:
+        return os.path.join(self.directory, entry_key + '.json')
+
+    def get(self, sequence_key: str, test: str, version) -> dict:
+        """Resultado guardado (una copia) o None."""
+        entry_key = self.entry_key(sequence_key, test, version)
+        if entry_key in self._memory:
+            self._memory.move_to_end(entry_key)
+            self.hits += 1
+            return _copy_result(self._memory[entry_key])
+        if self.directory is not None:
+            path = self._path(entry_key)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    result = {key: _from_json(value) for key, value in json.load(f).items()}
+                os.utime(path)
+            except (OSError, ValueError):
+                result = None
+            if result is not None:
+                self._remember(entry_key, result)
+                self.hits += 1
+                return _copy_result(result)
+        self.misses += 1
+        return None
+
+    def put(self, sequence_key: str, test: str, version, result: dict):
+        entry_key = self.entry_key(sequence_key, test, version)
+        self._remember(entry_key, _copy_result(result))
+        if self.directory is None:
+            return
+        path = self._path(entry_key)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({key: _json_value(value) for key, value in result.items()}, f)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)
+        if self._disk_bytes is None:
+            self._disk_bytes = self._scan_disk_bytes()
+        else:
+            self._disk_bytes += os.path.getsize(path) - previous
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _remember(self, entry_key: str, result: dict):
+        self._memory[entry_key] = result
+        self._memory.move_to_end(entry_key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _entries(self) -> list:
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict_disk(self):
+        """Borra los archivos menos usados hasta quedar en la mitad de max_disk_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_disk_bytes // 2
+        for _, size, name in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+        self._disk_bytes = total
+
+    def clear(self):
+        """Vacía la caché en memoria y borra la de disco."""
+        self._memory.clear()
+        if self.directory is not None:
+            for _, _, name in self._entries():
+                os.remove(os.path.join(self.directory, name))
+            self._disk_bytes = 0
@@ -0,0 +1,52 @@
+import numpy as np
+
+
+class RingBuffer:
+    """
+    Búfer circular de NumPy con varias columnas y capacidad fija.
+    Guarda solo los últimos `capacity` valores de cada columna, por lo que su memoria y el
+    costo de leerlo no dependen de cuántos valores se hayan agregado en total.
+    """
+    def __init__(self, capacity: int, num_columns: int, dtype=np.float64):
+        if capacity <= 0:
+            raise ValueError("La capacidad debe ser un entero positivo.")
+        self.capacity = capacity
+        self._data = np.zeros((num_columns, capacity), dtype=dtype)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+    def extend(self, columns):
+        """
+        Agrega valores al final. columns es una secuencia con un arreglo por columna, todos
+        de la misma longitud; si son más que la capacidad solo se conservan los últimos.
+        """
+        columns = np.asarray(columns, dtype=self._data.dtype)
+        n = columns.shape[1]
+        if n == 0:
+            return
+        if n >= self.capacity:
+            self._data[:] = columns[:, -self.capacity:]
+            self._start = 0
+            self._size = self.capacity
+            return
+        end = (self._start + self._size) % self.capacity
+        first = min(n, self.capacity - end)
+        self._data[:, end:end + first] = columns[:, :first]
+        self._data[:, :n - first] = columns[:, first:]
+        overflow = max(0, self._size + n - self.capacity)
+        self._start = (self._start + overflow) % self.capacity
+        self._size = min(self.capacity, self._size + n)
+
+    def view(self) -> np.ndarray:
+        """Devuelve una copia ordenada (de la más antigua a la más reciente) de forma (columnas, tamaño)."""
+        end = self._start + self._size
+        if end <= self.capacity:
+            return self._data[:, self._start:end].copy()
+        return np.concatenate((self._data[:, self._start:], self._data[:, :end - self.capacity]), axis=1)
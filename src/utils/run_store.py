@@ -0,0 +1,297 @@
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import numpy as np
+
+from src.core.checkpoint import HISTORY_KEYS
+
+# Carpeta por defecto del almacén (relativa al directorio de trabajo, como los checkpoints)
+DEFAULT_RUN_STORE_DIR = 'ejecuciones'
+DATABASE_FILE = 'ejecuciones.sqlite'
+RUN_STORE_SCHEMA_VERSION = 1
+# Tamaño máximo de los arreglos de una ejecución que la GUI guarda sin preguntar
+MAX_GUI_SAVE_BYTES = 512 * 1024 ** 2
+
+# Parámetros que definen una ejecución (forman el hash de configuración); rutas, ritmo de
+# reloj y opciones de exportación no cambian los resultados y quedan fuera
+GENERATOR_PARAMS = ('alpha', 'x0', 'y0', 'num_bits')
+SIMULATOR_PARAMS = ('num_users', 'latency_sensitivity', 'cpu_sensitivity', 'memory_sensitivity', 'recovery_rate', 'seed')
+SUMMARY_COLUMNS = ('num_steps', 'avg_requests', 'avg_latency', 'max_latency', 'avg_cpu', 'max_cpu', 'avg_memory', 'max_memory')
+# Nombres de RandomnessTests.run_all_tests -> claves de SimulationRunner
+TEST_NAMES = {'Monobit Test': 'monobit', 'Serial Test': 'serial',
+              'Auto-correlation Test (d=1)': 'autocorr', 'Poker Test (m=4)': 'poker'}
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created TEXT NOT NULL,
+    name TEXT,
+    config_hash TEXT NOT NULL,
+    {', '.join(f'{p} REAL' for p in GENERATOR_PARAMS + SIMULATOR_PARAMS)},
+    period_ok INTEGER,
+    stopped INTEGER,
+    {', '.join(f'{c} REAL' for c in SUMMARY_COLUMNS)},
+    config_json TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS test_results (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    test TEXT NOT NULL,
+    p_value REAL,
+    statistic REAL,
+    message TEXT,
+    result_json TEXT NOT NULL,
+    PRIMARY KEY (run_id, test)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_config_hash ON runs(config_hash);
+CREATE INDEX IF NOT EXISTS idx_runs_generator ON runs(alpha, x0, y0);
+CREATE INDEX IF NOT EXISTS idx_runs_simulator ON runs(num_users, latency_sensitivity, cpu_sensitivity, memory_sensitivity, recovery_rate);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs(created);
+CREATE INDEX IF NOT EXISTS idx_tests_p_value ON test_results(test, p_value);
+PRAGMA user_version = {RUN_STORE_SCHEMA_VERSION};
+"""
+
+_OPERATORS = {'<': '<', '<=': '<=', '>': '>', '>=': '>=', '=': '=', '==': '='}
+
+
+def config_hash(config_params: dict) -> str:
+    """Hash de los parámetros del generador y del simulador (iguales parámetros, igual hash)."""
+    relevant = {key: config_params.get(key) for key in GENERATOR_PARAMS + SIMULATOR_PARAMS}
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _json_value(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _float_or_none(value):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if np.isnan(value) else value
+
+
+def _condition(column: str, spec):
+    """
+    Condición SQL de un filtro de query: un valor (igualdad), una tupla (mín, máx) inclusiva
+    con None para un extremo abierto, o (operador, valor) con '<', '<=', '>', '>=' o '='.
+    """
+    if isinstance(spec, (tuple, list)) and len(spec) == 2 and spec[0] in _OPERATORS:
+        return f"{column} {_OPERATORS[spec[0]]} ?", [spec[1]]
+    if isinstance(spec, (tuple, list)):
+        low, high = spec
+        parts, values = [], []
+        if low is not None:
+            parts.append(f"{column} >= ?")
+            values.append(low)
+        if high is not None:
+            parts.append(f"{column} <= ?")
+            values.append(high)
+        return ' AND '.join(parts) or '1', values
+    return f"{column} = ?", [spec]
+
+
+def estimate_run_bytes(result: dict) -> int:
+    """Bytes que ocuparían en disco los arreglos .npy de result al guardarlo con save_run."""
+    total = 0
+    if result.get('bits') is not None:
+        total += len(result['bits'])
+    if result.get('x_values') is not None:
+        total += 8 * len(result['x_values'])
+    history = result.get('simulation_history') or {}
+    total += sum(8 * len(history[key]) for key in HISTORY_KEYS if key in history)
+    return total
+
+
+class RunStore:
+    """
+    Almacén local de ejecuciones: una base SQLite indexada por hash de configuración,
+    parámetros del generador y del simulador, y fecha, con los p-valores de cada prueba y
+    las estadísticas de resumen. Los arreglos grandes (bits, valores x, historial) se guardan
+    aparte, en archivos .npy por ejecución, y se cargan como np.memmap.
+
+    Una conexión SQLite solo puede usarse desde el hilo que la creó; para guardar desde un
+    hilo de fondo, abra allí su propio RunStore (se usa como gestor de contexto).
+    """
+    def __init__(self, directory: str = DEFAULT_RUN_STORE_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        # Varios procesos de un lote pueden escribir a la vez: esperar el bloqueo en lugar de fallar
+        self.connection = sqlite3.connect(os.path.join(directory, DATABASE_FILE), timeout=30)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def artifacts_dir(self, run_id: int) -> str:
+        return os.path.join(self.directory, f"{run_id:06d}")
+
+    def save_run(self, config_params: dict, result: dict, name: str = None) -> int:
+        """
+        Guarda una ejecución. result tiene el formato de SimulationRunner.run (o del mensaje
+        'result' de SimulationWorker): bits, x_values, simulation_history, test_results,
+        period_ok y, opcionalmente, stopped.
+
+        Returns:
+            int: Identificador de la ejecución.
+        """
+        from src.core.simulation_engine import summarize_history
+
+        history = result.get('simulation_history') or {}
+        summary = summarize_history(history) if len(history.get('latency', [])) > 0 else {}
+        params = [config_params.get(p) for p in GENERATOR_PARAMS + SIMULATOR_PARAMS]
+        columns = ['created', 'name', 'config_hash', *GENERATOR_PARAMS, *SIMULATOR_PARAMS,
+                   'period_ok', 'stopped', *SUMMARY_COLUMNS, 'config_json']
+        values = [datetime.datetime.now().isoformat(timespec='seconds'), name or config_params.get('name'),
+                  config_hash(config_params), *params,
+                  None if result.get('period_ok') is None else int(bool(result['period_ok'])),
+                  int(bool(result.get('stopped', False))),
+                  *[summary.get(c) for c in SUMMARY_COLUMNS],
+                  json.dumps(config_params, default=_json_value)]
+
+        with self.connection:
+            cursor = self.connection.execute(
+                f"INSERT INTO runs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})", values)
+            run_id = cursor.lastrowid
+            for test, test_result in (result.get('test_results') or {}).items():
+                if not isinstance(test_result, dict):
+                    continue
+                self.connection.execute(
+                    "INSERT INTO test_results (run_id, test, p_value, statistic, message, result_json) VALUES (?, ?, ?, ?, ?, ?)",
+                    (run_id, TEST_NAMES.get(test, test), _float_or_none(test_result.get('p_value')),
+                     _float_or_none(test_result.get('statistic')), test_result.get('message'),
+                     json.dumps({k: _json_value(v) for k, v in test_result.items()}, default=_json_value)))
+
+            # Arreglos en archivos aparte; si fallan, la transacción se deshace
+            arrays_dir = self.artifacts_dir(run_id)
+            os.makedirs(arrays_dir, exist_ok=True)
+            try:
+                if result.get('bits') is not None:
+                    np.save(os.path.join(arrays_dir, 'bits.npy'), np.asarray(result['bits'], dtype=np.uint8))
+                if result.get('x_values') is not None:
+                    np.save(os.path.join(arrays_dir, 'x_values.npy'), np.asarray(result['x_values'], dtype=np.float64))
+                for key in HISTORY_KEYS:
+                    if key in history:
+                        np.save(os.path.join(arrays_dir, f'history_{key}.npy'),
+                                np.asarray(history[key], dtype=np.int64 if key == 'time_steps' else np.float64))
+            except Exception:
+                shutil.rmtree(arrays_dir, ignore_errors=True)
+                raise
+        return run_id
+
+    def query(self, config_hash: str = None, created=None, p_values: dict = None,
+              order_by: str = 'created DESC', limit: int = None, **filters) -> list:
+        """
+        Busca ejecuciones. Los filtros por columna (alpha, x0, num_users, avg_latency,
+        period_ok, ...) y los de p_values ({prueba: filtro}) aceptan un valor, una tupla
+        (mín, máx) o (operador, valor); ver _condition. Por ejemplo:
+
+            store.query(alpha=(0.495, 0.497), p_values={'poker': ('<', 0.01)})
+
+        Returns:
+            list: Un dict por ejecución con sus columnas y 'p_values' ({prueba: p-valor}).
+        """
+        allowed = set(GENERATOR_PARAMS + SIMULATOR_PARAMS + SUMMARY_COLUMNS + ('id', 'name', 'period_ok', 'stopped'))
+        conditions, values = [], []
+        if config_hash is not None:
+            conditions.append("config_hash = ?")
+            values.append(config_hash)
+        if created is not None:
+            condition, condition_values = _condition('created', created)
+            conditions.append(condition)
+            values.extend(condition_values)
+        for column, spec in filters.items():
+            if column not in allowed:
+                raise ValueError(f"Filtro desconocido: '{column}'.")
+            condition, condition_values = _condition(column, spec)
+            conditions.append(condition)
+            values.extend(condition_values)
+        for test, spec in (p_values or {}).items():
+            condition, condition_values = _condition('t.p_value', spec)
+            conditions.append(f"EXISTS (SELECT 1 FROM test_results t WHERE t.run_id = runs.id AND t.test = ? AND {condition})")
+            values.extend([TEST_NAMES.get(test, test), *condition_values])
+
+        order_column, _, direction = order_by.partition(' ')
+        if order_column not in allowed | {'created'} or direction.upper() not in ('', 'ASC', 'DESC'):
+            raise ValueError(f"Orden no válido: '{order_by}'.")
+        sql = "SELECT * FROM runs"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            values.append(int(limit))
+
+        runs = [dict(row) for row in self.connection.execute(sql, values)]
+        if runs:
+            placeholders = ', '.join('?' * len(runs))
+            p_rows = self.connection.execute(
+                f"SELECT run_id, test, p_value FROM test_results WHERE run_id IN ({placeholders})",
+                [run['id'] for run in runs])
+            by_id = {run['id']: run for run in runs}
+            for run in runs:
+                run['p_values'] = {}
+            for row in p_rows:
+                by_id[row['run_id']]['p_values'][row['test']] = row['p_value']
+        return runs
+
+    def load_run(self, run_id: int, mmap: bool = True) -> dict:
+        """
+        Carga una ejecución con el mismo formato que SimulationRunner.run: config_params,
+        bits, x_values, simulation_history, test_results (con sus tablas de conteos) y
+        period_ok. Con mmap, los arreglos se leen del disco a medida que se usan.
+        """
+        row = self.connection.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"No existe la ejecución {run_id}.")
+        test_results = {}
+        for test_row in self.connection.execute("SELECT test, result_json FROM test_results WHERE run_id = ?", (run_id,)):
+            result = json.loads(test_row['result_json'])
+            if 'counts' in result:
+                result['counts'] = np.asarray(result['counts'])
+            test_results[test_row['test']] = result
+        period_ok = None if row['period_ok'] is None else bool(row['period_ok'])
+        test_results['period_ok'] = period_ok
+
+        arrays_dir = self.artifacts_dir(run_id)
+        mmap_mode = 'r' if mmap else None
+
+        def load(name, dtype):
+            path = os.path.join(arrays_dir, name)
+            if not os.path.exists(path):
+                return np.zeros(0, dtype=dtype)
+            return np.load(path, mmap_mode=mmap_mode)
+
+        return {
+            'id': run_id,
+            'name': row['name'],
+            'created': row['created'],
+            'config_params': json.loads(row['config_json']),
+            'bits': load('bits.npy', np.uint8),
+            'x_values': load('x_values.npy', np.float64),
+            'simulation_history': {key: load(f'history_{key}.npy', np.int64 if key == 'time_steps' else np.float64)
+                                   for key in HISTORY_KEYS},
+            'test_results': test_results,
+            'period_ok': period_ok,
+            'stopped': bool(row['stopped'])
+        }
+
+    def delete_run(self, run_id: int):
+        with self.connection:
+            self.connection.execute("DELETE FROM runs WHERE id = ?", (run_id,))
+        shutil.rmtree(self.artifacts_dir(run_id), ignore_errors=True)
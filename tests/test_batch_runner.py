@@ -0,0 +1,82 @@
+# tests/test_batch_runner.py
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from src.cli.batch_runner import load_config_file, run_batch
+from src.utils.run_store import RunStore
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.base = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write(self, name, text):
+        path = os.path.join(self.base, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def test_load_json_and_toml(self):
+        json_path = self._write('barrido.json', json.dumps({
+            'defaults': {'num_bits': 2000, 'seed': 1},
+            'runs': [{'alpha': 0.495}, {'alpha': 0.496, 'name': 'b'}]
+        }))
+        configs = load_config_file(json_path)
+        self.assertEqual([c['name'] for c in configs], ['barrido_001', 'b'])
+        self.assertEqual(configs[1]['num_bits'], 2000)
+        self.assertEqual(configs[0]['num_users'], 100)
+
+        toml_path = self._write('unica.toml', 'alpha = 0.497\nnum_bits = 1500\nx0 = 0.2\n')
+        configs = load_config_file(toml_path)
+        self.assertEqual(len(configs), 1)
+        self.assertEqual(configs[0]['name'], 'unica')
+        self.assertEqual(configs[0]['x0'], 0.2)
+
+        bad_path = self._write('mala.json', json.dumps({'alpha': 0.6}))
+        with self.assertRaises(ValueError):
+            load_config_file(bad_path)
+
+    def test_run_batch_writes_outputs(self):
+        configs = load_config_file(self._write('lote.json', json.dumps([
+            {'num_bits': 1200, 'seed': 3}, {'num_bits': 1300, 'seed': 4}
+        ])))
+        out_dir = os.path.join(self.base, 'salida')
+        summaries = run_batch(configs, out_dir, workers=2)
+        self.assertEqual([s['num_steps'] for s in summaries], [1200, 1300])
+        for name in ['lote_001', 'lote_002']:
+            for file_name in ['historial.csv', 'bits.csv', 'resumen.json']:
+                self.assertTrue(os.path.exists(os.path.join(out_dir, name, file_name)))
+        with open(os.path.join(out_dir, 'resumen_lote.json'), encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+    def test_stream_mode_matches_summary(self):
+        configs = load_config_file(self._write('flujo.json', json.dumps({'num_bits': 1500, 'seed': 5})))
+        in_memory = run_batch(configs, os.path.join(self.base, 'memoria'), workers=1)[0]
+        store_dir = os.path.join(self.base, 'ejecuciones')
+        streamed = run_batch(configs, os.path.join(self.base, 'flujo'), workers=1, stream=True, store_dir=store_dir)[0]
+        self.assertEqual(streamed['num_steps'], 1500)
+        with RunStore(store_dir) as store:
+            run = store.load_run(streamed['run_id'])
+        self.assertEqual(len(run['bits']), 1500)
+        self.assertEqual(len(run['simulation_history']['latency']), 1500)
+        for key, value in in_memory['simulation_summary'].items():
+            self.assertAlmostEqual(streamed['simulation_summary'][key], value)
+        self.assertTrue(os.path.exists(os.path.join(self.base, 'flujo', 'flujo', 'flujo', 'manifest.json')))
+        self.assertFalse(os.path.exists(os.path.join(self.base, 'flujo', 'flujo', 'historial.csv')))
+
+    def test_headless_does_not_import_gui(self):
+        code = ("import sys; import src.cli.batch_runner; import src.utils.data_exporter; "
+                "print(any(m.split('.')[0] in ('tkinter', 'matplotlib') for m in sys.modules))")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), 'False')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# tests/test_bitstream_export.py
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.core.chaotic_generator import ChaoticBitGenerator
+from src.core.progress import ProgressReporter, CancellationToken, OperationCancelled
+from src.utils.bitstream_export import BitstreamWriter, write_bitstream, stream_generator_bitstream
+
+class TestBitstreamExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.base = self.tmp_dir.name
+        self.bits = np.random.default_rng(3).integers(0, 2, 1000).astype(np.uint8)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _path(self, name):
+        return os.path.join(self.base, name)
+
+    def _read(self, name):
+        with open(self._path(name), 'rb') as f:
+            return f.read()
+
+    def test_packed_and_ascii(self):
+        self.assertEqual(write_bitstream(self._path('a.bin'), self.bits, chunk_bits=37), 1000)
+        data = np.frombuffer(self._read('a.bin'), dtype=np.uint8)
+        np.testing.assert_array_equal(np.unpackbits(data, count=1000), self.bits)
+        # El último byte incompleto se completa con ceros
+        write_bitstream(self._path('b.bin'), [1, 0, 1])
+        self.assertEqual(self._read('b.bin'), bytes([0b10100000]))
+        write_bitstream(self._path('c.txt'), self.bits, chunk_bits=100)
+        self.assertEqual(self._read('c.txt'), ''.join(map(str, self.bits.tolist())).encode('ascii'))
+
+    def test_word_formats(self):
+        words = np.packbits(self.bits[:992]).view('>u4')
+        write_bitstream(self._path('w.u32'), self.bits, chunk_bits=50)
+        np.testing.assert_array_equal(np.frombuffer(self._read('w.u32'), dtype='<u4'), words)
+        write_bitstream(self._path('w_be.u32'), self.bits, byteorder='big')
+        np.testing.assert_array_equal(np.frombuffer(self._read('w_be.u32'), dtype='>u4'), words)
+
+        with BitstreamWriter(self._path('d.dh'), 'dieharder') as writer:
+            writer.write(self.bits[:500])
+            writer.write(self.bits[500:])
+        lines = self._read('d.dh').decode('ascii').splitlines()
+        self.assertIn('type: d', lines)
+        self.assertEqual(int(lines[lines.index('type: d') + 1].split(':')[1]), 31)
+        self.assertEqual([int(v) for v in lines[-31:]], words.tolist())
+
+    def test_stream_from_generator(self):
+        bits, _, _ = ChaoticBitGenerator().generate_cccbg_bits(0.495, 0.3, 0.301, 5000)
+        result = stream_generator_bitstream(self._path('g.bin'), 0.495, 0.3, 0.301, 5000, chunk_bits=777)
+        self.assertEqual(result, {'bits_written': 5000, 'period_ok': True})
+        data = np.frombuffer(self._read('g.bin'), dtype=np.uint8)
+        np.testing.assert_array_equal(np.unpackbits(data, count=5000), bits)
+
+    def test_cancel_removes_file(self):
+        token = CancellationToken()
+        progress = ProgressReporter(lambda update: token.cancel() if update['done'] else None, token=token, min_interval=0)
+        with self.assertRaises(OperationCancelled):
+            write_bitstream(self._path('x.bin'), self.bits, chunk_bits=100, progress=progress)
+        self.assertFalse(os.path.exists(self._path('x.bin')))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,8 @@
 # tests/test_chaotic_generator.py
 import unittest
 import numpy as np
-from src.core.chaotic_generator import ChaoticBitGenerator
+from src.core.chaotic_generator import ChaoticBitGenerator, PERIOD_CHECK_STEPS
+from src.core.chaotic_maps import SkewTentMap, CoupledSkewTentMap
 
 class TestChaoticBitGenerator(unittest.TestCase):
 
@@ -11,21 +12,39 @@ class TestChaoticBitGenerator(unittest.TestCase):
     def test_skew_tent_map_func(self):
         # Prueba valores dentro del rango
         alpha = 0.495
+        skew_tent = SkewTentMap(alpha=alpha)
         x1 = 0.2
         x2 = 0.495
         x3 = 0.8
-        self.assertAlmostEqual(self.generator._skew_tent_map(x1, alpha), x1/alpha, places=6)
-        self.assertAlmostEqual(self.generator._skew_tent_map(x2, alpha), (1-x2)/(1-alpha), places=6)
-        self.assertAlmostEqual(self.generator._skew_tent_map(x3, alpha), (1-x3)/(1-alpha), places=6)
+        self.assertAlmostEqual(skew_tent.iterate([x1], 1)[0, 0], x1/alpha, places=6)
+        self.assertAlmostEqual(skew_tent.iterate([x2], 1)[0, 0], (1-x2)/(1-alpha), places=6)
+        self.assertAlmostEqual(skew_tent.iterate([x3], 1)[0, 0], (1-x3)/(1-alpha), places=6)
         # Prueba errores por parámetros fuera de rango
         with self.assertRaises(ValueError):
-            self.generator._skew_tent_map(x=0.2, alpha=0.48)
+            self.generator.generate_cccbg_chunk(alpha=0.48, x=0.2, y=0.3, num_bits=10)
         with self.assertRaises(ValueError):
-            self.generator._skew_tent_map(x=0.2, alpha=0.51)
+            self.generator.generate_cccbg_chunk(alpha=0.51, x=0.2, y=0.3, num_bits=10)
         with self.assertRaises(ValueError):
-            self.generator._skew_tent_map(x=-0.1, alpha=0.495)
+            self.generator.generate_cccbg_chunk(alpha=0.495, x=-0.1, y=0.3, num_bits=10)
         with self.assertRaises(ValueError):
-            self.generator._skew_tent_map(x=1.1, alpha=0.495)
+            self.generator.generate_cccbg_chunk(alpha=0.495, x=1.1, y=0.3, num_bits=10)
+
+    def test_chunk_stops_iterating_at_first_repeat(self):
+        class CountingMap(CoupledSkewTentMap):
+            steps = 0
+
+            def iterate(self, states, n):
+                self.steps += n
+                return super().iterate(states, n)
+
+        reference = CoupledSkewTentMap(alpha=0.495).iterate((0.3, 0.301), 10)
+        seen = {(round(reference[9, 0], 10), round(reference[9, 1], 10))}
+        chaotic_map = CountingMap(alpha=0.495)
+        bits, states, period_ok = self.generator.generate_chunk(chaotic_map, (0.3, 0.301), 10**6, seen)
+        self.assertFalse(period_ok)
+        self.assertEqual(len(bits), 9)
+        np.testing.assert_array_equal(states, reference)
+        self.assertLessEqual(chaotic_map.steps, PERIOD_CHECK_STEPS)
 
     def test_generate_cccbg_bits_valid(self):
         alpha = 0.495
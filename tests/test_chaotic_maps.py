@@ -0,0 +1,72 @@
+# tests/test_chaotic_maps.py
+import unittest
+import numpy as np
+from src.core import chaotic_maps
+from src.core.chaotic_maps import CHAOTIC_MAPS, DEFAULT_MAP, create_map
+from src.core.chaotic_generator import ChaoticBitGenerator
+
+
+class TestChaoticMaps(unittest.TestCase):
+
+    def test_registry_creates_each_map_with_its_parameters(self):
+        self.assertEqual(set(CHAOTIC_MAPS), {'skew_tent', 'cccbg', 'logistic', 'bernoulli', 'pwlcm', 'cml'})
+        self.assertEqual(create_map('logistic', r=3.9).params, {'r': 3.9})
+        self.assertEqual(create_map('cml', sites=5).initial_state(0.3, 0.31).shape, (5,))
+        with self.assertRaises(ValueError):
+            create_map('henon')
+        with self.assertRaises(ValueError):
+            create_map('logistic', alpha=0.5)
+        with self.assertRaises(ValueError):
+            create_map('pwlcm', p=0.7)
+
+    def test_scalar_and_batched_kernels_give_the_same_orbits(self):
+        rng = np.random.default_rng(0)
+        for name in CHAOTIC_MAPS:
+            chaotic_map = create_map(name)
+            states = rng.uniform(0.05, 0.95, (3, chaotic_map.dimension))
+            stepped, expected = states, []
+            for _ in range(300):
+                stepped = chaotic_map.step(stepped)
+                expected.append(stepped)
+            with self.subTest(mapa=name):
+                # Lote pequeño (núcleo escalar, si lo hay) y un estado suelto
+                np.testing.assert_array_equal(chaotic_map.iterate(states, 300), expected)
+                np.testing.assert_array_equal(chaotic_map.iterate(states[1], 300), np.array(expected)[:, 1])
+                chunks = list(chaotic_map.iter_chunks(states, 300, chunk_steps=128))
+                self.assertEqual([len(c) for c in chunks], [128, 128, 44])
+                np.testing.assert_array_equal(np.concatenate(chunks), expected)
+
+    def test_large_batches_use_the_vectorized_step(self):
+        chaotic_map = create_map('skew_tent')
+        states = np.random.default_rng(1).uniform(0, 1, (chaotic_maps.SCALAR_BATCH_LIMIT + 1, 1))
+        trajectory = chaotic_map.iterate(states, 50)
+        self.assertEqual(trajectory.shape, (50, len(states), 1))
+        np.testing.assert_array_equal(trajectory[:, 0], chaotic_map.iterate(states[0], 50))
+
+    def test_generator_uses_the_default_map(self):
+        generator = ChaoticBitGenerator()
+        bits, x_values, y_values, period_ok = generator.generate_cccbg_chunk(0.495, 0.3, 0.301, 5000)
+        map_bits, states, map_period_ok = generator.generate_chunk(create_map(DEFAULT_MAP, alpha=0.495), (0.3, 0.301), 5000)
+        np.testing.assert_array_equal(map_bits, bits)
+        np.testing.assert_array_equal(states, np.column_stack((x_values, y_values)))
+        self.assertEqual(map_period_ok, period_ok)
+
+    def test_generator_chains_blocks_of_any_map(self):
+        generator = ChaoticBitGenerator()
+        chaotic_map = create_map('cml')
+        state = chaotic_map.initial_state(0.3, 0.301)
+        whole = generator.generate_block(chaotic_map, state, 3000, set())
+        first = generator.generate_block(chaotic_map, state, 1000, set())
+        rest = generator.generate_block(chaotic_map, first[1][-1], 2000, set())
+        np.testing.assert_array_equal(whole[0], np.concatenate((first[0], rest[0])))
+        self.assertEqual(whole[1].shape, (3000, 8))
+
+    def test_period_check_stops_a_collapsed_orbit(self):
+        # Con beta = 2 la órbita de 0.5 cae en el punto fijo 0
+        bits, states, period_ok = ChaoticBitGenerator().generate_chunk(create_map('bernoulli'), (0.5,), 100)
+        self.assertFalse(period_ok)
+        self.assertEqual(bits.tolist(), [0])
+        self.assertEqual(states[:, 0].tolist(), [0.0, 0.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# tests/test_cost_model.py
+import json
+import os
+import tempfile
+import unittest
+from src.core import cost_model
+from src.core.cost_model import (calibrate, load_calibration, cached_calibration, estimate, plan_run, max_parallel_runs,
+                                 machine_key, new_history_dir, LARGE_CHUNK_SIZE, DEFAULT_HISTORY_DIR)
+from src.core.simulation_runner import DEFAULT_CONFIG
+
+# Calibración fija: 10 µs por paso en total y 300 / 200 bytes por paso con y sin historial
+CALIBRATION = {
+    'machine': None,
+    'seconds_per_step': {'generación': 2e-6, 'simulación': 2e-6, 'pruebas': 6e-6, 'exportación CSV': 3e-5},
+    'bytes_per_step': {'memoria': 300.0, 'flujo': 200.0},
+    'csv_bytes_per_step': 90.0,
+}
+GB = 10**9
+
+
+class TestCostModel(unittest.TestCase):
+
+    def test_estimate_is_linear_in_steps(self):
+        small = estimate(dict(DEFAULT_CONFIG, num_bits=10**4), CALIBRATION, gui=False)
+        large = estimate(dict(DEFAULT_CONFIG, num_bits=10**6), CALIBRATION, gui=False)
+        self.assertAlmostEqual(small['total_seconds'], 0.1)
+        self.assertAlmostEqual(large['total_seconds'], 10.0)
+        self.assertEqual(large['peak_memory_bytes'], 300 * 10**6)
+        self.assertEqual(large['disk_bytes'], 0)
+        with_csv = estimate(dict(DEFAULT_CONFIG, num_bits=10**6), CALIBRATION, gui=False, write_csv=True)
+        self.assertAlmostEqual(with_csv['seconds']['exportación CSV'], 30.0)
+        self.assertEqual(with_csv['disk_bytes'], 90 * 10**6)
+        # El ritmo fijo de pasos por segundo domina la simulación
+        paced = estimate(dict(DEFAULT_CONFIG, num_bits=1000, steps_per_second=100), CALIBRATION)
+        self.assertAlmostEqual(paced['seconds']['simulación'], 10.0)
+
+    def test_plan_keeps_small_runs_unchanged(self):
+        config = dict(DEFAULT_CONFIG, num_bits=10**4)
+        plan = plan_run(config, CALIBRATION, available_memory=8 * GB)
+        self.assertTrue(plan['fits'])
+        self.assertEqual(plan['config_params'], config)
+        self.assertEqual(plan['changes'] + plan['warnings'], [])
+
+    def test_plan_moves_history_to_disk_when_it_does_not_fit(self):
+        plan = plan_run(dict(DEFAULT_CONFIG, num_bits=10**7), CALIBRATION, available_memory=4 * GB)
+        self.assertTrue(plan['fits'])
+        self.assertEqual(os.path.dirname(plan['config_params']['history_dir']), DEFAULT_HISTORY_DIR)
+        self.assertEqual(plan['estimate']['peak_memory_bytes'], 200 * 10**7)
+        self.assertEqual(plan['estimate']['disk_bytes'], 49 * 10**7)
+        self.assertEqual(plan['config_params']['chunk_size'], LARGE_CHUNK_SIZE)
+        self.assertEqual(len(plan['changes']), 2)
+
+    def test_each_run_gets_its_own_history_dir(self):
+        with tempfile.TemporaryDirectory() as base:
+            first = new_history_dir(base)
+            os.makedirs(first)
+            second = new_history_dir(base)
+            self.assertNotEqual(first, second)
+            self.assertEqual(os.path.dirname(second), base)
+
+    def test_plan_refuses_runs_that_never_fit(self):
+        plan = plan_run(dict(DEFAULT_CONFIG, num_bits=10**8), CALIBRATION, available_memory=4 * GB)
+        self.assertFalse(plan['fits'])
+        self.assertIn('GB', plan['reason'])
+
+    def test_plan_warns_about_long_runs(self):
+        plan = plan_run(dict(DEFAULT_CONFIG, num_bits=10**9), CALIBRATION, available_memory=10**4 * GB)
+        self.assertTrue(plan['fits'])
+        self.assertEqual(len(plan['warnings']), 1)
+
+    def test_max_parallel_runs_is_limited_by_memory(self):
+        configs = [dict(DEFAULT_CONFIG, num_bits=10**7)] * 4
+        cpus = os.cpu_count() or 1
+        self.assertEqual(max_parallel_runs(configs, CALIBRATION, available_memory=10**4 * GB), cpus)
+        self.assertEqual(max_parallel_runs(configs, CALIBRATION, available_memory=GB), 1)
+
+    def test_calibration_is_measured_and_persisted(self):
+        calibration = calibrate()
+        self.assertEqual(calibration['machine'], machine_key())
+        for phase in ('generación', 'simulación', 'pruebas', 'exportación CSV'):
+            self.assertGreater(calibration['seconds_per_step'][phase], 0)
+        self.assertGreater(calibration['bytes_per_step']['memoria'], calibration['bytes_per_step']['flujo'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'calibracion.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(dict(CALIBRATION, machine=machine_key()), f)
+            cost_model._calibration_cache.pop(path, None)
+            self.assertIsNone(cached_calibration(os.path.join(directory, 'otra.json')))
+            # Una calibración guardada para este mismo equipo se usa sin volver a medir
+            self.assertEqual(cached_calibration(path)['bytes_per_step'], CALIBRATION['bytes_per_step'])
+            self.assertEqual(load_calibration(path)['bytes_per_step'], CALIBRATION['bytes_per_step'])
+            cost_model._calibration_cache.pop(path, None)
+
+if __name__ == '__main__':
+    unittest.main()
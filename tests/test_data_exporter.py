@@ -0,0 +1,115 @@
+# tests/test_data_exporter.py
+import importlib.util
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from src.core.progress import ProgressReporter, CancellationToken, OperationCancelled
+from src.utils.data_exporter import DataExporter
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+HAS_H5PY = importlib.util.find_spec('h5py') is not None
+
+class TestColumnarExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.base = self.tmp_dir.name
+        n = 2500
+        rng = np.random.default_rng(0)
+        self.history = {
+            'time_steps': list(range(n)),
+            'simulated_requests': rng.uniform(0, 100, n).tolist(),
+            'latency': rng.uniform(0, 50, n),
+            'cpu': rng.uniform(0, 100, n),
+            'memory': rng.uniform(0, 100, n)
+        }
+        self.bits = rng.integers(0, 2, n).astype(np.uint8)
+        self.x_values = rng.uniform(0, 1, n)
+        self.config = {'alpha': 0.495, 'x0': 0.1, 'num_bits': n}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _round_trip(self, fmt, extension):
+        path = os.path.join(self.base, 'tabla' + extension)
+        columns = DataExporter.history_columns(self.history)
+        written = DataExporter.write_columnar(path, columns, {'config_params': self.config}, fmt=fmt, row_group_rows=1000)
+        read, metadata = DataExporter.read_columnar(written)
+        self.assertEqual(list(read), list(columns))
+        for name, column in columns.items():
+            np.testing.assert_array_equal(read[name], column)
+        self.assertEqual(read['time_steps'].dtype, np.int64)
+        self.assertEqual(metadata['config_params'], self.config)
+
+    def test_npz_round_trip(self):
+        self._round_trip('npz', '.npz')
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow no está instalado")
+    def test_arrow_round_trip(self):
+        self._round_trip('parquet', '.parquet')
+        self._round_trip('feather', '.feather')
+
+    @unittest.skipUnless(HAS_H5PY, "h5py no está instalado")
+    def test_hdf5_round_trip(self):
+        self._round_trip('hdf5', '.h5')
+
+    def test_format_fallback(self):
+        path, fmt = DataExporter.resolve_columnar_format(os.path.join(self.base, 'datos.parquet'))
+        self.assertEqual(fmt, 'parquet' if HAS_PYARROW else ('hdf5' if HAS_H5PY else 'npz'))
+        self.assertTrue(path.endswith({'parquet': '.parquet', 'hdf5': '.h5', 'npz': '.npz'}[fmt]))
+        with self.assertRaises(ValueError):
+            DataExporter.resolve_columnar_format(os.path.join(self.base, 'datos.txt'))
+
+    def test_full_export_writes_one_file_per_table(self):
+        variability = {'orbit_x': np.linspace(0, 1, 50), 'orbit_iterations': list(range(50)),
+                       'sensitivity_x1': np.zeros(20), 'sensitivity_x2': np.ones(20),
+                       'sensitivity_iterations': list(range(20)), 'config_params': self.config}
+        written = DataExporter.write_columnar_export(
+            os.path.join(self.base, 'salida.npz'), self.history, self.bits, x_values=self.x_values,
+            period_ok=True, variability_data=variability
+        )
+        self.assertEqual([os.path.basename(p) for p in written],
+                         ['salida.npz', 'salida_bits.npz', 'salida_variabilidad_orbita.npz',
+                          'salida_variabilidad_sensibilidad.npz'])
+        bits, metadata = DataExporter.read_columnar(written[1])
+        np.testing.assert_array_equal(bits['valor_bit'], self.bits)
+        np.testing.assert_array_equal(bits['valor_real'], self.x_values)
+        self.assertEqual(metadata['table'], 'bits')
+        self.assertTrue(metadata['period_ok'])
+        self.assertEqual(metadata['config_params']['alpha'], 0.495)
+
+    def test_cancelled_export_removes_file(self):
+        token = CancellationToken()
+        progress = ProgressReporter(lambda update: token.cancel() if update['done'] else None, token=token, min_interval=0)
+        path = os.path.join(self.base, 'cancelada.npz')
+        with self.assertRaises(OperationCancelled):
+            DataExporter.write_columnar(path, DataExporter.history_columns(self.history), fmt='npz',
+                                        row_group_rows=100, progress=progress)
+        self.assertFalse(os.path.exists(path))
+
+    def test_csv_dialog_returns_a_cancellable_task(self):
+        path = os.path.join(self.base, 'historial.csv')
+        variability = {'orbit_x': np.linspace(0, 1, 50), 'orbit_iterations': list(range(50)), 'config_params': self.config}
+        with mock.patch('tkinter.filedialog.asksaveasfilename', return_value=path):
+            task = DataExporter.export_to_csv(self.history, self.bits, x_values=self.x_values, period_ok=True,
+                                              variability_data=variability)
+        # La ruta ya se eligió; la escritura ocurre al ejecutar la tarea (en el hilo que sea)
+        self.assertFalse(os.path.exists(path))
+        updates = []
+        message = task(ProgressReporter(updates.append, min_interval=0))
+        for suffix in ('', '_bits', '_variabilidad'):
+            self.assertTrue(os.path.exists(os.path.join(self.base, f'historial{suffix}.csv')))
+            self.assertIn(f'historial{suffix}.csv', message)
+        self.assertEqual({update['phase'] for update in updates}, {"Exportación del historial", "Exportación de bits"})
+
+        token = CancellationToken()
+        token.cancel()
+        with self.assertRaises(OperationCancelled):
+            task(ProgressReporter(token=token))
+        with mock.patch('tkinter.filedialog.asksaveasfilename', return_value=''):
+            self.assertIsNone(DataExporter.export_to_pdf(self.history, self.bits, {}))
+
+if __name__ == '__main__':
+    unittest.main()
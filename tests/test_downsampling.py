@@ -0,0 +1,56 @@
+# tests/test_downsampling.py
+import unittest
+import numpy as np
+from src.utils.downsampling import minmax_indices, minmax_envelope, decimate_minmax, lttb, LODPyramid
+
+class TestDownsampling(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.x = np.arange(100003)
+        self.y = rng.normal(size=len(self.x))
+        self.y[12345] = 50.0
+        self.y[67890] = -50.0
+
+    def test_minmax_keeps_extremes_and_endpoints(self):
+        indices = minmax_indices(self.y, 64)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertIn(12345, indices)
+        self.assertIn(67890, indices)
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], len(self.y) - 1)
+        x, y = decimate_minmax(self.x, self.y, max_points=1000)
+        self.assertLessEqual(len(x), 1100)
+        self.assertEqual(y.max(), self.y.max())
+        self.assertEqual(y.min(), self.y.min())
+
+    def test_lttb_size_and_endpoints(self):
+        x, y = lttb(self.x, self.y, 500)
+        self.assertEqual(len(x), 500)
+        self.assertEqual(x[0], 0)
+        self.assertEqual(x[-1], len(self.x) - 1)
+        self.assertTrue(np.all(np.diff(x) > 0))
+        self.assertIn(50.0, y)
+
+    def test_minmax_envelope(self):
+        x, low, high = minmax_envelope(self.x, self.y, 100)
+        self.assertLessEqual(len(x), 100)
+        self.assertEqual(x[0], 0)
+        self.assertEqual(high.max(), 50.0)
+        self.assertEqual(low.min(), -50.0)
+        self.assertTrue(np.all(low <= high))
+
+    def test_pyramid_query_levels(self):
+        pyramid = LODPyramid(self.x, self.y)
+        self.assertGreater(len(pyramid.levels), 1)
+        x, y = pyramid.query(max_points=2000)
+        self.assertLessEqual(len(x), 2000)
+        self.assertEqual(y.max(), 50.0)
+        self.assertEqual(y.min(), -50.0)
+        # Con zoom se recuperan los datos originales del rango visible
+        x, y = pyramid.query(1000, 1500, max_points=2000)
+        np.testing.assert_array_equal(x, self.x[999:1502])
+        np.testing.assert_array_equal(y, self.y[999:1502])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+# tests/test_export_sink.py
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from src.core import checkpoint as checkpoint_module
+from src.core.simulation_runner import SimulationRunner, DEFAULT_CONFIG
+from src.utils.export_sink import StreamingExportSink, read_stream, MANIFEST_FILE
+
+class TestStreamingExportSink(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.base = self.tmp_dir.name
+        self.config = dict(DEFAULT_CONFIG, num_bits=6000, seed=11)
+        self.reference = SimulationRunner(dict(self.config), chunk_size=1000).run()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _assert_matches_reference(self, stream):
+        self.assertEqual(stream['rows'], 6000)
+        for key, values in self.reference['simulation_history'].items():
+            np.testing.assert_array_equal(stream['simulation_history'][key], values)
+        np.testing.assert_array_equal(stream['bits'], self.reference['bits'])
+        np.testing.assert_array_equal(stream['x_values'], self.reference['x_values'])
+
+    def test_stream_matches_in_memory_run(self):
+        stream_dir = os.path.join(self.base, 'flujo')
+        config = dict(self.config, stream_dir=stream_dir, keep_history=False)
+        result = SimulationRunner(config, chunk_size=1000).run()
+        self.assertEqual(result['stream_dir'], stream_dir)
+        self.assertEqual(len(result['simulation_history']['latency']), 0)
+        self.assertEqual(len(result['bits']), 0)
+        self.assertEqual(result['test_results']['monobit']['p_value'],
+                         self.reference['test_results']['monobit']['p_value'])
+        stream = read_stream(stream_dir)
+        self.assertTrue(stream['complete'])
+        self.assertEqual(stream['config_params']['seed'], 11)
+        self._assert_matches_reference(stream)
+
+    def test_resume_discards_rows_after_checkpoint(self):
+        stream_dir = os.path.join(self.base, 'flujo')
+        checkpoint = os.path.join(self.base, 'checkpoint.npz')
+        config = dict(self.config, stream_dir=stream_dir)
+        runner = SimulationRunner(config, chunk_size=1000, checkpoint_path=checkpoint, checkpoint_interval=1000,
+                                  should_stop=lambda: runner.steps_done >= 3000)
+        self.assertTrue(runner.run()['stopped'])
+        # Simular filas escritas después del último checkpoint (por ejemplo, antes de un fallo)
+        with open(os.path.join(stream_dir, 'history_latency.bin'), 'ab') as f:
+            f.write(np.zeros(10).tobytes())
+        SimulationRunner.from_checkpoint(checkpoint, chunk_size=1000).run()
+        self._assert_matches_reference(read_stream(stream_dir))
+
+    def test_synced_rows_survive_without_close(self):
+        stream_dir = os.path.join(self.base, 'flujo')
+        sink = StreamingExportSink(stream_dir, buffer_rows=100)
+        steps = np.vstack([np.arange(250), np.ones((4, 250))])
+        sink.append(steps, np.ones(250), np.linspace(0, 1, 250))
+        sink.sync()
+        # Detener el escritor sin close, como si el proceso terminara: el manifiesto queda incompleto
+        sink._queue.put(None)
+        sink._thread.join()
+        stream = read_stream(stream_dir)
+        self.assertFalse(stream['complete'])
+        self.assertEqual(stream['rows'], 250)
+        np.testing.assert_array_equal(stream['simulation_history']['time_steps'], np.arange(250))
+        with self.assertRaises(ValueError):
+            sink.append(steps, np.ones(3), np.ones(3))
+        for f in sink._files.values():
+            f.close()
+
+    def test_period_failure_finishes_the_stream(self):
+        stream_dir = os.path.join(self.base, 'flujo')
+        # Con alpha = 0.5 y estos estados iniciales el generador repite un estado enseguida
+        config = dict(self.config, alpha=0.5, x0=0.25, y0=0.5, stream_dir=stream_dir)
+        for pipeline in (None, 'thread'):
+            with self.subTest(pipeline=pipeline):
+                result = SimulationRunner(dict(config), chunk_size=1000, pipeline=pipeline).run()
+                self.assertFalse(result['period_ok'])
+                stream = read_stream(stream_dir)
+                self.assertTrue(stream['complete'])
+                self.assertEqual(stream['rows'], len(result['bits']))
+                self.assertEqual(len(stream['x_values']), len(stream['bits']))
+
+    def test_checkpoint_is_saved_after_its_rows_are_synced(self):
+        stream_dir = os.path.join(self.base, 'flujo')
+        checkpoint = os.path.join(self.base, 'checkpoint.npz')
+        config = dict(self.config, stream_dir=stream_dir)
+        synced_at_save = []
+        save = checkpoint_module.save_checkpoint
+
+        def checked_save(path, snapshot):
+            with open(os.path.join(stream_dir, MANIFEST_FILE), encoding='utf-8') as f:
+                synced_at_save.append((snapshot['steps_done'], json.load(f)['rows_synced']))
+            save(path, snapshot)
+
+        with mock.patch.object(checkpoint_module, 'save_checkpoint', checked_save):
+            SimulationRunner(config, chunk_size=1000, checkpoint_path=checkpoint, checkpoint_interval=1000).run()
+        self.assertTrue(synced_at_save)
+        for steps_done, rows in synced_at_save:
+            self.assertGreaterEqual(rows, steps_done)
+        self.assertEqual(synced_at_save[-1][0], 6000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# tests/test_http_load_generator.py
+import unittest
+import numpy as np
+from src.core.http_load_generator import build_arrival_schedule, HttpLoadGenerator
+from src.utils.local_http_server import LocalHttpServer
+
+class TestHttpLoadGenerator(unittest.TestCase):
+
+    def test_schedule_from_bits_and_x_values(self):
+        schedule = build_arrival_schedule(bits=np.array([1, 0, 1]), num_users=10, step_seconds=0.5)
+        np.testing.assert_array_equal(schedule['requests_per_step'], [20, 12, 20])
+        self.assertEqual(len(schedule['arrival_times']), 52)
+        self.assertTrue(np.all(np.diff(schedule['arrival_times']) > 0))
+        self.assertTrue(np.all(schedule['arrival_times'] < 1.5))
+
+        schedule = build_arrival_schedule(x_values=np.array([0.0, 0.5, 0.75, 0.999]), num_users=100)
+        np.testing.assert_array_equal(schedule['requests_per_step'], [100, 150, 200, 250])
+        with self.assertRaises(ValueError):
+            build_arrival_schedule(num_users=10)
+
+    def test_run_against_local_server(self):
+        schedule = build_arrival_schedule(bits=np.array([1, 0, 1, 1, 0]), num_users=40, step_seconds=0.05)
+        with LocalHttpServer() as server:
+            result = HttpLoadGenerator(server.url, max_concurrency=8).run(schedule)
+            self.assertEqual(server.requests_served, len(schedule['arrival_times']))
+        self.assertEqual(result['errors'], 0)
+        self.assertLessEqual(result['connections_opened'], 8)
+        history = result['history']
+        self.assertEqual(set(history), {'time_steps', 'latency', 'cpu', 'memory', 'simulated_requests'})
+        self.assertEqual(history['simulated_requests'], list(schedule['requests_per_step'].astype(float)))
+        self.assertTrue(np.all(np.array(history['latency']) > 0))
+        self.assertEqual(result['http_errors'], 0)
+
+    def test_error_responses_are_counted(self):
+        schedule = build_arrival_schedule(bits=np.array([1, 0]), num_users=10, step_seconds=0.02)
+        with LocalHttpServer(status=503) as server:
+            result = HttpLoadGenerator(server.url, max_concurrency=4).run(schedule)
+        total = len(schedule['arrival_times'])
+        self.assertEqual(result['http_errors'], total)
+        self.assertEqual(result['errors'], total)
+        self.assertTrue(np.all(result['status_codes'] == 503))
+
+if __name__ == '__main__':
+    unittest.main()
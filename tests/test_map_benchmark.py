@@ -0,0 +1,33 @@
+# tests/test_map_benchmark.py
+import importlib.util
+import os
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location('map_benchmark', os.path.join(ROOT, 'benchmarks', 'map_benchmark.py'))
+map_benchmark = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(map_benchmark)
+
+
+class TestMapBenchmark(unittest.TestCase):
+
+    def test_reports_throughput_and_pass_rates(self):
+        results = map_benchmark.run_benchmarks(['logistic', 'bernoulli'], {'logistic': {'r': 3.99}}, num_bits=2000,
+                                               sequences=2, report=lambda line: None)
+        self.assertEqual([r['map'] for r in results], ['logistic', 'bernoulli'])
+        self.assertEqual(results[0]['params'], {'r': 3.99})
+        for result in results:
+            self.assertGreater(result['bits_per_second'], 0)
+            self.assertGreater(result['batch_steps_per_second'], 0)
+            self.assertEqual(set(result['test_pass_rates']), set(map_benchmark.BATTERY))
+        # El desplazamiento de Bernoulli (beta = 2) colapsa en punto flotante
+        self.assertEqual(results[1]['pass_rate'], 0.0)
+        self.assertLess(results[1]['mean_bits'], 2000)
+
+    def test_parse_params(self):
+        self.assertEqual(map_benchmark._parse_params(['cml.epsilon=0.2', 'cml.sites=16']), {'cml': {'epsilon': 0.2, 'sites': 16.0}})
+        with self.assertRaises(ValueError):
+            map_benchmark._parse_params(['epsilon=0.2'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+# tests/test_memmap_history.py
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.core.memmap_history import MemmapColumn, MemmapHistory, open_memmap_run
+from src.core.simulation_engine import summarize_history
+from src.core.simulation_runner import SimulationRunner, DEFAULT_CONFIG
+from src.utils import downsampling
+from src.utils.data_exporter import DataExporter
+
+
+class TestMemmapHistory(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = self._tmp.name
+        self.addCleanup(self._tmp.cleanup)
+
+    def _run(self, **options):
+        config = dict(DEFAULT_CONFIG, num_bits=20000, seed=4, **options)
+        return SimulationRunner(config, chunk_size=3000).run()
+
+    def test_column_grows_and_is_trimmed_on_close(self):
+        path = os.path.join(self.directory, 'latencia.bin')
+        column = MemmapColumn(path, '<f8', capacity=4)
+        column.extend([1.0, 2.0, 3.0])
+        column.append(4.0)
+        column.extend(np.arange(5.0, 11.0))
+        self.assertEqual(len(column), 10)
+        self.assertGreaterEqual(column.capacity, 10)
+        np.testing.assert_array_equal(column[-3:], [8.0, 9.0, 10.0])
+        self.assertEqual(list(column), list(np.arange(1.0, 11.0)))
+        column.close()
+        self.assertEqual(os.path.getsize(path), 10 * 8)
+        with self.assertRaises(ValueError):
+            column.append(11.0)
+
+    def test_history_is_reopened_from_its_manifest(self):
+        history = MemmapHistory(self.directory, capacity=100)
+        history.append_rows({'time_steps': [0, 1, 2], 'simulated_requests': [1.0, 2.0, 3.0],
+                             'latency': [5.0, 6.0, 7.0], 'cpu': [1.0, 1.0, 1.0], 'memory': [2.0, 2.0, 2.0]})
+        history.close()
+        reopened = MemmapHistory.open(self.directory)
+        self.assertEqual(reopened.rows, 3)
+        self.assertEqual(np.asarray(reopened['time_steps']).dtype, np.int64)
+        np.testing.assert_array_equal(reopened['latency'], [5.0, 6.0, 7.0])
+        starts = [start for start, _ in reopened.iter_chunks(chunk_rows=2)]
+        self.assertEqual(starts, [0, 2])
+
+    def test_rows_of_unequal_length_are_rejected(self):
+        history = MemmapHistory(self.directory, {'bits': '|u1', 'x_values': '<f8'}, capacity=10, name='bits')
+        with self.assertRaises(ValueError):
+            history.append_rows({'bits': [1, 0], 'x_values': [0.1, 0.2, 0.3]})
+        self.assertEqual(len(history['x_values']), 0)
+        history.close()
+
+    def test_period_failure_keeps_one_row_per_step_on_disk(self):
+        # Con alpha = 0.5 y estos estados iniciales el generador repite un estado enseguida
+        result = self._run(history_dir=self.directory, alpha=0.5, x0=0.25, y0=0.5)
+        self.assertFalse(result['period_ok'])
+        self.assertEqual(len(result['x_values']), len(result['bits']))
+        self.assertEqual(len(result['simulation_history']['latency']), len(result['bits']))
+
+    def test_run_on_disk_matches_run_in_memory(self):
+        expected = self._run()
+        result = self._run(history_dir=self.directory)
+        self.assertEqual(result['history_dir'], self.directory)
+        np.testing.assert_array_equal(result['bits'], expected['bits'])
+        np.testing.assert_array_equal(result['x_values'], expected['x_values'])
+        self.assertEqual(list(result['simulation_history']), list(expected['simulation_history']))
+        for key, values in expected['simulation_history'].items():
+            np.testing.assert_array_equal(result['simulation_history'][key], values)
+        np.testing.assert_array_equal(result['test_results']['poker']['counts'], expected['test_results']['poker']['counts'])
+        self.assertEqual(summarize_history(result['simulation_history']), summarize_history(expected['simulation_history']))
+
+        # Lo mismo al volver a abrir la carpeta (como hace SimulationWorker)
+        reopened = open_memmap_run(self.directory)
+        np.testing.assert_array_equal(reopened['bits'], expected['bits'])
+        np.testing.assert_array_equal(reopened['simulation_history']['cpu'], expected['simulation_history']['cpu'])
+
+    def test_csv_export_reads_history_in_chunks(self):
+        expected = self._run()
+        result = self._run(history_dir=self.directory)
+        paths = {}
+        for label, run in (('memoria', expected), ('disco', result)):
+            paths[label] = (os.path.join(self.directory, f'historial_{label}.csv'), os.path.join(self.directory, f'bits_{label}.csv'))
+            DataExporter.write_history_csv(paths[label][0], run['simulation_history'])
+            DataExporter.write_bits_csv(paths[label][1], run['bits'], x_values=run['x_values'], period_ok=True)
+        for in_memory, on_disk in zip(paths['memoria'], paths['disco']):
+            with open(in_memory, encoding='utf-8') as a, open(on_disk, encoding='utf-8') as b:
+                self.assertEqual(a.read(), b.read())
+
+    def test_resume_keeps_the_history_written_before_the_checkpoint(self):
+        expected = self._run()
+        checkpoint = os.path.join(self.directory, 'checkpoint.pkl')
+        history_dir = os.path.join(self.directory, 'historial')
+        batches = []
+        first = SimulationRunner(dict(DEFAULT_CONFIG, num_bits=20000, seed=4, history_dir=history_dir), chunk_size=3000,
+                                 checkpoint_path=checkpoint, checkpoint_interval=3000,
+                                 should_stop=lambda: len(batches) > 2, on_steps=batches.append).run()
+        self.assertTrue(first['stopped'])
+        result = SimulationRunner.from_checkpoint(checkpoint, chunk_size=3000).run()
+        np.testing.assert_array_equal(result['bits'], expected['bits'])
+        for key, values in expected['simulation_history'].items():
+            np.testing.assert_array_equal(result['simulation_history'][key], values)
+
+    def test_chunked_summary_matches_whole_column(self):
+        rng = np.random.default_rng(1)
+        history = {key: rng.uniform(0, 100, 1001).tolist() for key in ('simulated_requests', 'latency', 'cpu', 'memory')}
+        summary = summarize_history(history, chunk_rows=64)
+        self.assertEqual(summary['num_steps'], 1001)
+        self.assertAlmostEqual(summary['avg_latency'], float(np.mean(history['latency'])))
+        self.assertEqual(summary['max_memory'], float(np.max(history['memory'])))
+
+    def test_long_series_build_the_same_pyramid_in_chunks(self):
+        y = np.random.default_rng(2).standard_normal(100001)
+        x = np.arange(len(y))
+        expected = downsampling.LODPyramid(x, y)
+        for name, value in (('CHUNKED_LEVEL_POINTS', 5000), ('LEVEL_CHUNK_ROWS', 7000)):
+            self.addCleanup(setattr, downsampling, name, getattr(downsampling, name))
+            setattr(downsampling, name, value)
+        chunked = downsampling.LODPyramid(x, y)
+        self.assertLess(len(chunked.levels[1][0]), 5000 * 2 + 2)
+        levels = {len(level_x): (level_x, level_y) for level_x, level_y in expected.levels}
+        for level_x, level_y in chunked.levels:
+            np.testing.assert_array_equal(levels[len(level_x)][0], level_x)
+            np.testing.assert_array_equal(levels[len(level_x)][1], level_y)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# tests/test_metrics_buffer.py
+import threading
+import unittest
+import numpy as np
+from src.utils.metrics_buffer import MetricsBuffer, ColumnMetricsBuffer
+
+class TestMetricsBuffer(unittest.TestCase):
+
+    def test_drain_returns_all_pending_in_order(self):
+        buffer = MetricsBuffer()
+        producer = threading.Thread(target=lambda: [buffer.push({'time_step': i}) for i in range(10000)])
+        producer.start()
+        drained = []
+        while producer.is_alive() or len(buffer):
+            drained.extend(buffer.drain())
+        producer.join()
+        drained.extend(buffer.drain())
+        self.assertEqual([m['time_step'] for m in drained], list(range(10000)))
+        self.assertEqual(buffer.drain(), [])
+
+    def test_maxlen_drops_oldest(self):
+        buffer = MetricsBuffer(maxlen=3)
+        for i in range(5):
+            buffer.push({'time_step': i})
+        self.assertEqual([m['time_step'] for m in buffer.drain()], [2, 3, 4])
+        self.assertEqual(buffer.dropped, 2)
+
+    def test_column_buffer_keeps_tail_and_maxima(self):
+        buffer = ColumnMetricsBuffer(capacity=4, num_columns=2)
+        self.assertEqual(buffer.drain(), (None, None))
+        buffer.push(np.array([[0, 1, 2], [5.0, 90.0, 1.0]]))
+        buffer.push(np.array([[3, 4, 5], [2.0, 3.0, 4.0]]))
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(buffer.dropped, 2)
+        columns, maxima = buffer.drain()
+        np.testing.assert_array_equal(columns, [[2, 3, 4, 5], [1.0, 2.0, 3.0, 4.0]])
+        # El pico descartado sigue contando para el máximo
+        np.testing.assert_array_equal(maxima, [5, 90.0])
+        self.assertEqual(buffer.drain(), (None, None))
+        buffer.push(np.array([[6], [7.0]]))
+        np.testing.assert_array_equal(buffer.drain()[1], [6, 7.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+# tests/test_pipeline.py
+import threading
+import time
+import unittest
+import numpy as np
+from src.core.pipeline import Pipeline, Source, Stage
+from src.core.simulation_runner import SimulationRunner, DEFAULT_CONFIG
+
+
+class CountingSource(Source):
+    name = 'contador'
+
+    def __init__(self, total):
+        self.total = total
+        self.produced = 0
+
+    def chunks(self, stop):
+        for i in range(self.total):
+            if stop.is_set():
+                return
+            self.produced += 1
+            yield {'bits': np.full(10, i % 2)}
+
+
+class FailingStage(Stage):
+    name = 'falla'
+
+    def process(self, chunk):
+        raise ZeroDivisionError("etapa rota")
+
+
+class TestPipeline(unittest.TestCase):
+
+    def _run(self, **options):
+        config = dict(DEFAULT_CONFIG, num_bits=30000, seed=3, **options)
+        return SimulationRunner(config, chunk_size=4096).run()
+
+    def assert_same_run(self, result, expected):
+        np.testing.assert_array_equal(result['bits'], expected['bits'])
+        np.testing.assert_array_equal(result['x_values'], expected['x_values'])
+        for key, values in expected['simulation_history'].items():
+            np.testing.assert_array_equal(result['simulation_history'][key], values)
+        for key in ('monobit', 'serial', 'autocorr', 'poker'):
+            np.testing.assert_array_equal(result['test_results'][key]['counts'], expected['test_results'][key]['counts'])
+
+    def test_thread_pipeline_matches_sequential_run(self):
+        expected = self._run()
+        result = self._run(pipeline='thread')
+        self.assert_same_run(result, expected)
+        self.assertEqual([s['stage'] for s in result['pipeline']], ['generación', 'simulación', 'pruebas'])
+        self.assertEqual(result['pipeline'][0]['items'], 8)
+        self.assertNotIn('pipeline', expected)
+
+    def test_process_pipeline_matches_sequential_run(self):
+        self.assert_same_run(self._run(pipeline='process'), self._run())
+
+    def test_stop_finishes_chunks_already_generated(self):
+        calls = []
+        runner = SimulationRunner(dict(DEFAULT_CONFIG, num_bits=10**6, seed=3, pipeline='thread'), chunk_size=2048,
+                                  should_stop=lambda: len(calls) > 0, on_steps=calls.append)
+        result = runner.run()
+        self.assertTrue(result['stopped'])
+        steps = len(result['bits'])
+        self.assertLess(steps, 10**6)
+        self.assertEqual(len(result['simulation_history']['latency']), steps)
+        self.assertEqual(result['test_results']['monobit']['counts'].sum(), steps)
+
+    def test_bounded_queues_apply_backpressure(self):
+        source = CountingSource(100)
+        consumed = []
+
+        def slow_consume(chunk):
+            consumed.append(source.produced)
+            time.sleep(0.002)
+        Pipeline(source, [Stage()], queue_depth=2).run(slow_consume)
+        self.assertEqual(len(consumed), 100)
+        # Como mucho, dos colas llenas más un bloque en cada etapa
+        self.assertLessEqual(max(p - i for i, p in enumerate(consumed)), 2 * 2 + 3)
+
+    def test_stage_error_is_raised_without_hanging(self):
+        pipeline = Pipeline(CountingSource(1000), [FailingStage(), Stage()], queue_depth=1)
+        thread_result = {}
+        worker = threading.Thread(target=lambda: thread_result.setdefault('error', self._raises(pipeline)))
+        worker.start()
+        worker.join(10)
+        self.assertFalse(worker.is_alive())
+        self.assertIsInstance(thread_result['error'], ZeroDivisionError)
+
+    @staticmethod
+    def _raises(pipeline):
+        try:
+            pipeline.run(lambda chunk: None)
+        except Exception as error:
+            return error
+
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            Pipeline(CountingSource(1), mode='gpu')
+
+    def test_source_without_chunks_cannot_be_created(self):
+        with self.assertRaises(TypeError):
+            Source()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# tests/test_profiling.py
+import unittest
+import numpy as np
+from src.core.profiling import Profiler, NULL_PROFILER, format_profile
+from src.core.simulation_runner import SimulationRunner, DEFAULT_CONFIG
+
+class TestProfiler(unittest.TestCase):
+
+    def test_nested_spans_and_counters(self):
+        profiler = Profiler()
+        for _ in range(2):
+            with profiler.span('simulación'):
+                with profiler.span('pruebas'):
+                    profiler.count('bloques')
+        profile = profiler.report()
+        self.assertEqual([span['path'] for span in profile['spans']], ['simulación', 'simulación/pruebas'])
+        self.assertEqual([span['calls'] for span in profile['spans']], [2, 2])
+        self.assertEqual(profile['counters'], {'bloques': 2})
+        outer, inner = profile['spans']
+        self.assertGreaterEqual(outer['wall_seconds'], inner['wall_seconds'])
+        self.assertEqual(len(format_profile(profile)), 3)
+
+    def test_disabled_profiler_records_nothing(self):
+        self.assertIs(NULL_PROFILER.span('a'), NULL_PROFILER.span('b'))
+        with NULL_PROFILER.span('a'):
+            NULL_PROFILER.count('x')
+        self.assertEqual(NULL_PROFILER.report()['spans'], [])
+        self.assertEqual(NULL_PROFILER.report()['counters'], {})
+
+    def test_memory_peak_per_span(self):
+        profiler = Profiler(trace_memory=True)
+        with profiler.span('exterior'):
+            with profiler.span('asignación'):
+                data = np.ones(2_000_000)
+                del data
+            with profiler.span('liviana'):
+                pass
+        spans = {span['path']: span for span in profiler.report()['spans']}
+        self.assertGreaterEqual(spans['exterior/asignación']['alloc_peak_bytes'], 16_000_000)
+        self.assertLess(spans['exterior/liviana']['alloc_peak_bytes'], 1_000_000)
+        # El pico de una fase hija también cuenta para la fase padre
+        self.assertGreaterEqual(spans['exterior']['alloc_peak_bytes'], 16_000_000)
+
+    def test_merge_with_prefix(self):
+        worker = Profiler()
+        with worker.span('generación'):
+            worker.count('pasos', 10)
+        profiler = Profiler()
+        with profiler.span('proceso'):
+            pass
+        profiler.merge(worker.report(), prefix='proceso')
+        profiler.merge(worker.report(), prefix='proceso')
+        profile = profiler.report()
+        self.assertEqual([span['path'] for span in profile['spans']], ['proceso', 'proceso/generación'])
+        self.assertEqual(profile['spans'][1]['calls'], 2)
+        self.assertEqual(profile['counters'], {'proceso/pasos': 20})
+
+    def test_runner_profile(self):
+        result = SimulationRunner(dict(DEFAULT_CONFIG, num_bits=3000, profile=True), chunk_size=1000).run()
+        paths = [span['path'] for span in result['profile']['spans']]
+        for phase in ('generación', 'simulación', 'pruebas'):
+            self.assertIn(phase, paths)
+        self.assertEqual(result['profile']['counters']['pasos'], 3000)
+        self.assertNotIn('profile', SimulationRunner(dict(DEFAULT_CONFIG, num_bits=1000)).run())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# tests/test_progress.py
+import os
+import tempfile
+import threading
+import time
+import unittest
+import numpy as np
+from src.core.progress import ProgressReporter, CancellationToken, OperationCancelled, format_progress
+from src.core.chaotic_generator import ChaoticBitGenerator
+from src.core.randomness_tests import RandomnessTests
+from src.core.simulation_runner import SimulationRunner, DEFAULT_CONFIG
+from src.utils.data_exporter import DataExporter
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+class TestProgress(unittest.TestCase):
+
+    def test_throughput_eta_and_rate_limit(self):
+        clock = FakeClock()
+        updates = []
+        progress = ProgressReporter(updates.append, min_interval=1.0, clock=clock)
+        progress.start_phase("Fase", 100)
+        clock.now = 0.5
+        progress.advance(10)  # antes de min_interval: no se informa
+        clock.now = 2.0
+        progress.advance(10)
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(updates[-1]['done'], 20)
+        self.assertAlmostEqual(updates[-1]['throughput'], 10.0)
+        self.assertAlmostEqual(updates[-1]['eta_seconds'], 8.0)
+        progress.advance(80)  # el final de la fase siempre se informa
+        self.assertEqual(updates[-1]['eta_seconds'], 0.0)
+        self.assertIn("100/100", format_progress(updates[-1]))
+
+    def test_cancellation_raises(self):
+        token = CancellationToken()
+        progress = ProgressReporter(token=token)
+        progress.start_phase("Fase", 10)
+        token.cancel()
+        with self.assertRaises(OperationCancelled):
+            progress.advance()
+
+    def test_generator_and_tests_report_and_cancel(self):
+        updates = []
+        progress = ProgressReporter(updates.append, min_interval=0)
+        bits, _, _ = ChaoticBitGenerator().generate_cccbg_bits(0.495, 0.3, 0.301, 5000, progress=progress)
+        self.assertEqual(updates[-1]['done'], 5000)
+        RandomnessTests().run_all_tests(bits, progress=progress)
+        self.assertEqual((updates[-1]['phase'], updates[-1]['done']), ("Pruebas de aleatoriedad", 4))
+
+        token = CancellationToken()
+        threading.Timer(0.05, token.cancel).start()
+        start = time.perf_counter()
+        with self.assertRaises(OperationCancelled):
+            ChaoticBitGenerator().generate_cccbg_bits(0.495, 0.3, 0.301, 10_000_000,
+                                                      progress=ProgressReporter(token=token))
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_runner_stops_on_cancel(self):
+        token = CancellationToken()
+        progress = ProgressReporter(token=token)
+        threading.Timer(0.05, token.cancel).start()
+        start = time.perf_counter()
+        result = SimulationRunner(dict(DEFAULT_CONFIG, num_bits=10_000_000), chunk_size=100000,
+                                  progress=progress).run()
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertTrue(result['stopped'])
+        self.assertEqual(len(result['bits']), len(result['simulation_history']['latency']))
+
+    def test_export_cancel_removes_partial_file(self):
+        token = CancellationToken()
+        def cancel_midway(update):
+            if update['done'] > 0:
+                token.cancel()
+        progress = ProgressReporter(cancel_midway, token=token, min_interval=0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bits.csv')
+            with self.assertRaises(OperationCancelled):
+                DataExporter.write_bits_csv(path, np.zeros(250000, dtype=int), progress=progress)
+            self.assertFalse(os.path.exists(path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -87,5 +87,18 @@ class TestRandomnessTests(unittest.TestCase):
             self.assertIn(key, results)
             self.assertIsInstance(results[key]['p_value'], float)
 
+    def test_count_tables(self):
+        bits = np.random.randint(0, 2, size=20003)
+        results = self.tester.run_all_tests(bits)
+        pairs = [2 * bits[i] + bits[i+1] for i in range(len(bits) - 1)]
+        expected_pairs = [pairs.count(v) for v in range(4)]
+        np.testing.assert_array_equal(results['Monobit Test']['counts'], [np.sum(bits == 0), np.sum(bits == 1)])
+        np.testing.assert_array_equal(results['Serial Test']['counts'], expected_pairs)
+        np.testing.assert_array_equal(results['Auto-correlation Test (d=1)']['counts'], expected_pairs)
+        self.assertAlmostEqual(results['Auto-correlation Test (d=1)']['correlation'],
+                               np.corrcoef(bits[:-1], bits[1:])[0, 1], places=12)
+        blocks = [int(''.join(str(b) for b in bits[i*4:(i+1)*4]), 2) for i in range(len(bits) // 4)]
+        np.testing.assert_array_equal(results['Poker Test (m=4)']['counts'], np.bincount(blocks, minlength=16))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
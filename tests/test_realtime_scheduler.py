@@ -0,0 +1,63 @@
+# tests/test_realtime_scheduler.py
+import time
+import unittest
+from src.core.realtime_scheduler import RealTimeScheduler
+from src.core.simulation_runner import SimulationRunner
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+class TestRealTimeScheduler(unittest.TestCase):
+
+    def test_on_time_engine_gets_single_steps(self):
+        clock = FakeClock()
+        scheduler = RealTimeScheduler(steps_per_second=100, clock=clock, sleep=clock.sleep, spin_seconds=0.0)
+        batches = [scheduler.wait_next() for _ in range(50)]
+        self.assertEqual(batches, [1] * 50)
+        # Plazos absolutos: el paso 49 vence en t0 + 0.49 s, sin deriva acumulada
+        self.assertAlmostEqual(clock.now, 0.49, places=9)
+        self.assertEqual(scheduler.stats()['missed_deadlines'], 0)
+
+    def test_slow_engine_is_batched(self):
+        clock = FakeClock()
+        scheduler = RealTimeScheduler(steps_per_second=100, max_batch=20, clock=clock, sleep=clock.sleep, spin_seconds=0.0)
+        total = 0
+        while total < 200:
+            total += scheduler.wait_next()
+            clock.now += 0.05  # Cada lote tarda lo que 5 pasos
+        stats = scheduler.stats()
+        self.assertGreater(stats['max_batch'], 1)
+        self.assertLessEqual(stats['max_batch'], 20)
+        self.assertGreater(stats['missed_deadlines'], 0)
+        self.assertLess(stats['batches'], 200)
+        # Al ejecutar en lote el retraso no crece sin límite
+        self.assertLess(stats['max_lag_seconds'], 0.2)
+
+    def test_acceleration_factor(self):
+        scheduler = RealTimeScheduler(acceleration=10, step_seconds=2.0)
+        self.assertAlmostEqual(scheduler.period, 0.2)
+        with self.assertRaises(ValueError):
+            RealTimeScheduler()
+
+    def test_paced_run(self):
+        config = {
+            'alpha': 0.495, 'x0': 0.3, 'y0': 0.301, 'num_bits': 100, 'num_users': 100,
+            'latency_sensitivity': 1.5, 'cpu_sensitivity': 0.8, 'memory_sensitivity': 0.5,
+            'recovery_rate': 0.05, 'steps_per_second': 1000
+        }
+        start = time.perf_counter()
+        result = SimulationRunner(config).run()
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(result['bits']), 100)
+        self.assertGreaterEqual(elapsed, 0.099)
+        self.assertEqual(result['pacing']['steps_scheduled'], 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# tests/test_report_builder.py
+import importlib.util
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.core.progress import ProgressReporter, CancellationToken, OperationCancelled
+from src.utils.report_builder import ReportBuilder, build_report_pages
+
+HAS_PYPDF = importlib.util.find_spec('pypdf') is not None
+
+class TestReportBuilder(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'reporte.pdf')
+        n = 200000
+        rng = np.random.default_rng(2)
+        self.history = {'time_steps': np.arange(n), 'latency': rng.uniform(0, 500, n), 'cpu': rng.uniform(0, 100, n),
+                        'memory': rng.uniform(0, 100, n), 'simulated_requests': rng.uniform(50, 250, n)}
+        self.bits = rng.integers(0, 2, n)
+        x = rng.uniform(0, 1, n)
+        self.variability = {'orbit_x': x, 'sensitivity_x1': x, 'sensitivity_x2': x[::-1],
+                            'config_params': {'alpha': 0.495, 'x0': 0.3}}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_pages_use_reduced_data(self):
+        pages = build_report_pages(self.history, self.bits, {}, self.variability, max_points=1000)
+        self.assertEqual([kind for kind, _ in pages], ['summary', 'metrics', 'tests', 'orbit', 'sensitivity'])
+        style, (x, low, high) = pages[1][1]['series']['latency']
+        self.assertEqual(style, 'envelope')
+        self.assertLessEqual(len(x), 500)
+        self.assertEqual(high.max(), self.history['latency'].max())
+        self.assertEqual(int(pages[2][1]['monobit'].sum()), len(self.bits))
+        self.assertLessEqual(len(pages[3][1]['series'][0]), 1000)
+
+    def test_sequential_report_is_small(self):
+        ReportBuilder(workers=1).build(self.path, self.history, self.bits, {}, variability_data=self.variability)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(5), b'%PDF-')
+        self.assertLess(os.path.getsize(self.path), 2_000_000)
+
+    @unittest.skipUnless(HAS_PYPDF, "pypdf no está instalado")
+    def test_parallel_report_merges_pages(self):
+        from pypdf import PdfReader
+        ReportBuilder(workers=2).build(self.path, self.history, self.bits, {}, variability_data=self.variability)
+        self.assertEqual(len(PdfReader(self.path).pages), 5)
+
+    def test_cancel_removes_partial_report(self):
+        token = CancellationToken()
+        progress = ProgressReporter(lambda update: token.cancel() if update['done'] else None, token=token, min_interval=0)
+        with self.assertRaises(OperationCancelled):
+            ReportBuilder(workers=1, progress=progress).build(self.path, self.history, self.bits, {})
+        self.assertFalse(os.path.exists(self.path))
+
+if __name__ == '__main__':
+    unittest.main()
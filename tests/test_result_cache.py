@@ -0,0 +1,95 @@
+# tests/test_result_cache.py
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.core.randomness_tests import RandomnessTests
+from src.core.simulation_runner import SimulationRunner, DEFAULT_CONFIG
+from src.utils.result_cache import ResultCache, sequence_digest, config_key
+
+class CountingTests(RandomnessTests):
+    """Cuenta las pruebas Monobit calculadas (las demás se delegan igual)."""
+    calls = 0
+
+    def monobit_test(self, bit_sequence):
+        CountingTests.calls += 1
+        return super().monobit_test(bit_sequence)
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'cache')
+        rng = np.random.default_rng(0)
+        self.bits = rng.integers(0, 2, 20000, dtype=np.uint8)
+        CountingTests.calls = 0
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_sequence_digest(self):
+        self.assertEqual(sequence_digest(self.bits), sequence_digest(self.bits.astype(np.int64).tolist()))
+        changed = self.bits.copy()
+        changed[-1] ^= 1
+        self.assertNotEqual(sequence_digest(self.bits), sequence_digest(changed))
+        self.assertNotEqual(sequence_digest(self.bits[:8]), sequence_digest(np.append(self.bits[:8], 0)))
+        self.assertEqual(config_key(DEFAULT_CONFIG), config_key(dict(DEFAULT_CONFIG, num_users=5)))
+
+    def test_hits_memory_and_disk(self):
+        tests = CountingTests(cache=ResultCache(self.cache_dir))
+        first = tests.run_all_tests(self.bits)
+        second = tests.run_all_tests(self.bits.copy())
+        self.assertEqual(CountingTests.calls, 1)
+        self.assertEqual(tests.cache.hits, 4)
+        # Otra instancia lee lo guardado en disco
+        reopened = CountingTests(cache=ResultCache(self.cache_dir))
+        third = reopened.run_all_tests(self.bits)
+        self.assertEqual(CountingTests.calls, 1)
+        for name in first:
+            self.assertAlmostEqual(first[name]['p_value'], second[name]['p_value'])
+            self.assertAlmostEqual(first[name]['p_value'], third[name]['p_value'])
+            np.testing.assert_array_equal(first[name]['counts'], third[name]['counts'])
+
+    def test_version_change_invalidates(self):
+        cache = ResultCache(self.cache_dir)
+        cache.put('clave', 'Monobit Test', 1, {'p_value': 0.5})
+        self.assertIsNotNone(cache.get('clave', 'Monobit Test', 1))
+        self.assertIsNone(cache.get('clave', 'Monobit Test', 2))
+        cache.clear()
+        self.assertIsNone(ResultCache(self.cache_dir).get('clave', 'Monobit Test', 1))
+
+    def test_size_limits(self):
+        cache = ResultCache(self.cache_dir, max_entries=2, max_disk_bytes=2000)
+        for i in range(50):
+            cache.put(f'clave{i}', 'Poker Test (m=4)', 1, {'p_value': 0.1, 'counts': np.arange(16)})
+        self.assertEqual(len(cache._memory), 2)
+        total = sum(os.path.getsize(os.path.join(self.cache_dir, name)) for name in os.listdir(self.cache_dir))
+        self.assertLessEqual(total, 2000)
+        self.assertIsNotNone(cache.get('clave49', 'Poker Test (m=4)', 1))
+
+    def test_runner_reuses_results_by_config(self):
+        config = dict(DEFAULT_CONFIG, num_bits=12000, seed=2, test_cache_dir=self.cache_dir)
+        first = SimulationRunner(dict(config), chunk_size=4000).run()
+        runner = SimulationRunner(dict(config), chunk_size=4000)
+        second = runner.run()
+        self.assertEqual(runner.accumulator.n, 0)
+        self.assertEqual(runner.test_cache.hits, 4)
+        for key in ('monobit', 'serial', 'autocorr', 'poker'):
+            self.assertAlmostEqual(first['test_results'][key]['p_value'], second['test_results'][key]['p_value'])
+        # La secuencia también queda indexada por contenido
+        tests = CountingTests(cache=ResultCache(self.cache_dir))
+        tests.run_all_tests(first['bits'])
+        self.assertEqual(CountingTests.calls, 0)
+
+    def test_stopped_run_without_stored_bits_still_has_results(self):
+        config = dict(DEFAULT_CONFIG, num_bits=12000, seed=2, test_cache_dir=self.cache_dir)
+        SimulationRunner(dict(config), chunk_size=4000).run()
+        runner = SimulationRunner(dict(config, keep_history=False), chunk_size=4000,
+                                  should_stop=lambda: runner.steps_done >= 8000)
+        result = runner.run()
+        self.assertTrue(result['stopped'])
+        self.assertEqual(runner.accumulator.n, 8000)
+        self.assertFalse(np.isnan(result['test_results']['monobit']['p_value']))
+
+if __name__ == '__main__':
+    unittest.main()
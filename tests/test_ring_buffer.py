@@ -0,0 +1,28 @@
+# tests/test_ring_buffer.py
+import unittest
+import numpy as np
+from src.utils.ring_buffer import RingBuffer
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_keeps_last_values_in_order(self):
+        buffer = RingBuffer(capacity=5, num_columns=2)
+        stream = np.arange(23)
+        for chunk in np.array_split(stream, 9):
+            buffer.extend([chunk, chunk * 10])
+        view = buffer.view()
+        np.testing.assert_array_equal(view[0], stream[-5:])
+        np.testing.assert_array_equal(view[1], stream[-5:] * 10)
+
+    def test_partial_fill_and_large_batch(self):
+        buffer = RingBuffer(capacity=4, num_columns=1)
+        buffer.extend([[1.0, 2.0]])
+        np.testing.assert_array_equal(buffer.view()[0], [1.0, 2.0])
+        buffer.extend([np.arange(10.0)])
+        np.testing.assert_array_equal(buffer.view()[0], [6.0, 7.0, 8.0, 9.0])
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.view().shape, (1, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# tests/test_run_store.py
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.core.simulation_runner import SimulationRunner, DEFAULT_CONFIG
+from src.utils.run_store import RunStore, config_hash, estimate_run_bytes
+
+class TestRunStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = RunStore(self.tmp_dir.name)
+        self.config = dict(DEFAULT_CONFIG, num_bits=3000, seed=5)
+        self.result = SimulationRunner(dict(self.config), chunk_size=1000).run()
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp_dir.cleanup()
+
+    def test_config_hash_ignores_paths(self):
+        self.assertEqual(config_hash(self.config), config_hash(dict(self.config, stream_dir='flujo', name='otra')))
+        self.assertNotEqual(config_hash(self.config), config_hash(dict(self.config, alpha=0.3)))
+
+    def test_load_round_trip(self):
+        run_id = self.store.save_run(self.config, self.result, name='prueba')
+        run = self.store.load_run(run_id)
+        self.assertEqual(run['name'], 'prueba')
+        self.assertEqual(run['config_params']['seed'], 5)
+        self.assertEqual(run['period_ok'], self.result['period_ok'])
+        np.testing.assert_array_equal(run['bits'], self.result['bits'])
+        np.testing.assert_array_equal(run['x_values'], self.result['x_values'])
+        for key, values in self.result['simulation_history'].items():
+            np.testing.assert_array_equal(run['simulation_history'][key], values)
+        for test in ('monobit', 'serial', 'autocorr', 'poker'):
+            # Con pocos bits algunas pruebas dan NaN, que debe conservarse
+            np.testing.assert_allclose(run['test_results'][test]['p_value'], self.result['test_results'][test]['p_value'])
+        np.testing.assert_array_equal(run['test_results']['poker']['counts'], self.result['test_results']['poker']['counts'])
+
+    def test_estimated_size_matches_saved_arrays(self):
+        run_id = self.store.save_run(self.config, self.result)
+        arrays_dir = self.store.artifacts_dir(run_id)
+        saved = sum(np.load(os.path.join(arrays_dir, name), mmap_mode='r').nbytes for name in os.listdir(arrays_dir))
+        self.assertEqual(estimate_run_bytes(self.result), saved)
+
+    def test_query_by_parameters_and_p_values(self):
+        inside = self.store.save_run(dict(self.config, alpha=0.496), self.result)
+        self.store.save_run(dict(self.config, alpha=0.3), self.result)
+        monobit_p = self.result['test_results']['monobit']['p_value']
+
+        runs = self.store.query(alpha=(0.495, 0.497))
+        self.assertEqual([run['id'] for run in runs], [inside])
+        self.assertAlmostEqual(runs[0]['p_values']['monobit'], monobit_p)
+        self.assertEqual(len(self.store.query(alpha=(0.495, 0.497), p_values={'monobit': ('<', monobit_p)})), 0)
+        self.assertEqual(len(self.store.query(p_values={'Monobit Test': ('<=', monobit_p)})), 2)
+        self.assertEqual(len(self.store.query(alpha=(None, 0.4), num_users=self.config['num_users'])), 1)
+        self.assertEqual(len(self.store.query(config_hash=config_hash(dict(self.config, alpha=0.3)))), 1)
+        with self.assertRaises(ValueError):
+            self.store.query(config_json='x')
+
+    def test_delete_run(self):
+        run_id = self.store.save_run(self.config, self.result)
+        self.store.delete_run(run_id)
+        self.assertEqual(self.store.query(), [])
+        with self.assertRaises(KeyError):
+            self.store.load_run(run_id)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# tests/test_simulation_runner.py
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.core.simulation_runner import SimulationRunner
+from src.core.randomness_tests import RandomnessTests, RandomnessAccumulator
+
+class TestSimulationRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.config = {
+            'alpha': 0.495, 'x0': 0.3, 'y0': 0.301, 'num_bits': 12000,
+            'num_users': 100, 'latency_sensitivity': 1.5, 'cpu_sensitivity': 0.8,
+            'memory_sensitivity': 0.5, 'recovery_rate': 0.05, 'seed': 7
+        }
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.tmp_dir.name, 'checkpoint.npz')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_accumulator_matches_full_tests(self):
+        bits = np.random.randint(0, 2, size=20001)
+        acc = RandomnessAccumulator(d=1, m=4)
+        for chunk in np.array_split(bits, 7):
+            acc.update(chunk)
+        results = acc.results()
+        tester = RandomnessTests()
+        self.assertAlmostEqual(results['monobit']['p_value'], tester.monobit_test(bits)['p_value'], places=12)
+        self.assertAlmostEqual(results['serial']['statistic'], tester.serial_test(bits)['statistic'], places=9)
+        self.assertAlmostEqual(results['autocorr']['statistic'], tester.auto_correlation_test(bits, d=1)['statistic'], places=9)
+        self.assertAlmostEqual(results['poker']['statistic'], tester.poker_test(bits, m=4)['statistic'], places=9)
+        np.testing.assert_array_equal(results['serial']['counts'], tester.serial_test(bits)['counts'])
+        np.testing.assert_array_equal(results['poker']['counts'], tester.poker_test(bits, m=4)['counts'])
+        self.assertAlmostEqual(results['autocorr']['correlation'], tester.auto_correlation_test(bits, d=1)['correlation'], places=12)
+
+    def test_resume_is_bit_identical(self):
+        full = SimulationRunner(self.config, chunk_size=1000).run()
+
+        steps = []
+        stopped = SimulationRunner(self.config, chunk_size=1000,
+                                   checkpoint_path=self.checkpoint_path, checkpoint_interval=2000,
+                                   on_metrics=steps.append,
+                                   should_stop=lambda: len(steps) >= 5432).run()
+        self.assertTrue(stopped['stopped'])
+        self.assertEqual(len(stopped['bits']), 5432)
+        self.assertTrue(os.path.exists(self.checkpoint_path))
+
+        resumed = SimulationRunner.from_checkpoint(self.checkpoint_path, chunk_size=1000).run()
+        self.assertFalse(resumed['stopped'])
+        np.testing.assert_array_equal(full['bits'], resumed['bits'])
+        np.testing.assert_array_equal(full['x_values'], resumed['x_values'])
+        for key, values in full['simulation_history'].items():
+            self.assertEqual(values, resumed['simulation_history'][key])
+        for key in ['monobit', 'serial', 'autocorr', 'poker']:
+            self.assertEqual(full['test_results'][key]['statistic'], resumed['test_results'][key]['statistic'])
+
+    def test_checkpoint_snapshots_are_not_copied_again(self):
+        runner = SimulationRunner(self.config, chunk_size=1000,
+                                  checkpoint_path=self.checkpoint_path, checkpoint_interval=2000)
+        snapshots = []
+        get_state = runner.get_checkpoint_state
+        runner.get_checkpoint_state = lambda: snapshots.append(get_state()) or snapshots[-1]
+        result = runner.run()
+        self.assertGreater(len(snapshots), 2)
+        # Las instantáneas anteriores no cambian al seguir agregando bloques
+        for snapshot in snapshots:
+            steps = snapshot['steps_done']
+            np.testing.assert_array_equal(snapshot['bits'], result['bits'][:steps])
+            self.assertEqual(list(snapshot['simulator']['history']['latency']),
+                             result['simulation_history']['latency'][:steps])
+        self.assertTrue(np.shares_memory(snapshots[-1]['bits'], result['bits']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+# tests/test_simulation_worker.py
+import unittest
+import numpy as np
+from src.core.simulation_runner import SimulationRunner, DEFAULT_CONFIG
+from src.core.simulation_worker import SimulationWorker, export_shared_arrays, import_shared_arrays
+
+class TestSimulationWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.config = dict(DEFAULT_CONFIG, num_bits=20000, seed=3)
+
+    def test_shared_arrays_roundtrip(self):
+        arrays = {'a': np.arange(10, dtype=np.int64), 'b': np.linspace(0, 1, 7), 'empty': np.zeros(0)}
+        descriptors, segments = export_shared_arrays(arrays)
+        for segment in segments:
+            segment.close()
+        restored = import_shared_arrays(descriptors)
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(restored[name], array)
+            self.assertEqual(restored[name].dtype, array.dtype)
+
+    def test_worker_matches_in_process_run(self):
+        expected = SimulationRunner(self.config).run()
+        messages = []
+        result = SimulationWorker(self.config).run(on_message=messages.append)
+        np.testing.assert_array_equal(result['bits'], expected['bits'])
+        np.testing.assert_array_equal(result['x_values'], expected['x_values'])
+        self.assertEqual(list(result['simulation_history']), list(expected['simulation_history']))
+        for key, values in expected['simulation_history'].items():
+            self.assertIsInstance(result['simulation_history'][key], np.ndarray)
+            np.testing.assert_array_equal(result['simulation_history'][key], values)
+        self.assertEqual(result['test_results']['poker']['statistic'], expected['test_results']['poker']['statistic'])
+        streamed = np.concatenate([m[1] for m in messages if m[0] == 'metrics'], axis=1)
+        np.testing.assert_array_equal(streamed[2], expected['simulation_history']['latency'])
+        progress = [m[1] for m in messages if m[0] == 'progress']
+        self.assertEqual(progress[-1]['phase'], "Generación y simulación")
+        self.assertEqual((progress[-1]['done'], progress[-1]['total']), (20000, 20000))
+
+    def test_stop_request(self):
+        worker = SimulationWorker(dict(self.config, num_bits=50_000_000), chunk_size=1000)
+        def stop_on_progress(message):
+            if message[0] == 'progress':
+                worker.stop()
+        result = worker.run(on_message=stop_on_progress)
+        self.assertTrue(result['stopped'])
+        self.assertLess(len(result['bits']), 50_000_000)
+        self.assertEqual(len(result['bits']), len(result['simulation_history']['latency']))
+
+    def test_error_is_reported(self):
+        worker = SimulationWorker(checkpoint_path='/nonexistent/checkpoint.npz')
+        with self.assertRaises(RuntimeError):
+            worker.run()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+# tests/test_startup_imports.py
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules(module, candidates):
+    """Importa module en un intérprete nuevo y devuelve cuáles de candidates quedaron cargados."""
+    code = (f"import sys; import {module}; "
+            f"print(','.join(m for m in {candidates!r} if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [name for name in output.stdout.strip().split(',') if name]
+
+
+class TestStartupImports(unittest.TestCase):
+
+    def test_main_window_defers_heavy_modules(self):
+        loaded = loaded_modules('src.gui.main_window',
+                                ['matplotlib', 'matplotlib.pyplot', 'pandas', 'scipy'])
+        self.assertEqual(loaded, [])
+
+    def test_plot_tabs_do_not_load_pyplot_pandas_or_scipy(self):
+        loaded = loaded_modules('src.gui.results_tab',
+                                ['matplotlib.pyplot', 'matplotlib.backends.backend_pdf', 'pandas', 'scipy'])
+        self.assertEqual(loaded, [])
+
+    def test_worker_is_headless_and_defers_scipy(self):
+        loaded = loaded_modules('src.core.simulation_worker', ['tkinter', 'matplotlib', 'pandas', 'scipy'])
+        self.assertEqual(loaded, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+# tests/test_throughput_benchmark.py
+import importlib.util
+import os
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location('throughput_benchmark', os.path.join(ROOT, 'benchmarks', 'throughput_benchmark.py'))
+throughput_benchmark = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(throughput_benchmark)
+
+
+class TestThroughputBenchmark(unittest.TestCase):
+
+    def test_run_reports_throughput_and_memory(self):
+        results = throughput_benchmark.run_benchmarks([1000], names=['prueba_poker', 'simulador_lote'],
+                                                      repeat=1, report=lambda line: None)
+        self.assertEqual([r['benchmark'] for r in results], ['prueba_poker', 'simulador_lote'])
+        for result in results:
+            self.assertEqual(result['size'], 1000)
+            self.assertGreater(result['throughput'], 0)
+            self.assertGreater(result['peak_bytes'], 0)
+        self.assertIn('cpu_count', throughput_benchmark.machine_metadata())
+
+    def test_compare_flags_regressions(self):
+        def results(throughput, peak):
+            return {'results': [{'benchmark': 'generador', 'size': 1000, 'unit': 'bits/s',
+                                 'throughput': throughput, 'peak_bytes': peak}]}
+        base = results(100.0, 1000)
+        self.assertFalse(throughput_benchmark.compare(base, results(95.0, 1050), 0.1)[0]['regression'])
+        self.assertTrue(throughput_benchmark.compare(base, results(80.0, 1000), 0.1)[0]['regression'])
+        self.assertTrue(throughput_benchmark.compare(base, results(100.0, 1500), 0.1)[0]['regression'])
+
+if __name__ == '__main__':
+    unittest.main()
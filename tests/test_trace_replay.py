@@ -0,0 +1,63 @@
+# tests/test_trace_replay.py
+import os
+import tempfile
+import unittest
+import numpy as np
+from src.core.simulation_engine import LoadSimulator
+from src.core.trace_replay import TraceReader, align_to_steps, calibrate_from_trace, replay_trace
+
+class TestTraceReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        # Traza sintética generada por el propio modelo: dos filas por paso de 1 s
+        self.simulator = LoadSimulator(num_users=100, latency_sensitivity=0.7, cpu_sensitivity=0.3,
+                                       memory_sensitivity=0.2, recovery_rate=1.4, seed=5)
+        self.simulator.simulate_steps(np.random.RandomState(1).randint(0, 2, 5000))
+        h = self.simulator.history
+        n = len(h['latency'])
+        timestamps = np.repeat(np.arange(n), 2) + np.tile([0.25, 0.75], n)
+        self.rows = np.column_stack([timestamps] + [np.repeat(h[k], 2) for k in
+                                                    ['simulated_requests', 'latency', 'cpu', 'memory']])
+        self.csv_path = os.path.join(self.tmp_dir.name, 'traza.csv')
+        with open(self.csv_path, 'w') as f:
+            f.write('timestamp,requests,latency_ms,cpu,memory\n')
+            np.savetxt(f, self.rows, delimiter=',', fmt='%.17g')
+        self.npy_path = os.path.join(self.tmp_dir.name, 'traza.npy')
+        np.save(self.npy_path, self.rows)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_csv_chunks_match_file(self):
+        chunks = list(TraceReader(self.csv_path, chunk_rows=333).iter_chunks())
+        self.assertGreater(len(chunks), 1)
+        np.testing.assert_array_equal(np.concatenate([c['latency_ms'] for c in chunks]), self.rows[:, 2])
+
+    def test_alignment_across_chunks(self):
+        chunks = TraceReader(self.npy_path, chunk_rows=777).iter_chunks()
+        aligned = list(align_to_steps(chunks, step_seconds=1.0))
+        steps = np.concatenate([a['time_steps'] for a in aligned])
+        np.testing.assert_array_equal(steps, np.arange(5000))
+        requests = np.concatenate([a['simulated_requests'] for a in aligned])
+        np.testing.assert_allclose(requests, self.simulator.history['simulated_requests'])
+
+    def test_calibration_recovers_parameters(self):
+        for path in [self.csv_path, self.npy_path]:
+            params = calibrate_from_trace(path, step_seconds=1.0, num_users=100, chunk_rows=1000)
+            self.assertAlmostEqual(params['recovery_rate'], 1.4, places=6)
+            self.assertAlmostEqual(params['latency_sensitivity'], 0.7, places=6)
+            self.assertAlmostEqual(params['cpu_sensitivity'], 0.3, places=6)
+            self.assertAlmostEqual(params['memory_sensitivity'], 0.2, places=6)
+
+    def test_replay_error_metrics(self):
+        errors = replay_trace(self.npy_path, self.simulator.history, step_seconds=1.0, chunk_rows=500)
+        self.assertEqual(errors['latency']['n'], 5000)
+        self.assertAlmostEqual(errors['latency']['rmse'], 0.0)
+        shifted = {k: list(np.asarray(v) + 1.0) for k, v in self.simulator.history.items()}
+        errors = replay_trace(self.npy_path, shifted, step_seconds=1.0)
+        self.assertAlmostEqual(errors['cpu']['bias'], 1.0)
+        self.assertAlmostEqual(errors['cpu']['mae'], 1.0)
+
+if __name__ == '__main__':
+    unittest.main()